@@ -0,0 +1,91 @@
+"""Add full-text search vectors and trigram indexes
+
+Revision ID: add_fulltext_search
+Revises: add_user_stats_rollup
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = 'add_fulltext_search'
+down_revision = 'add_user_stats_rollup'
+branch_labels = None
+depends_on = None
+
+
+# Конфигурация russian стеммит кириллицу русским snowball, латиницу - английским
+SEARCH_VECTORS = {
+    'ContentBlock': """
+        setweight(to_tsvector('russian', coalesce("blockTitle", '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce("codeFoldTitle", '')), 'B') ||
+        setweight(to_tsvector('russian', coalesce("textContent", '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce("codeContent", '')), 'D')
+    """,
+    'TheoryCard': """
+        setweight(to_tsvector('russian', coalesce("questionBlock", '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce("answerBlock", '')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(category, '') || ' ' ||
+        coalesce("subCategory", '')), 'C')
+    """,
+    'InterviewRecord': """
+        setweight(to_tsvector('simple', coalesce(company_name, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(position, '')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(full_content, '')), 'C')
+    """,
+    'InterviewQuestion': """
+        setweight(to_tsvector('russian', coalesce(question_text, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(canonical_question, '')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(topic_name, '')), 'C')
+    """,
+}
+
+SEARCH_INDEXES = {
+    'ContentBlock': 'idx_contentblock_search',
+    'TheoryCard': 'idx_theorycard_search',
+    'InterviewRecord': 'idx_interviewrecord_search',
+    'InterviewQuestion': 'idx_interviewquestion_search',
+}
+
+TRIGRAM_INDEXES = {
+    'idx_contentblock_title_trgm': ('ContentBlock', 'blockTitle'),
+    'idx_theorycard_question_trgm': ('TheoryCard', 'questionBlock'),
+    'idx_interviewrecord_company_trgm': ('InterviewRecord', 'company_name'),
+    'idx_interviewquestion_text_trgm': ('InterviewQuestion', 'question_text'),
+}
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Генерируемые колонки пересчитываются PostgreSQL при INSERT/UPDATE
+    for table, expression in SEARCH_VECTORS.items():
+        op.execute(f"""
+            ALTER TABLE "{table}"
+            ADD COLUMN "searchVector" tsvector
+            GENERATED ALWAYS AS ({expression}) STORED
+        """)
+
+    for table, index_name in SEARCH_INDEXES.items():
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} '
+            f'ON "{table}" USING gin ("searchVector")'
+        )
+
+    for index_name, (table, column) in TRIGRAM_INDEXES.items():
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} '
+            f'ON "{table}" USING gin ("{column}" gin_trgm_ops)'
+        )
+
+
+def downgrade() -> None:
+    for index_name in TRIGRAM_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+    for index_name in SEARCH_INDEXES.values():
+        op.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+    for table in SEARCH_VECTORS:
+        op.execute(f'ALTER TABLE "{table}" DROP COLUMN IF EXISTS "searchVector"')
@@ -0,0 +1,27 @@
+"""Add indexes for keyset pagination of interviews
+
+Revision ID: add_keyset_pagination_indexes
+Revises: add_fulltext_search
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = 'add_keyset_pagination_indexes'
+down_revision = 'add_fulltext_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Порядок списка интервью: interview_date DESC, id DESC
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS idx_interviewrecord_date_id '
+        'ON "InterviewRecord" (interview_date DESC, id DESC)'
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS idx_interviewrecord_date_id')
@@ -0,0 +1,65 @@
+"""Ensure universe geometry columns and ClusterConnections exist
+
+Revision ID: add_universe_geometry
+Revises: add_keyset_pagination_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers
+revision = 'add_universe_geometry'
+down_revision = 'add_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+# universe_3d_coords_001 не связана с основной цепочкой миграций, поэтому
+# колонки для предрассчитанной геометрии добавляются идемпотентно
+CLUSTER_COLUMNS = {
+    'star_x': 'DOUBLE PRECISION',
+    'star_y': 'DOUBLE PRECISION',
+    'star_z': 'DOUBLE PRECISION',
+    'temperature': 'INTEGER',
+    'mass': 'DOUBLE PRECISION',
+    'orbit_radius': 'DOUBLE PRECISION',
+    'orbit_speed': 'DOUBLE PRECISION',
+    'embedding_vector': 'DOUBLE PRECISION[]',
+}
+
+
+def upgrade() -> None:
+    for column, column_type in CLUSTER_COLUMNS.items():
+        op.execute(
+            f'ALTER TABLE "InterviewCluster" '
+            f'ADD COLUMN IF NOT EXISTS {column} {column_type}'
+        )
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS "ClusterConnections" (
+            id SERIAL PRIMARY KEY,
+            source_cluster_id INTEGER
+                REFERENCES "InterviewCluster" (id) ON DELETE CASCADE,
+            target_cluster_id INTEGER
+                REFERENCES "InterviewCluster" (id) ON DELETE CASCADE,
+            connection_weight DOUBLE PRECISION,
+            connection_type VARCHAR(50),
+            created_at TIMESTAMP NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP NOT NULL DEFAULT now(),
+            UNIQUE (source_cluster_id, target_cluster_id)
+        )
+    """)
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS idx_cluster_connections_source '
+        'ON "ClusterConnections" (source_cluster_id)'
+    )
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS idx_cluster_connections_target '
+        'ON "ClusterConnections" (target_cluster_id)'
+    )
+
+
+def downgrade() -> None:
+    # Колонки и таблица могли быть созданы universe_3d_coords_001 - не удаляем
+    pass
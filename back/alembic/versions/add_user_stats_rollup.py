@@ -0,0 +1,155 @@
+"""Add UserStatsRollup with incremental maintenance triggers
+
+Revision ID: add_user_stats_rollup
+Revises: fix_interview_question_ids
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = 'add_user_stats_rollup'
+down_revision = 'fix_interview_question_ids'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('UserStatsRollup',
+        sa.Column('userId', sa.Integer(), nullable=False),
+        sa.Column('itemType', sa.String(), nullable=False),
+        sa.Column('mainCategory', sa.String(), nullable=False),
+        sa.Column('subCategory', sa.String(), nullable=False),
+        sa.Column('completedCount', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updatedAt', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['userId'], ['User.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('userId', 'itemType', 'mainCategory', 'subCategory')
+    )
+
+    # Прибавляет delta к счетчику пользователя в категории
+    op.execute("""
+        CREATE OR REPLACE FUNCTION stats_rollup_apply(
+            p_user_id INTEGER, p_item_type TEXT, p_main TEXT, p_sub TEXT, p_delta INTEGER
+        ) RETURNS VOID AS $$
+        BEGIN
+            IF p_delta = 0 OR p_main IS NULL THEN
+                RETURN;
+            END IF;
+            INSERT INTO "UserStatsRollup"
+                ("userId", "itemType", "mainCategory", "subCategory", "completedCount", "updatedAt")
+            VALUES (p_user_id, p_item_type, p_main, p_sub, GREATEST(p_delta, 0), now())
+            ON CONFLICT ("userId", "itemType", "mainCategory", "subCategory") DO UPDATE
+            SET "completedCount" = GREATEST("UserStatsRollup"."completedCount" + p_delta, 0),
+                "updatedAt" = now();
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Блок считается пройденным при solvedCount > 0
+    op.execute("""
+        CREATE OR REPLACE FUNCTION stats_rollup_content_progress() RETURNS TRIGGER AS $$
+        DECLARE
+            v_main TEXT;
+            v_sub TEXT;
+        BEGIN
+            IF TG_OP = 'UPDATE'
+               AND OLD."userId" = NEW."userId"
+               AND OLD."blockId" = NEW."blockId"
+               AND (OLD."solvedCount" > 0) = (NEW."solvedCount" > 0) THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD."solvedCount" > 0 THEN
+                SELECT f."mainCategory", f."subCategory" INTO v_main, v_sub
+                FROM "ContentBlock" b JOIN "ContentFile" f ON f.id = b."fileId"
+                WHERE b.id = OLD."blockId";
+                PERFORM stats_rollup_apply(OLD."userId", 'content', v_main, v_sub, -1);
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW."solvedCount" > 0 THEN
+                SELECT f."mainCategory", f."subCategory" INTO v_main, v_sub
+                FROM "ContentBlock" b JOIN "ContentFile" f ON f.id = b."fileId"
+                WHERE b.id = NEW."blockId";
+                PERFORM stats_rollup_apply(NEW."userId", 'content', v_main, v_sub, 1);
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Карточка считается изученной при reviewCount > 0
+    op.execute("""
+        CREATE OR REPLACE FUNCTION stats_rollup_theory_progress() RETURNS TRIGGER AS $$
+        DECLARE
+            v_main TEXT;
+            v_sub TEXT;
+        BEGIN
+            IF TG_OP = 'UPDATE'
+               AND OLD."userId" = NEW."userId"
+               AND OLD."cardId" = NEW."cardId"
+               AND (OLD."reviewCount" > 0) = (NEW."reviewCount" > 0) THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD."reviewCount" > 0 THEN
+                SELECT c.category, COALESCE(c."subCategory", 'General') INTO v_main, v_sub
+                FROM "TheoryCard" c WHERE c.id = OLD."cardId";
+                PERFORM stats_rollup_apply(OLD."userId", 'theory', v_main, v_sub, -1);
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW."reviewCount" > 0 THEN
+                SELECT c.category, COALESCE(c."subCategory", 'General') INTO v_main, v_sub
+                FROM "TheoryCard" c WHERE c.id = NEW."cardId";
+                PERFORM stats_rollup_apply(NEW."userId", 'theory', v_main, v_sub, 1);
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trg_stats_rollup_content_progress
+        AFTER INSERT OR DELETE OR UPDATE OF "solvedCount", "userId", "blockId"
+        ON "UserContentProgress"
+        FOR EACH ROW EXECUTE FUNCTION stats_rollup_content_progress();
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_stats_rollup_theory_progress
+        AFTER INSERT OR DELETE OR UPDATE OF "reviewCount", "userId", "cardId"
+        ON "UserTheoryProgress"
+        FOR EACH ROW EXECUTE FUNCTION stats_rollup_theory_progress();
+    """)
+
+    # Заполняем rollup по текущим данным
+    op.execute("""
+        INSERT INTO "UserStatsRollup"
+            ("userId", "itemType", "mainCategory", "subCategory", "completedCount", "updatedAt")
+        SELECT p."userId", 'content', f."mainCategory", f."subCategory", COUNT(*), now()
+        FROM "UserContentProgress" p
+        JOIN "ContentBlock" b ON b.id = p."blockId"
+        JOIN "ContentFile" f ON f.id = b."fileId"
+        WHERE p."solvedCount" > 0
+        GROUP BY p."userId", f."mainCategory", f."subCategory"
+    """)
+    op.execute("""
+        INSERT INTO "UserStatsRollup"
+            ("userId", "itemType", "mainCategory", "subCategory", "completedCount", "updatedAt")
+        SELECT p."userId", 'theory', c.category, COALESCE(c."subCategory", 'General'), COUNT(*), now()
+        FROM "UserTheoryProgress" p
+        JOIN "TheoryCard" c ON c.id = p."cardId"
+        WHERE p."reviewCount" > 0
+        GROUP BY p."userId", c.category, COALESCE(c."subCategory", 'General')
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS trg_stats_rollup_theory_progress ON "UserTheoryProgress"')
+    op.execute('DROP TRIGGER IF EXISTS trg_stats_rollup_content_progress ON "UserContentProgress"')
+    op.execute('DROP FUNCTION IF EXISTS stats_rollup_theory_progress()')
+    op.execute('DROP FUNCTION IF EXISTS stats_rollup_content_progress()')
+    op.execute('DROP FUNCTION IF EXISTS stats_rollup_apply(INTEGER, TEXT, TEXT, TEXT, INTEGER)')
+    op.drop_table('UserStatsRollup')
@@ -1,10 +1,16 @@
 """Структурированное логирование с JSON форматом и correlation ID"""
 
+import atexit
 import logging
+import queue
+import random
 import sys
+import threading
+import time
 import uuid
 from contextvars import ContextVar
-from typing import Any, Dict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
 
 import structlog
 from pythonjsonlogger import jsonlogger
@@ -110,12 +116,13 @@ class CustomJSONFormatter(jsonlogger.JsonFormatter):
         log_record["function"] = record.funcName
         log_record["line"] = record.lineno
 
-        # Добавляем контекстные поля
-        if correlation_id := get_correlation_id():
+        # Добавляем контекстные поля (при асинхронной записи они сохранены
+        # в record фильтром LogContextFilter)
+        if correlation_id := getattr(record, "correlation_id", get_correlation_id()):
             log_record["correlation_id"] = correlation_id
-        if user_id := get_user_id():
+        if user_id := getattr(record, "user_id", get_user_id()):
             log_record["user_id"] = user_id
-        if request_id := get_request_id():
+        if request_id := getattr(record, "request_id", get_request_id()):
             log_record["request_id"] = request_id
 
         # Добавляем информацию о сервисе
@@ -124,13 +131,135 @@ class CustomJSONFormatter(jsonlogger.JsonFormatter):
         log_record["environment"] = settings.app_environment
 
 
+class LogContextFilter(logging.Filter):
+    """Сохраняет контекст запроса в записи до передачи в фоновый поток"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if correlation_id := get_correlation_id():
+            record.correlation_id = correlation_id
+        if user_id := get_user_id():
+            record.user_id = user_id
+        if request_id := get_request_id():
+            record.request_id = request_id
+        return True
+
+
+class LogRateLimiter(logging.Filter):
+    """
+    Семплирование и ограничение частоты записей по логгерам
+
+    Правила задаются по префиксу имени логгера (самый длинный совпадающий):
+    sample_rates - доля сохраняемых записей уровня ниже WARNING,
+    rate_limits - максимум записей в секунду на логгер. WARNING и выше
+    не отбрасываются. Количество подавленных записей добавляется в
+    следующую пропущенную запись логгера (поле suppressed_records).
+    """
+
+    def __init__(
+        self,
+        sample_rates: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, int]] = None,
+    ):
+        super().__init__()
+        self.sample_rates = sample_rates or {}
+        self.rate_limits = rate_limits or {}
+        self._rules: Dict[str, Tuple[float, Optional[int]]] = {}
+        self._windows: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _match(rules: Dict[str, Any], name: str) -> Optional[Any]:
+        best = None
+        for prefix in rules:
+            if (name == prefix or name.startswith(prefix + ".") or prefix == "") and (
+                best is None or len(prefix) > len(best)
+            ):
+                best = prefix
+        return rules[best] if best is not None else None
+
+    def _rule(self, name: str) -> Tuple[float, Optional[int]]:
+        rule = self._rules.get(name)
+        if rule is None:
+            rate = self._match(self.sample_rates, name)
+            rule = (1.0 if rate is None else rate, self._match(self.rate_limits, name))
+            self._rules[name] = rule
+        return rule
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        sample_rate, rate_limit = self._rule(record.name)
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            return False
+        if rate_limit is None:
+            return True
+
+        now = int(time.monotonic())
+        with self._lock:
+            # [начало секундного окна, записей в окне, подавлено]
+            window = self._windows.setdefault(record.name, [now, 0, 0])
+            if window[0] != now:
+                window[0], window[1] = now, 0
+            if window[1] >= rate_limit:
+                window[2] += 1
+                return False
+            window[1] += 1
+            if window[2]:
+                record.suppressed_records = window[2]
+                window[2] = 0
+        return True
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Неблокирующий handler: запись кладется в очередь, форматирование и
+    вывод выполняет QueueListener в фоновом потоке. При переполнении
+    очереди запись отбрасывается, а не блокирует запрос.
+    """
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Форматирование откладывается до фонового потока; здесь только
+        # подставляются аргументы, пока они не изменились
+        record = logging.makeLogRecord(record.__dict__)
+        if not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue_listener: Optional[QueueListener] = None
+
+
+def shutdown_logging() -> None:
+    """Остановить фоновый поток логирования, дописав очередь"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 def setup_logging() -> None:
     """Настройка системы логирования"""
+    global _queue_listener
 
     # Настройка уровня логирования
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
     # Очистка существующих handlers
+    shutdown_logging()
     logging.root.handlers = []
 
     if settings.log_format == "json":
@@ -189,10 +318,30 @@ def setup_logging() -> None:
     console_handler.setFormatter(formatter)
     console_handler.setLevel(log_level)
 
+    rate_limiter = LogRateLimiter(
+        sample_rates=settings.log_sample_rates,
+        rate_limits=settings.log_rate_limits,
+    )
+
     # Настройка root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    root_logger.addHandler(console_handler)
+
+    if settings.log_async:
+        # Запрос только кладет запись в очередь; JSON и запись в stdout -
+        # в фоновом потоке QueueListener
+        queue_handler = AsyncQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+        queue_handler.setLevel(log_level)
+        queue_handler.addFilter(LogContextFilter())
+        queue_handler.addFilter(rate_limiter)
+        _queue_listener = QueueListener(
+            queue_handler.queue, console_handler, respect_handler_level=True
+        )
+        _queue_listener.start()
+        root_logger.addHandler(queue_handler)
+    else:
+        console_handler.addFilter(rate_limiter)
+        root_logger.addHandler(console_handler)
 
     # Настройка логгеров для библиотек
     logging.getLogger("uvicorn").setLevel(
@@ -233,9 +382,10 @@ class CorrelationIdMiddleware:
             correlation_id = create_correlation_id()
             set_correlation_id(correlation_id)
 
-            # Устанавливаем request ID
-            request_id = scope.get("headers", {}).get("x-request-id", correlation_id)
-            set_request_id(request_id)
+            # Устанавливаем request ID (заголовки в scope - список пар bytes)
+            headers = dict(scope.get("headers") or [])
+            request_id = headers.get(b"x-request-id", b"").decode("latin-1")
+            set_request_id(request_id or correlation_id)
 
             # Логируем начало запроса
             logger = get_logger("request")
@@ -0,0 +1,188 @@
+"""
+Профилировщик SQL запросов для поиска N+1 (development/staging)
+
+Включается `sql_profiler_enabled`. Для каждого HTTP запроса SQL
+группируется по форме (литералы и параметры заменены на `?`, списки IN
+свернуты), считается количество и время по каждой форме. Формы,
+повторившиеся не меньше `sql_profiler_repeat_threshold` раз, попадают в
+предупреждение в логе; короткая сводка отдается в заголовке X-SQL-Profile.
+
+Вне HTTP (скрипты, отладка в консоли) используется `profile_queries()`:
+
+    with profile_queries() as profile:
+        service.get_task_categories()
+    print(profile.summary())
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = b"x-sql-profile"
+MAX_SHAPE_LENGTH = 300
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_BIND_PARAM = re.compile(r"%\(\w+\)s|\$\d+|(?<!:):\w+|\?|__\[POSTCOMPILE_\w+\]")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Форма запроса: без литералов и значений параметров"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _BIND_PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PARAM_LIST.sub("(?)", shape)
+    shape = _VALUES_LIST.sub(r"\1", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryProfile:
+    """SQL запросы одного HTTP запроса (или блока profile_queries)"""
+
+    def __init__(self, repeat_threshold: int):
+        self.repeat_threshold = repeat_threshold
+        self.total_queries = 0
+        self.total_time = 0.0
+        # форма запроса -> [количество, суммарное время]
+        self.shapes: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.total_queries += 1
+        self.total_time += elapsed
+        entry = self.shapes.setdefault(normalize_sql(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def repeated(self) -> List[Dict[str, Any]]:
+        """Формы, выполненные не меньше repeat_threshold раз, по убыванию"""
+        return [
+            {
+                "count": int(count),
+                "time_ms": round(elapsed * 1000, 2),
+                "sql": shape[:MAX_SHAPE_LENGTH],
+            }
+            for shape, (count, elapsed) in sorted(
+                self.shapes.items(), key=lambda item: -item[1][0]
+            )
+            if count >= self.repeat_threshold
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "queries": self.total_queries,
+            "time_ms": round(self.total_time * 1000, 2),
+            "distinct": len(self.shapes),
+            "repeated": self.repeated(),
+        }
+
+    def header_value(self) -> bytes:
+        return (
+            f"queries={self.total_queries}; "
+            f"time_ms={self.total_time * 1000:.1f}; "
+            f"distinct={len(self.shapes)}; "
+            f"repeated={len(self.repeated())}"
+        ).encode("latin-1")
+
+
+query_profile_ctx: ContextVar[Optional[QueryProfile]] = ContextVar(
+    "query_profile", default=None
+)
+
+
+def _before_cursor_execute(conn, *_) -> None:
+    if query_profile_ctx.get() is not None:
+        conn.info.setdefault("profiler_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, *_) -> None:
+    profile = query_profile_ctx.get()
+    started = conn.info.get("profiler_started_at")
+    if profile is None or not started:
+        return
+    profile.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("profiler_started_at"):
+        connection.info["profiler_started_at"].pop()
+
+
+def install_query_profiler(engine) -> None:
+    """Подписать движок на профилировщик (без активного профиля - no-op)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def profile_queries(repeat_threshold: Optional[int] = None) -> Iterator[QueryProfile]:
+    """Профилировать SQL запросы внутри блока"""
+    profile = QueryProfile(repeat_threshold or settings.sql_profiler_repeat_threshold)
+    token = query_profile_ctx.set(profile)
+    try:
+        yield profile
+    finally:
+        query_profile_ctx.reset(token)
+
+
+class QueryProfilerMiddleware:
+    """ASGI middleware: профиль SQL на каждый HTTP запрос"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as profile:
+
+            async def send_wrapper(message):
+                # Заголовки уходят после обработчика, поэтому профиль полный
+                # (кроме запросов из StreamingResponse)
+                if (
+                    message["type"] == "http.response.start"
+                    and settings.sql_profiler_response_header
+                ):
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (PROFILE_HEADER, profile.header_value()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._report(scope, profile)
+
+    @staticmethod
+    def _report(scope, profile: QueryProfile) -> None:
+        if not profile.total_queries:
+            return
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        summary = profile.summary()
+        if summary["repeated"]:
+            logger.warning(
+                "Repeated SQL queries in request",
+                method=scope["method"],
+                route=route,
+                **summary,
+            )
+        else:
+            logger.debug("SQL profile", method=scope["method"], route=route, **summary)
@@ -1,5 +1,7 @@
 """Core Settings - Типизированная система настроек"""
 
+from typing import Dict, List
+
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings
 
@@ -25,6 +27,14 @@ class Settings(BaseSettings):
     database_max_overflow: int = Field(
         default=30, description="Максимальное переполнение pool"
     )
+    database_async_features: List[str] = Field(
+        default_factory=list,
+        description='Фичи с асинхронным доступом к БД (asyncpg), например ["theory"]',
+    )
+    fulltext_search_enabled: bool = Field(
+        default=True,
+        description="Полнотекстовый поиск (tsvector/pg_trgm) вместо ILIKE",
+    )
 
     # Redis settings
     redis_url: str = Field(..., description="URL подключения к Redis")
@@ -51,6 +61,156 @@ class Settings(BaseSettings):
     # Logging settings
     log_level: str = Field(default="INFO", description="Уровень логирования")
     log_format: str = Field(default="json", description="Формат логов: json или text")
+    log_async: bool = Field(
+        default=True, description="Форматировать и писать логи в фоновом потоке"
+    )
+    log_queue_size: int = Field(
+        default=10000, description="Размер очереди логов (при переполнении - сброс)"
+    )
+    log_sample_rates: Dict[str, float] = Field(
+        default_factory=dict,
+        description='Доля DEBUG/INFO записей по префиксу логгера, например {"app.features.task": 0.1}',
+    )
+    log_rate_limits: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Максимум DEBUG/INFO записей в секунду на логгер по префиксу",
+    )
+
+    # Metrics settings
+    metrics_enabled: bool = Field(
+        default=True, description="Сбор метрик запросов и эндпоинт /metrics"
+    )
+    sql_profiler_enabled: bool = Field(
+        default=False,
+        description="Профилирование SQL по запросам для поиска N+1 (dev/staging)",
+    )
+    sql_profiler_repeat_threshold: int = Field(
+        default=5, description="Сколько повторов одной формы SQL считать N+1"
+    )
+    sql_profiler_response_header: bool = Field(
+        default=True, description="Отдавать сводку профиля в заголовке X-SQL-Profile"
+    )
+
+    # Code execution settings
+    code_executor_pool_enabled: bool = Field(
+        default=True, description="Использовать пул прогретых контейнеров"
+    )
+    code_executor_pool_min_size: int = Field(
+        default=2, description="Минимум прогретых контейнеров на язык"
+    )
+    code_executor_pool_max_size: int = Field(
+        default=8, description="Максимум контейнеров на язык"
+    )
+    code_executor_pool_max_runs: int = Field(
+        default=50, description="Количество запусков до пересоздания контейнера"
+    )
+    code_executor_pool_sizes: Dict[str, List[int]] = Field(
+        default_factory=dict,
+        description='Размеры пула по языку, например {"PYTHON": [4, 16]}',
+    )
+    code_executor_threads: int = Field(
+        default=16, description="Потоков для блокирующих Docker вызовов"
+    )
+    code_executor_language_concurrency: int = Field(
+        default=8, description="Одновременных запусков на язык"
+    )
+    code_executor_max_queue: int = Field(
+        default=100, description="Максимальная очередь запусков на язык"
+    )
+    code_execution_broker: str = Field(
+        default="memory", description="Брокер очереди выполнений: memory или redis"
+    )
+    code_execution_workers: int = Field(
+        default=4, description="Воркеров очереди в процессе API (0 - не запускать)"
+    )
+    code_execution_stale_after: int = Field(
+        default=300,
+        description="Через сколько секунд RUNNING выполнение при старте воркеров "
+        "считается прерванным",
+    )
+    code_execution_stream_timeout: int = Field(
+        default=120, description="Максимальная длительность SSE потока в секундах"
+    )
+    code_execution_cache_enabled: bool = Field(
+        default=True, description="Кешировать результаты запусков тест-кейсов"
+    )
+    code_execution_cache_backend: str = Field(
+        default="redis", description="Хранилище кеша: redis (с fallback) или memory"
+    )
+    code_execution_cache_ttl: int = Field(
+        default=3600, description="Время жизни результата в кеше в секундах"
+    )
+    code_execution_cache_max_entries: int = Field(
+        default=10000, description="Размер LRU-кеша в памяти процесса"
+    )
+    code_execution_cache_bypass_blocks: List[str] = Field(
+        default_factory=list,
+        description="ID блоков с недетерминированными задачами (без кеша)",
+    )
+    code_validation_concurrency: int = Field(
+        default=4, description="Параллельно выполняемых тест-кейсов на одну проверку"
+    )
+    stats_rollups_enabled: bool = Field(
+        default=True,
+        description="Читать статистику из UserStatsRollup вместо полного скана",
+    )
+    catalog_snapshot_check_interval: int = Field(
+        default=5, description="Как часто сверять версию каталога в Redis (сек)"
+    )
+    catalog_snapshot_max_age: int = Field(
+        default=600, description="Максимальный возраст снимка каталога (сек)"
+    )
+    constellation_check_interval: int = Field(
+        default=30, description="Как часто проверять версию графа кластеров (сек)"
+    )
+    constellation_refresh_interval: int = Field(
+        default=3600, description="Плановый пересчет графа кластеров (сек)"
+    )
+    question_sampler_max_age: int = Field(
+        default=600, description="Максимальный возраст индекса случайных вопросов (сек)"
+    )
+    question_sampler_seen_ttl: int = Field(
+        default=86400,
+        description="Сколько помнить выданные пользователю вопросы (no_repeat, сек)",
+    )
+    pagination_count_cache_ttl: int = Field(
+        default=60, description="Время жизни оценки total в режиме estimate (сек)"
+    )
+    pagination_exact_count_threshold: int = Field(
+        default=1000,
+        description="До скольких строк по оценке планировщика считать точный COUNT",
+    )
+
+    auth_session_cache_enabled: bool = Field(
+        default=True, description="Кешировать пользователя сессии в памяти и Redis"
+    )
+    auth_session_cache_ttl: int = Field(
+        default=30, description="Время жизни записи кеша сессий в процессе (сек)"
+    )
+    auth_session_cache_max_entries: int = Field(
+        default=10000, description="Размер LRU-кеша сессий в памяти процесса"
+    )
+    auth_user_snapshot_ttl: int = Field(
+        default=300, description="Время жизни снимка пользователя в Redis (сек)"
+    )
+
+    # AI test generation settings
+    ai_http_pool_limit: int = Field(
+        default=20, description="Максимум соединений к LLM API в пуле процесса"
+    )
+    ai_http_pool_limit_per_host: int = Field(
+        default=10, description="Максимум соединений к одному хосту LLM API"
+    )
+    ai_http_keepalive_timeout: float = Field(
+        default=60.0,
+        description="Время жизни простаивающего соединения к LLM API (сек)",
+    )
+    ai_generation_cache_ttl: int = Field(
+        default=3600, description="Время жизни кеша ответов AI-генератора тестов (сек)"
+    )
+    ai_generation_cache_max_entries: int = Field(
+        default=500, description="Размер кеша ответов AI-генератора тестов (0 - выкл.)"
+    )
 
     # Additional settings
     proxyapi_key: str = Field(default="", description="Ключ для Proxy API")
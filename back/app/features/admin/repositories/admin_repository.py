@@ -2,6 +2,7 @@
 
 from typing import Dict
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.features.admin.exceptions import AdminStatsException
@@ -21,16 +22,19 @@ class AdminRepository:
     async def get_user_stats(self) -> Dict[str, int]:
         """Get user statistics"""
         try:
-            total_users = self.session.query(User).count()
-            admin_users = self.session.query(User).filter(User.role == "ADMIN").count()
-            regular_users = self.session.query(User).filter(User.role == "USER").count()
-            guest_users = self.session.query(User).filter(User.role == "GUEST").count()
+            # Одним запросом с группировкой вместо COUNT на каждую роль
+            counts = {
+                getattr(role, "value", role): count
+                for role, count in self.session.query(User.role, func.count())
+                .group_by(User.role)
+                .all()
+            }
 
             return {
-                "total": total_users,
-                "admins": admin_users,
-                "regular_users": regular_users,
-                "guests": guest_users,
+                "total": sum(counts.values()),
+                "admins": counts.get("ADMIN", 0),
+                "regular_users": counts.get("USER", 0),
+                "guests": counts.get("GUEST", 0),
             }
         except Exception as e:
             raise AdminStatsException(f"Failed to get user statistics: {str(e)}")
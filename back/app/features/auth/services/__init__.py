@@ -3,5 +3,6 @@
 """
 
 from .auth_service import AuthService
+from .session_cache import SessionUser, invalidate_user_sessions
 
-__all__ = ["AuthService"]
+__all__ = ["AuthService", "SessionUser", "invalidate_user_sessions"]
@@ -4,7 +4,6 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-import redis
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
@@ -19,6 +18,11 @@ from app.features.auth.dto.auth_dto import (
     UserResponse,
 )
 from app.features.auth.repositories.user_repository import UserRepository
+from app.features.auth.services.session_cache import (
+    SessionUser,
+    get_auth_redis,
+    get_session_cache,
+)
 from app.shared.models.enums import UserRole
 from app.shared.models.user_models import User
 
@@ -31,8 +35,7 @@ class AuthService:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        redis_url = getattr(settings, 'redis_url', "redis://127.0.0.1:6379/0")
-        self.redis_client = redis.from_url(redis_url, decode_responses=True)
+        self.redis_client = get_auth_redis()
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Проверка пароля"""
@@ -131,25 +134,68 @@ class AuthService:
             GracefulDegradation.handle_redis_error("delete_session", e)
             # Graceful degradation - сессия не удалится, но приложение не упадет
 
+        cache = get_session_cache()
+        if cache is not None:
+            cache.invalidate_session(session_id)
+
 
     async def get_user_by_session(self, request) -> User:
-        """Получение пользователя по сессии"""
+        """Получение пользователя по сессии (полная запись из БД)"""
+        session_user = await self.get_session_user(request)
+
+        user = await self.user_repository.get_by_id(session_user.id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
+            )
+
+        return user
+
+    async def get_session_user(self, request) -> SessionUser:
+        """
+        Снимок пользователя (id, email, роль) по сессии
+
+        Результат запоминается в request.state, поэтому все зависимости
+        одного запроса разрешают пользователя один раз.
+        """
+        cached = getattr(request.state, "session_user", None)
+        if cached is not None:
+            return cached
+
         session_id = request.cookies.get("session_id")
         if not session_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
             )
 
+        cache = get_session_cache()
+        user = cache.get_local(session_id) if cache is not None else None
+        if user is None:
+            user = await self._load_session_user(session_id, cache)
+            if cache is not None:
+                cache.remember(session_id, user)
+
+        request.state.session_user = user
+        return user
+
+    async def _load_session_user(self, session_id: str, cache) -> SessionUser:
         user_id = self.get_session_user_id(session_id)
         if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired"
             )
 
-        user = await self.user_repository.get_by_id(user_id)
-        if not user:
+        user = cache.get_snapshot(user_id) if cache is not None else None
+        if user is not None:
+            return user
+
+        db_user = await self.user_repository.get_by_id(user_id)
+        if not db_user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
             )
 
+        user = SessionUser.from_user(db_user)
+        if cache is not None:
+            cache.store_snapshot(user)
         return user
@@ -0,0 +1,253 @@
+"""
+Кеш сессия -> пользователь
+
+Каждый авторизованный запрос читает `session:<id>` из Redis и загружает
+пользователя из БД. Для большинства эндпоинтов нужны только id, email и
+роль, поэтому кешируется легкий снимок пользователя:
+- L1: LRU в памяти процесса (session_id -> снимок) с коротким TTL;
+- L2: Redis, `session:<id>` -> user_id и `session-user:<user_id>` -> снимок.
+
+Инвалидация - через Redis pub/sub: при выходе публикуется id сессии, при
+смене роли - id пользователя, и каждый процесс чистит свой L1. Если Redis
+недоступен, устаревание L1 ограничено его TTL.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+from app.core.exceptions import GracefulDegradation
+from app.core.logging import get_logger
+from app.core.settings import settings
+
+logger = get_logger(__name__)
+
+SESSION_KEY_PREFIX = "session"
+USER_SNAPSHOT_KEY_PREFIX = "session-user"
+INVALIDATION_CHANNEL = "auth:invalidate"
+# Сколько секунд ждать перед переподключением подписчика
+RESUBSCRIBE_INTERVAL = 5.0
+
+
+@dataclass(frozen=True)
+class SessionUser:
+    """Легкий снимок пользователя для авторизации запросов"""
+
+    id: int
+    email: str
+    role: str
+
+    @classmethod
+    def from_user(cls, user) -> "SessionUser":
+        role = getattr(user.role, "value", user.role)
+        return cls(id=user.id, email=user.email, role=role)
+
+
+class SessionUserLRU:
+    """Потокобезопасный LRU session_id -> SessionUser с TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, SessionUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[SessionUser]:
+        with self._lock:
+            item = self._data.get(session_id)
+            if item is None:
+                return None
+            expires_at, user = item
+            if expires_at < time.monotonic():
+                del self._data[session_id]
+                return None
+            self._data.move_to_end(session_id)
+            return user
+
+    def set(self, session_id: str, user: SessionUser) -> None:
+        with self._lock:
+            self._data[session_id] = (time.monotonic() + self.ttl_seconds, user)
+            self._data.move_to_end(session_id)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def discard_session(self, session_id: str) -> None:
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def discard_user(self, user_id: int) -> None:
+        with self._lock:
+            stale = [
+                session_id
+                for session_id, (_, user) in self._data.items()
+                if user.id == user_id
+            ]
+            for session_id in stale:
+                del self._data[session_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SessionUserCache:
+    """Двухуровневый кеш: память процесса + Redis, инвалидация через pub/sub"""
+
+    def __init__(
+        self,
+        redis_client,
+        max_entries: int,
+        local_ttl: float,
+        snapshot_ttl: int,
+    ):
+        self.redis = redis_client
+        self.snapshot_ttl = snapshot_ttl
+        self._local = SessionUserLRU(max_entries, local_ttl)
+        self._stop = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+
+    def get_local(self, session_id: str) -> Optional[SessionUser]:
+        return self._local.get(session_id)
+
+    def remember(self, session_id: str, user: SessionUser) -> None:
+        self._local.set(session_id, user)
+
+    def get_snapshot(self, user_id: int) -> Optional[SessionUser]:
+        """Снимок пользователя из Redis (L2)"""
+        try:
+            raw = self.redis.get(f"{USER_SNAPSHOT_KEY_PREFIX}:{user_id}")
+            return SessionUser(**json.loads(raw)) if raw else None
+        except Exception as e:
+            return GracefulDegradation.handle_redis_error(
+                "session_user_snapshot_get", e, None
+            )
+
+    def store_snapshot(self, user: SessionUser) -> None:
+        try:
+            self.redis.setex(
+                f"{USER_SNAPSHOT_KEY_PREFIX}:{user.id}",
+                self.snapshot_ttl,
+                json.dumps(asdict(user)),
+            )
+        except Exception as e:
+            GracefulDegradation.handle_redis_error("session_user_snapshot_set", e)
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Сбросить сессию во всех процессах (выход)"""
+        self._local.discard_session(session_id)
+        self._publish(f"{SESSION_KEY_PREFIX}:{session_id}")
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Сбросить снимок пользователя во всех процессах (смена роли и т.п.)"""
+        self._local.discard_user(user_id)
+        try:
+            self.redis.delete(f"{USER_SNAPSHOT_KEY_PREFIX}:{user_id}")
+        except Exception as e:
+            GracefulDegradation.handle_redis_error("session_user_snapshot_delete", e)
+        self._publish(f"user:{user_id}")
+
+    def _publish(self, message: str) -> None:
+        try:
+            self.redis.publish(INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            GracefulDegradation.handle_redis_error("session_invalidation_publish", e)
+
+    def _apply_invalidation(self, message: str) -> None:
+        kind, _, value = message.partition(":")
+        if kind == SESSION_KEY_PREFIX:
+            self._local.discard_session(value)
+        elif kind == "user" and value.isdigit():
+            self._local.discard_user(int(value))
+
+    def start_listener(self) -> None:
+        """Подписаться на инвалидацию в фоновом потоке"""
+        if self._listener is not None:
+            return
+        self._listener = threading.Thread(
+            target=self._listen, name="session-cache-invalidation", daemon=True
+        )
+        self._listener.start()
+
+    def stop_listener(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=2)
+            self._listener = None
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._apply_invalidation(message["data"])
+            except Exception as e:
+                GracefulDegradation.handle_redis_error("session_invalidation_listen", e)
+                # Пока подписки нет, пропущенные сообщения могли устареть
+                self._local.clear()
+                self._stop.wait(RESUBSCRIBE_INTERVAL)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+
+_redis_client = None
+_cache: Optional[SessionUserCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_auth_redis():
+    """Общий Redis клиент авторизации (один пул соединений на процесс)"""
+    global _redis_client
+    with _cache_lock:
+        if _redis_client is None:
+            import redis
+
+            redis_url = getattr(settings, "redis_url", "redis://127.0.0.1:6379/0")
+            _redis_client = redis.from_url(redis_url, decode_responses=True)
+        return _redis_client
+
+
+def get_session_cache() -> Optional[SessionUserCache]:
+    """Глобальный кеш сессий (None, если отключен в настройках)"""
+    global _cache
+    if not settings.auth_session_cache_enabled:
+        return None
+    redis_client = get_auth_redis()
+    with _cache_lock:
+        if _cache is None:
+            _cache = SessionUserCache(
+                redis_client,
+                max_entries=settings.auth_session_cache_max_entries,
+                local_ttl=settings.auth_session_cache_ttl,
+                snapshot_ttl=settings.auth_user_snapshot_ttl,
+            )
+            _cache.start_listener()
+        return _cache
+
+
+def invalidate_user_sessions(user_id: int) -> None:
+    """Вызывать после изменения роли или email пользователя"""
+    cache = get_session_cache()
+    if cache is not None:
+        cache.invalidate_user(user_id)
+
+
+def shutdown_session_cache() -> None:
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.stop_listener()
+            _cache = None
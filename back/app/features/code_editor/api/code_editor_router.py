@@ -4,6 +4,7 @@ import logging
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.features.code_editor.dto.requests import (
@@ -96,6 +97,57 @@ async def execute_code(
         )
 
 
+@router.post(
+    "/execute/async",
+    response_model=CodeExecutionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_code_execution(
+    request: CodeExecutionRequest,
+    code_editor_service: CodeEditorService = Depends(get_code_editor_service),
+    user=Depends(get_current_user_optional),
+):
+    """Постановка кода в очередь выполнения (результат - через polling или SSE)"""
+    logger.info(f"API: Постановка в очередь кода на языке {request.language}")
+
+    try:
+        user_id = user.id if user else None
+        execution = await code_editor_service.submit_code_execution(request, user_id)
+
+        logger.info(f"API: Выполнение поставлено в очередь, ID: {execution.id}")
+        return execution
+
+    except UnsupportedLanguageError as e:
+        logger.warning(f"API: Неподдерживаемый язык: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except UnsafeCodeError as e:
+        logger.warning(f"API: Небезопасный код: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"API: Ошибка при постановке в очередь: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to submit code execution: {str(e)}",
+        )
+
+
+@router.get("/executions/{execution_id}/stream")
+async def stream_execution(
+    execution_id: str,
+    code_editor_service: CodeEditorService = Depends(get_code_editor_service),
+    user=Depends(get_current_user_optional),
+):
+    """SSE поток статуса и результата выполнения кода"""
+    logger.info(f"API: Подписка на выполнение {execution_id}")
+
+    user_id = user.id if user else None
+    return StreamingResponse(
+        code_editor_service.stream_execution_events(execution_id, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/executions/{execution_id}", response_model=CodeExecutionResponse)
 async def get_execution_result(
     execution_id: str,
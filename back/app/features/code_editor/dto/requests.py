@@ -38,6 +38,12 @@ class ValidationRequest(BaseModel):
     sourceCode: str = Field(..., description="Исходный код для валидации")
     language: CodeLanguage = Field(..., description="Язык программирования")
     stdin: Optional[str] = Field(None, description="Входные данные для тестов")
+    failFast: bool = Field(
+        default=False, description="Остановить проверку после первого упавшего теста"
+    )
+    bypassCache: bool = Field(
+        default=False, description="Не использовать кеш результатов выполнения"
+    )
 
 
 class TestCaseCreateRequest(BaseModel):
@@ -1,16 +1,23 @@
 """Репозиторий для работы с редактором кода"""
 
 import logging
+import time
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import docker
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.features.code_editor.exceptions.code_editor_exceptions import (
     CodeExecutionError,
 )
+from app.features.code_editor.utils.code_safety import EDITOR_SCANNER
+from app.features.code_editor.utils.execution_backend import (
+    get_docker_client,
+    get_execution_backend,
+    language_key,
+)
 from app.shared.models.content_models import ContentBlock
 from app.shared.models.enums import CodeLanguage, ExecutionStatus
 from app.shared.models.code_execution_models import (
@@ -56,6 +63,23 @@ class CodeEditorRepositoryInterface(ABC):
     async def get_execution_by_id(self, execution_id: str) -> Optional[CodeExecution]:
         pass
 
+    @abstractmethod
+    async def reload_execution(self, execution_id: str) -> Optional[CodeExecution]:
+        pass
+
+    @abstractmethod
+    async def claim_execution(self, execution_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_executions_by_status(
+        self,
+        status: ExecutionStatus,
+        created_before: Optional[datetime] = None,
+        limit: int = 1000,
+    ) -> List[CodeExecution]:
+        pass
+
     @abstractmethod
     async def get_user_executions(
         self,
@@ -84,12 +108,17 @@ class CodeEditorRepository(CodeEditorRepositoryInterface):
 
     def __init__(self, session: Session):
         self.session = session
-        try:
-            self.docker_client = docker.from_env()
-            logger.info("Docker client успешно инициализирован")
-        except Exception as e:
-            logger.warning(f"Не удалось подключиться к Docker: {e}")
-            self.docker_client = None
+        self._docker_client = None
+
+    @property
+    def docker_client(self):
+        """Общий Docker клиент процесса (создается при первом обращении)"""
+        if self._docker_client is None:
+            try:
+                self._docker_client = get_docker_client()
+            except Exception as e:
+                logger.warning(f"Не удалось подключиться к Docker: {e}")
+        return self._docker_client
 
     async def get_supported_languages(self) -> List[SupportedLanguage]:
         """Получение списка поддерживаемых языков"""
@@ -246,6 +275,54 @@ class CodeEditorRepository(CodeEditorRepositoryInterface):
             logger.error(f"Ошибка при получении выполнения: {e}")
             return None
 
+    async def reload_execution(self, execution_id: str) -> Optional[CodeExecution]:
+        """Текущее состояние выполнения из БД, а не из identity map сессии"""
+        try:
+            return (
+                self.session.query(CodeExecution)
+                .filter(CodeExecution.id == execution_id)
+                .populate_existing()
+                .first()
+            )
+
+        except Exception as e:
+            logger.error(f"Ошибка при перечитывании выполнения: {e}")
+            return None
+
+    async def claim_execution(self, execution_id: str) -> bool:
+        """PENDING -> RUNNING, если выполнение еще не взял другой воркер"""
+        try:
+            claimed = (
+                self.session.query(CodeExecution)
+                .filter(
+                    CodeExecution.id == execution_id,
+                    CodeExecution.status == ExecutionStatus.PENDING,
+                )
+                .update(
+                    {CodeExecution.status: ExecutionStatus.RUNNING},
+                    synchronize_session="fetch",
+                )
+            )
+            self.session.commit()
+            return claimed == 1
+
+        except Exception as e:
+            logger.error(f"Ошибка при захвате выполнения: {e}")
+            self.session.rollback()
+            raise
+
+    async def get_executions_by_status(
+        self,
+        status: ExecutionStatus,
+        created_before: Optional[datetime] = None,
+        limit: int = 1000,
+    ) -> List[CodeExecution]:
+        """Выполнения в статусе status (старые первыми)"""
+        query = self.session.query(CodeExecution).filter(CodeExecution.status == status)
+        if created_before is not None:
+            query = query.filter(CodeExecution.createdAt < created_before)
+        return query.order_by(CodeExecution.createdAt).limit(limit).all()
+
     async def get_user_executions(
         self,
         user_id: int,
@@ -287,65 +364,10 @@ class CodeEditorRepository(CodeEditorRepositoryInterface):
         logger.info(f"Валидация безопасности кода для языка {language}")
 
         try:
-            # Список запрещенных паттернов
-            dangerous_patterns = {
-                CodeLanguage.PYTHON: [
-                    "__import__",
-                    "exec",
-                    "eval",
-                    "compile",
-                    "open",
-                    "file",
-                    "input",
-                    "raw_input",
-                    "reload",
-                    "globals",
-                    "locals",
-                    "os.",
-                    "sys.",
-                    "subprocess",
-                    "shutil",
-                    "socket",
-                    "urllib",
-                    "requests",
-                    "pickle",
-                    "marshal",
-                ],
-                CodeLanguage.JAVASCRIPT: [
-                    "require",
-                    "import",
-                    "fetch",
-                    "XMLHttpRequest",
-                    "document",
-                    "window",
-                    "global",
-                    "process",
-                    "Buffer",
-                    "eval",
-                    "Function",
-                    "setTimeout",
-                    "setInterval",
-                ],
-                CodeLanguage.JAVA: [
-                    "System.exit",
-                    "Runtime",
-                    "ProcessBuilder",
-                    "File",
-                    "FileInputStream",
-                    "FileOutputStream",
-                    "Socket",
-                    "ServerSocket",
-                    "Class.forName",
-                    "reflect",
-                ],
-            }
-
-            patterns = dangerous_patterns.get(language, [])
-
-            for pattern in patterns:
-                if pattern in source_code:
-                    logger.warning(f"Обнаружен опасный паттерн: {pattern}")
-                    return False
+            violation = EDITOR_SCANNER.scan(source_code, language)
+            if violation:
+                logger.warning(f"Обнаружен опасный паттерн: {violation.pattern}")
+                return False
 
             logger.info("Код прошел проверку безопасности")
             return True
@@ -366,6 +388,25 @@ class CodeEditorRepository(CodeEditorRepositoryInterface):
                 "", "Docker недоступен. Убедитесь, что Docker Desktop запущен."
             )
 
+        try:
+            # Docker SDK блокирующий, поэтому выполняем его вне event loop
+            return await get_execution_backend().run(
+                language_key(language),
+                self._execute_in_container,
+                source_code,
+                language,
+                stdin,
+            )
+        except CodeExecutionError:
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка при выполнении кода: {e}")
+            raise CodeExecutionError("", str(e))
+
+    def _execute_in_container(
+        self, source_code: str, language: SupportedLanguage, stdin: Optional[str]
+    ) -> Dict[str, Any]:
+        """Синхронный запуск контейнера (выполняется в пуле потоков)"""
         try:
             # Подготовка контейнера
             container_config = {
@@ -387,6 +428,7 @@ class CodeEditorRepository(CodeEditorRepositoryInterface):
             container_config["command"] = ["sh", "-c", command]
 
             # Создание и запуск контейнера
+            start_time = time.time()
             container = self.docker_client.containers.run(**container_config)
 
             # Отправка кода в контейнер
@@ -403,6 +445,7 @@ class CodeEditorRepository(CodeEditorRepositoryInterface):
             except Exception:
                 container.kill()
                 raise CodeExecutionError("", "Превышен таймаут выполнения")
+            execution_time_ms = int((time.time() - start_time) * 1000)
 
             # Получение результатов
             stdout = container.logs(stdout=True, stderr=False).decode("utf-8")
@@ -418,7 +461,7 @@ class CodeEditorRepository(CodeEditorRepositoryInterface):
                 "stdout": stdout,
                 "stderr": stderr,
                 "exit_code": exit_code,
-                "execution_time_ms": 0,  # TODO: Замерить реальное время
+                "execution_time_ms": execution_time_ms,
                 "memory_used_mb": memory_used,
                 "container_logs": container.logs().decode("utf-8")[
                     :1000
@@ -428,6 +471,8 @@ class CodeEditorRepository(CodeEditorRepositoryInterface):
             logger.info(f"Код выполнен, exit_code: {exit_code}")
             return execution_result
 
+        except CodeExecutionError:
+            raise
         except Exception as e:
             logger.error(f"Ошибка при выполнении кода: {e}")
             raise CodeExecutionError("", str(e))
@@ -0,0 +1,284 @@
+"""
+🔌 Общий клиент LLM для AI-генератора тест-кейсов
+
+AITestGeneratorService создается на каждый запрос, поэтому соединение,
+кеш и статистика живут здесь, на уровне процесса:
+- один aiohttp.ClientSession с пулом keep-alive соединений (без нового
+  TCP+TLS рукопожатия на каждую генерацию), закрывается при остановке
+  приложения (`shutdown_ai_generation_client`);
+- кеш ответов по sha256 от модели, параметров и сообщений (TTL + LRU);
+- объединение одинаковых запросов: пока ответ на промпт в пути, остальные
+  генерации с тем же промптом ждут его, а не идут в API повторно;
+- задержки запросов к API для p50/p95.
+
+Провайдер подменяется (`StubChatProvider` в тестах и локально):
+
+    client = AIGenerationClient(StubChatProvider('[{"name": "t"}]'))
+    service = AITestGeneratorService(content_repo, task_repo, config, client=client)
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Protocol, Tuple, Union
+
+import aiohttp
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+
+logger = get_logger(__name__)
+
+Messages = List[Dict[str, str]]
+
+SOURCE_CACHE = "cache"
+SOURCE_COALESCED = "coalesced"
+SOURCE_UPSTREAM = "upstream"
+# Сколько последних задержек API хранить для перцентилей
+LATENCY_WINDOW = 500
+
+
+class AIProviderError(Exception):
+    """Ошибка ответа LLM API"""
+
+    pass
+
+
+class ChatProvider(Protocol):
+    """Провайдер chat/completions: config - OpenAIConfig генератора"""
+
+    async def complete(self, config: Any, messages: Messages) -> str: ...
+
+    async def close(self) -> None: ...
+
+
+class OpenAIChatProvider:
+    """OpenAI-совместимый API через общий aiohttp.ClientSession"""
+
+    def __init__(
+        self,
+        pool_limit: Optional[int] = None,
+        pool_limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+    ):
+        self.pool_limit = pool_limit or settings.ai_http_pool_limit
+        self.pool_limit_per_host = (
+            pool_limit_per_host or settings.ai_http_pool_limit_per_host
+        )
+        self.keepalive_timeout = keepalive_timeout or settings.ai_http_keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        # Сессия привязана к циклу событий (в тестах цикл может смениться)
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_limit,
+                    limit_per_host=self.pool_limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300,
+                )
+            )
+            self._loop = loop
+        return self._session
+
+    async def complete(self, config: Any, messages: Messages) -> str:
+        session = self._get_session()
+        async with session.post(
+            f"{config.base_url}/chat/completions",
+            json={
+                "model": config.model,
+                "messages": messages,
+                "temperature": config.temperature,
+                "max_tokens": config.max_tokens,
+            },
+            headers={
+                "Authorization": f"Bearer {config.api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=aiohttp.ClientTimeout(total=config.timeout),
+        ) as response:
+            if response.status != 200:
+                text = await response.text()
+                raise AIProviderError(f"OpenAI API error {response.status}: {text}")
+            result = await response.json()
+            return result["choices"][0]["message"]["content"]
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class StubChatProvider:
+    """Локальный провайдер без сети: фиксированный ответ или функция от сообщений"""
+
+    def __init__(
+        self,
+        response: Union[str, Callable[[Messages], str]] = "[]",
+        delay: float = 0.0,
+    ):
+        self.response = response
+        self.delay = delay
+        self.calls = 0
+
+    async def complete(self, config: Any, messages: Messages) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.response(messages) if callable(self.response) else self.response
+
+    async def close(self) -> None:
+        pass
+
+
+def prompt_cache_key(config: Any, messages: Messages) -> str:
+    """Ключ кеша: модель, параметры генерации и все сообщения"""
+    payload = json.dumps(
+        [config.model, config.temperature, config.max_tokens, messages],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class Generation:
+    text: str
+    source: str
+    duration: float
+
+
+class AIGenerationClient:
+    """Кеш, объединение одинаковых запросов и статистика поверх провайдера"""
+
+    def __init__(
+        self,
+        provider: ChatProvider,
+        cache_ttl: Optional[float] = None,
+        cache_max_entries: Optional[int] = None,
+    ):
+        self.provider = provider
+        self.cache_ttl = (
+            cache_ttl if cache_ttl is not None else settings.ai_generation_cache_ttl
+        )
+        self.cache_max_entries = (
+            cache_max_entries
+            if cache_max_entries is not None
+            else settings.ai_generation_cache_max_entries
+        )
+        self._cache: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "coalesced_requests": 0,
+            "upstream_requests": 0,
+            "upstream_failures": 0,
+        }
+
+    async def generate(self, config: Any, messages: Messages) -> Generation:
+        started = time.perf_counter()
+        key = prompt_cache_key(config, messages)
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            self._counters["cache_hits"] += 1
+            return Generation(cached, SOURCE_CACHE, time.perf_counter() - started)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._counters["coalesced_requests"] += 1
+            # shield: отмена одного ожидающего не отменяет общий запрос
+            text = await asyncio.shield(inflight)
+            return Generation(text, SOURCE_COALESCED, time.perf_counter() - started)
+
+        self._counters["cache_misses"] += 1
+        self._counters["upstream_requests"] += 1
+        # Запрос к API - отдельная задача: отмена первого вызывающего не отменяет
+        # его для остальных, а кеш и статистика обновляются в done-callback
+        task = asyncio.ensure_future(self.provider.complete(config, messages))
+        task.add_done_callback(lambda done: self._on_upstream_done(key, started, done))
+        self._inflight[key] = task
+        text = await asyncio.shield(task)
+        return Generation(text, SOURCE_UPSTREAM, time.perf_counter() - started)
+
+    def _on_upstream_done(self, key: str, started: float, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        # exception() помечает ошибку полученной: ожидающих может уже не быть
+        if task.exception() is not None:
+            self._counters["upstream_failures"] += 1
+            return
+        self._latencies.append(time.perf_counter() - started)
+        self._cache_set(key, task.result())
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        item = self._cache.get(key)
+        if item is None:
+            return None
+        expires_at, text = item
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return text
+
+    def _cache_set(self, key: str, text: str) -> None:
+        if self.cache_max_entries <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl, text)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def latency_percentile(self, percentile: float) -> float:
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "cache_entries": len(self._cache),
+            "p50_response_time": self.latency_percentile(50),
+            "p95_response_time": self.latency_percentile(95),
+        }
+
+    async def close(self) -> None:
+        await self.provider.close()
+
+
+_client: Optional[AIGenerationClient] = None
+
+
+def get_ai_generation_client() -> AIGenerationClient:
+    """Общий клиент процесса (OpenAI провайдер по умолчанию)"""
+    global _client
+    if _client is None:
+        _client = AIGenerationClient(OpenAIChatProvider())
+    return _client
+
+
+def set_ai_chat_provider(provider: ChatProvider) -> AIGenerationClient:
+    """Подменить провайдер общего клиента (кеш и статистика сбрасываются)"""
+    global _client
+    _client = AIGenerationClient(provider)
+    return _client
+
+
+async def shutdown_ai_generation_client() -> None:
+    """Закрыть пул соединений (вызывается при остановке приложения)"""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.close()
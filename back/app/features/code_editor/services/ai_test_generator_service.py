@@ -13,10 +13,14 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional
 
-import aiohttp
-
 from app.core.logging import get_logger
 from app.features.code_editor.dto.test_case_dto import TestCaseAIGenerate
+from app.features.code_editor.services.ai_generation_client import (
+    SOURCE_CACHE,
+    SOURCE_COALESCED,
+    AIGenerationClient,
+    get_ai_generation_client,
+)
 from app.features.content.repositories.content_repository import ContentRepository
 from app.features.task.repositories.task_repository import TaskRepository
 from app.shared.models.content_models import ContentBlock
@@ -62,15 +66,23 @@ class AITestGeneratorService:
         content_repository: ContentRepository,
         task_repository: TaskRepository,
         config: OpenAIConfig = None,
+        client: Optional[AIGenerationClient] = None,
     ):
         self.content_repository = content_repository
         self.task_repository = task_repository
         self.config = config or OpenAIConfig()
+        # Пул соединений, кеш промптов и объединение запросов - общие на процесс
+        self.client = client or get_ai_generation_client()
         self.generation_stats = {
             "total_requests": 0,
             "successful_requests": 0,
             "failed_requests": 0,
             "avg_response_time": 0.0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "coalesced_requests": 0,
+            "p50_response_time": 0.0,
+            "p95_response_time": 0.0,
         }
         self.fallback_patterns = self._load_fallback_patterns()
 
@@ -120,49 +132,32 @@ class AITestGeneratorService:
     ) -> List[TestCasePattern]:
         """🤖 Генерация через OpenAI API (ProxyAPI.ru)"""
 
-        start_time = datetime.now()
         self.generation_stats["total_requests"] += 1
 
         try:
             prompt = self._build_smart_prompt(block, request, analysis)
-
-            payload = {
-                "model": self.config.model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are an expert at generating comprehensive test cases for programming tasks. Always respond with valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                "temperature": self.config.temperature,
-                "max_tokens": self.config.max_tokens,
-            }
-
-            headers = {
-                "Authorization": f"Bearer {self.config.api_key}",
-                "Content-Type": "application/json",
-            }
-
-            async with aiohttp.ClientSession() as session, session.post(
-                f"{self.config.base_url}/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
-            ) as response:
-                if response.status != 200:
-                    text = await response.text()
-                    raise Exception(f"OpenAI API error {response.status}: {text}")
-
-                result = await response.json()
-                ai_response = result["choices"][0]["message"]["content"]
-
-                # Обновляем статистику
-                duration = (datetime.now() - start_time).total_seconds()
-                self.generation_stats["successful_requests"] += 1
-                self._update_avg_response_time(duration)
-
-                return self._parse_ai_response(ai_response, request)
+            messages = [
+                {
+                    "role": "system",
+                    "content": "You are an expert at generating comprehensive test cases for programming tasks. Always respond with valid JSON.",
+                },
+                {"role": "user", "content": prompt},
+            ]
+
+            generation = await self.client.generate(self.config, messages)
+
+            # Обновляем статистику
+            self.generation_stats["successful_requests"] += 1
+            if generation.source == SOURCE_CACHE:
+                self.generation_stats["cache_hits"] += 1
+            elif generation.source == SOURCE_COALESCED:
+                self.generation_stats["coalesced_requests"] += 1
+            else:
+                self.generation_stats["cache_misses"] += 1
+            self._update_avg_response_time(generation.duration)
+            self._update_latency_percentiles()
+
+            return self._parse_ai_response(generation.text, request)
 
         except Exception as e:
             self.generation_stats["failed_requests"] += 1
@@ -476,10 +471,17 @@ Return ONLY the JSON array, no additional text or markdown formatting.
             ) / total_successful
             self.generation_stats["avg_response_time"] = new_avg
 
+    def _update_latency_percentiles(self):
+        """📊 p50/p95 задержки запросов к API (по процессу, без попаданий в кеш)"""
+        self.generation_stats["p50_response_time"] = self.client.latency_percentile(50)
+        self.generation_stats["p95_response_time"] = self.client.latency_percentile(95)
+
     def get_stats(self) -> Dict:
         """📊 Получение статистики генерации"""
+        self._update_latency_percentiles()
         return {
             **self.generation_stats,
+            "client": self.client.stats(),
             "success_rate": (
                 self.generation_stats["successful_requests"]
                 / max(self.generation_stats["total_requests"], 1)
@@ -1,10 +1,14 @@
 """Сервис для работы с редактором кода"""
 
+import asyncio
+import json
 import logging
+import time
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
+from app.core.settings import settings
 from app.features.code_editor.dto.requests import (
     CodeExecutionRequest,
     UserCodeSolutionCreateRequest,
@@ -34,13 +38,34 @@ from app.features.code_editor.repositories.code_editor_repository import (
 from app.features.code_editor.services.enhanced_code_executor_service import (
     EnhancedCodeExecutorService,
 )
+from app.features.code_editor.services.execution_cache import (
+    get_execution_cache,
+    is_cache_bypassed,
+)
+from app.features.code_editor.services.execution_queue import (
+    FINAL_STATUSES,
+    execution_to_event,
+    get_execution_broker,
+)
 from app.shared.models.enums import CodeLanguage
 from app.shared.models.code_execution_models import (
+    SupportedLanguage,
     UserCodeSolution,
 )
+from app.shared.models.test_case_models import TestCase
 
 logger = logging.getLogger(__name__)
 
+# Интервал keep-alive SSE потока и перечитывания статуса из БД
+STREAM_KEEPALIVE_SECONDS = 15
+
+
+def _format_sse(event: dict) -> str:
+    """Форматирует событие в формате text/event-stream"""
+    name = event.get("event", "message")
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    return f"event: {name}\ndata: {data}\n\n"
+
 
 class CodeEditorService:
     """Сервис для работы с редактором кода"""
@@ -136,6 +161,126 @@ class CodeEditorService:
             logger.error(f"Ошибка при выполнении кода: {e}")
             raise CodeExecutionError("", str(e))
 
+    async def submit_code_execution(
+        self, request: CodeExecutionRequest, user_id: Optional[int] = None
+    ) -> CodeExecutionResponse:
+        """Постановка выполнения кода в очередь (возвращает PENDING сразу)"""
+        logger.info(f"Постановка в очередь кода на языке {request.language}")
+
+        try:
+            language_enum = CodeLanguage(request.language)
+        except ValueError:
+            raise UnsupportedLanguageError(request.language)
+
+        if not await self.code_editor_repository.validate_code_safety(
+            request.sourceCode, language_enum
+        ):
+            raise UnsafeCodeError("Код содержит потенциально опасные конструкции")
+
+        language = await self.code_editor_repository.get_language_by_enum(
+            language_enum
+        )
+        if not language:
+            raise UnsupportedLanguageError(request.language)
+
+        try:
+            execution = self.code_executor_service.create_pending_execution(
+                source_code=request.sourceCode,
+                language=language,
+                stdin=request.stdin,
+                user_id=user_id,
+                block_id=request.blockId,
+            )
+            execution = await self.code_editor_repository.save_execution(execution)
+            await get_execution_broker().enqueue(execution.id)
+
+            return self._to_execution_response(execution)
+
+        except Exception as e:
+            logger.error(f"Ошибка при постановке в очередь: {e}")
+            raise CodeExecutionError("", str(e))
+
+    async def stream_execution_events(
+        self, execution_id: str, user_id: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        SSE поток событий выполнения
+
+        Подписываемся до чтения статуса из БД, чтобы не пропустить
+        результат, опубликованный между чтением и подпиской. На каждом
+        keep-alive строка перечитывается: результат, опубликованный
+        другим процессом (in-memory брокер), до подписки не дойдет.
+        """
+        broker = get_execution_broker()
+        subscription = await broker.subscribe(execution_id)
+
+        try:
+            execution = await self.code_editor_repository.get_execution_by_id(
+                execution_id
+            )
+            if not execution or (user_id and execution.userId != user_id):
+                yield _format_sse({"event": "error", "message": "Выполнение не найдено"})
+                return
+
+            if execution.status in FINAL_STATUSES:
+                yield _format_sse(execution_to_event(execution))
+                return
+
+            yield _format_sse({"event": "status", "status": execution.status.value})
+
+            status = execution.status.value
+            deadline = time.monotonic() + settings.code_execution_stream_timeout
+            while time.monotonic() < deadline:
+                event = await subscription.get(timeout=STREAM_KEEPALIVE_SECONDS)
+                if event is None:
+                    execution = await self.code_editor_repository.reload_execution(
+                        execution_id
+                    )
+                    if execution and execution.status in FINAL_STATUSES:
+                        yield _format_sse(execution_to_event(execution))
+                        return
+                    if execution:
+                        status = execution.status.value
+                    # Комментарий SSE, чтобы прокси не закрыли соединение
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_sse(event)
+                if event.get("final"):
+                    return
+                status = event.get("status", status)
+
+            execution = await self.code_editor_repository.reload_execution(execution_id)
+            if execution and execution.status in FINAL_STATUSES:
+                yield _format_sse(execution_to_event(execution))
+                return
+            if execution:
+                status = execution.status.value
+            yield _format_sse({"event": "timeout", "status": status})
+
+        finally:
+            await subscription.close()
+
+    def _to_execution_response(self, execution) -> CodeExecutionResponse:
+        """Преобразование CodeExecution в DTO ответа"""
+        return CodeExecutionResponse(
+            id=execution.id,
+            userId=execution.userId,
+            blockId=execution.blockId,
+            languageId=execution.languageId,
+            sourceCode=execution.sourceCode,
+            stdin=execution.stdin,
+            status=execution.status,
+            stdout=execution.stdout,
+            stderr=execution.stderr,
+            exitCode=execution.exitCode,
+            executionTimeMs=execution.executionTimeMs,
+            memoryUsedMB=execution.memoryUsedMB,
+            containerLogs=execution.containerLogs,
+            errorMessage=execution.errorMessage,
+            createdAt=execution.createdAt,
+            completedAt=execution.completedAt,
+        )
+
     async def get_execution_result(
         self, execution_id: str, user_id: Optional[int] = None
     ) -> CodeExecutionResponse:
@@ -488,54 +633,19 @@ class CodeEditorService:
             if not language:
                 raise UnsupportedLanguageError(validation_request.language.value)
 
-            # Выполняем тест-кейсы
-            test_results = []
-            passed_tests = 0
+            # Выполняем тест-кейсы параллельно с ограничением конкурентности
+            test_results = await self._run_test_cases(
+                validation_request.sourceCode,
+                language,
+                test_cases,
+                fail_fast=validation_request.failFast,
+                use_cache=not is_cache_bypassed(
+                    block_id, validation_request.bypassCache
+                ),
+            )
+            passed_tests = sum(1 for result in test_results if result.passed)
             total_weight = sum(tc.weight for tc in test_cases)
 
-            for test_case in test_cases:
-                try:
-                    # Выполняем код с входными данными тест-кейса
-                    execution_result = (
-                        await self.code_editor_repository.execute_code_with_language(
-                            validation_request.sourceCode, language, test_case.input
-                        )
-                    )
-
-                    actual_output = execution_result.get("stdout", "").strip()
-                    expected_output = test_case.expectedOutput.strip()
-                    passed = actual_output == expected_output
-
-                    if passed:
-                        passed_tests += 1
-
-                    test_result = TestCaseExecutionResponse(
-                        testCaseId=test_case.id,
-                        testName=test_case.name,
-                        input=test_case.input,
-                        expectedOutput=expected_output,
-                        actualOutput=actual_output,
-                        passed=passed,
-                        executionTimeMs=execution_result.get("execution_time_ms"),
-                        errorMessage=execution_result.get("stderr")
-                        if not passed
-                        else None,
-                    )
-                    test_results.append(test_result)
-
-                except Exception as e:
-                    test_result = TestCaseExecutionResponse(
-                        testCaseId=test_case.id,
-                        testName=test_case.name,
-                        input=test_case.input,
-                        expectedOutput=test_case.expectedOutput,
-                        actualOutput="",
-                        passed=False,
-                        executionTimeMs=None,
-                        errorMessage=str(e),
-                    )
-                    test_results.append(test_result)
-
             # Вычисляем финальный score
             if total_weight > 0:
                 weighted_score = sum(
@@ -567,6 +677,118 @@ class CodeEditorService:
             logger.error(f"Ошибка при валидации решения: {e}")
             raise
 
+    async def _run_test_cases(
+        self,
+        source_code: str,
+        language: SupportedLanguage,
+        test_cases: List[TestCase],
+        fail_fast: bool = False,
+        use_cache: bool = True,
+    ) -> List[TestCaseExecutionResponse]:
+        """
+        Выполняет тест-кейсы с ограниченной конкурентностью
+
+        Результаты возвращаются в порядке test_cases. При fail_fast тесты,
+        которые еще не начали выполняться после первого падения, помечаются
+        как пропущенные.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.code_validation_concurrency))
+        failed = asyncio.Event()
+
+        async def run_bounded(test_case: TestCase) -> TestCaseExecutionResponse:
+            async with semaphore:
+                if fail_fast and failed.is_set():
+                    return self._build_skipped_test_result(test_case)
+                result = await self._run_test_case(
+                    source_code, language, test_case, use_cache
+                )
+                if not result.passed:
+                    failed.set()
+                return result
+
+        return list(await asyncio.gather(*(run_bounded(tc) for tc in test_cases)))
+
+    async def _run_test_case(
+        self,
+        source_code: str,
+        language: SupportedLanguage,
+        test_case: TestCase,
+        use_cache: bool = True,
+    ) -> TestCaseExecutionResponse:
+        """Выполняет один тест-кейс и сравнивает вывод с ожидаемым"""
+        try:
+            execution_result = await self._execute_with_cache(
+                source_code, language, test_case.input, use_cache
+            )
+
+            actual_output = execution_result.get("stdout", "").strip()
+            expected_output = test_case.expectedOutput.strip()
+            passed = actual_output == expected_output
+
+            return TestCaseExecutionResponse(
+                testCaseId=test_case.id,
+                testName=test_case.name,
+                input=test_case.input,
+                expectedOutput=expected_output,
+                actualOutput=actual_output,
+                passed=passed,
+                executionTimeMs=execution_result.get("execution_time_ms"),
+                errorMessage=execution_result.get("stderr") if not passed else None,
+            )
+
+        except Exception as e:
+            return TestCaseExecutionResponse(
+                testCaseId=test_case.id,
+                testName=test_case.name,
+                input=test_case.input,
+                expectedOutput=test_case.expectedOutput,
+                actualOutput="",
+                passed=False,
+                executionTimeMs=None,
+                errorMessage=str(e),
+            )
+
+    async def _execute_with_cache(
+        self,
+        source_code: str,
+        language: SupportedLanguage,
+        stdin: Optional[str],
+        use_cache: bool,
+    ) -> dict:
+        """Выполняет код с входными данными, используя кеш результатов"""
+        cache = get_execution_cache()
+        if not use_cache:
+            cache.record_bypass()
+            return await self.code_editor_repository.execute_code_with_language(
+                source_code, language, stdin
+            )
+
+        cache_key = cache.make_key(language.id, source_code, stdin)
+        cached_result = await cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
+        execution_result = await self.code_editor_repository.execute_code_with_language(
+            source_code, language, stdin
+        )
+        await cache.set(cache_key, execution_result)
+        return execution_result
+
+    def _build_skipped_test_result(
+        self, test_case: TestCase
+    ) -> TestCaseExecutionResponse:
+        """Результат для теста, пропущенного из-за fail-fast"""
+        return TestCaseExecutionResponse(
+            testCaseId=test_case.id,
+            testName=test_case.name,
+            input=test_case.input,
+            expectedOutput=test_case.expectedOutput,
+            actualOutput="",
+            passed=False,
+            executionTimeMs=None,
+            errorMessage="Тест пропущен: предыдущий тест не пройден",
+        )
+
     async def get_health_status(self) -> HealthResponse:
         """Получение статуса здоровья модуля"""
         logger.info("Проверка здоровья code_editor модуля")
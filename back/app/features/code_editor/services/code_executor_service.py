@@ -6,19 +6,28 @@ import json
 import logging
 import os
 import platform
-import re
 import tempfile
 import time
 import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import docker
 from docker.errors import ContainerError, ImageNotFound
 
+from app.core.metrics import observe_code_execution
+from app.core.settings import settings
 from app.features.code_editor.repositories.code_editor_repository import (
     CodeEditorRepository,
 )
+from app.features.code_editor.services.container_pool import (
+    get_container_pool_manager,
+)
+from app.features.code_editor.utils.code_safety import CONTAINER_SCANNER
+from app.features.code_editor.utils.execution_backend import (
+    get_docker_client,
+    get_execution_backend,
+    language_key,
+)
 from app.shared.models.code_execution_models import CodeExecution, SupportedLanguage
 from app.shared.models.enums import CodeLanguage, ExecutionStatus
 
@@ -61,7 +70,7 @@ class CodeExecutorService:
         """Ленивая инициализация Docker клиента"""
         if self.docker_client is None:
             try:
-                self.docker_client = docker.from_env()
+                self.docker_client = get_docker_client()
             except Exception as e:
                 # Временно возвращаем заглушку вместо ошибки
                 logger.warning(
@@ -93,16 +102,22 @@ class CodeExecutorService:
         Returns:
             CodeExecution объект с результатами выполнения
         """
-        execution_id = str(uuid.uuid4())
-        start_time = time.time()
-
-        logger.info(
-            f"Starting code execution {execution_id} for language {language.language}"
+        execution = self.create_pending_execution(
+            source_code, language, stdin, user_id, block_id
         )
+        return await self.run_execution(execution, language)
 
-        # Создаем объект CodeExecution
-        execution = CodeExecution(
-            id=execution_id,
+    def create_pending_execution(
+        self,
+        source_code: str,
+        language: SupportedLanguage,
+        stdin: Optional[str] = None,
+        user_id: Optional[int] = None,
+        block_id: Optional[str] = None,
+    ) -> CodeExecution:
+        """Создает объект CodeExecution в статусе PENDING (без сохранения)"""
+        return CodeExecution(
+            id=str(uuid.uuid4()),
             userId=user_id,
             blockId=block_id,
             languageId=language.id,
@@ -120,6 +135,23 @@ class CodeExecutorService:
             completedAt=None,
         )
 
+    async def run_execution(
+        self, execution: CodeExecution, language: SupportedLanguage
+    ) -> CodeExecution:
+        """
+        Выполняет уже созданное выполнение и сохраняет результат
+
+        Используется как при синхронном запуске, так и воркерами очереди.
+        """
+        execution_id = execution.id
+        source_code = execution.sourceCode
+        stdin = execution.stdin
+        start_time = time.time()
+
+        logger.info(
+            f"Starting code execution {execution_id} for language {language.language}"
+        )
+
         try:
             # Проверяем доступность Docker перед выполнением
             try:
@@ -192,7 +224,89 @@ class CodeExecutorService:
         execution_id: str,
         stdin_file: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Запускает код в Docker контейнере"""
+        """Запускает код в Docker контейнере, не блокируя event loop"""
+        run = (
+            self._run_in_pooled_container
+            if settings.code_executor_pool_enabled
+            else self._run_in_fresh_container
+        )
+        started = time.perf_counter()
+        try:
+            return await get_execution_backend().run(
+                language_key(language), run, temp_dir, language, stdin_file
+            )
+        finally:
+            observe_code_execution(
+                language_key(language),
+                "pool" if settings.code_executor_pool_enabled else "fresh",
+                time.perf_counter() - started,
+            )
+
+    def _run_in_pooled_container(
+        self,
+        temp_dir: str,
+        language: SupportedLanguage,
+        stdin_file: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Запускает код в прогретом контейнере из пула
+
+        Ошибка пула (нет контейнера, сбой копирования кода или exec) -
+        запуск в одноразовом контейнере.
+        """
+
+        command = self._prepare_command(language, stdin_file)
+        timeout = min(language.timeoutSeconds, self.execution_timeout)
+        start_time = time.time()
+        try:
+            pool_manager = get_container_pool_manager(self._get_docker_client())
+            result = pool_manager.run(language, temp_dir, command, timeout)
+        except Exception as e:
+            logger.warning(
+                f"Container pool failed for {language.dockerImage}, "
+                f"falling back to fresh container: {e}"
+            )
+            return self._run_in_fresh_container(temp_dir, language, stdin_file)
+        execution_time = int((time.time() - start_time) * 1000)
+
+        if result["timed_out"]:
+            return {
+                "status": ExecutionStatus.TIMEOUT,
+                "stdout": result["stdout"],
+                "stderr": result["stderr"],
+                "exitCode": result["exit_code"],
+                "errorMessage": f"Time limit exceeded ({timeout}s)",
+                "containerLogs": f"Pooled container {result['container_id']} "
+                f"killed after {timeout}s",
+            }
+
+        if result["exit_code"] != 0:
+            return {
+                "status": ExecutionStatus.ERROR,
+                "stdout": result["stdout"],
+                "stderr": result["stderr"],
+                "exitCode": result["exit_code"],
+                "errorMessage": f"Runtime error (exit code {result['exit_code']})",
+                "containerLogs": f"Pooled container {result['container_id']} "
+                f"exited with code {result['exit_code']}",
+            }
+
+        return {
+            "status": ExecutionStatus.SUCCESS,
+            "stdout": result["stdout"],
+            "stderr": result["stderr"] or None,
+            "exitCode": 0,
+            "executionTimeMs": execution_time,
+            "containerLogs": f"Pooled container {result['container_id']} "
+            f"executed successfully in {execution_time}ms",
+        }
+
+    def _run_in_fresh_container(
+        self,
+        temp_dir: str,
+        language: SupportedLanguage,
+        stdin_file: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Запускает код в одноразовом Docker контейнере"""
 
         try:
             # Подготавливаем команду
@@ -219,9 +333,10 @@ class CodeExecutorService:
                 "stderr": True,
             }
 
-            logger.info(
-                f"Running container with config: {json.dumps(container_config, indent=2)}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Running container with config: {json.dumps(container_config, indent=2)}"
+                )
 
             # Запускаем контейнер
             start_time = time.time()
@@ -310,71 +425,12 @@ class CodeExecutorService:
             True если код безопасен, False - если содержит опасные конструкции
         """
 
-        # Общие опасные паттерны
-        dangerous_patterns = [
-            # Файловые операции
-            r"\bopen\s*\(",
-            r"\bfile\s*\(",
-            r"\bwith\s+open",
-            r"\.write\s*\(",
-            r"\.read\s*\(",
-            # Системные вызовы
-            r"\bos\.",
-            r"\bsystem\s*\(",
-            r"\bsubprocess\.",
-            r"\beval\s*\(",
-            r"\bexec\s*\(",
-            # Сеть
-            r"\bsocket\.",
-            r"\brequests\.",
-            r"\burllib\.",
-            r"\bhttplib\.",
-            # Импорты опасных модулей
-            r"import\s+os",
-            r"import\s+sys",
-            r"import\s+subprocess",
-            r"import\s+socket",
-            r"from\s+os\s+import",
-            r"from\s+sys\s+import",
-        ]
-
-        # Языко-специфичные проверки
-        if language == CodeLanguage.PYTHON:
-            dangerous_patterns.extend(
-                [
-                    r"__import__\s*\(",
-                    r"globals\s*\(",
-                    r"locals\s*\(",
-                    r"vars\s*\(",
-                    r"dir\s*\(",
-                ]
-            )
-        elif language == CodeLanguage.JAVASCRIPT:
-            dangerous_patterns.extend(
-                [
-                    r"require\s*\(",
-                    r"fs\.",
-                    r"process\.",
-                    r"child_process",
-                ]
-            )
-        elif language in [CodeLanguage.CPP, CodeLanguage.C]:
-            dangerous_patterns.extend(
-                [
-                    r"#include\s*<fstream>",
-                    r"#include\s*<cstdlib>",
-                    r"system\s*\(",
-                    r"popen\s*\(",
-                ]
+        violation = CONTAINER_SCANNER.scan(source_code, language)
+        if violation:
+            logger.warning(
+                f"Dangerous code pattern found in user code: '{violation.pattern}'"
             )
-
-        # Проверяем код на наличие опасных паттернов
-        for pattern in dangerous_patterns:
-            if re.search(pattern, source_code, re.IGNORECASE):
-                logger.warning(
-                    f"Dangerous code pattern found in user code: '{pattern}'"
-                )
-                return False
+            return False
 
         return True
 
@@ -0,0 +1,438 @@
+"""
+♻️ Пул прогретых Docker контейнеров для выполнения кода
+
+Вместо `docker run` на каждый запуск держим по каждому образу
+(`SupportedLanguage.dockerImage`) набор заранее запущенных и закрытых
+песочниц. Код передается в контейнер tar архивом через stdin `exec`
+(`put_archive` не пишет в tmpfs контейнера с read-only rootfs), выполняется
+через `exec`, после чего контейнер очищается и возвращается в пул. Контейнер
+пересоздается после `max_runs` запусков или при подозрении на загрязнение
+(таймаут, оставшиеся процессы, ошибка очистки).
+"""
+
+import io
+import logging
+import os
+import socket
+import tarfile
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from docker.utils.socket import consume_socket_output, frames_iter
+
+from app.core.settings import settings
+from app.shared.models.code_execution_models import SupportedLanguage
+
+logger = logging.getLogger(__name__)
+
+POOL_LABEL = "nareshka.code-executor.pool"
+WORK_DIR = "/code"
+# `timeout` завершается с 124, если остановил команду по TERM
+TIMEOUT_EXIT_CODE = 124
+# 128 + SIGKILL: добивание после TERM или OOM killer - таймаут, только если
+# лимит времени действительно истек
+KILLED_EXIT_CODE = 137
+KILL_AFTER_SECONDS = 1
+NOBODY_UID = 65534
+
+
+class ContainerPoolError(Exception):
+    """Ошибка пула контейнеров"""
+
+    pass
+
+
+class PooledContainer:
+    """Контейнер из пула и счетчик его запусков"""
+
+    def __init__(self, container: Any, image: str):
+        self.container = container
+        self.image = image
+        self.runs = 0
+        self.created_at = time.time()
+
+    @property
+    def id(self) -> str:
+        return self.container.id[:12]
+
+
+class LanguageContainerPool:
+    """Пул контейнеров для одного Docker образа"""
+
+    def __init__(
+        self,
+        docker_client: Any,
+        image: str,
+        memory_limit_mb: int,
+        min_size: int,
+        max_size: int,
+        max_runs: int,
+    ):
+        self.docker_client = docker_client
+        self.image = image
+        self.memory_limit_mb = memory_limit_mb
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.max_runs = max_runs
+
+        self._idle: Deque[PooledContainer] = deque()
+        self._total = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self.stats = {
+            "acquired": 0,
+            "created": 0,
+            "recycled": 0,
+            "contaminated": 0,
+            "wait_timeouts": 0,
+        }
+
+    def _container_config(self) -> Dict[str, Any]:
+        """Закрытая конфигурация песочницы (как у одноразового контейнера)"""
+        return {
+            "image": self.image,
+            "command": ["sleep", "infinity"],
+            "working_dir": WORK_DIR,
+            "tmpfs": {WORK_DIR: "rw,exec,nosuid,size=64m,mode=1777"},
+            "mem_limit": f"{self.memory_limit_mb}m",
+            "memswap_limit": f"{self.memory_limit_mb}m",
+            "cpu_quota": 50000,  # 50% CPU
+            "network_disabled": True,
+            "read_only": True,
+            "user": "nobody",
+            "cap_drop": ["ALL"],
+            "security_opt": ["no-new-privileges"],
+            "pids_limit": 50,
+            "labels": {POOL_LABEL: self.image},
+            "detach": True,
+        }
+
+    def _create(self) -> PooledContainer:
+        container = self.docker_client.containers.run(**self._container_config())
+        self.stats["created"] += 1
+        logger.debug(f"Pool {self.image}: started container {container.id[:12]}")
+        return PooledContainer(container, self.image)
+
+    def _destroy(self, pooled: PooledContainer) -> None:
+        try:
+            pooled.container.remove(force=True)
+        except Exception as e:
+            logger.warning(
+                f"Pool {self.image}: failed to remove container {pooled.id}: {e}"
+            )
+
+    def warm_up(self) -> None:
+        """Довести количество прогретых контейнеров до min_size"""
+        while True:
+            with self._condition:
+                if self._closed or self._total >= self.min_size:
+                    return
+                self._total += 1
+            try:
+                pooled = self._create()
+            except Exception:
+                with self._condition:
+                    self._total -= 1
+                raise
+            with self._condition:
+                self._idle.append(pooled)
+                self._condition.notify()
+
+    def warm_up_in_background(self) -> None:
+        """Прогреть пул в фоновом потоке, не задерживая текущий запрос"""
+
+        def _warm_up():
+            try:
+                self.warm_up()
+            except Exception as e:
+                logger.warning(f"Pool {self.image}: warm up failed: {e}")
+
+        threading.Thread(
+            target=_warm_up, name=f"pool-warmup-{self.image}", daemon=True
+        ).start()
+
+    def acquire(self, timeout: float) -> PooledContainer:
+        """Взять контейнер из пула, при необходимости создав новый"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise ContainerPoolError(f"Pool {self.image} is closed")
+                if self._idle:
+                    pooled = self._idle.popleft()
+                    self.stats["acquired"] += 1
+                    return pooled
+                if self._total < self.max_size:
+                    self._total += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["wait_timeouts"] += 1
+                    raise ContainerPoolError(
+                        f"No free containers for {self.image} "
+                        f"(max_size={self.max_size})"
+                    )
+                self._condition.wait(remaining)
+
+        try:
+            pooled = self._create()
+        except Exception:
+            with self._condition:
+                self._total -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.stats["acquired"] += 1
+        return pooled
+
+    def release(self, pooled: PooledContainer, contaminated: bool = False) -> None:
+        """Вернуть контейнер в пул или пересоздать его"""
+        pooled.runs += 1
+        recycle = contaminated or pooled.runs >= self.max_runs
+
+        with self._condition:
+            if not recycle and not self._closed:
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+            self._total -= 1
+            if contaminated:
+                self.stats["contaminated"] += 1
+            else:
+                self.stats["recycled"] += 1
+            self._condition.notify()
+
+        logger.debug(
+            f"Pool {self.image}: recycling container {pooled.id} "
+            f"(runs={pooled.runs}, contaminated={contaminated})"
+        )
+        self._destroy(pooled)
+        self.warm_up_in_background()
+
+    def shutdown(self) -> None:
+        """Остановить и удалить все простаивающие контейнеры"""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._condition.notify_all()
+        for pooled in idle:
+            self._destroy(pooled)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "image": self.image,
+                "idle": len(self._idle),
+                "total": self._total,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self.stats,
+            }
+
+
+class ContainerPoolManager:
+    """Набор пулов, по одному на Docker образ"""
+
+    def __init__(self, docker_client: Any):
+        self.docker_client = docker_client
+        self._pools: Dict[str, LanguageContainerPool] = {}
+        self._lock = threading.Lock()
+
+    def _pool_size(self, language: SupportedLanguage) -> Tuple[int, int]:
+        """Размер пула с учетом переопределений по языку"""
+        language_key = getattr(language.language, "value", str(language.language))
+        override: Optional[List[int]] = settings.code_executor_pool_sizes.get(
+            language_key
+        )
+        if override and len(override) == 2:
+            return override[0], override[1]
+        return (
+            settings.code_executor_pool_min_size,
+            settings.code_executor_pool_max_size,
+        )
+
+    def get_pool(self, language: SupportedLanguage) -> LanguageContainerPool:
+        """Получить (или создать) пул для образа языка"""
+        with self._lock:
+            pool = self._pools.get(language.dockerImage)
+            if pool is None:
+                min_size, max_size = self._pool_size(language)
+                pool = LanguageContainerPool(
+                    self.docker_client,
+                    image=language.dockerImage,
+                    memory_limit_mb=language.memoryLimitMB,
+                    min_size=min_size,
+                    max_size=max_size,
+                    max_runs=settings.code_executor_pool_max_runs,
+                )
+                self._pools[language.dockerImage] = pool
+                pool.warm_up_in_background()
+                logger.info(
+                    f"Created container pool for {language.dockerImage} "
+                    f"(min={min_size}, max={max_size})"
+                )
+            return pool
+
+    def run(
+        self,
+        language: SupportedLanguage,
+        source_dir: str,
+        command: str,
+        timeout: int,
+    ) -> Dict[str, Any]:
+        """
+        Выполнить команду в контейнере из пула
+
+        Args:
+            language: Язык (определяет образ и лимиты)
+            source_dir: Директория с файлами, которые нужно положить в /code
+            command: Команда оболочки для запуска
+            timeout: Лимит времени выполнения в секундах
+
+        Returns:
+            Словарь с exit_code, stdout, stderr и флагом timed_out
+        """
+        pool = self.get_pool(language)
+        pooled = pool.acquire(timeout=timeout)
+        contaminated = False
+
+        try:
+            _extract_archive(pooled.container, _archive_directory(source_dir))
+
+            started = time.monotonic()
+            exit_code, output = pooled.container.exec_run(
+                [
+                    "sh",
+                    "-c",
+                    f"timeout -k {KILL_AFTER_SECONDS} {timeout} {command}",
+                ],
+                workdir=WORK_DIR,
+                user="nobody",
+                demux=True,
+            )
+            elapsed = time.monotonic() - started
+            stdout, stderr = output if output else (None, None)
+            timed_out = exit_code == TIMEOUT_EXIT_CODE or (
+                exit_code == KILLED_EXIT_CODE and elapsed >= timeout
+            )
+
+            contaminated = timed_out or not _reset_container(pooled.container)
+
+            return {
+                "exit_code": exit_code,
+                "stdout": stdout.decode("utf-8", errors="replace") if stdout else "",
+                "stderr": stderr.decode("utf-8", errors="replace") if stderr else "",
+                "timed_out": timed_out,
+                "container_id": pooled.id,
+            }
+
+        except Exception:
+            contaminated = True
+            raise
+        finally:
+            pool.release(pooled, contaminated=contaminated)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            pools = list(self._pools.values())
+        return [pool.get_stats() for pool in pools]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown()
+
+
+def _owned_by_nobody(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+    # Файлы должны принадлежать nobody, иначе их не удалить при очистке
+    tarinfo.uid = tarinfo.gid = NOBODY_UID
+    tarinfo.uname = tarinfo.gname = "nobody"
+    return tarinfo
+
+
+def _archive_directory(source_dir: str) -> bytes:
+    """Упаковать содержимое директории в tar для передачи в контейнер"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name in os.listdir(source_dir):
+            tar.add(
+                os.path.join(source_dir, name), arcname=name, filter=_owned_by_nobody
+            )
+    return buffer.getvalue()
+
+
+def _extract_archive(container: Any, archive: bytes) -> None:
+    """Распаковать tar в рабочую директорию через stdin `tar -x`"""
+    api = container.client.api
+    exec_id = api.exec_create(
+        container.id,
+        ["tar", "-x", "-f", "-", "-C", WORK_DIR],
+        stdin=True,
+        user="nobody",
+    )["Id"]
+    response = api.exec_start(exec_id, socket=True)
+    raw = getattr(response, "_sock", response)
+    try:
+        raw.sendall(archive)
+        # EOF для tar: закрываем только запись, вывод дочитываем до конца
+        raw.shutdown(socket.SHUT_WR)
+        _, stderr = consume_socket_output(frames_iter(raw, tty=False), demux=True)
+    finally:
+        response.close()
+
+    exit_code = api.exec_inspect(exec_id).get("ExitCode")
+    if exit_code != 0:
+        message = stderr.decode("utf-8", errors="replace").strip() if stderr else ""
+        raise ContainerPoolError(
+            f"Failed to copy code into container {container.id[:12]} "
+            f"(tar exit code {exit_code}): {message}"
+        )
+
+
+def _reset_container(container: Any) -> bool:
+    """
+    Очистить рабочую директорию и убедиться, что не осталось процессов
+    пользователя. Возвращает False, если контейнер нельзя переиспользовать.
+    """
+    try:
+        exit_code, _ = container.exec_run(
+            ["sh", "-c", f"find {WORK_DIR} -mindepth 1 -delete"], user="nobody"
+        )
+        if exit_code != 0:
+            return False
+        # В контейнере должен остаться только `sleep infinity`
+        processes = container.top().get("Processes") or []
+        return len(processes) <= 1
+    except Exception as e:
+        logger.warning(f"Failed to reset pooled container: {e}")
+        return False
+
+
+_pool_manager: Optional[ContainerPoolManager] = None
+_pool_manager_lock = threading.Lock()
+
+
+def get_container_pool_manager(docker_client: Any) -> ContainerPoolManager:
+    """Глобальный менеджер пулов (один на процесс)"""
+    global _pool_manager
+    with _pool_manager_lock:
+        if _pool_manager is None:
+            _pool_manager = ContainerPoolManager(docker_client)
+        return _pool_manager
+
+
+def shutdown_container_pools() -> None:
+    """Удалить контейнеры всех пулов (вызывается при остановке приложения)"""
+    global _pool_manager
+    with _pool_manager_lock:
+        manager, _pool_manager = _pool_manager, None
+    if manager is not None:
+        manager.shutdown()
+        logger.info("Container pools shut down")
@@ -7,10 +7,16 @@ import logging
 import os
 from typing import Optional
 
+from app.core.settings import settings
 from app.features.code_editor.repositories.code_editor_repository import (
     CodeEditorRepository,
 )
 from app.features.code_editor.services.code_executor_service import CodeExecutorService
+from app.features.code_editor.services.container_pool import (
+    get_container_pool_manager,
+)
+from app.features.code_editor.services.execution_cache import get_execution_cache
+from app.features.code_editor.utils.execution_backend import get_execution_backend
 # Judge0Service удален
 from app.shared.models.enums import ExecutionStatus
 from app.shared.models.code_execution_models import CodeExecution, SupportedLanguage
@@ -61,6 +67,19 @@ class EnhancedCodeExecutorService:
             )
 
 
+    def create_pending_execution(
+        self,
+        source_code: str,
+        language: SupportedLanguage,
+        stdin: Optional[str] = None,
+        user_id: Optional[int] = None,
+        block_id: Optional[str] = None,
+    ) -> CodeExecution:
+        """Создает выполнение в статусе PENDING для постановки в очередь"""
+        return self.docker_service.create_pending_execution(
+            source_code, language, stdin, user_id, block_id
+        )
+
     def _create_error_execution(
         self,
         source_code: str,
@@ -120,7 +139,18 @@ class EnhancedCodeExecutorService:
 
     def get_execution_stats(self):
         """Возвращает статистику выполнения"""
+        pool_stats = []
+        if settings.code_executor_pool_enabled and self.docker_service.docker_client:
+            pool_stats = get_container_pool_manager(
+                self.docker_service.docker_client
+            ).get_stats()
+
         return {
-            "execution_method": "docker_only",
+            "execution_method": (
+                "docker_pool" if settings.code_executor_pool_enabled else "docker_only"
+            ),
             "supported_languages_count": 0,  # TODO: получить из docker_service
+            "container_pools": pool_stats,
+            "execution_queues": get_execution_backend().get_stats(),
+            "result_cache": get_execution_cache().get_stats(),
         }
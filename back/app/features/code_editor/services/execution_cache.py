@@ -0,0 +1,173 @@
+"""
+🗃️ Кеш детерминированных результатов выполнения кода
+
+Студенты постоянно отправляют один и тот же код на одни и те же входные
+данные. Результат запуска адресуется по содержимому: id языка, SHA-256
+исходного кода и SHA-256 stdin. Основное хранилище - Redis (TTL, вытеснение
+по политике maxmemory сервера), при недоступности Redis используется
+LRU-кеш в памяти процесса с тем же TTL.
+
+Кешируются только завершившиеся запуски; ошибки инфраструктуры и таймауты
+приходят исключениями и в кеш не попадают. Для недетерминированных задач
+кеш обходится явно (флаг запроса или список блоков в настройках).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.exceptions import GracefulDegradation
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "code-exec-result"
+# Сколько секунд не обращаться к Redis после ошибки
+REDIS_RETRY_INTERVAL = 30.0
+
+
+def _sha256(value: Optional[str]) -> str:
+    return hashlib.sha256((value or "").encode("utf-8")).hexdigest()
+
+
+class InMemoryLRUCache:
+    """Потокобезопасный LRU-кеш с TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ExecutionResultCache:
+    """Кеш результатов выполнения: Redis с fallback на память процесса"""
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int,
+        redis_url: Optional[str] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._memory = InMemoryLRUCache(max_entries, ttl_seconds)
+        self._redis = None
+        self._redis_retry_at = 0.0
+        if redis_url:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @staticmethod
+    def make_key(language_id: str, source_code: str, stdin: Optional[str]) -> str:
+        """Ключ кеша: язык + хеш исходника + хеш входных данных"""
+        return f"{KEY_PREFIX}:{language_id}:{_sha256(source_code)}:{_sha256(stdin)}"
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _disable_redis_temporarily(self, operation: str, error: Exception) -> None:
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+        GracefulDegradation.handle_redis_error(operation, error)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = None
+        if self._redis_available():
+            try:
+                raw = await self._redis.get(key)
+                value = json.loads(raw) if raw else None
+            except Exception as e:
+                self._disable_redis_temporarily("execution_cache_get", e)
+                value = self._memory.get(key)
+        else:
+            value = self._memory.get(key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        if self._redis_available():
+            try:
+                await self._redis.setex(
+                    key, self.ttl_seconds, json.dumps(value, default=str)
+                )
+                return
+            except Exception as e:
+                self._disable_redis_temporarily("execution_cache_set", e)
+        self._memory.set(key, value)
+
+    def record_bypass(self) -> None:
+        self.bypassed += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis" if self._redis_available() else "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+
+def is_cache_bypassed(block_id: Optional[str], bypass_requested: bool) -> bool:
+    """Нужно ли обойти кеш (недетерминированная задача или явный запрос)"""
+    if not settings.code_execution_cache_enabled or bypass_requested:
+        return True
+    return bool(block_id) and block_id in settings.code_execution_cache_bypass_blocks
+
+
+_cache: Optional[ExecutionResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_execution_cache() -> ExecutionResultCache:
+    """Глобальный кеш результатов (один на процесс)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            redis_url = (
+                settings.redis_url
+                if settings.code_execution_cache_backend == "redis"
+                else None
+            )
+            _cache = ExecutionResultCache(
+                ttl_seconds=settings.code_execution_cache_ttl,
+                max_entries=settings.code_execution_cache_max_entries,
+                redis_url=redis_url,
+            )
+        return _cache
@@ -0,0 +1,358 @@
+"""
+📬 Очередь асинхронного выполнения кода
+
+Отправка кода создает `CodeExecution` в статусе PENDING и кладет его id в
+очередь. Пул воркеров (в процессе API или в отдельных процессах, см.
+scripts/run_execution_worker.py) забирает задачи и выполняет их. Клиент
+получает результат через `GET /executions/{id}` или через SSE поток
+событий выполнения.
+
+Брокер абстрагирован: in-memory реализация работает в пределах одного
+процесса, Redis реализация позволяет масштабировать воркеры отдельно от API.
+
+In-memory очередь теряется при перезапуске, поэтому при старте воркеры
+заново ставят в очередь PENDING выполнения, а RUNNING старше
+`code_execution_stale_after` завершают ошибкой. Воркер захватывает
+выполнение атомарно (PENDING -> RUNNING), так что повторная постановка в
+очередь не запускает код дважды.
+"""
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.core.settings import settings
+from app.shared.models.code_execution_models import CodeExecution
+from app.shared.models.enums import ExecutionStatus
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "code-execution:queue"
+EVENTS_CHANNEL = "code-execution:events:{execution_id}"
+
+FINAL_STATUSES = {
+    ExecutionStatus.SUCCESS,
+    ExecutionStatus.ERROR,
+    ExecutionStatus.TIMEOUT,
+    ExecutionStatus.MEMORY_LIMIT,
+}
+
+
+class ExecutionSubscription(ABC):
+    """Подписка на события одного выполнения"""
+
+    @abstractmethod
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Следующее событие или None, если за timeout событий не было"""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+
+class ExecutionBroker(ABC):
+    """Интерфейс брокера очереди выполнений"""
+
+    @abstractmethod
+    async def enqueue(self, execution_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def publish(self, execution_id: str, event: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    async def subscribe(self, execution_id: str) -> ExecutionSubscription:
+        pass
+
+    async def close(self) -> None:
+        """Освободить соединения брокера (по умолчанию ничего не делает)"""
+        return None
+
+
+class _InMemorySubscription(ExecutionSubscription):
+    def __init__(self, broker: "InMemoryExecutionBroker", execution_id: str):
+        self._broker = broker
+        self._execution_id = execution_id
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self._broker._unsubscribe(self._execution_id, self)
+
+
+class InMemoryExecutionBroker(ExecutionBroker):
+    """Брокер в памяти процесса (без внешних зависимостей)"""
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers: Dict[str, List[_InMemorySubscription]] = {}
+
+    async def enqueue(self, execution_id: str) -> None:
+        await self._queue.put(execution_id)
+
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def publish(self, execution_id: str, event: Dict[str, Any]) -> None:
+        for subscription in self._subscribers.get(execution_id, []):
+            subscription.queue.put_nowait(event)
+
+    async def subscribe(self, execution_id: str) -> ExecutionSubscription:
+        subscription = _InMemorySubscription(self, execution_id)
+        self._subscribers.setdefault(execution_id, []).append(subscription)
+        return subscription
+
+    def _unsubscribe(
+        self, execution_id: str, subscription: _InMemorySubscription
+    ) -> None:
+        subscribers = self._subscribers.get(execution_id, [])
+        if subscription in subscribers:
+            subscribers.remove(subscription)
+        if not subscribers:
+            self._subscribers.pop(execution_id, None)
+
+
+class _RedisSubscription(ExecutionSubscription):
+    def __init__(self, pubsub: Any):
+        self._pubsub = pubsub
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        message = await self._pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=timeout
+        )
+        if not message:
+            return None
+        return json.loads(message["data"])
+
+    async def close(self) -> None:
+        await self._pubsub.unsubscribe()
+        await self._pubsub.aclose()
+
+
+class RedisExecutionBroker(ExecutionBroker):
+    """Брокер на Redis: очередь в списке, события через pub/sub"""
+
+    def __init__(self, redis_url: str):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+    async def enqueue(self, execution_id: str) -> None:
+        await self._redis.rpush(QUEUE_KEY, execution_id)
+
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        item = await self._redis.blpop([QUEUE_KEY], timeout=timeout)
+        return item[1] if item else None
+
+    async def publish(self, execution_id: str, event: Dict[str, Any]) -> None:
+        await self._redis.publish(
+            EVENTS_CHANNEL.format(execution_id=execution_id),
+            json.dumps(event, default=str),
+        )
+
+    async def subscribe(self, execution_id: str) -> ExecutionSubscription:
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(EVENTS_CHANNEL.format(execution_id=execution_id))
+        return _RedisSubscription(pubsub)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def execution_to_event(execution: CodeExecution) -> Dict[str, Any]:
+    """Финальное событие с результатом выполнения"""
+    return {
+        "event": "result",
+        "id": execution.id,
+        "status": getattr(execution.status, "value", execution.status),
+        "stdout": execution.stdout,
+        "stderr": execution.stderr,
+        "exitCode": execution.exitCode,
+        "executionTimeMs": execution.executionTimeMs,
+        "errorMessage": execution.errorMessage,
+        "final": True,
+    }
+
+
+class ExecutionWorkerPool:
+    """Пул asyncio воркеров, разбирающих очередь выполнений"""
+
+    def __init__(self, broker: ExecutionBroker, concurrency: int):
+        self.broker = broker
+        self.concurrency = concurrency
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+    async def start(self) -> None:
+        self._stopping = False
+        try:
+            await self.recover()
+        except Exception as e:
+            logger.error(f"Failed to recover queued executions: {e}")
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"code-execution-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} code execution workers")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Code execution workers stopped")
+
+    async def _worker(self, index: int) -> None:
+        while not self._stopping:
+            try:
+                execution_id = await self.broker.dequeue(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {index}: dequeue failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if not execution_id:
+                continue
+
+            try:
+                await self.process(execution_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {index}: execution {execution_id} failed: {e}")
+
+    async def recover(self) -> None:
+        """Вернуть в очередь PENDING выполнения и завершить зависшие RUNNING"""
+        from app.features.code_editor.repositories.code_editor_repository import (
+            CodeEditorRepository,
+        )
+        from app.shared.database.base import db_manager
+
+        stale_before = datetime.now() - timedelta(
+            seconds=settings.code_execution_stale_after
+        )
+        with db_manager.get_session() as session:
+            repository = CodeEditorRepository(session)
+
+            stale = await repository.get_executions_by_status(
+                ExecutionStatus.RUNNING, created_before=stale_before
+            )
+            for execution in stale:
+                execution.status = ExecutionStatus.ERROR
+                execution.errorMessage = "Выполнение прервано перезапуском сервера"
+                execution.completedAt = datetime.now()
+                await repository.save_execution(execution)
+                await self.broker.publish(execution.id, execution_to_event(execution))
+
+            pending = await repository.get_executions_by_status(ExecutionStatus.PENDING)
+            for execution in pending:
+                await self.broker.enqueue(execution.id)
+
+        if stale or pending:
+            logger.info(
+                f"Recovered executions: {len(pending)} re-enqueued, "
+                f"{len(stale)} stale marked as failed"
+            )
+
+    async def process(self, execution_id: str) -> None:
+        """Выполнить одну задачу из очереди"""
+        from app.features.code_editor.repositories.code_editor_repository import (
+            CodeEditorRepository,
+        )
+        from app.features.code_editor.services.code_executor_service import (
+            CodeExecutorService,
+        )
+        from app.shared.database.base import db_manager
+
+        with db_manager.get_session() as session:
+            repository = CodeEditorRepository(session)
+            executor = CodeExecutorService(repository)
+
+            execution = await repository.get_execution_by_id(execution_id)
+            if not execution or execution.status != ExecutionStatus.PENDING:
+                logger.warning(f"Skipping execution {execution_id}: not pending")
+                return
+            # id может оказаться в очереди дважды (восстановление при старте)
+            if not await repository.claim_execution(execution_id):
+                logger.warning(f"Skipping execution {execution_id}: already claimed")
+                return
+
+            language = await repository.get_language_by_id(execution.languageId)
+            if not language:
+                execution.status = ExecutionStatus.ERROR
+                execution.errorMessage = "Язык выполнения не найден"
+                await repository.save_execution(execution)
+                await self.broker.publish(execution_id, execution_to_event(execution))
+                return
+
+            await self.broker.publish(
+                execution_id, {"event": "status", "status": "RUNNING"}
+            )
+
+            execution = await executor.run_execution(execution, language)
+
+            if execution.stdout:
+                await self.broker.publish(
+                    execution_id, {"event": "stdout", "data": execution.stdout}
+                )
+            await self.broker.publish(execution_id, execution_to_event(execution))
+
+
+_broker: Optional[ExecutionBroker] = None
+_worker_pool: Optional[ExecutionWorkerPool] = None
+
+
+def get_execution_broker() -> ExecutionBroker:
+    """Глобальный брокер, выбранный настройкой code_execution_broker"""
+    global _broker
+    if _broker is None:
+        if settings.code_execution_broker == "redis":
+            _broker = RedisExecutionBroker(settings.redis_url)
+            logger.info("Code execution broker: redis")
+        else:
+            _broker = InMemoryExecutionBroker()
+            logger.info("Code execution broker: in-memory")
+    return _broker
+
+
+async def start_execution_workers(concurrency: Optional[int] = None) -> None:
+    """Запустить воркеры в текущем процессе (0 воркеров - не запускать)"""
+    global _worker_pool
+    concurrency = (
+        settings.code_execution_workers if concurrency is None else concurrency
+    )
+    if concurrency <= 0 or _worker_pool is not None:
+        return
+    _worker_pool = ExecutionWorkerPool(get_execution_broker(), concurrency)
+    await _worker_pool.start()
+
+
+async def stop_execution_workers() -> None:
+    """Остановить воркеры и закрыть брокер"""
+    global _worker_pool, _broker
+    if _worker_pool is not None:
+        await _worker_pool.stop()
+        _worker_pool = None
+    if _broker is not None:
+        await _broker.close()
+        _broker = None
@@ -0,0 +1,3 @@
+"""Тесты code_editor feature"""
+
+__all__ = []
@@ -0,0 +1,75 @@
+"""
+Тесты кеша и объединения запросов AIGenerationClient
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.features.code_editor.services.ai_generation_client import (
+    SOURCE_CACHE,
+    SOURCE_COALESCED,
+    AIGenerationClient,
+    StubChatProvider,
+)
+
+CONFIG = SimpleNamespace(model="stub", temperature=0.0, max_tokens=100)
+MESSAGES = [{"role": "user", "content": "tests"}]
+
+
+class TestAIGenerationClient:
+    """Объединение одинаковых запросов и отмена вызывающих"""
+
+    def test_first_caller_cancelled_does_not_cancel_coalesced(self):
+        """Отмена первого вызывающего не отменяет общий запрос и не ломает кеш"""
+
+        async def scenario():
+            provider = StubChatProvider('[{"name": "t"}]', delay=0.05)
+            client = AIGenerationClient(provider, cache_ttl=60, cache_max_entries=10)
+
+            first = asyncio.ensure_future(client.generate(CONFIG, MESSAGES))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(client.generate(CONFIG, MESSAGES))
+            await asyncio.sleep(0)
+
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
+            coalesced = await waiter
+            cached = await client.generate(CONFIG, MESSAGES)
+            return provider, client, coalesced, cached
+
+        provider, client, coalesced, cached = asyncio.run(scenario())
+
+        assert coalesced.text == '[{"name": "t"}]'
+        assert coalesced.source == SOURCE_COALESCED
+        assert cached.source == SOURCE_CACHE
+        assert provider.calls == 1
+        stats = client.stats()
+        assert stats["upstream_requests"] == 1
+        assert stats["coalesced_requests"] == 1
+        assert stats["cache_hits"] == 1
+        assert stats["upstream_failures"] == 0
+
+    def test_cancelled_caller_still_fills_cache(self):
+        """Ответ кешируется, даже если единственный вызывающий отменен"""
+
+        async def scenario():
+            provider = StubChatProvider("[]", delay=0.05)
+            client = AIGenerationClient(provider, cache_ttl=60, cache_max_entries=10)
+
+            first = asyncio.ensure_future(client.generate(CONFIG, MESSAGES))
+            await asyncio.sleep(0)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
+            await asyncio.sleep(0.1)
+            return provider, await client.generate(CONFIG, MESSAGES)
+
+        provider, result = asyncio.run(scenario())
+
+        assert result.source == SOURCE_CACHE
+        assert provider.calls == 1
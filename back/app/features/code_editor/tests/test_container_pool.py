@@ -0,0 +1,141 @@
+"""
+Тесты пула контейнеров: запуск кода через пул, таймауты и откат на
+одноразовый контейнер
+"""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.features.code_editor.services import code_executor_service, container_pool
+from app.features.code_editor.services.code_executor_service import (
+    CodeExecutorService,
+)
+from app.features.code_editor.services.container_pool import (
+    ContainerPoolError,
+    ContainerPoolManager,
+)
+from app.shared.models.enums import ExecutionStatus
+
+# Образ с python и tar; в CI можно подменить на образ из SupportedLanguage
+TEST_IMAGE = os.getenv("CODE_EXECUTOR_TEST_IMAGE", "python:3.11-alpine")
+
+
+def make_language(image="python-test", timeout=5):
+    return SimpleNamespace(
+        language="python",
+        dockerImage=image,
+        memoryLimitMB=128,
+        timeoutSeconds=timeout,
+        fileExtension=".py",
+        runCommand="python {file}",
+        compileCommand=None,
+    )
+
+
+def docker_client_or_skip():
+    docker = pytest.importorskip("docker")
+    try:
+        client = docker.from_env()
+        client.ping()
+        client.images.get(TEST_IMAGE)
+    except Exception as e:
+        pytest.skip(f"Docker or image {TEST_IMAGE} is not available: {e}")
+    return client
+
+
+class TestContainerPoolDocker:
+    """Запуск кода через пул на настоящем Docker"""
+
+    def test_run_code_through_pool(self, tmp_path):
+        """Код копируется в tmpfs read-only контейнера и выполняется"""
+        manager = ContainerPoolManager(docker_client_or_skip())
+        language = make_language(TEST_IMAGE)
+        (tmp_path / "main.py").write_text("print(input() * 2)\n", encoding="utf-8")
+        (tmp_path / "input.txt").write_text("ab\n", encoding="utf-8")
+
+        try:
+            first = manager.run(
+                language, str(tmp_path), "sh -c 'python main.py < input.txt'", 10
+            )
+            second = manager.run(
+                language, str(tmp_path), "sh -c 'python main.py < input.txt'", 10
+            )
+        finally:
+            manager.shutdown()
+
+        assert first["exit_code"] == 0
+        assert first["stdout"] == "abab\n"
+        assert not first["timed_out"]
+        # Второй запуск - в контейнере, возвращенном в пул после очистки /code
+        assert second["exit_code"] == 0
+        assert second["stdout"] == "abab\n"
+
+    def test_timeout_through_pool(self, tmp_path):
+        """Превышение лимита времени помечается как таймаут"""
+        manager = ContainerPoolManager(docker_client_or_skip())
+        (tmp_path / "main.py").write_text("while True: pass\n", encoding="utf-8")
+
+        try:
+            result = manager.run(
+                make_language(TEST_IMAGE), str(tmp_path), "python main.py", 1
+            )
+        finally:
+            manager.shutdown()
+
+        assert result["timed_out"]
+
+
+class TestContainerPoolUnit:
+    """Классификация кодов возврата и откат без Docker"""
+
+    def run_with_exit_code(self, tmp_path, exit_code):
+        container = MagicMock()
+        container.id = "c" * 64
+        container.exec_run.side_effect = [
+            (exit_code, (b"", b"Killed")),
+            (0, None),
+        ]
+        container.top.return_value = {"Processes": [["sleep"]]}
+        docker_client = MagicMock()
+        docker_client.containers.run.return_value = container
+        manager = ContainerPoolManager(docker_client)
+        (tmp_path / "main.py").write_text("pass\n", encoding="utf-8")
+
+        with patch.object(container_pool, "_extract_archive"):
+            pool = manager.get_pool(make_language())
+            pool.min_size = 0
+            return manager.run(make_language(), str(tmp_path), "python main.py", 5)
+
+    def test_killed_before_time_limit_is_not_timeout(self, tmp_path):
+        """137 (OOM killer) до истечения лимита - ошибка, а не таймаут"""
+        result = self.run_with_exit_code(tmp_path, 137)
+
+        assert result["exit_code"] == 137
+        assert not result["timed_out"]
+
+    def test_timeout_exit_code(self, tmp_path):
+        """124 - код возврата timeout при истечении лимита"""
+        assert self.run_with_exit_code(tmp_path, 124)["timed_out"]
+
+    def test_pool_error_falls_back_to_fresh_container(self, tmp_path):
+        """Сбой пула - выполнение в одноразовом контейнере"""
+        service = CodeExecutorService(MagicMock())
+        service.docker_client = MagicMock()
+        pool_manager = MagicMock()
+        pool_manager.run.side_effect = ContainerPoolError("tar failed")
+        fresh_result = {"status": ExecutionStatus.SUCCESS, "stdout": "ok"}
+
+        with patch.object(
+            code_executor_service,
+            "get_container_pool_manager",
+            return_value=pool_manager,
+        ), patch.object(
+            service, "_run_in_fresh_container", return_value=fresh_result
+        ) as fresh:
+            result = service._run_in_pooled_container(str(tmp_path), make_language())
+
+        assert result == fresh_result
+        fresh.assert_called_once()
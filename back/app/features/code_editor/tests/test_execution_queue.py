@@ -0,0 +1,69 @@
+"""
+Тесты восстановления очереди выполнений после перезапуска
+"""
+
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.features.code_editor.services.execution_queue import (
+    ExecutionWorkerPool,
+    InMemoryExecutionBroker,
+)
+from app.shared.models.enums import ExecutionStatus
+
+
+def make_execution(execution_id, status):
+    return SimpleNamespace(
+        id=execution_id,
+        status=status,
+        stdout=None,
+        stderr=None,
+        exitCode=None,
+        executionTimeMs=None,
+        errorMessage=None,
+        completedAt=None,
+    )
+
+
+class TestExecutionRecovery:
+    """PENDING снова в очереди, зависшие RUNNING завершены ошибкой"""
+
+    def test_recover_requeues_pending_and_fails_stale_running(self):
+        pending = make_execution("pending-1", ExecutionStatus.PENDING)
+        stale = make_execution("running-1", ExecutionStatus.RUNNING)
+
+        async def by_status(status, created_before=None):
+            if status == ExecutionStatus.RUNNING:
+                assert created_before is not None
+                return [stale]
+            return [pending]
+
+        repository = MagicMock()
+        repository.get_executions_by_status = AsyncMock(side_effect=by_status)
+        repository.save_execution = AsyncMock()
+
+        @contextmanager
+        def get_session():
+            yield MagicMock()
+
+        async def scenario():
+            broker = InMemoryExecutionBroker()
+            with patch(
+                "app.shared.database.base.db_manager.get_session", get_session
+            ), patch(
+                "app.features.code_editor.repositories.code_editor_repository."
+                "CodeEditorRepository",
+                return_value=repository,
+            ):
+                await ExecutionWorkerPool(broker, concurrency=1).recover()
+            return await broker.dequeue(timeout=0.1), await broker.dequeue(0.1)
+
+        first, second = asyncio.run(scenario())
+
+        assert first == "pending-1"
+        assert second is None
+        assert stale.status == ExecutionStatus.ERROR
+        assert stale.completedAt is not None
+        repository.save_execution.assert_awaited_once_with(stale)
@@ -0,0 +1,82 @@
+"""
+Тесты SSE потока событий выполнения
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.settings import settings
+from app.features.code_editor.services import code_editor_service
+from app.features.code_editor.services.code_editor_service import CodeEditorService
+from app.features.code_editor.services.execution_queue import InMemoryExecutionBroker
+from app.shared.models.enums import ExecutionStatus
+
+
+def make_execution(status):
+    return SimpleNamespace(
+        id="exec-1",
+        userId=1,
+        status=status,
+        stdout="ok",
+        stderr=None,
+        exitCode=0,
+        executionTimeMs=5,
+        errorMessage=None,
+    )
+
+
+def collect(service):
+    async def scenario():
+        return [chunk async for chunk in service.stream_execution_events("exec-1", 1)]
+
+    return asyncio.run(scenario())
+
+
+def events(chunks):
+    return [
+        json.loads(chunk.split("data: ", 1)[1])
+        for chunk in chunks
+        if "data: " in chunk
+    ]
+
+
+class TestExecutionStream:
+    """Результат из БД без события брокера и статус при таймауте"""
+
+    def make_service(self, reloaded):
+        repository = MagicMock()
+        repository.get_execution_by_id = AsyncMock(
+            return_value=make_execution(ExecutionStatus.RUNNING)
+        )
+        repository.reload_execution = AsyncMock(return_value=reloaded)
+        return CodeEditorService(repository)
+
+    def test_stream_ends_when_row_is_final(self):
+        """Результат другого процесса виден по перечитыванию строки"""
+        service = self.make_service(make_execution(ExecutionStatus.SUCCESS))
+
+        with patch.object(
+            code_editor_service,
+            "get_execution_broker",
+            return_value=InMemoryExecutionBroker(),
+        ), patch.object(code_editor_service, "STREAM_KEEPALIVE_SECONDS", 0.01):
+            received = events(collect(service))
+
+        assert received[0] == {"event": "status", "status": "RUNNING"}
+        assert received[-1]["event"] == "result"
+        assert received[-1]["status"] == "SUCCESS"
+
+    def test_timeout_reports_current_status(self):
+        """Событие timeout содержит реальный статус, а не PENDING"""
+        service = self.make_service(make_execution(ExecutionStatus.RUNNING))
+
+        with patch.object(
+            code_editor_service,
+            "get_execution_broker",
+            return_value=InMemoryExecutionBroker(),
+        ), patch.object(settings, "code_execution_stream_timeout", 0):
+            received = events(collect(service))
+
+        assert received[-1] == {"event": "timeout", "status": "RUNNING"}
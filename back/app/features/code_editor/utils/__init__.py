@@ -0,0 +1 @@
+"""Code Editor utilities"""
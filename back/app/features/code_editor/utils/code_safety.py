@@ -0,0 +1,237 @@
+"""
+Проверка безопасности пользовательского кода
+
+Правила компилируются один раз при импорте: для каждого CodeLanguage все
+регулярные выражения объединяются в одну альтернацию, перед которой стоит
+lookahead по множеству первых символов правил. Движок re быстро пропускает
+позиции, с которых не начинается ни одно правило, поэтому исходник
+просматривается за один проход. Сработавшее правило определяется только
+при совпадении - проверкой правил в найденной позиции.
+
+Правила-подстроки (literal=True) проверяются через `in`: поиск подстроки
+в CPython быстрее любого регулярного выражения.
+
+Наборы правил:
+- CONTAINER_SCANNER - регулярные выражения без учета регистра,
+  используется CodeExecutorService перед запуском в контейнере;
+- EDITOR_SCANNER - запрещенные подстроки с учетом регистра,
+  используется CodeEditorRepository перед выполнением из редактора.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Pattern
+
+from app.shared.models.enums import CodeLanguage
+
+# Метасимволы, с которых правило не может начинаться для вычисления префикса
+_REGEX_META = set(".^$*+?{}[]|()")
+
+
+@dataclass(frozen=True)
+class SafetyViolation:
+    """Сработавшее правило проверки безопасности"""
+
+    pattern: str
+    position: int
+
+
+def _first_char(rule: str) -> Optional[str]:
+    """Первый обязательный символ правила или None, если его не вычислить"""
+    while rule.startswith(r"\b"):
+        rule = rule[2:]
+    if not rule:
+        return None
+    if rule[0] == "\\":
+        escaped = rule[1:2]
+        return escaped if escaped and not escaped.isalnum() else None
+    return None if rule[0] in _REGEX_META else rule[0]
+
+
+class _CompiledRules:
+    """Скомпилированные правила одного языка"""
+
+    def __init__(self, rules: List[str], flags: int):
+        self.rules = rules
+        self.rule_regexes = [re.compile(rule, flags) for rule in rules]
+
+        alternation = "|".join(f"(?:{rule})" for rule in rules)
+        first_chars = [_first_char(rule) for rule in rules]
+        if all(first_chars):
+            charset = "".join(sorted({re.escape(char) for char in first_chars}))
+            alternation = f"(?=[{charset}])(?:{alternation})"
+        self.combined: Pattern[str] = re.compile(alternation, flags)
+
+    def scan(self, source_code: str) -> Optional[SafetyViolation]:
+        match = self.combined.search(source_code)
+        if match is None:
+            return None
+        position = match.start()
+        # Альтернация выбирает первую подходящую ветку - повторяем этот порядок
+        for rule, regex in zip(self.rules, self.rule_regexes):
+            if regex.match(source_code, position):
+                return SafetyViolation(pattern=rule, position=position)
+        return SafetyViolation(pattern=self.rules[0], position=position)
+
+
+class CodeSafetyScanner:
+    """Однопроходный сканер опасных конструкций"""
+
+    def __init__(
+        self,
+        language_rules: Dict[CodeLanguage, List[str]],
+        common_rules: Iterable[str] = (),
+        flags: int = 0,
+        literal: bool = False,
+    ):
+        """
+        Args:
+            language_rules: Правила для конкретных языков
+            common_rules: Правила для всех языков
+            flags: Флаги re (например, re.IGNORECASE)
+            literal: Правила - обычные подстроки, а не регулярные выражения
+        """
+        common = list(common_rules)
+        self.literal = literal
+        self._rules: Dict[CodeLanguage, List[str]] = {}
+        self._compiled: Dict[CodeLanguage, _CompiledRules] = {}
+
+        for language in CodeLanguage:
+            rules = common + language_rules.get(language, [])
+            self._rules[language] = rules
+            if rules and not literal:
+                self._compiled[language] = _CompiledRules(rules, flags)
+
+    def rules_for(self, language: CodeLanguage) -> List[str]:
+        return list(self._rules.get(language, []))
+
+    def scan(
+        self, source_code: str, language: CodeLanguage
+    ) -> Optional[SafetyViolation]:
+        """Вернуть сработавшее правило или None, если код безопасен"""
+        if self.literal:
+            for rule in self._rules.get(language, []):
+                position = source_code.find(rule)
+                if position != -1:
+                    return SafetyViolation(pattern=rule, position=position)
+            return None
+
+        compiled = self._compiled.get(language)
+        return compiled.scan(source_code) if compiled else None
+
+    def is_safe(self, source_code: str, language: CodeLanguage) -> bool:
+        return self.scan(source_code, language) is None
+
+
+CONTAINER_SCANNER = CodeSafetyScanner(
+    common_rules=[
+        # Файловые операции
+        r"\bopen\s*\(",
+        r"\bfile\s*\(",
+        r"\bwith\s+open",
+        r"\.write\s*\(",
+        r"\.read\s*\(",
+        # Системные вызовы
+        r"\bos\.",
+        r"\bsystem\s*\(",
+        r"\bsubprocess\.",
+        r"\beval\s*\(",
+        r"\bexec\s*\(",
+        # Сеть
+        r"\bsocket\.",
+        r"\brequests\.",
+        r"\burllib\.",
+        r"\bhttplib\.",
+        # Импорты опасных модулей
+        r"import\s+os",
+        r"import\s+sys",
+        r"import\s+subprocess",
+        r"import\s+socket",
+        r"from\s+os\s+import",
+        r"from\s+sys\s+import",
+    ],
+    language_rules={
+        CodeLanguage.PYTHON: [
+            r"__import__\s*\(",
+            r"globals\s*\(",
+            r"locals\s*\(",
+            r"vars\s*\(",
+            r"dir\s*\(",
+        ],
+        CodeLanguage.JAVASCRIPT: [
+            r"require\s*\(",
+            r"fs\.",
+            r"process\.",
+            r"child_process",
+        ],
+        CodeLanguage.CPP: [
+            r"#include\s*<fstream>",
+            r"#include\s*<cstdlib>",
+            r"system\s*\(",
+            r"popen\s*\(",
+        ],
+        CodeLanguage.C: [
+            r"#include\s*<fstream>",
+            r"#include\s*<cstdlib>",
+            r"system\s*\(",
+            r"popen\s*\(",
+        ],
+    },
+    flags=re.IGNORECASE,
+)
+
+
+EDITOR_SCANNER = CodeSafetyScanner(
+    language_rules={
+        CodeLanguage.PYTHON: [
+            "__import__",
+            "exec",
+            "eval",
+            "compile",
+            "open",
+            "file",
+            "input",
+            "raw_input",
+            "reload",
+            "globals",
+            "locals",
+            "os.",
+            "sys.",
+            "subprocess",
+            "shutil",
+            "socket",
+            "urllib",
+            "requests",
+            "pickle",
+            "marshal",
+        ],
+        CodeLanguage.JAVASCRIPT: [
+            "require",
+            "import",
+            "fetch",
+            "XMLHttpRequest",
+            "document",
+            "window",
+            "global",
+            "process",
+            "Buffer",
+            "eval",
+            "Function",
+            "setTimeout",
+            "setInterval",
+        ],
+        CodeLanguage.JAVA: [
+            "System.exit",
+            "Runtime",
+            "ProcessBuilder",
+            "File",
+            "FileInputStream",
+            "FileOutputStream",
+            "Socket",
+            "ServerSocket",
+            "Class.forName",
+            "reflect",
+        ],
+    },
+    literal=True,
+)
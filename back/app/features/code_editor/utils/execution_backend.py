@@ -0,0 +1,154 @@
+"""
+Бэкенд выполнения блокирующих Docker вызовов вне event loop
+
+docker-py полностью синхронный: `containers.run`, `wait`, `logs`, `stats`
+блокируют поток на все время работы пользовательского кода. Все такие
+вызовы выполняются в выделенном пуле потоков, а количество одновременных
+запусков ограничивается отдельно для каждого языка. Запросы сверх лимита
+ждут в очереди, а при переполнении очереди сразу получают отказ.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import docker
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutionQueueFullError(Exception):
+    """Очередь на выполнение для языка переполнена"""
+
+    pass
+
+
+class DockerExecutionBackend:
+    """Пул потоков для Docker вызовов с лимитами и очередью по языкам"""
+
+    def __init__(self, max_workers: int, per_language_limit: int, max_queue: int):
+        self.per_language_limit = per_language_limit
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="docker-exec"
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._waiting: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+
+    def _semaphore(self, language_key: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(language_key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_language_limit)
+            self._semaphores[language_key] = semaphore
+        return semaphore
+
+    async def run(
+        self, language_key: str, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """
+        Выполнить блокирующую функцию в пуле потоков
+
+        Args:
+            language_key: Ключ языка для лимита конкурентности
+            func: Синхронная функция с Docker вызовами
+
+        Raises:
+            ExecutionQueueFullError: если очередь языка переполнена
+        """
+        waiting = self._waiting.get(language_key, 0)
+        if waiting >= self.max_queue:
+            raise ExecutionQueueFullError(
+                f"Execution queue for {language_key} is full ({waiting} waiting)"
+            )
+
+        self._waiting[language_key] = waiting + 1
+        try:
+            await self._semaphore(language_key).acquire()
+        finally:
+            self._waiting[language_key] -= 1
+
+        self._running[language_key] = self._running.get(language_key, 0) + 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, partial(func, *args, **kwargs)
+            )
+        finally:
+            self._running[language_key] -= 1
+            self._semaphore(language_key).release()
+
+    async def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Выполнить короткий блокирующий вызов без лимита по языку"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        keys = set(self._waiting) | set(self._running)
+        return {
+            key: {
+                "running": self._running.get(key, 0),
+                "waiting": self._waiting.get(key, 0),
+                "limit": self.per_language_limit,
+            }
+            for key in sorted(keys)
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_backend: Optional[DockerExecutionBackend] = None
+_docker_client: Optional[Any] = None
+_lock = threading.Lock()
+
+
+def get_execution_backend() -> DockerExecutionBackend:
+    """Глобальный бэкенд выполнения (один на процесс)"""
+    global _backend
+    with _lock:
+        if _backend is None:
+            _backend = DockerExecutionBackend(
+                max_workers=settings.code_executor_threads,
+                per_language_limit=settings.code_executor_language_concurrency,
+                max_queue=settings.code_executor_max_queue,
+            )
+        return _backend
+
+
+def get_docker_client() -> Any:
+    """
+    Общий Docker клиент процесса
+
+    docker.from_env() обращается к демону для согласования версии API,
+    поэтому клиент создается один раз, а не в каждом репозитории.
+    Неудачная попытка не кешируется.
+    """
+    global _docker_client
+    with _lock:
+        if _docker_client is None:
+            _docker_client = docker.from_env()
+        return _docker_client
+
+
+def language_key(language: Any) -> str:
+    """Ключ лимита конкурентности для SupportedLanguage"""
+    return getattr(language.language, "value", None) or str(language.dockerImage)
+
+
+def shutdown_execution_backend() -> None:
+    """Остановить пул потоков (вызывается при остановке приложения)"""
+    global _backend
+    with _lock:
+        backend, _backend = _backend, None
+    if backend is not None:
+        backend.shutdown()
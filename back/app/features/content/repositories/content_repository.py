@@ -8,15 +8,17 @@ from datetime import datetime
 from typing import List, Optional, Tuple
 from uuid import uuid4
 
-from sqlalchemy import and_, asc, desc, func, or_
+from sqlalchemy import and_, asc, desc, func
 from sqlalchemy.orm import Session, joinedload
 
 from app.features.content.exceptions.content_exceptions import (
     ContentBlockNotFoundError,
     ContentFileNotFoundError,
 )
+from app.shared.catalog import bump_catalog_version
 from app.shared.models.content_models import ContentBlock, ContentFile
 from app.shared.models.content_models import UserContentProgress
+from app.shared.search import text_search_condition
 
 
 class ContentRepository:
@@ -92,12 +94,16 @@ class ContentRepository:
 
         # Полнотекстовый поиск
         if search_query and search_query.strip():
-            search_term = f"%{search_query.strip()}%"
             query = query.filter(
-                or_(
-                    ContentBlock.blockTitle.ilike(search_term),
-                    ContentBlock.textContent.ilike(search_term),
-                    ContentBlock.codeFoldTitle.ilike(search_term),
+                text_search_condition(
+                    ContentBlock.searchVector,
+                    search_query.strip(),
+                    fuzzy_columns=[ContentBlock.blockTitle],
+                    fallback_columns=[
+                        ContentBlock.blockTitle,
+                        ContentBlock.textContent,
+                        ContentBlock.codeFoldTitle,
+                    ],
                 )
             )
 
@@ -286,6 +292,7 @@ class ContentRepository:
         self.session.add(content_file)
         self.session.commit()
         self.session.refresh(content_file)
+        bump_catalog_version()
         return content_file
 
     def create_content_block(
@@ -328,4 +335,5 @@ class ContentRepository:
         self.session.add(content_block)
         self.session.commit()
         self.session.refresh(content_block)
+        bump_catalog_version()
         return content_block
@@ -126,6 +126,12 @@ def search_questions(
         50, ge=1, le=500, description="Максимальное количество результатов"
     ),
     offset: int = Query(0, ge=0, description="Смещение для пагинации"),
+    cursor: Optional[str] = Query(
+        None, description="Курсор следующей страницы (next_cursor), заменяет offset"
+    ),
+    estimate_total: bool = Query(
+        False, description="Оценка total вместо точного подсчета"
+    ),
     session: Session = Depends(get_session),
     current_user=Depends(get_current_user_optional),
 ) -> QuestionsListResponse:
@@ -144,6 +150,8 @@ def search_questions(
         companies=companies,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        estimate_total=estimate_total,
     )
 
 
@@ -186,6 +194,46 @@ def get_all_clusters(
     return service.get_all_clusters(category_id=category_id, search=search, limit=limit)
 
 
+@router.get(
+    "/{category_id}/random-questions",
+    response_model=List[QuestionResponse],
+    summary="Случайные вопросы категории",
+    description="Случайная выборка вопросов для тренажера интервью",
+)
+def get_random_questions(
+    category_id: str = Path(..., description="ID категории"),
+    count: int = Query(10, ge=1, le=100, description="Количество вопросов"),
+    seed: Optional[int] = Query(None, description="Seed для воспроизводимой выборки"),
+    no_repeat: bool = Query(
+        False, description="Не повторять вопросы, уже выданные пользователю"
+    ),
+    session: Session = Depends(get_session),
+    current_user=Depends(get_current_user_optional),
+) -> List[QuestionResponse]:
+    """
+    Получить случайные вопросы категории
+
+    С seed выборка детерминирована; no_repeat учитывается только для
+    авторизованного пользователя.
+    """
+    service = CategoriesService(session)
+
+    questions = service.get_random_questions(
+        category_id=category_id,
+        count=count,
+        seed=seed,
+        user_id=current_user.id if current_user else None,
+        no_repeat=no_repeat,
+    )
+    if not questions:
+        # Пустая выборка - проверяем, существует ли категория
+        try:
+            service.repository.get_category_by_id(category_id)
+        except CategoryNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+    return questions
+
+
 @router.get(
     "/{category_id}",
     response_model=CategoryDetailResponse,
@@ -49,6 +49,12 @@ def get_interviews(
     has_audio: Optional[bool] = Query(
         None, description="Фильтр по наличию аудио/видео записи"
     ),
+    cursor: Optional[str] = Query(
+        None, description="Курсор следующей страницы (next_cursor), заменяет page"
+    ),
+    estimate_total: bool = Query(
+        False, description="Оценка total вместо точного подсчета"
+    ),
     session: Session = Depends(get_session),
     current_user=Depends(get_current_user_optional),
 ):
@@ -59,6 +65,8 @@ def get_interviews(
     - **company**: Название компании для фильтрации (устарел)
     - **companies**: Список компаний для фильтрации
     - **search**: Поиск по тексту интервью
+    - **cursor**: Курсор из next_cursor предыдущей страницы
+    - **estimate_total**: Приблизительный total (быстрее на больших выборках)
     """
     service = InterviewService(session)
 
@@ -71,7 +79,13 @@ def get_interviews(
 
     filters = {"companies": companies_filter, "search": search, "has_audio": has_audio}
 
-    return service.get_interviews_list(page=page, limit=limit, filters=filters)
+    return service.get_interviews_list(
+        page=page,
+        limit=limit,
+        filters=filters,
+        cursor=cursor,
+        estimate_total=estimate_total,
+    )
 
 
 @router.get(
@@ -160,6 +160,12 @@ class QuestionsListResponse(BaseModel):
     page: int = Field(..., description="Текущая страница")
     limit: int = Field(..., description="Количество на странице")
     has_next: bool = Field(..., description="Есть ли следующая страница")
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы (keyset пагинация)"
+    )
+    total_is_estimate: bool = Field(
+        False, description="total - оценка, а не точный подсчет"
+    )
 
     class Config:
         json_schema_extra = {
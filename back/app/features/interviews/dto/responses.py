@@ -47,6 +47,8 @@ class InterviewsListResponse(BaseModel):
     limit: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # Курсор следующей страницы (keyset)
+    total_is_estimate: bool = False  # total - оценка, а не точный COUNT
 
 
 class CompanyStatsResponse(BaseModel):
@@ -2,7 +2,7 @@
 Categories Repository - репозиторий для работы с категориями вопросов интервью
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
@@ -10,6 +10,8 @@ from sqlalchemy.orm import Session
 from app.features.interviews.exceptions.interview_exceptions import (
     CategoryNotFoundError,
 )
+from app.shared.database.pagination import count_rows, text_select
+from app.shared.search import is_fulltext_enabled
 
 
 class QuestionQueryBuilder:
@@ -48,6 +50,13 @@ class QuestionQueryBuilder:
                 interview_id = search_query.replace("interview:", "")
                 conditions.append("interview_id = :interview_id")
                 params["interview_id"] = interview_id
+            elif is_fulltext_enabled():
+                conditions.append(
+                    "(\"searchVector\" @@ (websearch_to_tsquery('russian', :search_query)"
+                    " || websearch_to_tsquery('simple', :search_query))"
+                    " OR :search_query <% question_text)"
+                )
+                params["search_query"] = search_query
             else:
                 conditions.append("LOWER(question_text) LIKE LOWER(:search_pattern)")
                 params["search_pattern"] = f"%{search_query}%"
@@ -199,20 +208,16 @@ class CategoriesRepository:
 
         return clusters
 
-    def get_questions_by_category(
-        self, category_id: str, limit: int = 10, offset: int = 0, random: bool = False
-    ) -> List[Dict[str, Any]]:
-        """Получить вопросы категории"""
-        order_clause = "ORDER BY RANDOM()" if random else "ORDER BY id"
+    def get_questions_by_ids(self, question_ids: List[str]) -> List[Dict[str, Any]]:
+        """Получить вопросы по id в порядке переданного списка"""
+        if not question_ids:
+            return []
 
-        query = f"{QuestionQueryBuilder.BASE_SELECT} WHERE category_id = :category_id {order_clause} LIMIT :limit OFFSET :offset"
+        query = f"{QuestionQueryBuilder.BASE_SELECT} WHERE id = ANY(:ids)"
+        result = self.session.execute(text(query), {"ids": list(question_ids)})
 
-        result = self.session.execute(
-            text(query),
-            {"category_id": category_id, "limit": limit, "offset": offset},
-        ).fetchall()
-
-        return [QuestionQueryBuilder.row_to_dict(row) for row in result]
+        by_id = {row.id: QuestionQueryBuilder.row_to_dict(row) for row in result}
+        return [by_id[qid] for qid in question_ids if qid in by_id]
 
     def get_questions_by_cluster(
         self, cluster_id: int, limit: int = 50, offset: int = 0
@@ -235,14 +240,19 @@ class CategoriesRepository:
         companies: Optional[List[str]] = None,
         limit: int = 50,
         offset: int = 0,
+        after_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Поиск вопросов"""
+        """Поиск вопросов (after_id - keyset пагинация по id вместо offset)"""
         conditions, params = QuestionQueryBuilder.build_conditions_and_params(
             search_query=search_query,
             category_ids=category_ids,
             cluster_ids=cluster_ids,
             companies=companies,
         )
+        if after_id is not None:
+            conditions.append("id > :after_id")
+            params["after_id"] = after_id
+            offset = 0
 
         query = QuestionQueryBuilder.BASE_SELECT
         if conditions:
@@ -260,21 +270,27 @@ class CategoriesRepository:
         category_ids: Optional[List[str]] = None,
         cluster_ids: Optional[List[int]] = None,
         companies: Optional[List[str]] = None,
-    ) -> int:
-        """Подсчет количества вопросов для поиска"""
+        estimate: bool = False,
+    ) -> Tuple[int, bool]:
+        """Количество вопросов для поиска и флаг оценки (estimate - план запроса)"""
         conditions, params = QuestionQueryBuilder.build_conditions_and_params(
             search_query=search_query,
             category_ids=category_ids,
             cluster_ids=cluster_ids,
             companies=companies,
         )
+        where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
 
-        query = QuestionQueryBuilder.BASE_COUNT
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
+        if estimate:
+            return count_rows(
+                self.session,
+                text_select(f'SELECT id FROM "InterviewQuestion"{where_clause}', params),
+                estimate=True,
+            )
 
+        query = QuestionQueryBuilder.BASE_COUNT + where_clause
         result = self.session.execute(text(query), params).fetchone()
-        return result.count
+        return result.count, False
 
     def get_category_statistics(self) -> Dict[str, Any]:
         """Получить общую статистику по категориям"""
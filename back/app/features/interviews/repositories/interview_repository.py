@@ -1,11 +1,14 @@
 """Repository для работы с интервью"""
 
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import desc, func, or_
+from sqlalchemy import desc, func, tuple_
 from sqlalchemy.orm import Session
 
+from app.shared.database.pagination import count_rows, decode_cursor, encode_cursor
 from app.shared.models.interview_models import InterviewRecord
+from app.shared.search import text_search_condition
 
 
 class InterviewRepository:
@@ -15,9 +18,20 @@ class InterviewRepository:
         self.session = session
 
     def get_interviews(
-        self, page: int = 1, limit: int = 20, filters: Optional[Dict[str, Any]] = None
-    ) -> tuple[List[InterviewRecord], int]:
-        """Получение списка интервью с фильтрацией и пагинацией"""
+        self,
+        page: int = 1,
+        limit: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        estimate_total: bool = False,
+    ) -> tuple[List[InterviewRecord], int, bool, Optional[str]]:
+        """
+        Получение списка интервью с фильтрацией и пагинацией
+
+        С cursor используется keyset пагинация (page игнорируется).
+        Возвращает интервью, общее количество, флаг "количество - оценка"
+        (только при estimate_total) и курсор следующей страницы.
+        """
         query = self.session.query(InterviewRecord)
 
         # Применение фильтров
@@ -38,11 +52,15 @@ class InterviewRepository:
                 )
 
             if filters.get("search"):
-                search_term = f"%{filters['search']}%"
                 query = query.filter(
-                    or_(
-                        InterviewRecord.full_content.ilike(search_term),
-                        InterviewRecord.company_name.ilike(search_term),
+                    text_search_condition(
+                        InterviewRecord.searchVector,
+                        filters["search"],
+                        fuzzy_columns=[InterviewRecord.company_name],
+                        fallback_columns=[
+                            InterviewRecord.full_content,
+                            InterviewRecord.company_name,
+                        ],
                     )
                 )
 
@@ -51,18 +69,38 @@ class InterviewRepository:
                     InterviewRecord.has_audio_recording == filters["has_audio"]
                 )
 
-        # Подсчет общего количества
-        total = query.count()
+        total, total_is_estimate = count_rows(
+            self.session,
+            query.with_entities(InterviewRecord.id).statement,
+            estimate=estimate_total,
+        )
+
+        # Keyset пагинация по (interview_date, id); id делает порядок однозначным
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor, (datetime, str))
+            query = query.filter(
+                tuple_(InterviewRecord.interview_date, InterviewRecord.id)
+                < tuple_(cursor_date, cursor_id)
+            )
+        else:
+            query = query.offset((page - 1) * limit)
 
-        # Пагинация и сортировка
+        # Лишняя строка показывает, есть ли следующая страница, без COUNT
         interviews = (
-            query.order_by(desc(InterviewRecord.interview_date))
-            .offset((page - 1) * limit)
-            .limit(limit)
+            query.order_by(
+                desc(InterviewRecord.interview_date), desc(InterviewRecord.id)
+            )
+            .limit(limit + 1)
             .all()
         )
 
-        return interviews, total
+        next_cursor = None
+        if len(interviews) > limit:
+            interviews = interviews[:limit]
+            last = interviews[-1]
+            next_cursor = encode_cursor([last.interview_date, last.id])
+
+        return interviews, total, total_is_estimate, next_cursor
 
     def get_interview_by_id(self, interview_id: str) -> Optional[InterviewRecord]:
         """Получение интервью по ID"""
@@ -18,6 +18,8 @@ from app.features.interviews.dto.categories_responses import (
 from app.features.interviews.repositories.categories_repository import (
     CategoriesRepository,
 )
+from app.features.interviews.services.question_sampler import get_question_sampler
+from app.shared.database.pagination import decode_cursor, encode_cursor
 
 
 class CategoriesService:
@@ -89,17 +91,35 @@ class CategoriesService:
         ]
 
         # Получаем примеры вопросов
-        questions_data = self.repository.get_questions_by_category(
-            category_id=category_id, limit=limit_questions, random=True
+        sample_questions = self.get_random_questions(
+            category_id=category_id, count=limit_questions
         )
-        sample_questions = [
-            self._create_question_response(q) for q in questions_data
-        ]
 
         return CategoryDetailResponse(
             category=category, clusters=clusters, sample_questions=sample_questions
         )
 
+    def get_random_questions(
+        self,
+        category_id: str,
+        count: int = 10,
+        seed: Optional[int] = None,
+        user_id: Optional[int] = None,
+        no_repeat: bool = False,
+    ) -> List[QuestionResponse]:
+        """Случайные вопросы категории (seed - воспроизводимая выборка)"""
+        question_ids = get_question_sampler().sample(
+            self.session,
+            category_id,
+            count,
+            seed=seed,
+            user_id=user_id,
+            no_repeat=no_repeat,
+        )
+        questions_data = self.repository.get_questions_by_ids(question_ids)
+
+        return [self._create_question_response(q) for q in questions_data]
+
     def get_cluster_questions(
         self, cluster_id: int, page: int = 1, limit: int = 50
     ) -> List[QuestionResponse]:
@@ -120,40 +140,50 @@ class CategoriesService:
         companies: Optional[List[str]] = None,
         limit: int = 50,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        estimate_total: bool = False,
     ) -> QuestionsListResponse:
-        """Поиск вопросов с пагинацией"""
+        """Поиск вопросов с пагинацией (offset или курсор)"""
 
         # Получаем общее количество вопросов
-        total_count = self.repository.count_questions(
+        total_count, total_is_estimate = self.repository.count_questions(
             search_query=search_query,
             category_ids=category_ids,
             cluster_ids=cluster_ids,
             companies=companies,
+            estimate=estimate_total,
         )
 
-        # Получаем вопросы для текущей страницы
+        after_id = decode_cursor(cursor, (str,))[0] if cursor else None
+
+        # Лишняя строка показывает, есть ли следующая страница
         questions_data = self.repository.search_questions(
             search_query=search_query,
             category_ids=category_ids,
             cluster_ids=cluster_ids,
             companies=companies,
-            limit=limit,
+            limit=limit + 1,
             offset=offset,
+            after_id=after_id,
         )
+        has_next = len(questions_data) > limit
+        questions_data = questions_data[:limit]
 
         # Конвертируем в DTO
         questions = [self._create_question_response(q) for q in questions_data]
 
-        # Рассчитываем пагинацию
-        page = (offset // limit) + 1
-        has_next = (offset + limit) < total_count
+        next_cursor = None
+        if has_next and questions_data:
+            next_cursor = encode_cursor([questions_data[-1]["id"]])
 
         return QuestionsListResponse(
             questions=questions,
             total=total_count,
-            page=page,
+            page=(offset // limit) + 1,
             limit=limit,
             has_next=has_next,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate,
         )
 
     def get_statistics(self) -> CategoriesStatisticsResponse:
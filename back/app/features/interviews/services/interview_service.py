@@ -23,10 +23,22 @@ class InterviewService:
         self.repository = InterviewRepository(session)
 
     def get_interviews_list(
-        self, page: int = 1, limit: int = 20, filters: Optional[Dict[str, Any]] = None
+        self,
+        page: int = 1,
+        limit: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        estimate_total: bool = False,
     ) -> InterviewsListResponse:
         """Получение списка интервью с пагинацией"""
-        interviews, total = self.repository.get_interviews(page, limit, filters)
+        (
+            interviews,
+            total,
+            total_is_estimate,
+            next_cursor,
+        ) = self.repository.get_interviews(
+            page, limit, filters, cursor=cursor, estimate_total=estimate_total
+        )
 
         # Преобразование в DTO
         interview_responses = [
@@ -34,8 +46,8 @@ class InterviewService:
             for interview in interviews
         ]
 
-        has_next = page * limit < total
-        has_prev = page > 1
+        has_next = next_cursor is not None
+        has_prev = page > 1 or cursor is not None
 
         return InterviewsListResponse(
             interviews=interview_responses,
@@ -44,6 +56,8 @@ class InterviewService:
             limit=limit,
             has_next=has_next,
             has_prev=has_prev,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate,
         )
 
     def get_interview_by_id(
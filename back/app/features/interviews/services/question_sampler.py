@@ -0,0 +1,237 @@
+"""
+Случайная выборка вопросов интервью по категории
+
+Вместо ORDER BY RANDOM() (сортировка всей категории на каждый запрос)
+в памяти процесса держится индекс id вопросов по категориям; N вопросов
+выбираются за O(N), после чего строки загружаются по первичному ключу.
+
+- Индекс перестраивается после импорта (`bump_question_sampler_version`
+  увеличивает версию в Redis) и не реже раза в `question_sampler_max_age`.
+- С seed выборка детерминирована (воспроизводимые квизы).
+- no_repeat: вопросы, уже выданные пользователю в категории, исключаются,
+  пока категория не будет пройдена целиком; выданные id хранятся в Redis
+  `question_sampler_seen_ttl` секунд.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLER_VERSION_KEY = "question-sampler:version"
+SEEN_KEY_PREFIX = "question-sampler:seen"
+# Без Redis выданные вопросы помним в памяти для ограниченного числа пар
+MAX_LOCAL_SEEN_ENTRIES = 10000
+VERSION_CHECK_INTERVAL = 5.0
+
+
+class QuestionIdIndex:
+    """id вопросов по категориям одной версии"""
+
+    def __init__(self, version: str, ids_by_category: Dict[str, Tuple[str, ...]]):
+        self.version = version
+        self.ids_by_category = ids_by_category
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(cls, session: Session, version: str) -> "QuestionIdIndex":
+        started = time.monotonic()
+        rows = session.execute(
+            text(
+                """
+                SELECT category_id, ARRAY_AGG(id ORDER BY id) AS ids
+                FROM "InterviewQuestion"
+                WHERE category_id IS NOT NULL
+                GROUP BY category_id
+                """
+            )
+        ).fetchall()
+        index = cls(version, {row.category_id: tuple(row.ids) for row in rows})
+        logger.info(
+            f"Question sampler index v{version} built: {len(index.ids_by_category)} "
+            f"categories in {(time.monotonic() - started) * 1000:.0f} ms"
+        )
+        return index
+
+
+def sample_ids(
+    pool: Sequence[str], count: int, rng: random.Random, exclude: Set[str]
+) -> List[str]:
+    """
+    count случайных id из pool без повторов и без exclude
+
+    Пока исключенных не больше половины, используется выборка с отказами
+    (ожидаемо O(count)); иначе - выборка из отфильтрованного списка.
+    """
+    available = len(pool) - len(exclude)
+    count = min(count, max(available, 0))
+    if count <= 0:
+        return []
+    if not exclude:
+        return rng.sample(pool, count)
+    if len(exclude) <= len(pool) // 2:
+        picked: List[str] = []
+        chosen: Set[str] = set()
+        while len(picked) < count:
+            candidate = pool[rng.randrange(len(pool))]
+            if candidate in exclude or candidate in chosen:
+                continue
+            chosen.add(candidate)
+            picked.append(candidate)
+        return picked
+    return rng.sample([item for item in pool if item not in exclude], count)
+
+
+class QuestionSampler:
+    """Индекс id в памяти процесса и учет выданных пользователю вопросов"""
+
+    def __init__(self, redis_url: Optional[str], max_age: float, seen_ttl: int):
+        self.max_age = max_age
+        self.seen_ttl = seen_ttl
+        self._index: Optional[QuestionIdIndex] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._local_seen: "OrderedDict[Tuple[int, str], Set[str]]" = OrderedDict()
+        self._redis = None
+        if redis_url:
+            import redis
+
+            self._redis = redis.from_url(redis_url, decode_responses=True)
+
+    def _remote_version(self) -> Optional[str]:
+        if self._redis is None:
+            return None
+        try:
+            return self._redis.get(SAMPLER_VERSION_KEY) or "0"
+        except Exception as e:
+            logger.warning(f"Question sampler version check failed: {e}")
+            return None
+
+    def _is_stale(self, index: QuestionIdIndex, now: float) -> bool:
+        if now - index.built_at > self.max_age:
+            return True
+        if now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        remote = self._remote_version()
+        return remote is not None and remote != index.version
+
+    def get_index(self, session: Session) -> QuestionIdIndex:
+        now = time.monotonic()
+        index = self._index
+        if index is not None and not self._is_stale(index, now):
+            return index
+        with self._lock:
+            if self._index is not None and self._index.built_at >= now:
+                return self._index
+            version = self._remote_version() or "local"
+            self._index = QuestionIdIndex.build(session, version)
+            self._checked_at = time.monotonic()
+            return self._index
+
+    def invalidate(self) -> None:
+        self._index = None
+        if self._redis is not None:
+            try:
+                self._redis.incr(SAMPLER_VERSION_KEY)
+            except Exception as e:
+                logger.warning(f"Question sampler version bump failed: {e}")
+
+    def _get_seen(self, user_id: int, category_id: str) -> Set[str]:
+        if self._redis is not None:
+            try:
+                return set(
+                    self._redis.smembers(f"{SEEN_KEY_PREFIX}:{user_id}:{category_id}")
+                )
+            except Exception as e:
+                logger.warning(f"Question sampler seen lookup failed: {e}")
+                return set()
+        return set(self._local_seen.get((user_id, category_id), ()))
+
+    def _mark_seen(
+        self, user_id: int, category_id: str, ids: List[str], reset: bool
+    ) -> None:
+        if self._redis is not None:
+            key = f"{SEEN_KEY_PREFIX}:{user_id}:{category_id}"
+            try:
+                pipe = self._redis.pipeline()
+                if reset:
+                    pipe.delete(key)
+                if ids:
+                    pipe.sadd(key, *ids)
+                pipe.expire(key, self.seen_ttl)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Question sampler seen update failed: {e}")
+            return
+        with self._lock:
+            seen = (
+                set() if reset else self._local_seen.get((user_id, category_id), set())
+            )
+            seen.update(ids)
+            self._local_seen[(user_id, category_id)] = seen
+            self._local_seen.move_to_end((user_id, category_id))
+            while len(self._local_seen) > MAX_LOCAL_SEEN_ENTRIES:
+                self._local_seen.popitem(last=False)
+
+    def sample(
+        self,
+        session: Session,
+        category_id: str,
+        count: int,
+        seed: Optional[int] = None,
+        user_id: Optional[int] = None,
+        no_repeat: bool = False,
+    ) -> List[str]:
+        """id случайных вопросов категории в порядке выборки"""
+        pool = self.get_index(session).ids_by_category.get(category_id, ())
+        if not pool:
+            return []
+
+        rng = random.Random(seed)
+        track = no_repeat and user_id is not None
+        seen = self._get_seen(user_id, category_id) if track else set()
+
+        ids = sample_ids(pool, count, rng, seen)
+        if not track:
+            return ids
+
+        # Категория пройдена: добираем недостающее из нового круга
+        reset = len(ids) < min(count, len(pool))
+        if reset:
+            next_round = sample_ids(pool, count - len(ids), rng, set(ids))
+            ids += next_round
+            self._mark_seen(user_id, category_id, next_round, reset=True)
+        else:
+            self._mark_seen(user_id, category_id, ids, reset=False)
+        return ids
+
+
+_sampler: Optional[QuestionSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_question_sampler() -> QuestionSampler:
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = QuestionSampler(
+                redis_url=settings.redis_url,
+                max_age=settings.question_sampler_max_age,
+                seen_ttl=settings.question_sampler_seen_ttl,
+            )
+        return _sampler
+
+
+def bump_question_sampler_version() -> None:
+    """Вызывать после импорта вопросов интервью"""
+    get_question_sampler().invalidate()
@@ -2,9 +2,8 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.features.mindmap.config import (
@@ -16,7 +15,7 @@ from app.features.mindmap.config import (
 from app.features.mindmap.utils.enums import CodeLanguage
 from app.features.mindmap.utils.query_builder import ContentQueryBuilder
 from app.features.mindmap.utils.progress_calculator import ProgressCalculator
-from app.shared.models.content_models import ContentBlock, ContentFile
+from app.shared.models.content_models import ContentBlock
 from app.shared.models.content_models import UserContentProgress
 
 logger = logging.getLogger(__name__)
@@ -56,6 +55,13 @@ class MindMapRepositoryInterface(ABC):
         """Получить прогресс пользователя по теме"""
         pass
 
+    @abstractmethod
+    def get_technology_progress(
+        self, user_id: int, technology: str
+    ) -> Optional[Dict[str, Any]]:
+        """Получить общий прогресс и прогресс по всем темам технологии"""
+        pass
+
     @abstractmethod
     def get_topic_tasks(
         self,
@@ -233,6 +239,64 @@ class MindMapRepository(MindMapRepositoryInterface):
             logger.error(f"Ошибка при получении прогресса по топику: {e}")
             return None
 
+    def get_technology_progress(
+        self, user_id: int, technology: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Получить общий прогресс и прогресс по всем темам технологии
+
+        Один GROUP BY запрос по (категория, подкатегория) вместо пары
+        запросов на каждую тему.
+        """
+        logger.info(
+            f"Получение прогресса пользователя {user_id} по технологии {technology}"
+        )
+
+        try:
+            tech_center = self.get_technology_center(technology)
+            if not tech_center:
+                return None
+
+            topics = self.get_technology_topics(technology)
+            main_category = tech_center["main_category"]
+            counts = ContentQueryBuilder.count_tasks_by_category(
+                self.session,
+                user_id,
+                [main_category] + [topic["main_category"] for topic in topics],
+            )
+
+            # Итоги по основной категории (тема без подкатегории - вся категория)
+            main_totals: Dict[str, Tuple[int, int]] = {}
+            for (main, _), (total, completed) in counts.items():
+                main_total, main_completed = main_totals.get(main, (0, 0))
+                main_totals[main] = (main_total + total, main_completed + completed)
+
+            topics_progress = {}
+            for topic in topics:
+                topic_main = topic["main_category"].lower()
+                if topic["sub_category"]:
+                    key = (topic_main, topic["sub_category"].lower())
+                    total, completed = counts.get(key, (0, 0))
+                else:
+                    total, completed = main_totals.get(topic_main, (0, 0))
+                topics_progress[topic["key"]] = ProgressCalculator.build_progress_dict(
+                    total, completed
+                )
+
+            overall_total, overall_completed = main_totals.get(
+                main_category.lower(), (0, 0)
+            )
+            return {
+                "overall": ProgressCalculator.build_progress_dict(
+                    overall_total, overall_completed
+                ),
+                "topics": topics_progress,
+            }
+
+        except Exception as e:
+            logger.error(f"Ошибка при получении прогресса по технологии: {e}")
+            return None
+
     def get_topic_tasks(
         self,
         topic_key: str,
@@ -354,34 +418,14 @@ class MindMapRepository(MindMapRepositoryInterface):
             sub_category = topic_config["sub_category"]
 
             # Общее количество задач
-            total_tasks = (
-                self.session.query(func.count(ContentBlock.id))
-                .join(ContentFile, ContentBlock.fileId == ContentFile.id)
-                .filter(
-                    ContentBlock.codeContent.isnot(None),
-                    func.lower(ContentFile.mainCategory) == func.lower(main_category),
-                    func.lower(ContentFile.subCategory) == func.lower(sub_category),
-                )
-                .scalar()
-                or 0
+            total_tasks = ContentQueryBuilder.count_total_tasks(
+                self.session, main_category, sub_category
             )
 
             completed_tasks = 0
             if user_id:
-                completed_tasks = (
-                    self.session.query(func.count(UserContentProgress.id))
-                    .join(ContentBlock, UserContentProgress.blockId == ContentBlock.id)
-                    .join(ContentFile, ContentBlock.fileId == ContentFile.id)
-                    .filter(
-                        UserContentProgress.userId == user_id,
-                        UserContentProgress.solvedCount > 0,
-                        ContentBlock.codeContent.isnot(None),
-                        func.lower(ContentFile.mainCategory)
-                        == func.lower(main_category),
-                        func.lower(ContentFile.subCategory) == func.lower(sub_category),
-                    )
-                    .scalar()
-                    or 0
+                completed_tasks = ContentQueryBuilder.count_completed_tasks(
+                    self.session, user_id, main_category, sub_category
                 )
 
             completion_rate = (
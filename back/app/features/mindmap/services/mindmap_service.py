@@ -62,12 +62,16 @@ class MindMapService:
             if not tech_center:
                 raise TechnologyNotSupportedError(technology)
 
-            # Получаем общий прогресс пользователя если авторизован
+            # Прогресс пользователя по технологии и всем темам одним запросом
             overall_progress = None
+            topics_progress = {}
             if user_id:
-                overall_progress = self.mindmap_repository.get_overall_progress(
+                technology_progress = self.mindmap_repository.get_technology_progress(
                     user_id, technology
                 )
+                if technology_progress:
+                    overall_progress = technology_progress["overall"]
+                    topics_progress = technology_progress["topics"]
 
             # Получаем топики для технологии
             all_topics = self.mindmap_repository.get_technology_topics(technology)
@@ -112,12 +116,7 @@ class MindMapService:
                 x = CENTER_X + RADIUS * math.cos(angle)
                 y = CENTER_Y + RADIUS * math.sin(angle)
 
-                # Получаем прогресс по теме если пользователь авторизован
-                topic_progress = None
-                if user_id:
-                    topic_progress = self.mindmap_repository.get_topic_progress(
-                        user_id, topic["key"], technology
-                    )
+                topic_progress = topics_progress.get(topic["key"])
 
                 # Создаем узел топика
                 topic_node = MindMapNodeResponse(
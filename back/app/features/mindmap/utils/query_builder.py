@@ -1,8 +1,9 @@
 """Общие утилиты для построения SQL запросов"""
 
-from typing import Optional, List, Dict
-from sqlalchemy import func
+from typing import Optional, List, Dict, Iterable, Tuple
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Query, Session
+from app.shared.catalog import get_catalog_snapshot
 from app.shared.models.content_models import ContentBlock, ContentFile
 from app.shared.models.content_models import UserContentProgress
 
@@ -59,19 +60,16 @@ class ContentQueryBuilder:
         sub_category: Optional[str] = None
     ) -> int:
         """Подсчет выполненных задач пользователем"""
-        query = (
-            session.query(func.count(UserContentProgress.id))
-            .join(ContentBlock, UserContentProgress.blockId == ContentBlock.id)
-            .join(ContentFile, ContentBlock.fileId == ContentFile.id)
-            .filter(
+        solved_block_ids = [
+            block_id
+            for (block_id,) in session.query(UserContentProgress.blockId).filter(
                 UserContentProgress.userId == user_id,
                 UserContentProgress.solvedCount > 0,
-                ContentBlock.codeContent.isnot(None)
             )
+        ]
+        return get_catalog_snapshot(session).count_code_tasks_in(
+            solved_block_ids, main_category, sub_category
         )
-        
-        query = ContentQueryBuilder.filter_by_category(query, main_category, sub_category)
-        return query.scalar() or 0
 
     @staticmethod
     def count_total_tasks(
@@ -80,14 +78,52 @@ class ContentQueryBuilder:
         sub_category: Optional[str] = None
     ) -> int:
         """Подсчет общего количества задач"""
-        query = (
-            session.query(func.count(ContentBlock.id))
+        return get_catalog_snapshot(session).count_code_tasks(
+            main_category, sub_category
+        )
+
+    @staticmethod
+    def count_tasks_by_category(
+        session: Session,
+        user_id: int,
+        main_categories: Iterable[str]
+    ) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        """
+        Всего и выполнено задач с кодом по (категория, подкатегория) одним
+        GROUP BY запросом; ключи в нижнем регистре
+        """
+        main_keys = {category.lower() for category in main_categories if category}
+        if not main_keys:
+            return {}
+
+        main_key = func.lower(ContentFile.mainCategory)
+        sub_key = func.lower(ContentFile.subCategory)
+        rows = (
+            session.query(
+                main_key,
+                sub_key,
+                func.count(ContentBlock.id),
+                func.count(func.distinct(UserContentProgress.blockId)),
+            )
+            .select_from(ContentBlock)
             .join(ContentFile, ContentBlock.fileId == ContentFile.id)
-            .filter(ContentBlock.codeContent.isnot(None))
+            .outerjoin(
+                UserContentProgress,
+                and_(
+                    UserContentProgress.blockId == ContentBlock.id,
+                    UserContentProgress.userId == user_id,
+                    UserContentProgress.solvedCount > 0,
+                ),
+            )
+            .filter(ContentBlock.codeContent.isnot(None), main_key.in_(main_keys))
+            .group_by(main_key, sub_key)
+            .all()
         )
-        
-        query = ContentQueryBuilder.filter_by_category(query, main_category, sub_category)
-        return query.scalar() or 0
+
+        return {
+            (main, sub or ""): (total, completed)
+            for main, sub, total, completed in rows
+        }
 
     @staticmethod
     def get_bulk_user_progress(
@@ -0,0 +1,18 @@
+"""
+Search Feature - полнотекстовый поиск по контенту.
+
+Ранжированный поиск (tsvector + pg_trgm) по блокам контента, карточкам
+теории, интервью и вопросам интервью с подсветкой совпадений.
+"""
+
+from app.features.search.repositories.search_repository import SearchRepository
+from app.features.search.services.search_service import SearchService
+
+# Router импортируется напрямую в main.py для избежания циклических импортов
+
+__all__ = [
+    # Services
+    "SearchService",
+    # Repositories
+    "SearchRepository",
+]
@@ -0,0 +1,7 @@
+"""API роутеры search feature"""
+
+from .search_router import router
+
+__all__ = [
+    "router",
+]
@@ -0,0 +1,32 @@
+"""API роутер полнотекстового поиска"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.features.search.dto.responses import SearchResponse
+from app.features.search.repositories.search_repository import SearchRepository
+from app.features.search.services.search_service import SearchService
+from app.shared.database import get_session
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+def get_search_service(db: Session = Depends(get_session)) -> SearchService:
+    """Зависимость для получения сервиса поиска"""
+    return SearchService(SearchRepository(db))
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(..., description="Поисковый запрос (websearch синтаксис)"),
+    sources: Optional[List[str]] = Query(
+        None, description="Источники: content, theory, interviews, questions"
+    ),
+    limit: int = Query(20, ge=1, le=100, description="Количество результатов"),
+    offset: int = Query(0, ge=0, le=500, description="Смещение"),
+    search_service: SearchService = Depends(get_search_service),
+):
+    """Поиск по блокам, теории, интервью и вопросам с ранжированием и подсветкой"""
+    return search_service.search(q, sources=sources, limit=limit, offset=offset)
@@ -0,0 +1,8 @@
+"""DTO search feature"""
+
+from .responses import SearchHitResponse, SearchResponse
+
+__all__ = [
+    "SearchHitResponse",
+    "SearchResponse",
+]
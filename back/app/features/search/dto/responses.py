@@ -0,0 +1,26 @@
+"""DTO ответов полнотекстового поиска"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHitResponse(BaseModel):
+    """Найденный документ"""
+
+    source: str
+    id: str
+    title: str
+    snippet: str
+    rank: float
+    category: Optional[str] = None
+    subCategory: Optional[str] = None
+
+
+class SearchResponse(BaseModel):
+    """Результаты поиска, отсортированные по релевантности"""
+
+    query: str
+    sources: List[str]
+    results: List[SearchHitResponse]
+    tookMs: float
@@ -0,0 +1,8 @@
+"""Исключения search feature"""
+
+from .search_exceptions import SearchQueryError, SearchUnavailableError
+
+__all__ = [
+    "SearchQueryError",
+    "SearchUnavailableError",
+]
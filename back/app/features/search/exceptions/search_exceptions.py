@@ -0,0 +1,25 @@
+"""Исключения для полнотекстового поиска"""
+
+from fastapi import status
+
+from app.shared.exceptions.base import BaseAppException, ValidationException
+
+
+class SearchUnavailableError(BaseAppException):
+    """Полнотекстовый поиск выключен (миграция не применена)"""
+
+    def __init__(self):
+        message = "Полнотекстовый поиск недоступен"
+        super().__init__(
+            message=message,
+            error_code="SEARCH_UNAVAILABLE",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            user_message=message,
+        )
+
+
+class SearchQueryError(ValidationException):
+    """Некорректный поисковый запрос"""
+
+    def __init__(self, message: str, value: str = None):
+        super().__init__(message=message, field="q", value=value)
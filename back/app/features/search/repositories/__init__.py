@@ -0,0 +1,7 @@
+"""Репозитории search feature"""
+
+from .search_repository import SearchRepository
+
+__all__ = [
+    "SearchRepository",
+]
@@ -0,0 +1,138 @@
+"""Репозиторий полнотекстового поиска по всем видам контента"""
+
+import logging
+from typing import Dict, List
+
+from sqlalchemy import String, Text, cast, column, func, select, table
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from app.shared.models.content_models import ContentBlock, ContentFile
+from app.shared.models.interview_models import InterviewRecord
+from app.shared.models.theory_models import TheoryCard
+from app.shared.search import search_headline, search_rank, text_search_condition
+
+logger = logging.getLogger(__name__)
+
+# Таблица вопросов без ORM модели (см. QuestionQueryBuilder)
+interview_question = table(
+    "InterviewQuestion",
+    column("id", String),
+    column("question_text", Text),
+    column("topic_name", String),
+    column("category_id", String),
+    column("company", String),
+    column("searchVector", TSVECTOR),
+)
+
+
+class SearchRepository:
+    """Ранжированный поиск по блокам, карточкам теории, интервью и вопросам"""
+
+    SOURCES = ("content", "theory", "interviews", "questions")
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def search(self, query: str, sources: List[str], limit: int) -> List[Dict]:
+        """Лучшие `limit` совпадений из каждого источника"""
+        hits = []
+        for source in sources:
+            statement = getattr(self, f"_{source}_query")(query, limit)
+            rows = self.session.execute(statement).all()
+            hits.extend(
+                {
+                    "source": source,
+                    "id": str(row.id),
+                    "title": row.title or "",
+                    "snippet": row.snippet or "",
+                    "category": row.category,
+                    "subCategory": row.sub_category,
+                    "rank": float(row.rank or 0.0),
+                }
+                for row in rows
+            )
+        return hits
+
+    @staticmethod
+    def _with_headline(statement, query: str, limit: int):
+        """ts_headline считается только для отобранных строк, а не для всех совпадений"""
+        ranked = statement.order_by(column("rank").desc()).limit(limit).subquery()
+        return select(
+            ranked.c.id,
+            ranked.c.title,
+            search_headline(ranked.c.body, query).label("snippet"),
+            ranked.c.category,
+            ranked.c.sub_category,
+            ranked.c.rank,
+        ).order_by(ranked.c.rank.desc())
+
+    def _content_query(self, query: str, limit: int):
+        vector = ContentBlock.searchVector
+        statement = (
+            select(
+                ContentBlock.id,
+                ContentBlock.blockTitle.label("title"),
+                func.coalesce(ContentBlock.textContent, ContentBlock.codeContent).label(
+                    "body"
+                ),
+                ContentFile.mainCategory.label("category"),
+                ContentFile.subCategory.label("sub_category"),
+                search_rank(vector, query, ContentBlock.blockTitle).label("rank"),
+            )
+            .join(ContentFile, ContentBlock.fileId == ContentFile.id)
+            .where(
+                text_search_condition(
+                    vector, query, fuzzy_columns=[ContentBlock.blockTitle]
+                )
+            )
+        )
+        return self._with_headline(statement, query, limit)
+
+    def _theory_query(self, query: str, limit: int):
+        vector = TheoryCard.searchVector
+        statement = select(
+            TheoryCard.id,
+            TheoryCard.questionBlock.label("title"),
+            TheoryCard.answerBlock.label("body"),
+            TheoryCard.category.label("category"),
+            TheoryCard.subCategory.label("sub_category"),
+            search_rank(vector, query, TheoryCard.questionBlock).label("rank"),
+        ).where(
+            text_search_condition(
+                vector, query, fuzzy_columns=[TheoryCard.questionBlock]
+            )
+        )
+        return self._with_headline(statement, query, limit)
+
+    def _interviews_query(self, query: str, limit: int):
+        vector = InterviewRecord.searchVector
+        statement = select(
+            InterviewRecord.id,
+            InterviewRecord.company_name.label("title"),
+            InterviewRecord.full_content.label("body"),
+            InterviewRecord.position.label("category"),
+            cast(None, String).label("sub_category"),
+            search_rank(vector, query, InterviewRecord.company_name).label("rank"),
+        ).where(
+            text_search_condition(
+                vector, query, fuzzy_columns=[InterviewRecord.company_name]
+            )
+        )
+        return self._with_headline(statement, query, limit)
+
+    def _questions_query(self, query: str, limit: int):
+        q = interview_question.c
+        statement = select(
+            q.id,
+            q.question_text.label("title"),
+            q.question_text.label("body"),
+            q.category_id.label("category"),
+            q.topic_name.label("sub_category"),
+            search_rank(q.searchVector, query, q.question_text).label("rank"),
+        ).where(
+            text_search_condition(
+                q.searchVector, query, fuzzy_columns=[q.question_text]
+            )
+        )
+        return self._with_headline(statement, query, limit)
@@ -0,0 +1,7 @@
+"""Сервисы search feature"""
+
+from .search_service import SearchService
+
+__all__ = [
+    "SearchService",
+]
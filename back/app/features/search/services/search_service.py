@@ -0,0 +1,67 @@
+"""Сервис полнотекстового поиска"""
+
+import logging
+import time
+from typing import List, Optional
+
+from app.features.search.dto.responses import SearchHitResponse, SearchResponse
+from app.features.search.exceptions import SearchQueryError, SearchUnavailableError
+from app.features.search.repositories.search_repository import SearchRepository
+from app.shared.search import is_fulltext_enabled, normalize_query
+
+logger = logging.getLogger(__name__)
+
+MIN_QUERY_LENGTH = 2
+MAX_QUERY_LENGTH = 200
+
+
+class SearchService:
+    """Объединяет результаты источников в одну выдачу по релевантности"""
+
+    def __init__(self, search_repository: SearchRepository):
+        self.search_repository = search_repository
+
+    def search(
+        self,
+        query: str,
+        sources: Optional[List[str]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchResponse:
+        if not is_fulltext_enabled():
+            raise SearchUnavailableError()
+
+        query = normalize_query(query)
+        if not query or len(query) < MIN_QUERY_LENGTH:
+            raise SearchQueryError(
+                f"Запрос должен содержать минимум {MIN_QUERY_LENGTH} символа", query
+            )
+        if len(query) > MAX_QUERY_LENGTH:
+            raise SearchQueryError(
+                f"Запрос не длиннее {MAX_QUERY_LENGTH} символов", query[:50]
+            )
+
+        sources = sources or list(SearchRepository.SOURCES)
+        unknown = [s for s in sources if s not in SearchRepository.SOURCES]
+        if unknown:
+            raise SearchQueryError(
+                f"Неизвестные источники: {', '.join(unknown)}", ",".join(unknown)
+            )
+
+        started = time.perf_counter()
+        # Каждому источнику достаточно offset + limit лучших строк
+        hits = self.search_repository.search(query, sources, offset + limit)
+        hits.sort(key=lambda hit: hit["rank"], reverse=True)
+        took_ms = (time.perf_counter() - started) * 1000
+
+        logger.debug(
+            "Full-text search",
+            extra={"query": query, "sources": sources, "hits": len(hits)},
+        )
+
+        return SearchResponse(
+            query=query,
+            sources=sources,
+            results=[SearchHitResponse(**hit) for hit in hits[offset : offset + limit]],
+            tookMs=round(took_ms, 2),
+        )
@@ -1,15 +1,19 @@
 """Репозиторий для работы со статистикой"""
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
+from sqlalchemy import text
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.settings import settings
 from app.features.stats.exceptions.stats_exceptions import (
     StatsCalculationError,
 )
+from app.shared.catalog import get_catalog_snapshot
 from app.shared.models.content_models import ContentBlock, ContentFile
 from app.shared.models.content_models import UserContentProgress
+from app.shared.models.progress_models import UserStatsRollup
 from app.shared.models.theory_models import (
     TheoryCard,
     UserTheoryProgress,
@@ -17,6 +21,29 @@ from app.shared.models.theory_models import (
 
 logger = logging.getLogger(__name__)
 
+ROLLUP_CONTENT = "content"
+ROLLUP_THEORY = "theory"
+
+# Полный пересчет rollup по текущему прогрессу (триггеры поддерживают его
+# инкрементально, пересчет нужен после импорта с переносом категорий)
+_REBUILD_ROLLUP_SQL = """
+    INSERT INTO "UserStatsRollup"
+        ("userId", "itemType", "mainCategory", "subCategory", "completedCount", "updatedAt")
+    SELECT p."userId", 'content', f."mainCategory", f."subCategory", COUNT(*), now()
+    FROM "UserContentProgress" p
+    JOIN "ContentBlock" b ON b.id = p."blockId"
+    JOIN "ContentFile" f ON f.id = b."fileId"
+    WHERE p."solvedCount" > 0 AND (:user_id IS NULL OR p."userId" = :user_id)
+    GROUP BY p."userId", f."mainCategory", f."subCategory"
+    UNION ALL
+    SELECT p."userId", 'theory', c.category, COALESCE(c."subCategory", 'General'),
+           COUNT(*), now()
+    FROM "UserTheoryProgress" p
+    JOIN "TheoryCard" c ON c.id = p."cardId"
+    WHERE p."reviewCount" > 0 AND (:user_id IS NULL OR p."userId" = :user_id)
+    GROUP BY p."userId", c.category, COALESCE(c."subCategory", 'General')
+"""
+
 
 class StatsRepository:
     """Репозиторий для работы со статистикой"""
@@ -66,6 +93,8 @@ class StatsRepository:
 
     async def _get_content_overview_stats(self, user_id: int) -> Dict[str, Any]:
         """Получение обзорной статистики контента"""
+        if settings.stats_rollups_enabled:
+            return self._get_rollup_overview_stats(user_id, ROLLUP_CONTENT)
 
         # Получаем все блоки контента
         content_blocks = (
@@ -151,6 +180,8 @@ class StatsRepository:
 
     async def _get_theory_overview_stats(self, user_id: int) -> Dict[str, Any]:
         """Получение обзорной статистики теории"""
+        if settings.stats_rollups_enabled:
+            return self._get_rollup_overview_stats(user_id, ROLLUP_THEORY)
 
         # Получаем все карточки теории
         theory_cards = (
@@ -236,6 +267,89 @@ class StatsRepository:
             "detailed": stats_by_category,
         }
 
+    def _get_catalog_totals(self, item_type: str) -> Dict[Tuple[str, str], int]:
+        """Количество элементов каталога по (категория, подкатегория)"""
+        snapshot = get_catalog_snapshot(self.session)
+        if item_type == ROLLUP_CONTENT:
+            return snapshot.content_totals
+        return snapshot.theory_totals
+
+    def _get_rollup_completed(
+        self, user_id: int, item_type: str
+    ) -> Dict[Tuple[str, str], int]:
+        """Пройденные пользователем элементы из UserStatsRollup"""
+        rows = (
+            self.session.query(
+                UserStatsRollup.mainCategory,
+                UserStatsRollup.subCategory,
+                UserStatsRollup.completedCount,
+            )
+            .filter(
+                UserStatsRollup.userId == user_id,
+                UserStatsRollup.itemType == item_type,
+                UserStatsRollup.completedCount > 0,
+            )
+            .all()
+        )
+        return {(category, sub): completed for category, sub, completed in rows}
+
+    def _get_rollup_overview_stats(
+        self, user_id: int, item_type: str
+    ) -> Dict[str, Any]:
+        """Обзорная статистика по rollup: итоги каталога + счетчики пользователя"""
+        totals = self._get_catalog_totals(item_type)
+        completed_by_key = self._get_rollup_completed(user_id, item_type)
+
+        stats_by_category = {}
+        total_items = 0
+        completed_items = 0
+
+        for (category, sub_category), total in totals.items():
+            # Категории без элементов в каталоге (удаленные) не учитываются
+            completed = min(completed_by_key.get((category, sub_category), 0), total)
+
+            category_data = stats_by_category.setdefault(
+                category,
+                {"total": 0, "completed": 0, "percentage": 0, "subCategories": {}},
+            )
+            category_data["total"] += total
+            category_data["completed"] += completed
+            category_data["subCategories"][sub_category] = {
+                "total": total,
+                "completed": completed,
+                "percentage": round(completed / total * 100, 2) if total > 0 else 0,
+            }
+
+            total_items += total
+            completed_items += completed
+
+        for category_data in stats_by_category.values():
+            if category_data["total"] > 0:
+                category_data["percentage"] = round(
+                    category_data["completed"] / category_data["total"] * 100, 2
+                )
+
+        return {
+            "total": total_items,
+            "completed": completed_items,
+            "percentage": round(
+                (completed_items / total_items * 100) if total_items > 0 else 0, 2
+            ),
+            "detailed": stats_by_category,
+        }
+
+    def rebuild_rollups(self, user_id: Optional[int] = None) -> int:
+        """Пересчитать UserStatsRollup (для пользователя или для всех)"""
+        delete_query = self.session.query(UserStatsRollup)
+        if user_id is not None:
+            delete_query = delete_query.filter(UserStatsRollup.userId == user_id)
+        delete_query.delete(synchronize_session=False)
+
+        result = self.session.execute(text(_REBUILD_ROLLUP_SQL), {"user_id": user_id})
+        self.session.commit()
+        logger.info(f"Пересчитано строк UserStatsRollup: {result.rowcount}")
+        return result.rowcount
+
     async def get_content_stats(self, user_id: int) -> Dict[str, Any]:
         """Получение детальной статистики по контенту"""
         logger.info(
@@ -3,7 +3,7 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.features.task.dto.requests import (
@@ -14,6 +14,7 @@ from app.features.task.dto.responses import (
     TaskAttemptResponse,
     TaskCategoriesResponse,
     TaskCompaniesResponse,
+    TaskFacetsResponse,
     TasksListResponse,
     TaskSolutionResponse,
 )
@@ -39,7 +40,6 @@ def get_task_service(db: Session = Depends(get_session)) -> TaskService:
 
 @router.get("/items", response_model=TasksListResponse)
 async def get_task_items(
-    request: Request,  # Добавляем request для отладки
     page: int = Query(1, ge=1, description="Номер страницы"),
     limit: int = Query(
         10, ge=1, le=100, description="Количество элементов на странице"
@@ -61,26 +61,20 @@ async def get_task_items(
     companiesList: List[str] = Query(
         [], description="Фильтр по компаниям (множественный)"
     ),
+    cursor: Optional[str] = Query(
+        None, description="Курсор следующей страницы (pagination.nextCursor)"
+    ),
     current_user=Depends(get_current_user_optional),
     task_service: TaskService = Depends(get_task_service),
 ):
     """Получение объединенного списка задач (content blocks + quiz карточки)"""
     user_id = current_user.id if current_user else None
 
-    # 🔍 ENHANCED DEBUG LOGGING
-    session_id = request.cookies.get("session_id")
-    logger.info(
-        "🔍 DEBUG: get_task_items called",
-        extra={
-            "current_user": current_user is not None,
-            "user_id": user_id,
-            "user_email": current_user.email if current_user else None,
-            "session_id": session_id[:10] + "..." if session_id else None,
-            "cookies": dict(request.cookies),
-            "page": page,
-            "limit": limit,
-        },
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "get_task_items called",
+            extra={"user_id": user_id, "page": page, "limit": limit},
+        )
 
     # Объединяем companies и companiesList
     final_companies = list(companiesList) if companiesList else []
@@ -102,22 +96,20 @@ async def get_task_items(
         only_unsolved=onlyUnsolved,
         companies=final_companies if final_companies else None,
         user_id=user_id,
+        cursor=cursor,
     )
 
-    # 🔍 DEBUG: Log result details
-    if result.data:
-        sample_tasks = result.data[:3]  # First 3 tasks
-        logger.info(
-            f"🔍 DEBUG: Returning {len(result.data)} tasks",
+    if result.data and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Returning {len(result.data)} tasks",
             extra={
                 "user_id": user_id,
                 "sample_progress": [
                     {
                         "task_id": task.id[:10] + "...",
-                        "title": task.title[:20] + "...",
                         "currentUserSolvedCount": task.currentUserSolvedCount,
                     }
-                    for task in sample_tasks
+                    for task in result.data[:3]
                 ],
             },
         )
@@ -144,6 +136,35 @@ async def get_companies(
     )
 
 
+@router.get("/facets", response_model=TaskFacetsResponse)
+async def get_task_facets(
+    mainCategories: List[str] = Query(
+        [], description="Фильтр по основным категориям (множественный)"
+    ),
+    subCategories: List[str] = Query([], description="Подкатегории (множественный)"),
+    q: Optional[str] = Query(None, description="Полнотекстовый поиск"),
+    itemType: Optional[str] = Query(
+        None, description="Тип: content_block, theory_quiz или all"
+    ),
+    onlyUnsolved: Optional[bool] = Query(None, description="Только нерешенные"),
+    companiesList: List[str] = Query(
+        [], description="Фильтр по компаниям (множественный)"
+    ),
+    current_user=Depends(get_current_user_optional),
+    task_service: TaskService = Depends(get_task_service),
+):
+    """Количество заданий по категориям и компаниям для текущих фильтров"""
+    return await task_service.get_task_facets(
+        main_categories=mainCategories if mainCategories else None,
+        sub_categories=subCategories if subCategories else None,
+        search_query=q,
+        item_type=itemType,
+        only_unsolved=onlyUnsolved,
+        companies=companiesList if companiesList else None,
+        user_id=current_user.id if current_user else None,
+    )
+
+
 # Дополнительные endpoints для работы с попытками и решениями
 
 
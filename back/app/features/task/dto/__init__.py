@@ -9,12 +9,15 @@ from .responses import (
     FileResponse,
     TaskAttemptResponse,
     TaskCategoriesResponse,
+    TaskCategoryFacetResponse,
     TaskCategoryResponse,
     TaskCompaniesResponse,
     TaskCompanyResponse,
+    TaskFacetsResponse,
     TaskResponse,
     TasksListResponse,
     TaskSolutionResponse,
+    TaskSubCategoryFacetResponse,
 )
 
 __all__ = [
@@ -29,6 +32,9 @@ __all__ = [
     "TaskCategoriesResponse",
     "TaskCompanyResponse",
     "TaskCompaniesResponse",
+    "TaskSubCategoryFacetResponse",
+    "TaskCategoryFacetResponse",
+    "TaskFacetsResponse",
     "TaskAttemptResponse",
     "TaskSolutionResponse",
     "FileResponse",
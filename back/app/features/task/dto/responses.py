@@ -66,7 +66,14 @@ class TasksListResponse(BaseModel):
     pagination: Dict[str, Any]
 
     @classmethod
-    def create(cls, tasks: List[TaskResponse], total: int, page: int, limit: int):
+    def create(
+        cls,
+        tasks: List[TaskResponse],
+        total: int,
+        page: int,
+        limit: int,
+        next_cursor: Optional[str] = None,
+    ):
         pagination = {
             "page": page,
             "limit": limit,
@@ -74,6 +81,7 @@ class TasksListResponse(BaseModel):
             "totalPages": (total + limit - 1) // limit,
             "hasNext": page * limit < total,
             "hasPrev": page > 1,
+            "nextCursor": next_cursor,
         }
 
         return cls(data=tasks, pagination=pagination)
@@ -120,6 +128,31 @@ class TaskCompaniesResponse(BaseModel):
         from_attributes = True
 
 
+class TaskSubCategoryFacetResponse(BaseModel):
+    """Количество заданий в подкатегории"""
+
+    name: str
+    count: int
+
+
+class TaskCategoryFacetResponse(BaseModel):
+    """Количество заданий в категории с разбивкой по подкатегориям"""
+
+    name: str
+    count: int
+    contentBlockCount: int = 0
+    theoryQuizCount: int = 0
+    subCategories: List[TaskSubCategoryFacetResponse] = []
+
+
+class TaskFacetsResponse(BaseModel):
+    """Фасеты фильтров: категории и компании с учетом текущих фильтров"""
+
+    categories: List[TaskCategoryFacetResponse]
+    companies: List[TaskCompanyResponse]
+    total: int
+
+
 class TaskAttemptResponse(BaseModel):
     """Ответ с информацией о попытке решения"""
 
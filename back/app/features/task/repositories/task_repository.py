@@ -1,27 +1,63 @@
 """Репозиторий для работы с заданиями - DEPRECATED - используйте TaskAggregatorService"""
 
+import base64
 import html
+import json
 import logging
 from datetime import datetime
 from typing import List, Optional, Tuple
 from uuid import uuid4
 
-from sqlalchemy import func, or_
+from sqlalchemy import Integer, String, func, literal, or_, select, tuple_, union_all
 from sqlalchemy.orm import Session, joinedload
 
 from app.features.task.dto.responses import (
     TaskCategoryResponse as TaskCategory,
     TaskCompanyResponse as TaskCompany,
 )
+from app.features.task.exceptions.task_exceptions import TaskValidationError
 from app.features.task.repositories.task_attempt_repository import TaskAttemptRepository
+from app.shared.catalog import get_catalog_snapshot
 from app.shared.models.content_models import ContentBlock, ContentFile
 from app.shared.schemas.progress import TaskAttempt, TaskSolution
 from app.shared.schemas.task import Task
 from app.shared.models.content_models import UserContentProgress
+from app.shared.models.enums import CodeLanguage
 from app.shared.models.theory_models import TheoryCard, UserTheoryProgress
+from app.shared.search import text_search_condition
 
 logger = logging.getLogger(__name__)
 
+# Мапинг языков программирования
+_CODE_LANGUAGE_MAPPING = {
+    "js": "JAVASCRIPT",
+    "javascript": "JAVASCRIPT",
+    "ts": "TYPESCRIPT",
+    "typescript": "TYPESCRIPT",
+    "py": "PYTHON",
+    "python": "PYTHON",
+    "java": "JAVA",
+    "cpp": "CPP",
+    "c++": "CPP",
+    "c": "C",
+    "go": "GO",
+    "rust": "RUST",
+    "php": "PHP",
+    "ruby": "RUBY",
+    "rb": "RUBY",
+}
+
+# Колонки сортировки в общей проекции заданий; последний ключ (id) делает
+# порядок однозначным для keyset пагинации
+_DEFAULT_SORT = ("type_rank", "sort_path", "position", "id")
+_TASK_SORT_KEYS = {
+    "orderInFile": _DEFAULT_SORT,
+    "orderIndex": _DEFAULT_SORT,
+    "title": ("title", "type_rank", "id"),
+    "category": ("main_category", "type_rank", "sort_path", "position", "id"),
+    "createdAt": ("created_at", "type_rank", "id"),
+}
+
 
 class TaskRepository:
     """
@@ -149,82 +185,239 @@ class TaskRepository:
         only_unsolved: Optional[bool] = None,
         companies: Optional[List[str]] = None,
         user_id: Optional[int] = None,
-    ) -> Tuple[List[Task], int]:
-        """Получение объединенного списка заданий с пагинацией и фильтрацией"""
-        all_tasks = []
-
-        # Получаем content blocks
-        if not item_type or item_type in ["content_block", "all"]:
-            content_tasks = await self.get_content_blocks(
-                main_categories=main_categories,
-                sub_categories=sub_categories,
-                search_query=search_query,
-                only_unsolved=only_unsolved,
-                companies=companies,
-                user_id=user_id,
-            )
-            all_tasks.extend(content_tasks)
-
-        # Получаем theory quizzes (только если нет фильтра по компаниям)
-        if (not item_type or item_type in ["theory_quiz", "all"]) and not companies:
-            theory_tasks = await self.get_theory_quizzes(
-                main_categories=main_categories,
-                sub_categories=sub_categories,
-                search_query=search_query,
-                only_unsolved=only_unsolved,
-                user_id=user_id,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Task], int, Optional[str]]:
+        """
+        Получение объединенного списка заданий с пагинацией и фильтрацией
+
+        Блоки контента и квизы объединяются в SQL (UNION ALL с общей
+        проекцией), сортировка и пагинация выполняются на стороне БД.
+        С cursor используется keyset пагинация (page игнорируется), без него -
+        OFFSET по номеру страницы. Возвращает задания, общее количество и
+        курсор следующей страницы.
+        """
+        tasks_union = self._build_task_union(
+            main_categories,
+            sub_categories,
+            search_query,
+            item_type,
+            only_unsolved,
+            companies,
+            user_id,
+        )
+        if tasks_union is None:
+            return [], 0, None
+
+        total = (
+            self.session.execute(select(func.count()).select_from(tasks_union)).scalar()
+            or 0
+        )
+
+        sort_columns = [
+            tasks_union.c[name] for name in _TASK_SORT_KEYS.get(sort_by, _DEFAULT_SORT)
+        ]
+        descending = sort_order.lower() == "desc"
+
+        page_query = select(
+            tasks_union.c.id, tasks_union.c.item_type, *sort_columns
+        ).order_by(*[col.desc() if descending else col.asc() for col in sort_columns])
+
+        if cursor:
+            cursor_values = self._decode_task_cursor(cursor, sort_by)
+            position = tuple_(*sort_columns)
+            page_query = page_query.where(
+                position < tuple_(*cursor_values)
+                if descending
+                else position > tuple_(*cursor_values)
             )
-            all_tasks.extend(theory_tasks)
+        else:
+            page_query = page_query.offset((page - 1) * limit)
 
-        # Сортировка
-        all_tasks = self._sort_tasks(all_tasks, sort_by, sort_order)
+        rows = self.session.execute(page_query.limit(limit)).all()
 
-        # Пагинация
-        total = len(all_tasks)
-        offset = (page - 1) * limit
-        paginated_tasks = all_tasks[offset : offset + limit]
+        tasks = self._load_tasks_for_page(
+            [(row.id, row.item_type) for row in rows], user_id
+        )
 
-        return paginated_tasks, total
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = self._encode_task_cursor(list(rows[-1])[2:])
 
-    async def get_content_blocks(
+        return tasks, total, next_cursor
+
+    def _build_task_union(
+        self,
+        main_categories: Optional[List[str]],
+        sub_categories: Optional[List[str]],
+        search_query: Optional[str],
+        item_type: Optional[str],
+        only_unsolved: Optional[bool],
+        companies: Optional[List[str]],
+        user_id: Optional[int],
+    ):
+        """UNION ALL блоков контента и квизов с общей проекцией (или None)"""
+        include_content = not item_type or item_type in ["content_block", "all"]
+        # Квизы не имеют компаний - при фильтре по компаниям не попадают
+        include_theory = (
+            not item_type or item_type in ["theory_quiz", "all"]
+        ) and not companies
+
+        selects = []
+        if include_content:
+            selects.append(
+                self._content_block_projection(
+                    main_categories,
+                    sub_categories,
+                    search_query,
+                    only_unsolved,
+                    companies,
+                    user_id,
+                )
+            )
+        if include_theory:
+            selects.append(
+                self._theory_quiz_projection(
+                    main_categories,
+                    sub_categories,
+                    search_query,
+                    only_unsolved,
+                    user_id,
+                )
+            )
+        if not selects:
+            return None
+
+        return (union_all(*selects) if len(selects) > 1 else selects[0]).subquery(
+            "tasks"
+        )
+
+    async def get_task_facets(
         self,
         main_categories: Optional[List[str]] = None,
         sub_categories: Optional[List[str]] = None,
         search_query: Optional[str] = None,
+        item_type: Optional[str] = None,
         only_unsolved: Optional[bool] = None,
         companies: Optional[List[str]] = None,
         user_id: Optional[int] = None,
-    ) -> List[Task]:
-        """Получение контентных блоков как заданий"""
+    ) -> dict:
+        """
+        Фасеты для фильтров: количество заданий по категориям/подкатегориям
+        и по компаниям с учетом текущих фильтров
+
+        Два запроса: GROUP BY по объединенной проекции и unnest(companies).
+        Результат без фильтра по прогрессу пользователя кешируется вместе
+        со снимком каталога.
+        """
+
+        def compute() -> dict:
+            category_rows = []
+            tasks_union = self._build_task_union(
+                main_categories,
+                sub_categories,
+                search_query,
+                item_type,
+                only_unsolved,
+                companies,
+                user_id,
+            )
+            if tasks_union is not None:
+                category_rows = self.session.execute(
+                    select(
+                        tasks_union.c.item_type,
+                        tasks_union.c.main_category,
+                        tasks_union.c.sub_category,
+                        func.count(),
+                    )
+                    .group_by(
+                        tasks_union.c.item_type,
+                        tasks_union.c.main_category,
+                        tasks_union.c.sub_category,
+                    )
+                    .order_by(tasks_union.c.main_category, tasks_union.c.sub_category)
+                ).all()
+
+            company_rows = []
+            if not item_type or item_type in ["content_block", "all"]:
+                company_rows = self._count_companies(
+                    self._content_block_conditions(
+                        main_categories,
+                        sub_categories,
+                        search_query,
+                        only_unsolved,
+                        companies,
+                        user_id,
+                    )
+                )
 
-        query = (
-            self.session.query(ContentBlock)
-            .join(ContentFile)
-            # .filter(ContentBlock.blockType.in_(["QUIZ", "ЗАДАЧА", "CODING"]))  # TEMPORARY FIX: blockType field doesn't exist
-            .options(joinedload(ContentBlock.file))
+            return {
+                "categories": [tuple(row) for row in category_rows],
+                "companies": company_rows,
+            }
+
+        if only_unsolved and user_id:
+            return compute()
+
+        cache_key = (
+            "task_facets",
+            tuple(sorted(main_categories or [])),
+            tuple(sorted(sub_categories or [])),
+            search_query or None,
+            item_type or None,
+            tuple(sorted(companies or [])),
         )
+        return get_catalog_snapshot(self.session).memoize(cache_key, compute)
+
+    def _count_companies(self, conditions: list) -> List[Tuple[str, int]]:
+        """Количество блоков по компаниям одним запросом через unnest"""
+        company_rows = (
+            select(func.unnest(ContentBlock.companies).label("company"))
+            .select_from(ContentBlock)
+            .join(ContentFile, ContentBlock.fileId == ContentFile.id)
+            .where(*conditions)
+            .subquery("block_companies")
+        )
+        rows = self.session.execute(
+            select(company_rows.c.company, func.count())
+            .group_by(company_rows.c.company)
+            .order_by(company_rows.c.company)
+        ).all()
+        return [(company, count) for company, count in rows]
+
+    def _content_block_conditions(
+        self,
+        main_categories: Optional[List[str]],
+        sub_categories: Optional[List[str]],
+        search_query: Optional[str],
+        only_unsolved: Optional[bool],
+        companies: Optional[List[str]],
+        user_id: Optional[int],
+    ) -> list:
+        """Условия фильтрации блоков контента (запрос должен включать ContentFile)"""
+        conditions = []
 
-        # Фильтры
         if main_categories:
-            query = query.filter(ContentFile.mainCategory.in_(main_categories))
+            conditions.append(ContentFile.mainCategory.in_(main_categories))
 
         if sub_categories:
-            query = query.filter(ContentFile.subCategory.in_(sub_categories))
+            conditions.append(ContentFile.subCategory.in_(sub_categories))
 
         if companies:
-            conditions = []
-            for company in companies:
-                conditions.append(ContentBlock.companies.any(company))
-            if conditions:
-                query = query.filter(or_(*conditions))
+            conditions.append(
+                or_(*[ContentBlock.companies.any(company) for company in companies])
+            )
 
         if search_query:
-            search_term = f"%{search_query}%"
-            query = query.filter(
-                or_(
-                    ContentBlock.textContent.ilike(search_term),
-                    ContentBlock.codeContent.ilike(search_term),
-                    ContentFile.webdavPath.ilike(search_term),
+            conditions.append(
+                text_search_condition(
+                    ContentBlock.searchVector,
+                    search_query,
+                    fuzzy_columns=[ContentBlock.blockTitle],
+                    fallback_columns=[
+                        ContentBlock.textContent,
+                        ContentBlock.codeContent,
+                        ContentFile.webdavPath,
+                    ],
                 )
             )
 
@@ -238,7 +431,197 @@ class TaskRepository:
                 )
                 .subquery()
             )
-            query = query.filter(~ContentBlock.id.in_(solved_block_ids))
+            conditions.append(~ContentBlock.id.in_(select(solved_block_ids)))
+
+        return conditions
+
+    def _theory_quiz_conditions(
+        self,
+        main_categories: Optional[List[str]],
+        sub_categories: Optional[List[str]],
+        search_query: Optional[str],
+        only_unsolved: Optional[bool],
+        user_id: Optional[int],
+    ) -> list:
+        """Условия фильтрации квизов (карточки QUIZ/ПРАКТИКА)"""
+        conditions = [
+            or_(
+                TheoryCard.category.ilike("%QUIZ%"),
+                TheoryCard.category.ilike("%ПРАКТИКА%"),
+            )
+        ]
+
+        if main_categories:
+            conditions.append(TheoryCard.category.in_(main_categories))
+
+        if sub_categories:
+            conditions.append(TheoryCard.subCategory.in_(sub_categories))
+
+        if search_query:
+            conditions.append(
+                text_search_condition(
+                    TheoryCard.searchVector,
+                    search_query,
+                    fuzzy_columns=[TheoryCard.questionBlock],
+                    fallback_columns=[
+                        TheoryCard.questionBlock,
+                        TheoryCard.answerBlock,
+                        TheoryCard.category,
+                    ],
+                )
+            )
+
+        # Фильтр нерешённых задач
+        if only_unsolved and user_id:
+            solved_card_ids = (
+                self.session.query(UserTheoryProgress.cardId)
+                .filter(
+                    UserTheoryProgress.userId == user_id,
+                    UserTheoryProgress.solvedCount > 0,
+                )
+                .subquery()
+            )
+            conditions.append(~TheoryCard.id.in_(select(solved_card_ids)))
+
+        return conditions
+
+    def _content_block_projection(self, *filters):
+        """Блоки контента в общей проекции UNION ALL"""
+        return (
+            select(
+                ContentBlock.id.label("id"),
+                literal("content_block", String).label("item_type"),
+                literal(0, Integer).label("type_rank"),
+                ContentBlock.blockTitle.label("title"),
+                ContentFile.mainCategory.label("main_category"),
+                ContentFile.subCategory.label("sub_category"),
+                ContentFile.webdavPath.label("sort_path"),
+                ContentBlock.orderInFile.label("position"),
+                ContentBlock.createdAt.label("created_at"),
+            )
+            .select_from(ContentBlock)
+            .join(ContentFile, ContentBlock.fileId == ContentFile.id)
+            .where(*self._content_block_conditions(*filters))
+        )
+
+    def _theory_quiz_projection(self, *filters):
+        """Квизы в общей проекции UNION ALL"""
+        return select(
+            TheoryCard.id.label("id"),
+            literal("theory_quiz", String).label("item_type"),
+            literal(1, Integer).label("type_rank"),
+            (literal("Квиз: ", String) + TheoryCard.category).label("title"),
+            TheoryCard.category.label("main_category"),
+            TheoryCard.subCategory.label("sub_category"),
+            literal("", String).label("sort_path"),
+            TheoryCard.orderIndex.label("position"),
+            TheoryCard.createdAt.label("created_at"),
+        ).where(*self._theory_quiz_conditions(*filters))
+
+    @staticmethod
+    def _encode_task_cursor(values: list) -> str:
+        raw = json.dumps(values, default=str, ensure_ascii=False)
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_task_cursor(cursor: str, sort_by: str) -> list:
+        keys = _TASK_SORT_KEYS.get(sort_by, _DEFAULT_SORT)
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            if not isinstance(values, list) or len(values) != len(keys):
+                raise ValueError("не соответствует сортировке")
+            return [
+                datetime.fromisoformat(value) if key == "created_at" else value
+                for key, value in zip(keys, values)
+            ]
+        except (ValueError, TypeError) as e:
+            raise TaskValidationError("cursor", str(e)) from e
+
+    def _load_tasks_for_page(
+        self, page_items: List[Tuple[str, str]], user_id: Optional[int]
+    ) -> List[Task]:
+        """Загрузить сущности страницы и прогресс пользователя по их id"""
+        block_ids = [item_id for item_id, kind in page_items if kind == "content_block"]
+        card_ids = [item_id for item_id, kind in page_items if kind == "theory_quiz"]
+
+        tasks_by_id = {}
+
+        if block_ids:
+            blocks = (
+                self.session.query(ContentBlock)
+                .options(joinedload(ContentBlock.file))
+                .filter(ContentBlock.id.in_(block_ids))
+                .all()
+            )
+            solved = {}
+            if user_id:
+                solved = dict(
+                    self.session.query(
+                        UserContentProgress.blockId, UserContentProgress.solvedCount
+                    )
+                    .filter(
+                        UserContentProgress.userId == user_id,
+                        UserContentProgress.blockId.in_(block_ids),
+                    )
+                    .all()
+                )
+            for block in blocks:
+                tasks_by_id[block.id] = self._content_block_to_task(
+                    block, solved.get(block.id, 0)
+                )
+
+        if card_ids:
+            cards = (
+                self.session.query(TheoryCard).filter(TheoryCard.id.in_(card_ids)).all()
+            )
+            solved = {}
+            if user_id:
+                solved = dict(
+                    self.session.query(
+                        UserTheoryProgress.cardId, UserTheoryProgress.solvedCount
+                    )
+                    .filter(
+                        UserTheoryProgress.userId == user_id,
+                        UserTheoryProgress.cardId.in_(card_ids),
+                    )
+                    .all()
+                )
+            for card in cards:
+                tasks_by_id[card.id] = self._theory_card_to_task(
+                    card, solved.get(card.id, 0)
+                )
+
+        return [
+            tasks_by_id[item_id] for item_id, _ in page_items if item_id in tasks_by_id
+        ]
+
+    async def get_content_blocks(
+        self,
+        main_categories: Optional[List[str]] = None,
+        sub_categories: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        only_unsolved: Optional[bool] = None,
+        companies: Optional[List[str]] = None,
+        user_id: Optional[int] = None,
+    ) -> List[Task]:
+        """Получение контентных блоков как заданий"""
+
+        query = (
+            self.session.query(ContentBlock)
+            .join(ContentFile)
+            # .filter(ContentBlock.blockType.in_(["QUIZ", "ЗАДАЧА", "CODING"]))  # TEMPORARY FIX: blockType field doesn't exist
+            .options(joinedload(ContentBlock.file))
+            .filter(
+                *self._content_block_conditions(
+                    main_categories,
+                    sub_categories,
+                    search_query,
+                    only_unsolved,
+                    companies,
+                    user_id,
+                )
+            )
+        )
 
         blocks = query.order_by(ContentFile.webdavPath, ContentBlock.orderInFile).all()
 
@@ -256,101 +639,30 @@ class TaskRepository:
                     .all()
                 )
                 user_progress = {p.blockId: p.solvedCount for p in progress_records}
-                logger.info(
-                    f"🔍 DEBUG: Found progress records: {len(progress_records)}, progress_dict: {user_progress}"
-                )
 
-                # Дополнительное логирование для отладки
-                if progress_records:
-                    sample_progress = progress_records[:3]
-                    logger.info(
-                        "🔍 DEBUG: Sample progress records",
+                # Отладочные подробности не собираем, если DEBUG выключен
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Loaded content progress",
                         extra={
                             "user_id": user_id,
+                            "blocks": len(block_ids),
+                            "progress_records": len(progress_records),
                             "sample_records": [
                                 {
-                                    "userId": p.userId,
                                     "blockId": p.blockId[:10] + "...",
                                     "solvedCount": p.solvedCount,
-                                    "createdAt": str(p.createdAt),
                                 }
-                                for p in sample_progress
+                                for p in progress_records[:3]
                             ],
                         },
                     )
-                else:
-                    # Проверим, есть ли вообще записи для этого пользователя
-                    total_user_progress = (
-                        self.session.query(UserContentProgress)
-                        .filter(UserContentProgress.userId == user_id)
-                        .count()
-                    )
-                    logger.info(
-                        f"🔍 DEBUG: No progress found for current blocks, but user has {total_user_progress} total progress records"
-                    )
-        else:
-            logger.info("🔍 DEBUG: user_id is None, skipping progress loading")
 
         # Преобразуем в Task
-        tasks = []
-        for block in blocks:
-            # Мапинг языков программирования
-            language_mapping = {
-                "js": "JAVASCRIPT",
-                "javascript": "JAVASCRIPT",
-                "ts": "TYPESCRIPT",
-                "typescript": "TYPESCRIPT",
-                "py": "PYTHON",
-                "python": "PYTHON",
-                "java": "JAVA",
-                "cpp": "CPP",
-                "c++": "CPP",
-                "c": "C",
-                "go": "GO",
-                "rust": "RUST",
-                "php": "PHP",
-                "ruby": "RUBY",
-                "rb": "RUBY",
-            }
-
-            # Преобразуем язык программирования
-            code_language = None
-            if block.codeLanguage:
-                mapped_lang = language_mapping.get(block.codeLanguage.lower())
-                if mapped_lang:
-                    from app.shared.models.enums import CodeLanguage
-
-                    try:
-                        code_language = CodeLanguage(mapped_lang)
-                    except ValueError:
-                        code_language = None
-
-            solved_count = user_progress.get(block.id, 0)
-
-            task = Task(
-                id=block.id,
-                item_type="content_block",
-                title=block.blockTitle,
-                description=self._unescape_text_content(block.textContent),
-                main_category=block.file.mainCategory if block.file else "",
-                sub_category=block.file.subCategory if block.file else None,
-                file_id=block.fileId,
-                file_path=block.file.webdavPath if block.file else None,
-                path_titles=block.pathTitles or [],
-                block_level=block.blockLevel,
-                order_in_file=block.orderInFile,
-                text_content=self._unescape_text_content(block.textContent),
-                code_content=block.codeContent,
-                code_language=code_language,
-                is_code_foldable=block.isCodeFoldable,
-                code_fold_title=block.codeFoldTitle,
-                extracted_urls=block.extractedUrls or [],
-                companies=block.companies or [],
-                current_user_solved_count=solved_count,
-                created_at=block.createdAt,
-                updated_at=block.updatedAt,
-            )
-            tasks.append(task)
+        tasks = [
+            self._content_block_to_task(block, user_progress.get(block.id, 0))
+            for block in blocks
+        ]
 
         return tasks
 
@@ -365,41 +677,11 @@ class TaskRepository:
         """Получение теоретических квизов как заданий"""
 
         query = self.session.query(TheoryCard).filter(
-            or_(
-                TheoryCard.category.ilike("%QUIZ%"),
-                TheoryCard.category.ilike("%ПРАКТИКА%"),
+            *self._theory_quiz_conditions(
+                main_categories, sub_categories, search_query, only_unsolved, user_id
             )
         )
 
-        # Фильтры
-        if main_categories:
-            query = query.filter(TheoryCard.category.in_(main_categories))
-
-        if sub_categories:
-            query = query.filter(TheoryCard.subCategory.in_(sub_categories))
-
-        if search_query:
-            search_term = f"%{search_query}%"
-            query = query.filter(
-                or_(
-                    TheoryCard.questionBlock.ilike(search_term),
-                    TheoryCard.answerBlock.ilike(search_term),
-                    TheoryCard.category.ilike(search_term),
-                )
-            )
-
-        # Фильтр нерешённых задач
-        if only_unsolved and user_id:
-            solved_card_ids = (
-                self.session.query(UserTheoryProgress.cardId)
-                .filter(
-                    UserTheoryProgress.userId == user_id,
-                    UserTheoryProgress.solvedCount > 0,
-                )
-                .subquery()
-            )
-            query = query.filter(~TheoryCard.id.in_(solved_card_ids))
-
         cards = query.order_by(TheoryCard.orderIndex).all()
 
         # Получаем прогресс пользователя
@@ -413,106 +695,16 @@ class TaskRepository:
             user_progress = {p.cardId: p.solvedCount for p in progress_records}
 
         # Преобразуем в Task
-        tasks = []
-        for card in cards:
-            task = Task(
-                id=card.id,
-                item_type="theory_quiz",
-                title=f"Квиз: {card.category}",
-                description=card.questionBlock,
-                main_category=card.category,
-                sub_category=card.subCategory,
-                file_id=None,
-                file_path=None,
-                path_titles=[],
-                block_level=None,
-                order_in_file=card.orderIndex,
-                text_content=None,
-                code_content=None,
-                code_language=None,
-                is_code_foldable=None,
-                code_fold_title=None,
-                extracted_urls=[],
-                companies=[],
-                question_block=card.questionBlock,
-                answer_block=card.answerBlock,
-                tags=card.tags or [],
-                order_index=card.orderIndex,
-                current_user_solved_count=user_progress.get(card.id, 0),
-                created_at=card.createdAt,
-                updated_at=card.updatedAt,
-            )
-            tasks.append(task)
+        tasks = [
+            self._theory_card_to_task(card, user_progress.get(card.id, 0))
+            for card in cards
+        ]
 
         return tasks
 
     async def get_task_categories(self) -> List[TaskCategory]:
         """Получение списка категорий заданий с подкатегориями и статистикой"""
-
-        # Категории из content blocks
-        content_categories = (
-            self.session.query(
-                ContentFile.mainCategory,
-                ContentFile.subCategory,
-                func.count(ContentBlock.id).label("count"),
-            )
-            .join(ContentBlock)
-            # .filter(ContentBlock.blockType.in_(["QUIZ", "ЗАДАЧА", "CODING"]))  # TEMPORARY FIX: blockType field doesn't exist
-            .group_by(ContentFile.mainCategory, ContentFile.subCategory)
-            .all()
-        )
-
-        # Категории из theory cards
-        theory_categories = (
-            self.session.query(
-                TheoryCard.category,
-                TheoryCard.subCategory,
-                func.count(TheoryCard.id).label("count"),
-            )
-            .filter(
-                or_(
-                    TheoryCard.category.ilike("%QUIZ%"),
-                    TheoryCard.category.ilike("%ПРАКТИКА%"),
-                )
-            )
-            .group_by(TheoryCard.category, TheoryCard.subCategory)
-            .all()
-        )
-
-        # Объединяем категории
-        categories_dict = {}
-
-        # Обрабатываем content categories
-        for main_cat, sub_cat, count in content_categories:
-            if main_cat not in categories_dict:
-                categories_dict[main_cat] = TaskCategory(
-                    name=main_cat,
-                    subCategories=[],
-                    totalCount=0,
-                    contentBlockCount=0,
-                    theoryQuizCount=0,
-                )
-            categories_dict[main_cat].contentBlockCount += count
-            categories_dict[main_cat].totalCount += count
-            if sub_cat and sub_cat not in categories_dict[main_cat].subCategories:
-                categories_dict[main_cat].subCategories.append(sub_cat)
-
-        # Обрабатываем theory categories
-        for main_cat, sub_cat, count in theory_categories:
-            if main_cat not in categories_dict:
-                categories_dict[main_cat] = TaskCategory(
-                    name=main_cat,
-                    subCategories=[],
-                    totalCount=0,
-                    contentBlockCount=0,
-                    theoryQuizCount=0,
-                )
-            categories_dict[main_cat].theoryQuizCount += count
-            categories_dict[main_cat].totalCount += count
-            if sub_cat and sub_cat not in categories_dict[main_cat].subCategories:
-                categories_dict[main_cat].subCategories.append(sub_cat)
-
-        return list(categories_dict.values())
+        return self._get_aggregator().get_task_categories()
 
     async def get_task_companies(
         self,
@@ -520,39 +712,22 @@ class TaskRepository:
         sub_categories: Optional[List[str]] = None,
     ) -> List[TaskCompany]:
         """Получение списка компаний из заданий с количеством"""
-
-        query = (
-            self.session.query(ContentBlock)
-            .join(ContentFile)
-            .filter(
-                # ContentBlock.blockType.in_(["QUIZ", "ЗАДАЧА", "CODING"]),  # TEMPORARY FIX: blockType field doesn't exist
-                ContentBlock.companies.isnot(None),
-                func.array_length(ContentBlock.companies, 1) > 0,
-            )
-        )
-
-        # Фильтры
+        conditions = []
         if main_categories:
-            query = query.filter(ContentFile.mainCategory.in_(main_categories))
-
+            conditions.append(ContentFile.mainCategory.in_(main_categories))
         if sub_categories:
-            query = query.filter(ContentFile.subCategory.in_(sub_categories))
-
-        blocks = query.all()
+            conditions.append(ContentFile.subCategory.in_(sub_categories))
 
-        # Подсчитываем компании
-        company_counts = {}
-        for block in blocks:
-            if block.companies:
-                for company in block.companies:
-                    company_counts[company] = company_counts.get(company, 0) + 1
-
-        companies = [
-            TaskCompany(name=name, count=count)
-            for name, count in sorted(company_counts.items())
-        ]
+        cache_key = (
+            "task_companies",
+            tuple(sorted(main_categories or [])),
+            tuple(sorted(sub_categories or [])),
+        )
+        company_rows = get_catalog_snapshot(self.session).memoize(
+            cache_key, lambda: self._count_companies(conditions)
+        )
 
-        return companies
+        return [TaskCompany(name=name, count=count) for name, count in company_rows]
 
     # Методы для работы с TaskAttempt и TaskSolution
 
@@ -620,6 +795,71 @@ class TaskRepository:
 
         return query.order_by(TaskSolution.solvedAt.desc()).all()
 
+    def _content_block_to_task(self, block: ContentBlock, solved_count: int) -> Task:
+        """Преобразование блока контента в Task"""
+        code_language = None
+        if block.codeLanguage:
+            mapped_lang = _CODE_LANGUAGE_MAPPING.get(block.codeLanguage.lower())
+            if mapped_lang:
+                try:
+                    code_language = CodeLanguage(mapped_lang)
+                except ValueError:
+                    code_language = None
+
+        return Task(
+            id=block.id,
+            item_type="content_block",
+            title=block.blockTitle,
+            description=self._unescape_text_content(block.textContent),
+            main_category=block.file.mainCategory if block.file else "",
+            sub_category=block.file.subCategory if block.file else None,
+            file_id=block.fileId,
+            file_path=block.file.webdavPath if block.file else None,
+            path_titles=block.pathTitles or [],
+            block_level=block.blockLevel,
+            order_in_file=block.orderInFile,
+            text_content=self._unescape_text_content(block.textContent),
+            code_content=block.codeContent,
+            code_language=code_language,
+            is_code_foldable=block.isCodeFoldable,
+            code_fold_title=block.codeFoldTitle,
+            extracted_urls=block.extractedUrls or [],
+            companies=block.companies or [],
+            current_user_solved_count=solved_count,
+            created_at=block.createdAt,
+            updated_at=block.updatedAt,
+        )
+
+    def _theory_card_to_task(self, card: TheoryCard, solved_count: int) -> Task:
+        """Преобразование карточки-квиза в Task"""
+        return Task(
+            id=card.id,
+            item_type="theory_quiz",
+            title=f"Квиз: {card.category}",
+            description=card.questionBlock,
+            main_category=card.category,
+            sub_category=card.subCategory,
+            file_id=None,
+            file_path=None,
+            path_titles=[],
+            block_level=None,
+            order_in_file=card.orderIndex,
+            text_content=None,
+            code_content=None,
+            code_language=None,
+            is_code_foldable=None,
+            code_fold_title=None,
+            extracted_urls=[],
+            companies=[],
+            question_block=card.questionBlock,
+            answer_block=card.answerBlock,
+            tags=card.tags or [],
+            order_index=card.orderIndex,
+            current_user_solved_count=solved_count,
+            created_at=card.createdAt,
+            updated_at=card.updatedAt,
+        )
+
     def _unescape_text_content(self, text):
         if text is None:
             return None
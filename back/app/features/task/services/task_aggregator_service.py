@@ -13,6 +13,7 @@ from app.features.task.repositories.content_block_repository import (
     ContentBlockRepository,
 )
 from app.features.task.repositories.theory_quiz_repository import TheoryQuizRepository
+from app.shared.catalog import get_catalog_snapshot
 from app.shared.schemas.task import Task
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,7 @@ class TaskAggregatorService:
     """Сервис для агрегации задач из разных репозиториев"""
 
     def __init__(self, session: Session):
+        self.session = session
         self.content_block_repo = ContentBlockRepository(session)
         self.theory_quiz_repo = TheoryQuizRepository(session)
 
@@ -116,38 +118,31 @@ class TaskAggregatorService:
         return sorted(tasks, key=get_sort_key, reverse=reverse)
 
     def get_task_categories(self) -> List[TaskCategory]:
-        """Получить все категории задач из всех источников"""
+        """Получить все категории задач из всех источников (по снимку каталога)"""
+        snapshot = get_catalog_snapshot(self.session)
+        categories_dict = {}
 
-        # Получаем категории из блоков контента
-        content_categories = self.content_block_repo.get_content_block_categories()
-
-        # Получаем категории из теоретических тестов
-        theory_categories = self.theory_quiz_repo.get_theory_quiz_categories()
-
-        # Объединяем и убираем дубликаты
-        all_categories = list(set(content_categories + theory_categories))
-        all_categories.sort()
-
-        # Подсчитываем количество задач в каждой категории
-        categories_with_counts = []
-        for category in all_categories:
-            # Подсчет для блоков контента
-            content_tasks, content_count = self.content_block_repo.get_content_blocks(
-                category=category, limit=0
-            )
-
-            # Подсчет для теоретических тестов
-            theory_tasks, theory_count = self.theory_quiz_repo.get_theory_quizzes(
-                category=category, limit=0
-            )
-
-            total_count = content_count + theory_count
-
-            categories_with_counts.append(
-                TaskCategory(name=category, count=total_count)
-            )
-
-        return categories_with_counts
+        sources = (
+            (snapshot.content_totals, "contentBlockCount"),
+            (snapshot.quiz_totals, "theoryQuizCount"),
+        )
+        for totals, count_field in sources:
+            for (main_cat, sub_cat), count in totals.items():
+                category = categories_dict.get(main_cat)
+                if category is None:
+                    category = categories_dict[main_cat] = TaskCategory(
+                        name=main_cat,
+                        subCategories=[],
+                        totalCount=0,
+                        contentBlockCount=0,
+                        theoryQuizCount=0,
+                    )
+                setattr(category, count_field, getattr(category, count_field) + count)
+                category.totalCount += count
+                if sub_cat and sub_cat not in category.subCategories:
+                    category.subCategories.append(sub_cat)
+
+        return list(categories_dict.values())
 
     def get_task_companies(self) -> List[TaskCompany]:
         """Получить все компании из задач (только из блоков контента)"""
@@ -11,6 +11,7 @@ from app.features.task.dto.responses import (
     TaskAttemptResponse,
     TaskCategoriesResponse,
     TaskCompaniesResponse,
+    TaskFacetsResponse,
     TaskResponse,
     TasksListResponse,
     TaskSolutionResponse,
@@ -42,6 +43,7 @@ class TaskService:
         only_unsolved: Optional[bool] = None,
         companies: Optional[List[str]] = None,
         user_id: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> TasksListResponse:
         """Получение объединенного списка заданий с пагинацией и фильтрацией"""
         logger.info(
@@ -53,7 +55,7 @@ class TaskService:
             if companies and isinstance(companies, str):
                 companies = [c.strip() for c in companies.split(",") if c.strip()]
 
-            tasks, total = await self.task_repository.get_tasks(
+            tasks, total, next_cursor = await self.task_repository.get_tasks(
                 page=page,
                 limit=limit,
                 main_categories=main_categories,
@@ -65,6 +67,7 @@ class TaskService:
                 only_unsolved=only_unsolved,
                 companies=companies,
                 user_id=user_id,
+                cursor=cursor,
             )
 
             # Преобразуем в DTO
@@ -101,7 +104,9 @@ class TaskService:
                 task_responses.append(task_response)
 
             logger.info(f"Найдено {total} заданий, возвращено {len(task_responses)}")
-            return TasksListResponse.create(task_responses, total, page, limit)
+            return TasksListResponse.create(
+                task_responses, total, page, limit, next_cursor
+            )
 
         except Exception as e:
             logger.error(f"Ошибка при получении заданий: {str(e)}")
@@ -164,6 +169,75 @@ class TaskService:
             logger.error(f"Ошибка при получении компаний: {str(e)}")
             raise
 
+    async def get_task_facets(
+        self,
+        main_categories: Optional[List[str]] = None,
+        sub_categories: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        item_type: Optional[str] = None,
+        only_unsolved: Optional[bool] = None,
+        companies: Optional[List[str]] = None,
+        user_id: Optional[int] = None,
+    ) -> TaskFacetsResponse:
+        """Количество заданий по категориям, подкатегориям и компаниям"""
+        try:
+            facets = await self.task_repository.get_task_facets(
+                main_categories=main_categories,
+                sub_categories=sub_categories,
+                search_query=search_query,
+                item_type=item_type,
+                only_unsolved=only_unsolved,
+                companies=companies,
+                user_id=user_id,
+            )
+
+            categories = {}
+            total = 0
+            for task_type, main_category, sub_category, count in facets["categories"]:
+                category = categories.setdefault(
+                    main_category,
+                    {
+                        "name": main_category,
+                        "count": 0,
+                        "contentBlockCount": 0,
+                        "theoryQuizCount": 0,
+                        "subCategories": {},
+                    },
+                )
+                category["count"] += count
+                if task_type == "content_block":
+                    category["contentBlockCount"] += count
+                else:
+                    category["theoryQuizCount"] += count
+                if sub_category:
+                    sub_categories_counts = category["subCategories"]
+                    sub_categories_counts[sub_category] = (
+                        sub_categories_counts.get(sub_category, 0) + count
+                    )
+                total += count
+
+            category_responses = []
+            for name in sorted(categories):
+                category = categories[name]
+                category["subCategories"] = [
+                    {"name": sub_name, "count": sub_count}
+                    for sub_name, sub_count in sorted(category["subCategories"].items())
+                ]
+                category_responses.append(category)
+
+            return TaskFacetsResponse(
+                categories=category_responses,
+                companies=[
+                    {"name": name, "count": count}
+                    for name, count in facets["companies"]
+                ],
+                total=total,
+            )
+
+        except Exception as e:
+            logger.error(f"Ошибка при получении фасетов: {str(e)}")
+            raise
+
     async def create_task_attempt(
         self, user_id: int, request: TaskAttemptCreateRequest
     ) -> TaskAttemptResponse:
@@ -16,7 +16,7 @@ from app.features.theory.dto.responses import (
     UserTheoryProgressResponse,
 )
 from app.features.theory.services.theory_service import TheoryService
-from app.shared.database import get_session
+from app.shared.database.async_base import get_feature_session
 from app.shared.dependencies import (
     get_current_user_optional,
     get_current_user_required,
@@ -25,7 +25,9 @@ from app.shared.dependencies import (
 router = APIRouter(prefix="/theory", tags=["Theory"])
 
 
-def get_theory_service(db: Session = Depends(get_session)) -> TheoryService:
+def get_theory_service(
+    db: Session = Depends(get_feature_session("theory")),
+) -> TheoryService:
     """Зависимость для получения сервиса theory"""
     from app.features.theory.repositories.theory_repository import TheoryRepository
 
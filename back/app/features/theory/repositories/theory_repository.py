@@ -4,25 +4,32 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
-from sqlalchemy import and_, asc, desc, func, or_
+from sqlalchemy import and_, asc, desc, func, select
 from sqlalchemy.orm import Session
 
 from app.features.theory.exceptions.theory_exceptions import (
     TheoryCardNotFoundError,
     TheoryProgressError,
 )
+from app.shared.database.async_repository import AsyncBaseRepository
 from app.shared.models.enums import CardState
 from app.shared.models.theory_models import (
     TheoryCard,
     UserTheoryProgress,
 )
+from app.shared.search import text_search_condition
 
 
-class TheoryRepository:
-    """Репозиторий для работы с теоретическими карточками"""
+class TheoryRepository(AsyncBaseRepository[TheoryCard]):
+    """
+    Репозиторий для работы с теоретическими карточками
+
+    Работает как с Session, так и с AsyncSession (фича "theory" в
+    database_async_features), см. AsyncBaseRepository.
+    """
 
     def __init__(self, session: Session):
-        self.session = session
+        super().__init__(session, TheoryCard)
 
     async def get_theory_cards(
         self,
@@ -40,51 +47,51 @@ class TheoryRepository:
         """Получение теоретических карточек с пагинацией и фильтрацией"""
         offset = (page - 1) * limit
 
-        query = self.session.query(TheoryCard).filter(
+        query = select(TheoryCard).where(
             ~TheoryCard.category.ilike("%QUIZ%"),
             ~TheoryCard.category.ilike("%ПРАКТИКА%"),
         )
 
         # Фильтры
         if category:
-            query = query.filter(
-                func.lower(TheoryCard.category) == func.lower(category)
-            )
+            query = query.where(func.lower(TheoryCard.category) == func.lower(category))
 
         if sub_category:
-            query = query.filter(
+            query = query.where(
                 func.lower(TheoryCard.subCategory) == func.lower(sub_category)
             )
 
         if deck:
-            query = query.filter(TheoryCard.deck.ilike(f"%{deck}%"))
+            query = query.where(TheoryCard.deck.ilike(f"%{deck}%"))
 
         # Поиск
         if search_query and search_query.strip():
-            search_term = f"%{search_query.strip()}%"
-            query = query.filter(
-                or_(
-                    TheoryCard.questionBlock.ilike(search_term),
-                    TheoryCard.answerBlock.ilike(search_term),
-                    TheoryCard.category.ilike(search_term),
-                    TheoryCard.subCategory.ilike(search_term),
+            query = query.where(
+                text_search_condition(
+                    TheoryCard.searchVector,
+                    search_query.strip(),
+                    fuzzy_columns=[TheoryCard.questionBlock],
+                    fallback_columns=[
+                        TheoryCard.questionBlock,
+                        TheoryCard.answerBlock,
+                        TheoryCard.category,
+                        TheoryCard.subCategory,
+                    ],
                 )
             )
 
         # Фильтр неизученных карточек
         if only_unstudied and user_id:
-            studied_card_ids = (
-                self.session.query(UserTheoryProgress.cardId)
-                .filter(
-                    UserTheoryProgress.userId == user_id,
-                    UserTheoryProgress.solvedCount > 0,
-                )
-                .subquery()
+            studied_card_ids = select(UserTheoryProgress.cardId).where(
+                UserTheoryProgress.userId == user_id,
+                UserTheoryProgress.solvedCount > 0,
             )
-            query = query.filter(~TheoryCard.id.in_(studied_card_ids))
+            query = query.where(~TheoryCard.id.in_(studied_card_ids))
 
         # Подсчёт общего количества
-        total = query.count()
+        total = await self._scalar(
+            select(func.count()).select_from(query.order_by(None).subquery())
+        )
 
         # Сортировка
         if hasattr(TheoryCard, sort_by):
@@ -94,31 +101,31 @@ class TheoryRepository:
                 query = query.order_by(asc(getattr(TheoryCard, sort_by)))
 
         # Пагинация
-        cards = query.offset(offset).limit(limit).all()
+        cards = await self._scalars(query.offset(offset).limit(limit))
 
         return cards, total
 
     async def get_theory_card_by_id(self, card_id: str) -> Optional[TheoryCard]:
         """Получение теоретической карточки по ID"""
-        card = self.session.query(TheoryCard).filter(TheoryCard.id == card_id).first()
-        return card
+        return await self.get_by_id(card_id)
 
     async def get_theory_categories(self) -> List[Dict[str, Any]]:
         """Получение списка категорий с подкатегориями и количеством карточек"""
         categories_data = (
-            self.session.query(
-                TheoryCard.category,
-                TheoryCard.subCategory,
-                func.count(TheoryCard.id).label("count"),
-            )
-            .filter(
-                ~TheoryCard.category.ilike("%QUIZ%"),
-                ~TheoryCard.category.ilike("%ПРАКТИКА%"),
+            await self._execute(
+                select(
+                    TheoryCard.category,
+                    TheoryCard.subCategory,
+                    func.count(TheoryCard.id).label("count"),
+                )
+                .where(
+                    ~TheoryCard.category.ilike("%QUIZ%"),
+                    ~TheoryCard.category.ilike("%ПРАКТИКА%"),
+                )
+                .group_by(TheoryCard.category, TheoryCard.subCategory)
+                .order_by(TheoryCard.category, TheoryCard.subCategory)
             )
-            .group_by(TheoryCard.category, TheoryCard.subCategory)
-            .order_by(TheoryCard.category, TheoryCard.subCategory)
-            .all()
-        )
+        ).all()
 
         # Группировка по категориям
         categories_dict = {}
@@ -141,34 +148,32 @@ class TheoryRepository:
 
     async def get_theory_subcategories(self, category: str) -> List[str]:
         """Получение списка подкатегорий для категории"""
-        subcategories = (
-            self.session.query(TheoryCard.subCategory)
-            .filter(
+        subcategories = await self._scalars(
+            select(TheoryCard.subCategory)
+            .where(
                 func.lower(TheoryCard.category) == func.lower(category),
                 TheoryCard.subCategory.isnot(None),
             )
             .distinct()
             .order_by(TheoryCard.subCategory)
-            .all()
         )
 
-        return [sub[0] for sub in subcategories if sub[0]]
+        return [sub for sub in subcategories if sub]
 
     async def get_user_theory_progress(
         self, user_id: int, card_id: str
     ) -> Optional[UserTheoryProgress]:
         """Получение прогресса пользователя по карточке"""
-        progress = (
-            self.session.query(UserTheoryProgress)
-            .filter(
+        return await self._scalar(
+            select(UserTheoryProgress)
+            .where(
                 and_(
                     UserTheoryProgress.userId == user_id,
                     UserTheoryProgress.cardId == card_id,
                 )
             )
-            .first()
+            .limit(1)
         )
-        return progress
 
     async def create_or_update_user_progress(
         self, user_id: int, card_id: str, **progress_data
@@ -200,11 +205,11 @@ class TheoryRepository:
             self.session.add(progress)
 
         try:
-            self.session.commit()
-            self.session.refresh(progress)
+            await self._commit()
+            await self._refresh(progress)
             return progress
         except Exception as e:
-            self.session.rollback()
+            await self._rollback()
             raise TheoryProgressError(f"Ошибка при сохранении прогресса: {str(e)}")
 
     async def get_due_theory_cards(
@@ -215,9 +220,9 @@ class TheoryRepository:
 
         # Карточки с истекшим сроком повторения
         due_cards_query = (
-            self.session.query(TheoryCard)
+            select(TheoryCard)
             .join(UserTheoryProgress)
-            .filter(
+            .where(
                 UserTheoryProgress.userId == user_id,
                 UserTheoryProgress.dueDate <= current_time,
                 UserTheoryProgress.cardState.in_(
@@ -229,26 +234,23 @@ class TheoryRepository:
         )
 
         # Новые карточки, если недостаточно карточек для повторения
-        due_cards = due_cards_query.all()
+        due_cards = await self._scalars(due_cards_query)
         remaining_limit = limit - len(due_cards)
 
         if remaining_limit > 0:
-            studied_card_ids = (
-                self.session.query(UserTheoryProgress.cardId)
-                .filter(UserTheoryProgress.userId == user_id)
-                .subquery()
+            studied_card_ids = select(UserTheoryProgress.cardId).where(
+                UserTheoryProgress.userId == user_id
             )
 
-            new_cards = (
-                self.session.query(TheoryCard)
-                .filter(
+            new_cards = await self._scalars(
+                select(TheoryCard)
+                .where(
                     ~TheoryCard.id.in_(studied_card_ids),
                     ~TheoryCard.category.ilike("%QUIZ%"),
                     ~TheoryCard.category.ilike("%ПРАКТИКА%"),
                 )
                 .order_by(TheoryCard.orderIndex)
                 .limit(remaining_limit)
-                .all()
             )
 
             due_cards.extend(new_cards)
@@ -258,47 +260,39 @@ class TheoryRepository:
     async def get_theory_stats(self, user_id: int) -> Dict[str, Any]:
         """Получение статистики изучения теории пользователя"""
         # Общее количество карточек
-        total_cards = (
-            self.session.query(func.count(TheoryCard.id))
-            .filter(
+        total_cards = await self._scalar(
+            select(func.count(TheoryCard.id)).where(
                 ~TheoryCard.category.ilike("%QUIZ%"),
                 ~TheoryCard.category.ilike("%ПРАКТИКА%"),
             )
-            .scalar()
         )
 
         # Изученные карточки
-        studied_cards = (
-            self.session.query(func.count(UserTheoryProgress.id))
-            .filter(
+        studied_cards = await self._scalar(
+            select(func.count(UserTheoryProgress.id)).where(
                 UserTheoryProgress.userId == user_id,
                 UserTheoryProgress.solvedCount > 0,
             )
-            .scalar()
         )
 
         # Карточки к повторению
         current_time = datetime.utcnow()
-        due_cards = (
-            self.session.query(func.count(UserTheoryProgress.id))
-            .filter(
+        due_cards = await self._scalar(
+            select(func.count(UserTheoryProgress.id)).where(
                 UserTheoryProgress.userId == user_id,
                 UserTheoryProgress.dueDate <= current_time,
                 UserTheoryProgress.cardState.in_(
                     [CardState.LEARNING, CardState.REVIEW]
                 ),
             )
-            .scalar()
         )
 
         # Средний фактор лёгкости
-        avg_ease_factor = (
-            self.session.query(func.avg(UserTheoryProgress.easeFactor))
-            .filter(
+        avg_ease_factor = await self._scalar(
+            select(func.avg(UserTheoryProgress.easeFactor)).where(
                 UserTheoryProgress.userId == user_id,
                 UserTheoryProgress.solvedCount > 0,
             )
-            .scalar()
         )
 
         return {
@@ -318,9 +312,9 @@ class TheoryRepository:
             return False
 
         try:
-            self.session.delete(progress)
-            self.session.commit()
+            await self._delete(progress)
+            await self._commit()
             return True
         except Exception as e:
-            self.session.rollback()
+            await self._rollback()
             raise TheoryProgressError(f"Ошибка при сбросе прогресса: {str(e)}")
@@ -3,13 +3,19 @@ Cluster Visualization API Router (feature: visualization)
 Endpoints для визуализации кластеров в виде созвездий
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.features.visualization.services.constellation_snapshot import (
+    get_constellation_snapshot,
+)
+from app.features.visualization.services.universe_geometry import (
+    load_universe_geometry,
+)
 from app.shared.database import get_session
 from app.shared.dependencies import get_current_user_optional
 
@@ -43,6 +49,32 @@ class ClusterConstellationResponse(BaseModel):
     stats: Dict[str, Any]
 
 
+class UniverseStar(BaseModel):
+    id: int
+    name: str
+    category_id: str
+    questions_count: int
+    star_x: float
+    star_y: float
+    star_z: float
+    temperature: Optional[int] = None
+    mass: Optional[float] = None
+    orbit_radius: Optional[float] = None
+    orbit_speed: Optional[float] = None
+
+
+class UniverseConnection(BaseModel):
+    source_cluster_id: int
+    target_cluster_id: int
+    connection_weight: float
+    connection_type: str
+
+
+class UniverseResponse(BaseModel):
+    stars: List[UniverseStar]
+    connections: List[UniverseConnection]
+
+
 router = APIRouter(
     prefix="/cluster-visualization",
     tags=["visualization"],
@@ -74,158 +106,33 @@ async def get_cluster_constellation(
     current_user=Depends(get_current_user_optional),
 ):
     """Получение данных для визуализации созвездия кластеров"""
-    # 1) Кластеры и их метрики
-    cluster_query = text(
-        """
-        WITH total_interviews AS (
-            SELECT COALESCE(NULLIF(COUNT(DISTINCT interview_id),0),1) AS total
-            FROM "InterviewQuestion" WHERE interview_id IS NOT NULL
-        ), cluster_stats AS (
-            SELECT 
-                c.id,
-                c.name,
-                c.category_id,
-                cat.name as category_name,
-                c.keywords,
-                c.questions_count,
-                c.example_question,
-                COUNT(DISTINCT q.interview_id) as interview_count,
-                ROUND(COUNT(DISTINCT q.interview_id) * 100.0 / (SELECT total FROM total_interviews), 2) as interview_penetration,
-                ARRAY(
-                    SELECT q2.company 
-                    FROM "InterviewQuestion" q2
-                    WHERE q2.cluster_id = c.id AND q2.company IS NOT NULL
-                    GROUP BY q2.company 
-                    ORDER BY COUNT(*) DESC 
-                    LIMIT 3
-                ) as top_companies,
-                COALESCE(ROUND(AVG(CASE WHEN ir.position ILIKE '%junior%' OR ir.position ILIKE '%стажер%' THEN 1.0 ELSE 0.0 END) * 100, 1),0) as junior_pct,
-                COALESCE(ROUND(AVG(CASE WHEN ir.position ILIKE '%middle%' OR ir.position ILIKE '%средний%' THEN 1.0 ELSE 0.0 END) * 100, 1),0) as middle_pct,
-                COALESCE(ROUND(AVG(CASE WHEN ir.position ILIKE '%senior%' OR ir.position ILIKE '%ведущий%' OR ir.position ILIKE '%тимлид%' THEN 1.0 ELSE 0.0 END) * 100, 1),0) as senior_pct
-            FROM "InterviewCluster" c
-            LEFT JOIN "InterviewQuestion" q ON c.id = q.cluster_id
-            LEFT JOIN "InterviewRecord" ir ON q.interview_id = ir.id
-            LEFT JOIN "InterviewCategory" cat ON c.category_id = cat.id
-            WHERE (
-                :no_filter = TRUE 
-                OR c.category_id = ANY(:category_filter)
-                OR (:single_category_id IS NOT NULL AND c.category_id = :single_category_id)
-            )
-            GROUP BY c.id, c.name, c.category_id, cat.name, c.keywords, c.questions_count, c.example_question
-            HAVING COUNT(DISTINCT q.interview_id) >= :min_interview_count
-        )
-        SELECT * FROM cluster_stats
-        ORDER BY interview_penetration DESC
-        LIMIT :limit
-        """
+    # Граф предрассчитан целиком, фильтры применяются в памяти
+    category_ids = list(category_filter or [])
+    if category_id is not None:
+        category_ids.append(category_id)
+
+    graph = get_constellation_snapshot(session).build_graph(
+        min_interview_count=min_interview_count,
+        min_link_weight=min_link_weight,
+        category_ids=category_ids,
+        limit=limit,
     )
+    return ClusterConstellationResponse(**graph)
 
-    no_filter = (
-        category_filter is None or len(category_filter) == 0
-    ) and category_id is None
-
-    clusters_result = session.execute(
-        cluster_query,
-        {
-            "min_interview_count": min_interview_count,
-            "category_filter": category_filter
-            if category_filter and len(category_filter) > 0
-            else [],
-            "single_category_id": category_id,
-            "no_filter": no_filter,
-            "limit": limit,
-        },
-    ).fetchall()
 
-    # 2) Связи между кластерами (через пары из массива кластеров в интервью)
-    links_query = text(
-        """
-        WITH base AS (
-            SELECT interview_id, ARRAY_AGG(DISTINCT cluster_id) as clusters
-            FROM "InterviewQuestion"
-            WHERE interview_id IS NOT NULL AND cluster_id IS NOT NULL
-            GROUP BY interview_id
-        ), pairs AS (
-            SELECT (clusters)[i] AS c1, (clusters)[j] AS c2
-            FROM base,
-            LATERAL generate_subscripts(clusters,1) i,
-            LATERAL generate_subscripts(clusters,1) j
-            WHERE i < j
-        ), agg AS (
-            SELECT c1, c2, COUNT(*) AS shared_interviews
-            FROM pairs
-            GROUP BY c1, c2
-            HAVING COUNT(*) >= :min_link_weight
-        )
-        SELECT * FROM agg ORDER BY shared_interviews DESC
-        """
-    )
-
-    links_result = session.execute(
-        links_query, {"min_link_weight": min_link_weight}
-    ).fetchall()
-
-    # 3) Формируем узлы
-    nodes: List[ClusterNode] = []
-    cluster_ids = set()
-    max_questions = (
-        max([r.questions_count for r in clusters_result]) if clusters_result else 1
-    )
-    for cluster in clusters_result:
-        cluster_ids.add(cluster.id)
-        nodes.append(
-            ClusterNode(
-                id=cluster.id,
-                name=cluster.name,
-                category_id=cluster.category_id,
-                category_name=cluster.category_name,
-                questions_count=cluster.questions_count,
-                interview_count=cluster.interview_count,
-                interview_penetration=float(cluster.interview_penetration),
-                keywords=cluster.keywords if cluster.keywords else [],
-                example_question=cluster.example_question or "",
-                size=cluster.questions_count / max_questions,
-                top_companies=cluster.top_companies if cluster.top_companies else [],
-                difficulty_distribution={
-                    "junior": float(cluster.junior_pct),
-                    "middle": float(cluster.middle_pct),
-                    "senior": float(cluster.senior_pct),
-                },
-            )
-        )
-
-    # 4) Формируем связи
-    links: List[ClusterLink] = []
-    max_weight = max([l.shared_interviews for l in links_result]) if links_result else 1
-    for link in links_result:
-        if link.c1 in cluster_ids and link.c2 in cluster_ids:
-            links.append(
-                ClusterLink(
-                    source=link.c1,
-                    target=link.c2,
-                    weight=link.shared_interviews,
-                    strength=link.shared_interviews / max_weight,
-                )
-            )
-
-    # 5) Категории
-    categories_rows = session.execute(text('SELECT id, name FROM "InterviewCategory"'))
-    categories = {row.id: row.name for row in categories_rows}
-
-    # 6) Статистика
-    stats = {
-        "total_clusters": len(nodes),
-        "total_links": len(links),
-        "avg_penetration": (sum(n.interview_penetration for n in nodes) / len(nodes))
-        if nodes
-        else 0,
-        "max_cluster_size": max([n.questions_count for n in nodes]) if nodes else 0,
-        "strongest_link": max([l.weight for l in links]) if links else 0,
-    }
-
-    return ClusterConstellationResponse(
-        nodes=nodes, links=links, categories=categories, stats=stats
-    )
+@router.get(
+    "/universe",
+    response_model=UniverseResponse,
+    summary="Предрассчитанная 3D геометрия кластеров",
+    description="Координаты и семантические связи из scripts/build_universe_layout.py",
+)
+async def get_universe(
+    min_weight: float = Query(0.0, description="Минимальная близость связи"),
+    limit: int | None = Query(None, description="Максимальное количество кластеров"),
+    session: Session = Depends(get_session),
+):
+    """3D координаты кластеров и связи между ними без расчетов на запрос"""
+    return UniverseResponse(**load_universe_geometry(session, min_weight, limit))
 
 
 @router.get("/cluster/{cluster_id}/questions")
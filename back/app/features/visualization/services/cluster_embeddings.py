@@ -0,0 +1,161 @@
+"""
+Локальные эмбеддинги кластеров вопросов (без сети и внешних моделей)
+
+Текст вопроса -> TF-IDF по хешированным токенам (crc32, стабильно между
+запусками) -> L2-нормированные строки усредняются по кластеру ->
+рандомизированный truncated SVD до `dimensions` компонент. Связи -
+top-k соседей по косинусной близости эмбеддингов.
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[^\W\d_]{2,}", re.UNICODE)
+SIMILARITY_BLOCK_SIZE = 1024
+
+
+def hash_tokens(text: str, n_features: int) -> Dict[int, int]:
+    """Частоты хешированных токенов текста"""
+    counts: Dict[int, int] = {}
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        index = zlib.crc32(token.encode("utf-8")) % n_features
+        counts[index] = counts.get(index, 0) + 1
+    return counts
+
+
+def cluster_tfidf_centroids(
+    documents: Iterable[Tuple[int, str]], n_features: int
+) -> Tuple[List[int], np.ndarray]:
+    """
+    Центроиды TF-IDF по кластерам
+
+    documents - пары (cluster_id, текст). Возвращает id кластеров и матрицу
+    (кластеры x n_features) средних L2-нормированных TF-IDF векторов.
+    """
+    cluster_index: Dict[int, int] = {}
+    doc_clusters: List[int] = []
+    doc_ids: List[np.ndarray] = []
+    term_ids: List[np.ndarray] = []
+    term_counts: List[np.ndarray] = []
+
+    for cluster_id, text in documents:
+        counts = hash_tokens(text or "", n_features)
+        if not counts:
+            continue
+        doc = len(doc_clusters)
+        doc_clusters.append(cluster_index.setdefault(cluster_id, len(cluster_index)))
+        doc_ids.append(np.full(len(counts), doc, dtype=np.int64))
+        term_ids.append(np.fromiter(counts.keys(), dtype=np.int64, count=len(counts)))
+        term_counts.append(
+            np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        )
+
+    if not doc_clusters:
+        return [], np.zeros((0, n_features), dtype=np.float32)
+
+    docs = np.concatenate(doc_ids)
+    terms = np.concatenate(term_ids)
+    tf = np.concatenate(term_counts)
+    n_docs = len(doc_clusters)
+
+    # Сглаженный idf и сублинейный tf, как в TfidfVectorizer(sublinear_tf=True)
+    df = np.bincount(terms, minlength=n_features)
+    idf = np.log((1 + n_docs) / (1 + df)) + 1
+    weights = (1 + np.log(tf)) * idf[terms]
+    norms = np.sqrt(np.bincount(docs, weights=weights**2, minlength=n_docs))
+    weights /= norms[docs]
+
+    clusters = np.asarray(doc_clusters, dtype=np.int64)
+    centroids = np.zeros((len(cluster_index), n_features), dtype=np.float64)
+    np.add.at(centroids, (clusters[docs], terms), weights)
+    centroids /= np.bincount(clusters, minlength=len(cluster_index))[:, None]
+
+    ordered_ids = sorted(cluster_index, key=cluster_index.__getitem__)
+    return ordered_ids, centroids.astype(np.float32)
+
+
+def truncated_svd(
+    matrix: np.ndarray, dimensions: int, seed: int = 42, power_iterations: int = 4
+) -> np.ndarray:
+    """Рандомизированный truncated SVD (Halko et al.): U_k * S_k"""
+    n_rows, n_cols = matrix.shape
+    dimensions = max(1, min(dimensions, n_rows, n_cols))
+    rng = np.random.default_rng(seed)
+    oversampled = min(dimensions + 10, n_rows, n_cols)
+
+    basis = matrix @ rng.standard_normal((n_cols, oversampled)).astype(matrix.dtype)
+    for _ in range(power_iterations):
+        basis, _ = np.linalg.qr(basis)
+        basis, _ = np.linalg.qr(matrix.T @ basis)
+        basis = matrix @ basis
+    basis, _ = np.linalg.qr(basis)
+
+    u, s, _ = np.linalg.svd(basis.T @ matrix, full_matrices=False)
+    return (basis @ u[:, :dimensions]) * s[:dimensions]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def top_k_similar(
+    embeddings: np.ndarray, top_k: int, min_similarity: float
+) -> List[Tuple[int, int, float]]:
+    """
+    Пары (i, j), i < j, где j среди top_k ближайших к i или наоборот,
+    с косинусной близостью не ниже min_similarity
+    """
+    n = len(embeddings)
+    top_k = min(top_k, n - 1)
+    if top_k <= 0:
+        return []
+    unit = normalize_rows(embeddings.astype(np.float32))
+    pairs: Dict[Tuple[int, int], float] = {}
+
+    for start in range(0, n, SIMILARITY_BLOCK_SIZE):
+        block = unit[start : start + SIMILARITY_BLOCK_SIZE] @ unit.T
+        rows = np.arange(len(block))
+        block[rows, rows + start] = -np.inf
+        neighbours = np.argpartition(-block, top_k - 1, axis=1)[:, :top_k]
+        similarity = block[rows[:, None], neighbours]
+        for row, col, value in zip(
+            np.repeat(rows + start, top_k).tolist(),
+            neighbours.ravel().tolist(),
+            similarity.ravel().tolist(),
+        ):
+            if value >= min_similarity:
+                pairs[(min(row, col), max(row, col))] = value
+
+    return [(i, j, value) for (i, j), value in sorted(pairs.items())]
+
+
+def embed_clusters(
+    documents: Iterable[Tuple[int, str]],
+    dimensions: int = 64,
+    n_features: int = 4096,
+    seed: int = 42,
+) -> Tuple[List[int], np.ndarray]:
+    """id кластеров и их эмбеддинги (кластеры x dimensions)"""
+    cluster_ids, centroids = cluster_tfidf_centroids(documents, n_features)
+    if not cluster_ids:
+        return [], np.zeros((0, dimensions), dtype=np.float32)
+    centered = centroids - centroids.mean(axis=0)
+    return cluster_ids, truncated_svd(centered, dimensions, seed).astype(np.float32)
+
+
+def pca_3d(embeddings: np.ndarray) -> np.ndarray:
+    """Проекция на три главные компоненты (без sklearn)"""
+    centered = embeddings - embeddings.mean(axis=0)
+    _, _, components = np.linalg.svd(centered, full_matrices=False)
+    coords = centered @ components[:3].T
+    if coords.shape[1] < 3:
+        coords = np.pad(coords, ((0, 0), (0, 3 - coords.shape[1])))
+    return coords
+
+
+def as_lists(matrix: np.ndarray, decimals: int = 6) -> Sequence[List[float]]:
+    return np.round(matrix.astype(np.float64), decimals).tolist()
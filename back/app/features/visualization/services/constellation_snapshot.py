@@ -0,0 +1,383 @@
+"""
+Предрассчитанный граф созвездия кластеров
+
+Метрики кластеров (интервью, топ компаний, распределение уровней) и связи
+по совместной встречаемости в интервью меняются только при импорте
+вопросов, а их расчет - самый тяжелый запрос визуализации. Снимок
+строится целиком (без фильтров) и хранится в памяти процесса; фильтры
+по категориям, лимит и минимальные веса применяются к нему в памяти.
+
+Снимок перестраивается в фоновом потоке:
+- после импорта (`bump_constellation_version` увеличивает версию в Redis);
+- по расписанию, раз в `constellation_refresh_interval` секунд.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CONSTELLATION_VERSION_KEY = "constellation:version"
+
+CLUSTERS_QUERY = text(
+    """
+    WITH total_interviews AS (
+        SELECT COALESCE(NULLIF(COUNT(DISTINCT interview_id), 0), 1) AS total
+        FROM "InterviewQuestion" WHERE interview_id IS NOT NULL
+    ), interview_levels AS (
+        -- Уровень позиции классифицируется один раз на интервью
+        SELECT
+            id,
+            CASE WHEN position ILIKE '%junior%' OR position ILIKE '%стажер%'
+                THEN 1.0 ELSE 0.0 END AS is_junior,
+            CASE WHEN position ILIKE '%middle%' OR position ILIKE '%средний%'
+                THEN 1.0 ELSE 0.0 END AS is_middle,
+            CASE WHEN position ILIKE '%senior%' OR position ILIKE '%ведущий%'
+                OR position ILIKE '%тимлид%' THEN 1.0 ELSE 0.0 END AS is_senior
+        FROM "InterviewRecord"
+    ), company_ranks AS (
+        SELECT
+            cluster_id,
+            company,
+            ROW_NUMBER() OVER (
+                PARTITION BY cluster_id ORDER BY COUNT(*) DESC
+            ) AS company_rank
+        FROM "InterviewQuestion"
+        WHERE cluster_id IS NOT NULL AND company IS NOT NULL
+        GROUP BY cluster_id, company
+    ), top_companies AS (
+        SELECT cluster_id, ARRAY_AGG(company ORDER BY company_rank) AS companies
+        FROM company_ranks
+        WHERE company_rank <= 3
+        GROUP BY cluster_id
+    )
+    SELECT
+        c.id,
+        c.name,
+        c.category_id,
+        cat.name AS category_name,
+        c.keywords,
+        c.questions_count,
+        c.example_question,
+        COUNT(DISTINCT q.interview_id) AS interview_count,
+        ROUND(
+            COUNT(DISTINCT q.interview_id) * 100.0
+            / (SELECT total FROM total_interviews), 2
+        ) AS interview_penetration,
+        tc.companies AS top_companies,
+        COALESCE(ROUND(AVG(COALESCE(lv.is_junior, 0.0)) * 100, 1), 0) AS junior_pct,
+        COALESCE(ROUND(AVG(COALESCE(lv.is_middle, 0.0)) * 100, 1), 0) AS middle_pct,
+        COALESCE(ROUND(AVG(COALESCE(lv.is_senior, 0.0)) * 100, 1), 0) AS senior_pct
+    FROM "InterviewCluster" c
+    LEFT JOIN "InterviewQuestion" q ON c.id = q.cluster_id
+    LEFT JOIN interview_levels lv ON q.interview_id = lv.id
+    LEFT JOIN "InterviewCategory" cat ON c.category_id = cat.id
+    LEFT JOIN top_companies tc ON tc.cluster_id = c.id
+    GROUP BY c.id, c.name, c.category_id, cat.name, c.keywords,
+        c.questions_count, c.example_question, tc.companies
+    ORDER BY interview_penetration DESC, c.id
+    """
+)
+
+LINKS_QUERY = text(
+    """
+    WITH pairs AS (
+        SELECT DISTINCT q1.interview_id, q1.cluster_id AS c1, q2.cluster_id AS c2
+        FROM "InterviewQuestion" q1
+        JOIN "InterviewQuestion" q2
+            ON q1.interview_id = q2.interview_id AND q1.cluster_id < q2.cluster_id
+        WHERE q1.interview_id IS NOT NULL
+    )
+    SELECT c1, c2, COUNT(*) AS shared_interviews
+    FROM pairs
+    GROUP BY c1, c2
+    ORDER BY shared_interviews DESC
+    """
+)
+
+
+@dataclass(frozen=True)
+class ConstellationCluster:
+    """Кластер со всеми метриками, не зависящими от фильтров"""
+
+    id: int
+    name: str
+    category_id: str
+    category_name: Optional[str]
+    questions_count: int
+    interview_count: int
+    interview_penetration: float
+    keywords: Tuple[str, ...]
+    example_question: str
+    top_companies: Tuple[str, ...]
+    difficulty_distribution: Tuple[Tuple[str, float], ...]
+
+
+@dataclass
+class ConstellationSnapshot:
+    """Снимок графа одной версии; кластеры и связи отсортированы по убыванию"""
+
+    version: str
+    clusters: List[ConstellationCluster]
+    links: List[Tuple[int, int, int]]
+    categories: Dict[str, str]
+    built_at: float = field(default_factory=time.monotonic)
+
+    def build_graph(
+        self,
+        min_interview_count: int = 1,
+        min_link_weight: int = 3,
+        category_ids: Optional[List[str]] = None,
+        limit: int = 200,
+    ) -> Dict[str, Any]:
+        """Узлы, связи и статистика с фильтрами запроса"""
+        allowed = set(category_ids) if category_ids else None
+        selected = [
+            cluster
+            for cluster in self.clusters
+            if cluster.interview_count >= min_interview_count
+            and (allowed is None or cluster.category_id in allowed)
+        ][:limit]
+
+        max_questions = max((c.questions_count for c in selected), default=1) or 1
+        nodes = [
+            {
+                "id": cluster.id,
+                "name": cluster.name,
+                "category_id": cluster.category_id,
+                "category_name": cluster.category_name,
+                "questions_count": cluster.questions_count,
+                "interview_count": cluster.interview_count,
+                "interview_penetration": cluster.interview_penetration,
+                "keywords": list(cluster.keywords),
+                "example_question": cluster.example_question,
+                "size": cluster.questions_count / max_questions,
+                "top_companies": list(cluster.top_companies),
+                "difficulty_distribution": dict(cluster.difficulty_distribution),
+            }
+            for cluster in selected
+        ]
+
+        # Нормировка силы - по самой сильной связи среди всех кластеров,
+        # как и при расчете на лету
+        cluster_ids = {cluster.id for cluster in selected}
+        max_weight = next((w for _, _, w in self.links if w >= min_link_weight), 1)
+        links = [
+            {
+                "source": c1,
+                "target": c2,
+                "weight": weight,
+                "strength": weight / max_weight,
+            }
+            for c1, c2, weight in self.links
+            if weight >= min_link_weight and c1 in cluster_ids and c2 in cluster_ids
+        ]
+
+        stats = {
+            "total_clusters": len(nodes),
+            "total_links": len(links),
+            "avg_penetration": (
+                sum(n["interview_penetration"] for n in nodes) / len(nodes)
+                if nodes
+                else 0
+            ),
+            "max_cluster_size": max((n["questions_count"] for n in nodes), default=0),
+            "strongest_link": max((link["weight"] for link in links), default=0),
+            "snapshot_version": self.version,
+        }
+
+        return {
+            "nodes": nodes,
+            "links": links,
+            "categories": self.categories,
+            "stats": stats,
+        }
+
+
+def build_constellation_snapshot(
+    session: Session, version: str
+) -> ConstellationSnapshot:
+    """Рассчитать граф целиком: метрики всех кластеров и все связи"""
+    started = time.monotonic()
+
+    clusters = [
+        ConstellationCluster(
+            id=row.id,
+            name=row.name,
+            category_id=row.category_id,
+            category_name=row.category_name,
+            questions_count=row.questions_count or 0,
+            interview_count=row.interview_count,
+            interview_penetration=float(row.interview_penetration),
+            keywords=tuple(row.keywords or ()),
+            example_question=row.example_question or "",
+            top_companies=tuple(row.top_companies or ()),
+            difficulty_distribution=(
+                ("junior", float(row.junior_pct)),
+                ("middle", float(row.middle_pct)),
+                ("senior", float(row.senior_pct)),
+            ),
+        )
+        for row in session.execute(CLUSTERS_QUERY)
+    ]
+    links = [
+        (row.c1, row.c2, row.shared_interviews) for row in session.execute(LINKS_QUERY)
+    ]
+    categories = {
+        row.id: row.name
+        for row in session.execute(text('SELECT id, name FROM "InterviewCategory"'))
+    }
+
+    logger.info(
+        f"Constellation snapshot v{version} built: {len(clusters)} clusters, "
+        f"{len(links)} links in {(time.monotonic() - started) * 1000:.0f} ms"
+    )
+    return ConstellationSnapshot(
+        version=version, clusters=clusters, links=links, categories=categories
+    )
+
+
+class ConstellationCache:
+    """Снимок в памяти процесса с фоновым обновлением"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        check_interval: float,
+        refresh_interval: float,
+    ):
+        self.check_interval = check_interval
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[ConstellationSnapshot] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._redis = None
+        if redis_url:
+            import redis
+
+            self._redis = redis.from_url(redis_url, decode_responses=True)
+
+    def _remote_version(self) -> Optional[str]:
+        if self._redis is None:
+            return None
+        try:
+            return self._redis.get(CONSTELLATION_VERSION_KEY) or "0"
+        except Exception as e:
+            logger.warning(f"Constellation version check failed: {e}")
+            return None
+
+    def _is_stale(self, snapshot: ConstellationSnapshot) -> bool:
+        if time.monotonic() - snapshot.built_at > self.refresh_interval:
+            return True
+        remote = self._remote_version()
+        return remote is not None and remote != snapshot.version
+
+    def refresh(self, session: Session) -> ConstellationSnapshot:
+        """Перестроить снимок (запросы идут без блокировки читателей)"""
+        version = self._remote_version() or "local"
+        snapshot = build_constellation_snapshot(session, version)
+        self._snapshot = snapshot
+        return snapshot
+
+    def get(self, session: Session) -> ConstellationSnapshot:
+        """Текущий снимок; строится синхронно только при первом обращении"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                self.refresh(session)
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Пометить граф устаревшим во всех процессах"""
+        if self._redis is not None:
+            try:
+                self._redis.incr(CONSTELLATION_VERSION_KEY)
+                return
+            except Exception as e:
+                logger.warning(f"Constellation version bump failed: {e}")
+        # Без Redis фоновый поток увидит отсутствие снимка при следующей проверке
+        self._snapshot = None
+
+    def _refresh_loop(self) -> None:
+        from app.shared.database.base import db_manager
+
+        while not self._stop.wait(self.check_interval):
+            snapshot = self._snapshot
+            if snapshot is not None and not self._is_stale(snapshot):
+                continue
+            try:
+                with db_manager.get_session() as session:
+                    self.refresh(session)
+            except Exception as e:
+                # Оставляем предыдущий снимок, повторим на следующей проверке
+                logger.warning(f"Constellation snapshot refresh failed: {e}")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="constellation-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_cache: Optional[ConstellationCache] = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> ConstellationCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ConstellationCache(
+                redis_url=settings.redis_url,
+                check_interval=settings.constellation_check_interval,
+                refresh_interval=settings.constellation_refresh_interval,
+            )
+        return _cache
+
+
+def get_constellation_snapshot(session: Session) -> ConstellationSnapshot:
+    """Актуальный снимок созвездия (сессия нужна только для первого расчета)"""
+    return _get_cache().get(session)
+
+
+def bump_constellation_version() -> None:
+    """Вызывать после импорта вопросов или перекластеризации"""
+    _get_cache().invalidate()
+
+
+def start_constellation_refresher() -> None:
+    """Построить снимок и запустить фоновое обновление"""
+    from app.shared.database.base import db_manager
+
+    cache = _get_cache()
+    try:
+        with db_manager.get_session() as session:
+            cache.refresh(session)
+    except Exception as e:
+        logger.warning(f"Constellation snapshot warm-up failed: {e}")
+    cache.start()
+
+
+def stop_constellation_refresher() -> None:
+    if _cache is not None:
+        _cache.stop()
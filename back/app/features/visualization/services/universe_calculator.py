@@ -1,18 +1,23 @@
 """
 Universe Calculator for computing 3D positions of galaxies, clusters, and questions
+
+Positions are computed column-wise with NumPy (one RNG batch per layout stage)
+instead of per-item loops, so layouts scale to the whole question bank. Random
+offsets come from a seeded generator: the same input gives the same layout.
 """
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from app.features.visualization.services.cluster_embeddings import pca_3d
+
 logger = logging.getLogger(__name__)
 
 # Optional imports - will work without them
 try:
-    from sklearn.decomposition import PCA
     from sklearn.manifold import TSNE
     from sklearn.preprocessing import StandardScaler
 
@@ -21,13 +26,60 @@ except ImportError:
     SKLEARN_AVAILABLE = False
     logger.warning("scikit-learn not installed, some features will be limited")
 
+try:
+    from scipy import sparse
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+DIFFICULTY_KEYWORDS = {
+    "advanced": 3,
+    "complex": 3,
+    "optimization": 2,
+    "algorithm": 2,
+    "architecture": 3,
+    "design pattern": 2,
+    "performance": 2,
+    "senior": 3,
+    "expert": 3,
+}
+
+# Separate RNG streams per stage: adding questions does not move planets
+_CLUSTER_STREAM, _COMPANY_STREAM, _QUESTION_STREAM = 0, 1, 2
+
+# Minimum shared keywords for a semantic connection
+MIN_SHARED_KEYWORDS = 2
+
+# Cluster pairs buffered before merging counts (numpy fallback without scipy)
+PAIR_CHUNK_SIZE = 4_000_000
+
+
+def _rows(columns: Dict[str, Any], size: int) -> List[Dict[str, Any]]:
+    """Column arrays/lists -> list of row dicts (tolist() gives Python scalars)"""
+    names = list(columns)
+    values = [
+        column.tolist() if isinstance(column, np.ndarray) else column
+        for column in columns.values()
+    ]
+    return [dict(zip(names, row)) for row in zip(*values)] if size else []
+
 
 class UniverseCalculator:
     """Calculate 3D positions for Interview Universe visualization"""
 
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = 42):
         self.golden_ratio = (1 + np.sqrt(5)) / 2
         self.scaler = StandardScaler() if SKLEARN_AVAILABLE else None
+        self.seed = seed
+        self._difficulty_cache: Dict[str, int] = {}
+
+    def _rng(self, stream: int) -> np.random.Generator:
+        """Seeded generator for one layout stage (seed=None - random layout)"""
+        if self.seed is None:
+            return np.random.default_rng()
+        return np.random.default_rng([self.seed, stream])
 
     def calculate_galaxy_positions(
         self, categories: List[Dict[str, Any]]
@@ -36,64 +88,53 @@ class UniverseCalculator:
         Calculate spiral galaxy positions for categories
         Uses golden ratio spiral for optimal distribution
         """
-        positions = []
-        total_questions = sum(cat.get("questions_count", 0) for cat in categories)
-
-        for i, category in enumerate(categories):
-            # Golden ratio spiral for even distribution
-            angle = 2 * np.pi * i / self.golden_ratio
-
-            # Radius based on relative importance (question count)
-            question_ratio = category.get("questions_count", 0) / max(
-                total_questions, 1
-            )
-            radius = 50 + (question_ratio * 150)  # 50-200 units
-
-            # Vertical spread for 3D effect
-            z = (i - len(categories) / 2) * 20
-
-            # Calculate luminosity based on activity
-            luminosity = self._calculate_luminosity(category)
-
-            positions.append(
-                {
-                    "id": category.get("id"),
-                    "name": category.get("name"),
-                    "galaxy_x": float(radius * np.cos(angle)),
-                    "galaxy_y": float(radius * np.sin(angle)),
-                    "galaxy_z": float(z),
-                    "spiral_arm_angle": float(angle),
-                    "luminosity": float(luminosity),
-                    "spiral_arm": i % 3,  # 3 spiral arms
-                    "metadata": {
+        n = len(categories)
+        counts = np.array(
+            [category.get("questions_count", 0) for category in categories], dtype=float
+        )
+        index = np.arange(n)
+
+        # Golden ratio spiral; radius 50-200 by share of questions
+        angle = 2 * np.pi * index / self.golden_ratio
+        radius = 50 + counts / max(counts.sum(), 1) * 150
+
+        return _rows(
+            {
+                "id": [category.get("id") for category in categories],
+                "name": [category.get("name") for category in categories],
+                "galaxy_x": radius * np.cos(angle),
+                "galaxy_y": radius * np.sin(angle),
+                "galaxy_z": (index - n / 2) * 20.0,  # Vertical spread for 3D
+                "spiral_arm_angle": angle,
+                "luminosity": self._calculate_luminosity(counts),
+                "spiral_arm": index % 3,  # 3 spiral arms
+                "metadata": [
+                    {
                         "questions_count": category.get("questions_count", 0),
                         "clusters_count": category.get("clusters_count", 0),
                         "percentage": category.get("percentage", 0),
-                    },
-                }
-            )
-
-        return positions
+                    }
+                    for category in categories
+                ],
+            },
+            n,
+        )
 
     def calculate_cluster_positions(
         self,
         clusters: List[Dict[str, Any]],
         embeddings: Optional[np.ndarray] = None,
         use_tsne: bool = True,
-    ) -> np.ndarray:
+    ) -> List[Dict[str, Any]]:
         """
         Calculate 3D positions for clusters using embeddings
-        Falls back to random distribution if embeddings not available
+        Falls back to spherical distribution if embeddings not available
         """
         n_clusters = len(clusters)
 
-        if (
-            embeddings is not None
-            and embeddings.shape[0] == n_clusters
-            and SKLEARN_AVAILABLE
-        ):
+        if embeddings is not None and n_clusters and embeddings.shape[0] == n_clusters:
             # Use actual embeddings for semantic positioning
-            if use_tsne and n_clusters > 30:
+            if SKLEARN_AVAILABLE and use_tsne and n_clusters > 30:
                 # t-SNE for better local structure preservation
                 perplexity = min(30, n_clusters - 1)
                 tsne = TSNE(
@@ -106,9 +147,8 @@ class UniverseCalculator:
                 )
                 coords_3d = tsne.fit_transform(embeddings)
             else:
-                # PCA for smaller datasets or faster computation
-                pca = PCA(n_components=3)
-                coords_3d = pca.fit_transform(embeddings)
+                # PCA for smaller datasets, faster computation or no sklearn
+                coords_3d = pca_3d(embeddings)
 
             # Normalize and scale
             if self.scaler:
@@ -126,37 +166,70 @@ class UniverseCalculator:
             logger.warning("No embeddings provided, using spherical distribution")
             coords_3d = self._generate_spherical_distribution(n_clusters)
 
-        # Add orbital motion parameters
-        positions = []
-        for i, cluster in enumerate(clusters):
-            # Calculate temperature (difficulty) based on keywords
-            temperature = self._estimate_difficulty(cluster)
-
-            # Mass represents importance (based on question count)
-            mass = float(np.log1p(cluster.get("questions_count", 1)) * 10)
-
-            # Orbital parameters for animation
-            category_idx = self._get_category_index(cluster.get("category_id"))
-            orbit_radius = float(30 + (i % 5) * 15)  # Varying orbital radii
-            orbit_speed = float(0.5 + (np.random.random() * 0.5))  # Varying speeds
-
-            positions.append(
-                {
-                    "id": cluster.get("id"),
-                    "name": cluster.get("name"),
-                    "star_x": float(coords_3d[i, 0]),
-                    "star_y": float(coords_3d[i, 1]),
-                    "star_z": float(coords_3d[i, 2]),
-                    "temperature": int(temperature),
-                    "mass": mass,
-                    "orbit_radius": orbit_radius,
-                    "orbit_speed": orbit_speed,
-                    "category_id": cluster.get("category_id"),
-                    "questions_count": cluster.get("questions_count", 0),
-                }
-            )
-
-        return positions
+        # Mass represents importance (question count), temperature - difficulty
+        counts = np.array(
+            [cluster.get("questions_count", 1) for cluster in clusters], dtype=float
+        )
+        rng = self._rng(_CLUSTER_STREAM)
+
+        return _rows(
+            {
+                "id": [cluster.get("id") for cluster in clusters],
+                "name": [cluster.get("name") for cluster in clusters],
+                "star_x": coords_3d[:, 0],
+                "star_y": coords_3d[:, 1],
+                "star_z": coords_3d[:, 2],
+                "temperature": [
+                    self._estimate_difficulty(cluster) for cluster in clusters
+                ],
+                "mass": np.log1p(counts) * 10,
+                # Orbital parameters for animation
+                "orbit_radius": 30.0 + (np.arange(n_clusters) % 5) * 15,
+                "orbit_speed": 0.5 + rng.random(n_clusters) * 0.5,
+                "category_id": [cluster.get("category_id") for cluster in clusters],
+                "questions_count": [
+                    cluster.get("questions_count", 0) for cluster in clusters
+                ],
+            },
+            n_clusters,
+        )
+
+    def company_layout(
+        self, companies: List[Dict[str, Any]], clusters: List[Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Planet positions as columns: xyz (n, 3), cluster_index, orbit_angle,
+        orbit_distance, size. clusters - output of calculate_cluster_positions
+        """
+        n = len(companies) if clusters else 0
+        stars = np.array(
+            [[c["star_x"], c["star_y"], c["star_z"]] for c in clusters], dtype=float
+        ).reshape(-1, 3)
+        cluster_index = self._primary_cluster_indices(companies[:n], clusters)
+
+        rng = self._rng(_COMPANY_STREAM)
+        orbit_angle = rng.random(n) * 2 * np.pi
+        orbit_distance = 10 + rng.random(n) * 20
+        offset_z = (rng.random(n) - 0.5) * 10
+
+        xyz = stars[cluster_index] + np.column_stack(
+            [
+                orbit_distance * np.cos(orbit_angle),
+                orbit_distance * np.sin(orbit_angle),
+                offset_z,
+            ]
+        )
+        counts = np.array(
+            [company.get("questions_count", 1) for company in companies[:n]],
+            dtype=float,
+        )
+        return {
+            "xyz": xyz.reshape(-1, 3),
+            "cluster_index": cluster_index,
+            "orbit_angle": orbit_angle,
+            "orbit_distance": orbit_distance,
+            "size": np.log1p(counts) * 2,
+        }
 
     def calculate_company_positions(
         self, companies: List[Dict[str, Any]], clusters: List[Dict[str, Any]]
@@ -164,45 +237,87 @@ class UniverseCalculator:
         """
         Calculate positions for companies as planets orbiting clusters
         """
-        positions = []
-        cluster_map = {c["id"]: c for c in clusters}
-
-        for company in companies:
-            # Find primary cluster for this company
-            primary_cluster = self._find_primary_cluster(company, cluster_map)
-
-            if primary_cluster:
-                # Calculate orbital position around cluster
-                orbit_angle = np.random.random() * 2 * np.pi
-                orbit_distance = 10 + np.random.random() * 20
-
-                planet_x = primary_cluster["star_x"] + orbit_distance * np.cos(
-                    orbit_angle
-                )
-                planet_y = primary_cluster["star_y"] + orbit_distance * np.sin(
-                    orbit_angle
-                )
-                planet_z = primary_cluster["star_z"] + (np.random.random() - 0.5) * 10
-
-                positions.append(
+        layout = self.company_layout(companies, clusters)
+        n = len(layout["orbit_angle"])
+        cluster_ids = [cluster["id"] for cluster in clusters]
+
+        return _rows(
+            {
+                "id": [company.get("id") for company in companies[:n]],
+                "name": [company.get("company_name") for company in companies[:n]],
+                "x": layout["xyz"][:, 0],
+                "y": layout["xyz"][:, 1],
+                "z": layout["xyz"][:, 2],
+                "primary_cluster_id": [
+                    cluster_ids[i] for i in layout["cluster_index"].tolist()
+                ],
+                "orbit_angle": layout["orbit_angle"],
+                "orbit_distance": layout["orbit_distance"],
+                "size": layout["size"],
+                "metadata": [
                     {
-                        "id": company.get("id"),
-                        "name": company.get("company_name"),
-                        "x": planet_x,
-                        "y": planet_y,
-                        "z": planet_z,
-                        "primary_cluster_id": primary_cluster["id"],
-                        "orbit_angle": orbit_angle,
-                        "orbit_distance": orbit_distance,
-                        "size": np.log1p(company.get("questions_count", 1)) * 2,
-                        "metadata": {
-                            "questions_count": company.get("questions_count", 0),
-                            "categories": company.get("categories", []),
-                        },
+                        "questions_count": company.get("questions_count", 0),
+                        "categories": company.get("categories", []),
                     }
-                )
+                    for company in companies[:n]
+                ],
+            },
+            n,
+        )
 
-        return positions
+    def question_layout(
+        self,
+        questions: List[Dict[str, Any]],
+        company_positions: Dict[str, Dict[str, float]],
+    ) -> Dict[str, np.ndarray]:
+        """
+        Satellite positions as columns for questions whose company has a
+        position: question_index (into questions), xyz (n, 3), orbit_angle,
+        distance, glow
+        """
+        company_ids = list(company_positions)
+        company_index = {company_id: i for i, company_id in enumerate(company_ids)}
+        centers = np.array(
+            [
+                [
+                    company_positions[c]["x"],
+                    company_positions[c]["y"],
+                    company_positions[c]["z"],
+                ]
+                for c in company_ids
+            ],
+            dtype=float,
+        ).reshape(-1, 3)
+
+        owner = np.fromiter(
+            (
+                company_index.get(company, -1) if company else -1
+                for company in (question.get("company") for question in questions)
+            ),
+            dtype=np.int64,
+            count=len(questions),
+        )
+        question_index = np.flatnonzero(owner >= 0)
+        n = len(question_index)
+
+        # Random point on a sphere shell of radius 2-5 around the company
+        rng = self._rng(_QUESTION_STREAM)
+        angle = rng.random(n) * 2 * np.pi
+        phi = rng.random(n) * np.pi
+        distance = 2 + rng.random(n) * 3
+        sin_phi = np.sin(phi)
+        offsets = distance[:, None] * np.column_stack(
+            [sin_phi * np.cos(angle), sin_phi * np.sin(angle), np.cos(phi)]
+        )
+
+        return {
+            "question_index": question_index,
+            "company_index": owner[question_index],
+            "xyz": centers[owner[question_index]] + offsets,
+            "orbit_angle": angle,
+            "distance": distance,
+            "glow": self._calculate_question_glow(rng, n),
+        }
 
     def calculate_question_positions(
         self,
@@ -212,70 +327,122 @@ class UniverseCalculator:
         """
         Calculate positions for questions as satellites around companies
         """
-        positions = []
-
-        for question in questions:
-            company_id = question.get("company")
-            if company_id and company_id in company_positions:
-                company_pos = company_positions[company_id]
-
-                # Random satellite position around company
-                sat_angle = np.random.random() * 2 * np.pi
-                sat_phi = np.random.random() * np.pi
-                sat_distance = 2 + np.random.random() * 3
-
-                sat_x = company_pos["x"] + sat_distance * np.sin(sat_phi) * np.cos(
-                    sat_angle
-                )
-                sat_y = company_pos["y"] + sat_distance * np.sin(sat_phi) * np.sin(
-                    sat_angle
-                )
-                sat_z = company_pos["z"] + sat_distance * np.cos(sat_phi)
+        layout = self.question_layout(questions, company_positions)
+        placed = [questions[i] for i in layout["question_index"].tolist()]
+        company_ids = list(company_positions)
+
+        return _rows(
+            {
+                "id": [question.get("id") for question in placed],
+                "x": layout["xyz"][:, 0],
+                "y": layout["xyz"][:, 1],
+                "z": layout["xyz"][:, 2],
+                "satellite_orbit_angle": layout["orbit_angle"],
+                "satellite_distance": layout["distance"],
+                "glow_intensity": layout["glow"],
+                "company_id": [
+                    company_ids[i] for i in layout["company_index"].tolist()
+                ],
+                "cluster_id": [question.get("cluster_id") for question in placed],
+            },
+            len(placed),
+        )
+
+    def shared_keyword_counts(
+        self, clusters: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pairs of clusters (i < j) sharing keywords and the number of shared
+        keywords, ordered by (i, j)
 
-                positions.append(
-                    {
-                        "id": question.get("id"),
-                        "x": sat_x,
-                        "y": sat_y,
-                        "z": sat_z,
-                        "satellite_orbit_angle": sat_angle,
-                        "satellite_distance": sat_distance,
-                        "glow_intensity": self._calculate_question_glow(question),
-                        "company_id": company_id,
-                        "cluster_id": question.get("cluster_id"),
-                    }
-                )
+        Computed as the upper triangle of A @ A.T, where A is the sparse
+        cluster x keyword incidence matrix: cost is proportional to the
+        number of co-occurring pairs, not n^2.
+        """
+        n = len(clusters)
+        vocabulary: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for i, cluster in enumerate(clusters):
+            for keyword in set(cluster.get("keywords") or ()):
+                rows.append(i)
+                cols.append(vocabulary.setdefault(keyword, len(vocabulary)))
+
+        empty = np.empty(0, dtype=np.int64)
+        if not rows:
+            return empty, empty, empty
+        rows_array = np.asarray(rows, dtype=np.int64)
+        cols_array = np.asarray(cols, dtype=np.int64)
+
+        if SCIPY_AVAILABLE:
+            incidence = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.int32), (rows_array, cols_array)),
+                shape=(n, len(vocabulary)),
+            )
+            shared = sparse.triu(incidence @ incidence.T, k=1).tocoo()
+            order = np.lexsort((shared.col, shared.row))
+            return (
+                shared.row[order].astype(np.int64),
+                shared.col[order].astype(np.int64),
+                shared.data[order].astype(np.int64),
+            )
 
-        return positions
+        # Without scipy: for each keyword, all pairs of its clusters; pair
+        # counts are merged in chunks so hub keywords do not hold every pair
+        order = np.lexsort((rows_array, cols_array))
+        members = rows_array[order]
+        bounds = np.flatnonzero(np.diff(cols_array[order])) + 1
+        codes, counts = empty, empty
+        pending: List[np.ndarray] = []
+        pending_size = 0
+        for group in np.split(members, bounds):
+            if len(group) < 2:
+                continue
+            # members are sorted within a keyword, so left < right
+            left, right = np.triu_indices(len(group), k=1)
+            pending.append(group[left] * n + group[right])
+            pending_size += len(left)
+            if pending_size >= PAIR_CHUNK_SIZE:
+                codes, counts = self._merge_pair_counts(codes, counts, pending)
+                pending, pending_size = [], 0
+        if pending:
+            codes, counts = self._merge_pair_counts(codes, counts, pending)
+        return codes // n, codes % n, counts
+
+    @staticmethod
+    def _merge_pair_counts(
+        codes: np.ndarray, counts: np.ndarray, pending: List[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Add pending pair codes (one occurrence each) to sorted code counts"""
+        merged, inverse = np.unique(
+            np.concatenate([codes, *pending]), return_inverse=True
+        )
+        weights = np.concatenate(
+            [counts, np.ones(sum(len(chunk) for chunk in pending), dtype=np.int64)]
+        )
+        return merged, np.bincount(inverse, weights=weights).astype(np.int64)
 
     def calculate_connections(
         self, clusters: List[Dict[str, Any]], min_weight: int = 10
     ) -> List[Dict[str, Any]]:
         """
-        Calculate semantic and co-occurrence connections between clusters
+        Calculate semantic connections between clusters (shared keywords)
         """
-        connections = []
-
-        # This would typically query the database for co-occurrence data
-        # For now, returning placeholder structure
-        for i, source in enumerate(clusters):
-            for j, target in enumerate(clusters[i + 1 :], i + 1):
-                # Simulate connection weight based on shared keywords
-                source_keywords = set(source.get("keywords", []))
-                target_keywords = set(target.get("keywords", []))
-                shared = len(source_keywords & target_keywords)
-
-                if shared >= 2:  # At least 2 shared keywords
-                    connections.append(
-                        {
-                            "source_cluster_id": source["id"],
-                            "target_cluster_id": target["id"],
-                            "connection_weight": float(shared * 5),
-                            "connection_type": "semantic",
-                        }
-                    )
-
-        return connections
+        sources, targets, shared = self.shared_keyword_counts(clusters)
+        weights = shared * 5.0
+        keep = (shared >= MIN_SHARED_KEYWORDS) & (weights >= min_weight)
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+
+        cluster_ids = [cluster["id"] for cluster in clusters]
+        return _rows(
+            {
+                "source_cluster_id": [cluster_ids[i] for i in sources.tolist()],
+                "target_cluster_id": [cluster_ids[i] for i in targets.tolist()],
+                "connection_weight": weights,
+                "connection_type": ["semantic"] * len(weights),
+            },
+            len(weights),
+        )
 
     def calculate_heat_signatures(
         self,
@@ -303,33 +470,29 @@ class UniverseCalculator:
         return heat_map
 
     # Helper methods
-    def _calculate_luminosity(self, category: Dict[str, Any]) -> float:
+    def _calculate_luminosity(self, questions_counts: np.ndarray) -> np.ndarray:
         """Calculate galaxy luminosity based on activity and size"""
         base_luminosity = 0.5
-        size_factor = min(category.get("questions_count", 0) / 1000, 1.0) * 0.3
+        size_factor = np.minimum(questions_counts / 1000, 1.0) * 0.3
         activity_factor = 0.2  # Would be calculated from recent activity
         return base_luminosity + size_factor + activity_factor
 
     def _estimate_difficulty(self, cluster: Dict[str, Any]) -> int:
         """Estimate difficulty level (1-10) based on keywords"""
-        keywords = cluster.get("keywords", [])
-        difficulty_keywords = {
-            "advanced": 3,
-            "complex": 3,
-            "optimization": 2,
-            "algorithm": 2,
-            "architecture": 3,
-            "design pattern": 2,
-            "performance": 2,
-            "senior": 3,
-            "expert": 3,
-        }
-
         score = 5  # Base difficulty
-        for keyword in keywords:
-            for diff_key, points in difficulty_keywords.items():
-                if diff_key in keyword.lower():
-                    score = min(10, score + points)
+        for keyword in cluster.get("keywords", []):
+            points = self._difficulty_cache.get(keyword)
+            if points is None:
+                lowered = keyword.lower()
+                points = sum(
+                    value
+                    for diff_key, value in DIFFICULTY_KEYWORDS.items()
+                    if diff_key in lowered
+                )
+                self._difficulty_cache[keyword] = points
+            score += points
+            if score >= 10:
+                return 10
 
         return score
 
@@ -365,17 +528,23 @@ class UniverseCalculator:
         }
         return category_map.get(category_id, 0)
 
-    def _find_primary_cluster(
-        self, company: Dict[str, Any], cluster_map: Dict[int, Dict[str, Any]]
-    ) -> Optional[Dict[str, Any]]:
-        """Find the primary cluster for a company based on question distribution"""
-        # This would typically analyze actual question distribution
-        # For now, return random cluster
-        if cluster_map:
-            return list(cluster_map.values())[0]
-        return None
-
-    def _calculate_question_glow(self, question: Dict[str, Any]) -> float:
+    def _primary_cluster_indices(
+        self, companies: List[Dict[str, Any]], clusters: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Index of the primary cluster for each company"""
+        # This would typically analyze actual question distribution;
+        # companies without primary_cluster_id orbit the first cluster
+        cluster_index = {cluster["id"]: i for i, cluster in enumerate(clusters)}
+        return np.fromiter(
+            (
+                cluster_index.get(company.get("primary_cluster_id"), 0)
+                for company in companies
+            ),
+            dtype=np.int64,
+            count=len(companies),
+        )
+
+    def _calculate_question_glow(self, rng: np.random.Generator, n: int) -> np.ndarray:
         """Calculate glow intensity based on question popularity/difficulty"""
         # This would be based on actual metrics
-        return np.random.random() * 0.5 + 0.5
+        return rng.random(n) * 0.5 + 0.5
@@ -0,0 +1,193 @@
+"""
+Предрасчет геометрии 3D вселенной кластеров
+
+Пакетная задача (scripts/build_universe_layout.py) строит эмбеддинги
+кластеров по текстам вопросов, один раз раскладывает их в 3D и пишет
+координаты, эмбеддинги и семантические связи в InterviewCluster и
+ClusterConnections. API только читает готовую геометрию.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.features.visualization.services.cluster_embeddings import (
+    as_lists,
+    embed_clusters,
+    top_k_similar,
+)
+from app.features.visualization.services.universe_calculator import (
+    UniverseCalculator,
+)
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CONNECTION = "semantic"
+QUESTIONS_BATCH_SIZE = 5000
+
+QUESTIONS_QUERY = text(
+    """
+    SELECT cluster_id, question_text
+    FROM "InterviewQuestion"
+    WHERE cluster_id IS NOT NULL
+    """
+)
+
+CLUSTERS_QUERY = text(
+    """
+    SELECT id, name, category_id, keywords, questions_count
+    FROM "InterviewCluster"
+    """
+)
+
+RESET_GEOMETRY = text(
+    """
+    UPDATE "InterviewCluster"
+    SET star_x = NULL, star_y = NULL, star_z = NULL, temperature = NULL,
+        mass = NULL, orbit_radius = NULL, orbit_speed = NULL,
+        embedding_vector = NULL
+    WHERE star_x IS NOT NULL OR embedding_vector IS NOT NULL
+    """
+)
+
+UPDATE_GEOMETRY = text(
+    """
+    UPDATE "InterviewCluster"
+    SET star_x = :star_x, star_y = :star_y, star_z = :star_z,
+        temperature = :temperature, mass = :mass,
+        orbit_radius = :orbit_radius, orbit_speed = :orbit_speed,
+        embedding_vector = :embedding_vector, "updatedAt" = NOW()
+    WHERE id = :id
+    """
+)
+
+DELETE_CONNECTIONS = text(
+    'DELETE FROM "ClusterConnections" WHERE connection_type = :connection_type'
+)
+
+INSERT_CONNECTION = text(
+    """
+    INSERT INTO "ClusterConnections"
+        (source_cluster_id, target_cluster_id, connection_weight, connection_type)
+    VALUES (:source, :target, :weight, :connection_type)
+    ON CONFLICT (source_cluster_id, target_cluster_id) DO UPDATE
+    SET connection_weight = EXCLUDED.connection_weight,
+        connection_type = EXCLUDED.connection_type,
+        updated_at = NOW()
+    """
+)
+
+STARS_QUERY = text(
+    """
+    SELECT id, name, category_id, questions_count, star_x, star_y, star_z,
+           temperature, mass, orbit_radius, orbit_speed
+    FROM "InterviewCluster"
+    WHERE star_x IS NOT NULL
+    ORDER BY id
+    """
+)
+
+CONNECTIONS_QUERY = text(
+    """
+    SELECT source_cluster_id, target_cluster_id, connection_weight, connection_type
+    FROM "ClusterConnections"
+    WHERE connection_weight >= :min_weight
+    ORDER BY source_cluster_id, target_cluster_id
+    """
+)
+
+
+def compute_universe_layout(
+    session: Session,
+    *,
+    dimensions: int = 64,
+    n_features: int = 4096,
+    top_k: int = 5,
+    min_similarity: float = 0.3,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """Эмбеддинги, 3D координаты и связи кластеров (без записи в БД)"""
+    started = time.monotonic()
+    rows = session.execute(
+        QUESTIONS_QUERY, execution_options={"yield_per": QUESTIONS_BATCH_SIZE}
+    )
+    cluster_ids, embeddings = embed_clusters(
+        ((row.cluster_id, row.question_text) for row in rows),
+        dimensions=dimensions,
+        n_features=n_features,
+        seed=seed,
+    )
+    logger.info(
+        f"Embedded {len(cluster_ids)} clusters in {time.monotonic() - started:.1f}s"
+    )
+
+    clusters_by_id = {
+        row.id: dict(row._mapping) for row in session.execute(CLUSTERS_QUERY)
+    }
+    # Кластеры без вопросов в таблице остаются без геометрии
+    known = [
+        i for i, cluster_id in enumerate(cluster_ids) if cluster_id in clusters_by_id
+    ]
+    cluster_ids = [cluster_ids[i] for i in known]
+    embeddings = embeddings[known]
+    clusters = [clusters_by_id[cluster_id] for cluster_id in cluster_ids]
+
+    stars = UniverseCalculator(seed=seed).calculate_cluster_positions(
+        clusters, embeddings
+    )
+    connections = [
+        {
+            "source": cluster_ids[i],
+            "target": cluster_ids[j],
+            "weight": round(similarity, 4),
+            "connection_type": SEMANTIC_CONNECTION,
+        }
+        for i, j, similarity in top_k_similar(embeddings, top_k, min_similarity)
+    ]
+    return {"stars": stars, "embeddings": embeddings, "connections": connections}
+
+
+def save_universe_layout(session: Session, layout: Dict[str, Any]) -> None:
+    """Заменить геометрию кластеров и семантические связи (в транзакции вызывающего)"""
+    session.execute(RESET_GEOMETRY)
+    if layout["stars"]:
+        session.execute(
+            UPDATE_GEOMETRY,
+            [
+                {
+                    "id": star["id"],
+                    "star_x": star["star_x"],
+                    "star_y": star["star_y"],
+                    "star_z": star["star_z"],
+                    "temperature": star["temperature"],
+                    "mass": star["mass"],
+                    "orbit_radius": star["orbit_radius"],
+                    "orbit_speed": star["orbit_speed"],
+                    "embedding_vector": vector,
+                }
+                for star, vector in zip(layout["stars"], as_lists(layout["embeddings"]))
+            ],
+        )
+
+    session.execute(DELETE_CONNECTIONS, {"connection_type": SEMANTIC_CONNECTION})
+    if layout["connections"]:
+        session.execute(INSERT_CONNECTION, layout["connections"])
+
+
+def load_universe_geometry(
+    session: Session, min_weight: float = 0.0, limit: Optional[int] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Предрассчитанные звезды и связи между ними"""
+    stars = [dict(row._mapping) for row in session.execute(STARS_QUERY)]
+    if limit is not None:
+        stars = sorted(stars, key=lambda star: -(star["questions_count"] or 0))[:limit]
+    star_ids = {star["id"] for star in stars}
+    connections = [
+        dict(row._mapping)
+        for row in session.execute(CONNECTIONS_QUERY, {"min_weight": min_weight})
+        if row.source_cluster_id in star_ids and row.target_cluster_id in star_ids
+    ]
+    return {"stars": stars, "connections": connections}
@@ -0,0 +1,19 @@
+"""Снимок каталога контента, общий для всех пользователей"""
+
+from .snapshot import (
+    CatalogBlock,
+    CatalogSnapshot,
+    bump_catalog_version,
+    get_catalog_snapshot,
+    is_theory_quiz_category,
+    warm_catalog_snapshot,
+)
+
+__all__ = [
+    "CatalogBlock",
+    "CatalogSnapshot",
+    "bump_catalog_version",
+    "get_catalog_snapshot",
+    "is_theory_quiz_category",
+    "warm_catalog_snapshot",
+]
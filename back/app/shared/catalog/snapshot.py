@@ -0,0 +1,271 @@
+"""
+Версионированный снимок каталога контента
+
+Знаменатели статистики (сколько блоков и карточек в категории) одинаковы
+для всех пользователей и меняются только при импорте контента. Снимок
+строится одним проходом по каталогу и хранится в памяти процесса:
+- блоки контента: id -> категория, подкатегория, наличие кода;
+- карточки теории: id -> категория, подкатегория;
+- количество блоков и карточек по категориям.
+
+Инвалидация - через версию каталога в Redis (`bump_catalog_version` после
+импорта). Процессы сверяют версию не чаще раза в
+`catalog_snapshot_check_interval` секунд; без Redis снимок перестраивается
+по истечении `catalog_snapshot_max_age`.
+"""
+
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import GracefulDegradation
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.shared.models.content_models import ContentBlock, ContentFile
+from app.shared.models.theory_models import TheoryCard
+
+logger = get_logger(__name__)
+
+CATALOG_VERSION_KEY = "catalog:version"
+# Сколько производных значений (фасеты и т.п.) хранить на один снимок
+MAX_DERIVED_ENTRIES = 256
+
+CategoryKey = Tuple[str, Optional[str]]
+
+
+def is_theory_quiz_category(category: Optional[str]) -> bool:
+    """Карточки QUIZ/ПРАКТИКА - это задачи, а не теория"""
+    upper = (category or "").upper()
+    return "QUIZ" in upper or "ПРАКТИКА" in upper
+
+
+@dataclass(frozen=True)
+class CatalogBlock:
+    """Блок контента в снимке каталога"""
+
+    main_category: str
+    sub_category: str
+    has_code: bool
+
+
+@dataclass
+class CatalogSnapshot:
+    """Неизменяемый снимок каталога одной версии"""
+
+    version: str
+    blocks: Dict[str, CatalogBlock]
+    theory_cards: Dict[str, Tuple[str, Optional[str]]]
+    built_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        # Все блоки по (категория, подкатегория)
+        self.content_totals: Dict[CategoryKey, int] = Counter(
+            (block.main_category, block.sub_category) for block in self.blocks.values()
+        )
+        # Блоки с кодом по категориям без учета регистра (mindmap)
+        self.code_totals: Dict[CategoryKey, int] = Counter(
+            (block.main_category.lower(), block.sub_category.lower())
+            for block in self.blocks.values()
+            if block.has_code
+        )
+        # Карточки теории без QUIZ/ПРАКТИКА, пустая подкатегория -> General
+        self.theory_totals: Dict[CategoryKey, int] = Counter(
+            (category, sub_category or "General")
+            for category, sub_category in self.theory_cards.values()
+            if not is_theory_quiz_category(category)
+        )
+        # Карточки QUIZ/ПРАКТИКА (задачи)
+        self.quiz_totals: Dict[CategoryKey, int] = Counter(
+            (category, sub_category)
+            for category, sub_category in self.theory_cards.values()
+            if is_theory_quiz_category(category)
+        )
+        self._derived: Dict[Hashable, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    def memoize(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Значение, производное от каталога, кешированное на время жизни снимка
+
+        Подходит только для данных, не зависящих от пользователя: при смене
+        версии каталога снимок заменяется целиком вместе с этим кешем.
+        """
+        with self._derived_lock:
+            if key in self._derived:
+                return self._derived[key]
+        value = factory()
+        with self._derived_lock:
+            if len(self._derived) >= MAX_DERIVED_ENTRIES:
+                self._derived.pop(next(iter(self._derived)))
+            self._derived[key] = value
+        return value
+
+    def count_code_tasks(
+        self, main_category: str, sub_category: Optional[str] = None
+    ) -> int:
+        """Количество блоков с кодом в категории (без учета регистра)"""
+        main_key = main_category.lower()
+        if sub_category:
+            return self.code_totals.get((main_key, sub_category.lower()), 0)
+        return sum(
+            count for (main, _), count in self.code_totals.items() if main == main_key
+        )
+
+    def count_code_tasks_in(
+        self,
+        block_ids: Iterable[str],
+        main_category: str,
+        sub_category: Optional[str] = None,
+    ) -> int:
+        """Сколько из переданных блоков - задачи с кодом в категории"""
+        main_key = main_category.lower()
+        sub_key = sub_category.lower() if sub_category else None
+        count = 0
+        for block_id in block_ids:
+            block = self.blocks.get(block_id)
+            if (
+                block
+                and block.has_code
+                and block.main_category.lower() == main_key
+                and (sub_key is None or block.sub_category.lower() == sub_key)
+            ):
+                count += 1
+        return count
+
+
+def build_catalog_snapshot(session: Session, version: str) -> CatalogSnapshot:
+    """Построить снимок одним проходом по блокам и карточкам"""
+    started = time.monotonic()
+
+    block_rows = (
+        session.query(
+            ContentBlock.id,
+            ContentFile.mainCategory,
+            ContentFile.subCategory,
+            ContentBlock.codeContent.isnot(None),
+        )
+        .join(ContentFile, ContentBlock.fileId == ContentFile.id)
+        .all()
+    )
+    card_rows = session.query(
+        TheoryCard.id, TheoryCard.category, TheoryCard.subCategory
+    ).all()
+
+    snapshot = CatalogSnapshot(
+        version=version,
+        blocks={
+            block_id: CatalogBlock(main, sub, bool(has_code))
+            for block_id, main, sub, has_code in block_rows
+        },
+        theory_cards={card_id: (category, sub) for card_id, category, sub in card_rows},
+    )
+
+    logger.info(
+        f"Catalog snapshot v{version} built: {len(snapshot.blocks)} blocks, "
+        f"{len(snapshot.theory_cards)} cards in "
+        f"{(time.monotonic() - started) * 1000:.0f} ms"
+    )
+    return snapshot
+
+
+class CatalogSnapshotCache:
+    """Снимок каталога в памяти процесса с проверкой версии"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        check_interval: float,
+        max_age: float,
+    ):
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url:
+            import redis
+
+            self._redis = redis.from_url(redis_url, decode_responses=True)
+
+    def _remote_version(self) -> Optional[str]:
+        if self._redis is None:
+            return None
+        try:
+            return self._redis.get(CATALOG_VERSION_KEY) or "0"
+        except Exception as e:
+            return GracefulDegradation.handle_redis_error("catalog_version_get", e)
+
+    def _is_stale(self, snapshot: CatalogSnapshot, now: float) -> bool:
+        if now - snapshot.built_at > self.max_age:
+            return True
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        remote = self._remote_version()
+        return remote is not None and remote != snapshot.version
+
+    def get(self, session: Session) -> CatalogSnapshot:
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and not self._is_stale(snapshot, now):
+            return snapshot
+
+        with self._lock:
+            # Снимок мог перестроить другой поток, пока мы ждали блокировку
+            if self._snapshot is not None and self._snapshot.built_at >= now:
+                return self._snapshot
+            version = self._remote_version() or "local"
+            self._snapshot = build_catalog_snapshot(session, version)
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def bump_version(self) -> None:
+        """Пометить каталог измененным во всех процессах"""
+        self._snapshot = None
+        if self._redis is not None:
+            try:
+                self._redis.incr(CATALOG_VERSION_KEY)
+            except Exception as e:
+                GracefulDegradation.handle_redis_error("catalog_version_bump", e)
+
+
+_cache: Optional[CatalogSnapshotCache] = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> CatalogSnapshotCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CatalogSnapshotCache(
+                redis_url=settings.redis_url,
+                check_interval=settings.catalog_snapshot_check_interval,
+                max_age=settings.catalog_snapshot_max_age,
+            )
+        return _cache
+
+
+def get_catalog_snapshot(session: Session) -> CatalogSnapshot:
+    """Актуальный снимок каталога (сессия нужна только для перестроения)"""
+    return _get_cache().get(session)
+
+
+def bump_catalog_version() -> None:
+    """Вызывать после импорта или изменения контента"""
+    _get_cache().bump_version()
+
+
+def warm_catalog_snapshot() -> None:
+    """Построить снимок при старте приложения"""
+    from app.shared.database.base import db_manager
+
+    try:
+        with db_manager.get_session() as session:
+            get_catalog_snapshot(session)
+    except Exception as e:
+        logger.warning(f"Catalog snapshot warm-up failed: {e}")
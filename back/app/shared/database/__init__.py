@@ -7,9 +7,34 @@ from app.shared.exceptions.base import (
     ResourceNotFoundException,
 )
 
+from .async_base import (
+    get_async_db_manager,
+    get_async_session,
+    get_feature_session,
+    is_async_db_enabled,
+)
+from .async_repository import AsyncBaseRepository
 from .base import async_transactional, db_manager, transactional
+from .bulk_loader import (
+    INSERT_MISSING,
+    REPLACE,
+    UPSERT,
+    BulkLoader,
+    BulkLoadError,
+    BulkLoadResult,
+    RejectedRow,
+    iter_csv,
+    iter_json,
+)
 from .connection import Base, SessionLocal, engine, get_db
 from .models import AuditMixin, BaseModel, SoftDeleteMixin
+from .pagination import (
+    InvalidCursorError,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    text_select,
+)
 from .repository import BaseRepository, ReadOnlyRepository
 from .session import get_db_session, get_db_transaction
 
@@ -0,0 +1,141 @@
+"""
+Асинхронный доступ к БД (AsyncEngine + asyncpg)
+
+Синхронный движок psycopg2 блокирует event loop на время запроса, поэтому
+один медленный запрос задерживает все конкурентные запросы воркера.
+Асинхронный путь включается по фичам через `database_async_features`:
+зависимость `get_feature_session(feature)` отдает AsyncSession для
+включенных фич и обычную Session для остальных.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.core.logging import get_logger
+from app.core.metrics import instrument_engine
+from app.core.query_profiler import install_query_profiler
+from app.core.settings import settings
+
+logger = get_logger(__name__)
+
+
+def to_async_url(database_url: str) -> str:
+    """postgresql[+psycopg2]://... -> postgresql+asyncpg://..."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return database_url
+    # asyncpg не понимает sslmode из libpq, переносим в ssl
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    if sslmode:
+        query["ssl"] = sslmode
+    return url.set(drivername="postgresql+asyncpg", query=query).render_as_string(
+        hide_password=False
+    )
+
+
+class AsyncDatabaseManager:
+    """Менеджер асинхронных сессий БД"""
+
+    def __init__(self, database_url: str):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        self.engine = create_async_engine(
+            to_async_url(database_url),
+            echo=settings.database_echo,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+        )
+        instrument_engine(self.engine.sync_engine)
+        install_query_profiler(self.engine.sync_engine)
+
+        # expire_on_commit=False: после commit атрибуты читаются без
+        # неявного запроса (ленивая загрузка в async недоступна)
+        self.SessionLocal = async_sessionmaker(
+            self.engine, autoflush=False, expire_on_commit=False
+        )
+
+    @asynccontextmanager
+    async def get_session(self):
+        """Получить асинхронную сессию с автоматическим закрытием"""
+        async with self.SessionLocal() as session:
+            yield session
+
+    @asynccontextmanager
+    async def get_transaction(self):
+        """Получить транзакцию с автоматическим commit/rollback"""
+        async with self.SessionLocal() as session:
+            try:
+                async with session.begin():
+                    yield session
+                logger.debug("Async transaction committed successfully")
+            except Exception as e:
+                logger.error(f"Async transaction rolled back: {e}", exc_info=True)
+                raise
+
+    async def health_check(self) -> bool:
+        """Проверка состояния БД"""
+        try:
+            async with self.get_session() as session:
+                await session.execute(text("SELECT 1"))
+                return True
+        except Exception as e:
+            logger.error(f"Async database health check failed: {e}")
+            return False
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+
+
+_async_db_manager: Optional[AsyncDatabaseManager] = None
+
+
+def get_async_db_manager() -> AsyncDatabaseManager:
+    """Глобальный менеджер (движок создается при первом обращении)"""
+    global _async_db_manager
+    if _async_db_manager is None:
+        _async_db_manager = AsyncDatabaseManager(settings.database_url)
+    return _async_db_manager
+
+
+def is_async_db_enabled(feature: str) -> bool:
+    """Включен ли асинхронный доступ к БД для фичи"""
+    return feature in settings.database_async_features
+
+
+async def get_async_session() -> AsyncIterator:
+    """Dependency для получения асинхронной сессии БД"""
+    async with get_async_db_manager().get_session() as session:
+        yield session
+
+
+def get_feature_session(feature: str):
+    """
+    Dependency с сессией для фичи: AsyncSession, если фича переведена на
+    асинхронный доступ, иначе синхронная Session
+    """
+
+    async def dependency() -> AsyncIterator:
+        if is_async_db_enabled(feature):
+            async with get_async_db_manager().get_session() as session:
+                yield session
+        else:
+            from app.shared.database.base import db_manager
+
+            with db_manager.get_session() as session:
+                yield session
+
+    return dependency
+
+
+async def dispose_async_engine() -> None:
+    """Закрыть пул соединений при остановке приложения"""
+    global _async_db_manager
+    if _async_db_manager is not None:
+        await _async_db_manager.dispose()
+        _async_db_manager = None
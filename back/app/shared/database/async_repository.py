@@ -0,0 +1,56 @@
+"""
+Базовый репозиторий для фич, переведенных на асинхронный доступ к БД
+
+Сессия приходит из `get_feature_session(feature)`: AsyncSession, если фича
+есть в `database_async_features`, иначе обычная Session. Запросы строятся
+через select() и выполняются через _execute, который ожидает результат
+только для асинхронной сессии, поэтому методы репозитория одинаково
+работают в обоих режимах.
+"""
+
+import inspect
+from typing import Any, Generic, Optional, Type, TypeVar
+
+from sqlalchemy import select
+
+T = TypeVar("T")  # Generic type for model
+
+
+class AsyncBaseRepository(Generic[T]):
+    """Асинхронные методы поверх Session или AsyncSession"""
+
+    def __init__(self, session, model: Type[T]):
+        self.session = session
+        self.model = model
+        self.model_name = model.__name__
+
+    @staticmethod
+    async def _resolve(result):
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    async def _execute(self, statement):
+        return await self._resolve(self.session.execute(statement))
+
+    async def _scalars(self, statement) -> list:
+        return list((await self._execute(statement)).scalars().all())
+
+    async def _scalar(self, statement):
+        return (await self._execute(statement)).scalar()
+
+    async def _commit(self) -> None:
+        await self._resolve(self.session.commit())
+
+    async def _rollback(self) -> None:
+        await self._resolve(self.session.rollback())
+
+    async def _refresh(self, entity) -> None:
+        await self._resolve(self.session.refresh(entity))
+
+    async def _delete(self, entity) -> None:
+        await self._resolve(self.session.delete(entity))
+
+    async def get_by_id(self, entity_id: Any) -> Optional[T]:
+        """Сущность по ID"""
+        return await self._scalar(select(self.model).where(self.model.id == entity_id))
@@ -8,6 +8,8 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.logging import get_logger
+from app.core.metrics import instrument_engine
+from app.core.query_profiler import install_query_profiler
 from app.core.settings import settings
 
 logger = get_logger(__name__)
@@ -34,6 +36,8 @@ class DatabaseManager:
             pool_pre_ping=True,
             pool_recycle=3600,
         )
+        instrument_engine(self.engine)
+        install_query_profiler(self.engine)
 
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
@@ -0,0 +1,511 @@
+"""
+Массовая загрузка данных через PostgreSQL COPY
+
+Строки (dict) потоком пишутся в CSV буфер и пачками по `chunk_size`
+уходят `COPY ... FROM STDIN` во временную staging таблицу с колонками
+целевой. Затем одним запросом данные переносятся в целевую таблицу:
+
+- `upsert` - INSERT ... ON CONFLICT (key) DO UPDATE;
+- `insert_missing` - только строки, ключа которых еще нет в таблице;
+- `replace` - upsert плюс удаление строк, которых нет во входных данных.
+  Если в staging ничего не попало или есть отклоненные строки, replace
+  падает с `BulkLoadError` до удаления (иначе битый файл очистит таблицу);
+  `allow_partial_replace=True` отключает проверку.
+
+Все шаги идут в транзакции вызывающего: до commit читатели видят старые
+данные, после - новые целиком (атомарная замена без переименования
+таблиц, индексы и внешние ключи не пересоздаются).
+
+Отклоненные строки не прерывают загрузку, а попадают в
+`BulkLoadResult.rejected` с номером строки во входных данных и причиной:
+ошибка `transform`, пустой ключ или обязательная колонка, ошибка типа при
+COPY, отсутствующая запись по внешнему ключу.
+
+    loader = BulkLoader(session, "InterviewQuestion", QUESTION_COLUMNS, key=["id"])
+    result = loader.load(iter_csv(path), mode=REPLACE, transform=to_question)
+    session.commit()
+"""
+
+import csv
+import io
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+UPSERT = "upsert"
+INSERT_MISSING = "insert_missing"
+REPLACE = "replace"
+MODES = (UPSERT, INSERT_MISSING, REPLACE)
+
+DEFAULT_CHUNK_SIZE = 10_000
+ROW_NUMBER_COLUMN = "_bulk_row"
+NULL_MARKER = r"\N"
+
+# Обязательные колонки без значения по умолчанию
+NOT_NULL_COLUMNS = text(
+    """
+    SELECT attname
+    FROM pg_attribute
+    WHERE attrelid = CAST(:table AS regclass)
+      AND attnum > 0 AND NOT attisdropped
+      AND attnotnull AND NOT atthasdef AND attgenerated = ''
+    """
+)
+
+# Внешние ключи из одной колонки
+FOREIGN_KEYS = text(
+    """
+    SELECT a.attname AS column_name,
+           CAST(c.confrelid AS regclass)::text AS ref_table,
+           ra.attname AS ref_column
+    FROM pg_constraint c
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+    JOIN pg_attribute ra ON ra.attrelid = c.confrelid AND ra.attnum = c.confkey[1]
+    WHERE c.contype = 'f'
+      AND c.conrelid = CAST(:table AS regclass)
+      AND array_length(c.conkey, 1) = 1
+    """
+)
+
+Transform = Callable[[Mapping[str, Any]], Optional[Mapping[str, Any]]]
+
+
+class BulkLoadError(Exception):
+    """Загрузка остановлена до изменения целевой таблицы"""
+
+    def __init__(self, message: str, result: "BulkLoadResult"):
+        super().__init__(message)
+        self.result = result
+
+
+@dataclass
+class RejectedRow:
+    row: int
+    reason: str
+    data: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class BulkLoadResult:
+    table: str
+    mode: str
+    read: int = 0
+    staged: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    elapsed: float = 0.0
+    rejected: List[RejectedRow] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"{self.table}: прочитано {self.read}, вставлено {self.inserted}, "
+            f"обновлено {self.updated}, удалено {self.deleted}, "
+            f"пропущено {self.skipped}, дубликатов {self.duplicates}, "
+            f"отклонено {len(self.rejected)} за {self.elapsed:.1f}s"
+        )
+
+    def write_rejected(self, path: Path) -> None:
+        """Отклоненные строки в JSON Lines для разбора"""
+        with open(path, "w", encoding="utf-8") as f:
+            for rejected in self.rejected:
+                f.write(
+                    json.dumps(
+                        {
+                            "row": rejected.row,
+                            "reason": rejected.reason,
+                            "data": rejected.data,
+                        },
+                        ensure_ascii=False,
+                        default=str,
+                    )
+                    + "\n"
+                )
+
+
+def iter_csv(path: Path, **reader_kwargs) -> Iterator[Dict[str, Any]]:
+    """Строки CSV файла потоком; пустые значения - None"""
+    # utf-8-sig: BOM (pandas to_csv(encoding="utf-8-sig")) не попадает в
+    # имя первой колонки
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f, **reader_kwargs):
+            yield {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def iter_json(path: Path) -> Iterator[Dict[str, Any]]:
+    """Объекты из JSON массива или JSON Lines (.jsonl читается потоком)"""
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _array_literal(values: Iterable[Any]) -> str:
+    items = []
+    for value in values:
+        if value is None:
+            items.append("NULL")
+        else:
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            items.append(f'"{escaped}"')
+    return "{" + ",".join(items) + "}"
+
+
+def _is_null(value: Any) -> bool:
+    # NaN - пропуск в данных из pandas
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _csv_value(value: Any) -> str:
+    """Значение в формате COPY CSV: NULL без кавычек, остальное в кавычках"""
+    if _is_null(value):
+        return NULL_MARKER
+    if isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, (list, tuple, set)):
+        value = _array_literal(value)
+    elif isinstance(value, dict):
+        value = json.dumps(value, ensure_ascii=False)
+    else:
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def format_csv_row(values: Sequence[Any]) -> str:
+    return ",".join(_csv_value(value) for value in values) + "\n"
+
+
+class BulkLoader:
+    """Загрузка строк в таблицу через staging таблицу и COPY (psycopg2)"""
+
+    def __init__(
+        self,
+        session: Session,
+        table: str,
+        columns: Sequence[str],
+        key: Sequence[str],
+        *,
+        update_columns: Optional[Sequence[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_progress: Optional[Callable[[BulkLoadResult], None]] = None,
+    ):
+        missing_key = [column for column in key if column not in columns]
+        if not key or missing_key:
+            raise ValueError(f"Key columns must be loaded: {missing_key or key}")
+        self.session = session
+        self.table = table
+        self.columns = list(columns)
+        self.key = list(key)
+        self.update_columns = list(
+            update_columns
+            if update_columns is not None
+            else [column for column in self.columns if column not in self.key]
+        )
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.staging = quote_identifier(f"_bulk_{table.lower()}")
+        self.target = quote_identifier(table)
+
+    def load(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        *,
+        mode: str = UPSERT,
+        transform: Optional[Transform] = None,
+        allow_partial_replace: bool = False,
+    ) -> BulkLoadResult:
+        """
+        Загрузить строки в транзакции сессии (commit - на вызывающем)
+
+        transform(row) -> dict колонок, None (пропустить строку) или
+        ValueError/KeyError/TypeError (отклонить с причиной).
+        allow_partial_replace - разрешить REPLACE с пустым staging или
+        отклоненными строками.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown bulk load mode: {mode}")
+        started = time.monotonic()
+        result = BulkLoadResult(table=self.table, mode=mode)
+        required = self._required_columns()
+
+        self._create_staging()
+        chunk: List[Tuple[int, List[Any]]] = []
+        for number, row in enumerate(rows, start=1):
+            result.read = number
+            values = self._prepare(number, row, transform, required, result)
+            if values is None:
+                continue
+            chunk.append((number, values))
+            if len(chunk) >= self.chunk_size:
+                self._copy_chunk(chunk, result)
+                chunk = []
+        if chunk:
+            self._copy_chunk(chunk, result)
+
+        self._reject_missing_references(result)
+        if mode == REPLACE and not allow_partial_replace:
+            self._check_replace(result)
+        self._merge(mode, result)
+        result.elapsed = time.monotonic() - started
+        logger.info(
+            "Bulk load finished",
+            table=self.table,
+            mode=mode,
+            read=result.read,
+            inserted=result.inserted,
+            updated=result.updated,
+            deleted=result.deleted,
+            rejected=len(result.rejected),
+            elapsed=round(result.elapsed, 2),
+        )
+        return result
+
+    # --- подготовка строк ---
+
+    def _prepare(
+        self,
+        number: int,
+        row: Mapping[str, Any],
+        transform: Optional[Transform],
+        required: Sequence[str],
+        result: BulkLoadResult,
+    ) -> Optional[List[Any]]:
+        if transform is not None:
+            try:
+                row = transform(row)
+            except (ValueError, KeyError, TypeError) as e:
+                result.rejected.append(
+                    RejectedRow(number, f"{type(e).__name__}: {e}", dict(row))
+                )
+                return None
+            if row is None:
+                result.skipped += 1
+                return None
+
+        values = [row.get(column) for column in self.columns]
+        empty = [
+            column
+            for column, value in zip(self.columns, values)
+            if column in required and _is_null(value)
+        ]
+        if empty:
+            result.rejected.append(
+                RejectedRow(number, f"Пустые обязательные поля: {empty}", dict(row))
+            )
+            return None
+        return values
+
+    def _required_columns(self) -> List[str]:
+        not_null = {
+            name
+            for (name,) in self.session.execute(
+                NOT_NULL_COLUMNS, {"table": self.target}
+            )
+        }
+        return [
+            column
+            for column in self.columns
+            if column in not_null or column in self.key
+        ]
+
+    # --- staging и COPY ---
+
+    def _create_staging(self) -> None:
+        columns = ", ".join(quote_identifier(column) for column in self.columns)
+        self.session.execute(text(f"DROP TABLE IF EXISTS {self.staging}"))
+        self.session.execute(
+            text(
+                f"CREATE TEMP TABLE {self.staging} ON COMMIT DROP AS "
+                f"SELECT {columns}, 0::bigint AS {ROW_NUMBER_COLUMN} "
+                f"FROM {self.target} WITH NO DATA"
+            )
+        )
+
+    def _copy_sql(self) -> str:
+        columns = ", ".join(
+            quote_identifier(column) for column in [*self.columns, ROW_NUMBER_COLUMN]
+        )
+        return (
+            f"COPY {self.staging} ({columns}) FROM STDIN "
+            f"WITH (FORMAT csv, NULL '{NULL_MARKER}')"
+        )
+
+    def _copy_chunk(
+        self, chunk: List[Tuple[int, List[Any]]], result: BulkLoadResult
+    ) -> None:
+        connection = self.session.connection()
+        dbapi_error = connection.dialect.dbapi.Error
+        cursor = connection.connection.cursor()
+        try:
+            try:
+                self._copy_rows(cursor, chunk)
+                result.staged += len(chunk)
+            except dbapi_error:
+                # Ошибка типа в пачке: повторяем по одной строке, чтобы
+                # отклонить только плохие
+                for number, values in chunk:
+                    try:
+                        self._copy_rows(cursor, [(number, values)])
+                        result.staged += 1
+                    except dbapi_error as e:
+                        reason = str(e).strip().splitlines()[0]
+                        result.rejected.append(
+                            RejectedRow(number, reason, dict(zip(self.columns, values)))
+                        )
+        finally:
+            cursor.close()
+
+        logger.info(
+            "Bulk load progress",
+            table=self.table,
+            read=result.read,
+            staged=result.staged,
+            rejected=len(result.rejected),
+        )
+        if self.on_progress is not None:
+            self.on_progress(result)
+
+    def _copy_rows(self, cursor, chunk: List[Tuple[int, List[Any]]]) -> None:
+        buffer = io.StringIO()
+        for number, values in chunk:
+            buffer.write(format_csv_row([*values, number]))
+        buffer.seek(0)
+        cursor.execute("SAVEPOINT bulk_copy")
+        try:
+            cursor.copy_expert(self._copy_sql(), buffer)
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT bulk_copy")
+            raise
+        finally:
+            cursor.execute("RELEASE SAVEPOINT bulk_copy")
+
+    # --- перенос в целевую таблицу ---
+
+    def _reject_missing_references(self, result: BulkLoadResult) -> None:
+        """Убрать из staging строки со ссылками на несуществующие записи"""
+        for column, ref_table, ref_column in self.session.execute(
+            FOREIGN_KEYS, {"table": self.target}
+        ):
+            if column not in self.columns:
+                continue
+            quoted = quote_identifier(column)
+            missing = self.session.execute(
+                text(
+                    f"DELETE FROM {self.staging} s "
+                    f"WHERE s.{quoted} IS NOT NULL AND NOT EXISTS ("
+                    f"SELECT 1 FROM {ref_table} r "
+                    f"WHERE r.{quote_identifier(ref_column)} = s.{quoted}) "
+                    f"RETURNING s.{ROW_NUMBER_COLUMN}, s.{quoted}"
+                )
+            ).all()
+            for number, value in missing:
+                result.rejected.append(
+                    RejectedRow(
+                        number,
+                        f"Нет записи {ref_table}.{ref_column} = {value!r}",
+                        {column: value},
+                    )
+                )
+        result.rejected.sort(key=lambda rejected: rejected.row)
+
+    def _check_replace(self, result: BulkLoadResult) -> None:
+        """REPLACE удаляет все, чего нет в staging: неполные данные не заменяют таблицу"""
+        if not result.staged:
+            raise BulkLoadError(
+                f"{self.table}: нет строк для замены "
+                f"(прочитано {result.read}, отклонено {len(result.rejected)})",
+                result,
+            )
+        if result.rejected:
+            first = result.rejected[0]
+            raise BulkLoadError(
+                f"{self.table}: отклонено {len(result.rejected)} строк, замена "
+                f"отменена (строка {first.row}: {first.reason})",
+                result,
+            )
+
+    def _merge(self, mode: str, result: BulkLoadResult) -> None:
+        columns = ", ".join(quote_identifier(column) for column in self.columns)
+        key = ", ".join(quote_identifier(column) for column in self.key)
+        key_match = " AND ".join(
+            f"t.{quote_identifier(column)} = s.{quote_identifier(column)}"
+            for column in self.key
+        )
+
+        # Повторы ключа во входных данных: побеждает последняя строка
+        result.duplicates = self.session.execute(
+            text(f"SELECT count(*) - count(DISTINCT ({key})) FROM {self.staging}")
+        ).scalar_one()
+        source = (
+            f"SELECT DISTINCT ON ({key}) {columns} FROM {self.staging} "
+            f"ORDER BY {key}, {ROW_NUMBER_COLUMN} DESC"
+        )
+
+        if mode == REPLACE:
+            result.deleted = self.session.execute(
+                text(
+                    f"DELETE FROM {self.target} t WHERE NOT EXISTS ("
+                    f"SELECT 1 FROM {self.staging} s WHERE {key_match})"
+                )
+            ).rowcount
+
+        if mode == INSERT_MISSING:
+            source = (
+                f"SELECT * FROM ({source}) s WHERE NOT EXISTS ("
+                f"SELECT 1 FROM {self.target} t WHERE {key_match})"
+            )
+            conflict = "ON CONFLICT DO NOTHING"
+        elif self.update_columns:
+            assignments = ", ".join(
+                f"{quote_identifier(column)} = EXCLUDED.{quote_identifier(column)}"
+                for column in self.update_columns
+            )
+            conflict = f"ON CONFLICT ({key}) DO UPDATE SET {assignments}"
+        else:
+            conflict = f"ON CONFLICT ({key}) DO NOTHING"
+
+        # xmax = 0 у только что вставленных строк, иначе строка обновлена
+        inserted, updated = self.session.execute(
+            text(
+                f"WITH merged AS ("
+                f"INSERT INTO {self.target} ({columns}) {source} {conflict} "
+                f"RETURNING (xmax = 0) AS is_insert) "
+                f"SELECT count(*) FILTER (WHERE is_insert), "
+                f"count(*) FILTER (WHERE NOT is_insert) FROM merged"
+            )
+        ).one()
+        result.inserted, result.updated = inserted, updated
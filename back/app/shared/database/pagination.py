@@ -0,0 +1,162 @@
+"""
+Keyset пагинация и оценка количества строк
+
+Курсор - непрозрачная строка (base64 JSON) со значениями ключей сортировки
+последней строки страницы; следующая страница выбирается условием
+`(ключи) < (значения курсора)`, поэтому глубина страницы не влияет на
+стоимость запроса, в отличие от OFFSET.
+
+Для total есть два режима:
+- точный COUNT(*) (по умолчанию);
+- оценка: строки из плана запроса (EXPLAIN), а для небольших выборок -
+  точный COUNT. Оба значения кешируются в памяти процесса на
+  `pagination_count_cache_ttl` секунд.
+
+`count_rows` возвращает (total, is_estimate): флаг в ответе API отражает,
+оценка ли total на самом деле, а не только то, что ее запросили.
+"""
+
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.shared.exceptions.base import ValidationException
+
+logger = get_logger(__name__)
+
+
+class InvalidCursorError(ValidationException):
+    """Курсор поврежден или не соответствует сортировке"""
+
+    def __init__(self, reason: str):
+        super().__init__(
+            message=f"Некорректный курсор пагинации: {reason}", field="cursor"
+        )
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Закодировать значения ключей сортировки последней строки"""
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        ensure_ascii=False,
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """Раскодировать курсор; types - ожидаемые типы ключей (datetime, str, int)"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("не соответствует сортировке")
+        return [
+            datetime.fromisoformat(value) if expected is datetime else expected(value)
+            for expected, value in zip(types, values)
+        ]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(str(e)) from e
+
+
+class _CountCache:
+    """TTL-кеш количеств строк по SQL и параметрам"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Tuple[int, bool]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, ttl: float) -> Optional[Tuple[int, bool]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > ttl:
+                return None
+            return entry[1]
+
+    def set(self, key: Hashable, value: Tuple[int, bool]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_count_cache = _CountCache(max_entries=1024)
+
+
+def _cache_key(statement) -> Hashable:
+    compiled = statement.compile()
+    params = tuple(
+        sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in compiled.params.items()
+        )
+    )
+    return str(compiled), params
+
+
+def planner_row_estimate(session: Session, statement) -> int:
+    """Оценка количества строк запроса по плану PostgreSQL (без выполнения)"""
+    connection = session.connection()
+    compiled = statement.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    plan = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(
+    session: Session, statement, estimate: bool = False
+) -> Tuple[int, bool]:
+    """
+    Количество строк выборки (select или text с параметрами) и флаг оценки
+
+    estimate=True: если планировщик ожидает больше
+    `pagination_exact_count_threshold` строк, возвращается его оценка
+    (флаг True), иначе - точный COUNT (флаг False); результат кешируется.
+    """
+    count_query = select(func.count()).select_from(
+        statement.subquery() if hasattr(statement, "subquery") else statement
+    )
+    if not estimate:
+        return session.execute(count_query).scalar() or 0, False
+
+    key = _cache_key(statement)
+    cached = _count_cache.get(key, settings.pagination_count_cache_ttl)
+    if cached is not None:
+        return cached
+
+    try:
+        # Savepoint: ошибка EXPLAIN не должна обрывать транзакцию запроса
+        with session.begin_nested():
+            total = planner_row_estimate(session, statement)
+    except Exception as e:
+        logger.warning(f"Planner row estimate failed, using COUNT: {e}")
+        total = None
+    is_estimate = (
+        total is not None and total > settings.pagination_exact_count_threshold
+    )
+    if not is_estimate:
+        total = session.execute(count_query).scalar() or 0
+
+    _count_cache.set(key, (total, is_estimate))
+    return total, is_estimate
+
+
+def text_select(sql: str, params: Dict[str, Any]):
+    """text() запрос с параметрами как подзапрос для count_rows"""
+    return text(sql).bindparams(**params).columns()
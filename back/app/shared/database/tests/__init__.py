@@ -0,0 +1,3 @@
+"""Тесты shared database"""
+
+__all__ = []
@@ -0,0 +1,49 @@
+"""
+Тесты AsyncBaseRepository: одни и те же методы с Session и AsyncSession
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.features.theory.repositories.theory_repository import TheoryRepository
+
+CARD = SimpleNamespace(id="card-1")
+
+
+def make_result():
+    result = MagicMock()
+    result.scalar.return_value = CARD
+    return result
+
+
+class TestAsyncBaseRepository:
+    """Результат ожидается только для асинхронной сессии"""
+
+    def test_sync_session(self):
+        session = MagicMock()
+        session.execute.return_value = make_result()
+        repository = TheoryRepository(session)
+
+        card = asyncio.run(repository.get_theory_card_by_id("card-1"))
+
+        assert card is CARD
+        session.execute.assert_called_once()
+
+    def test_async_session(self):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=make_result())
+        session.delete = AsyncMock()
+        session.commit = AsyncMock()
+        repository = TheoryRepository(session)
+
+        async def scenario():
+            card = await repository.get_by_id("card-1")
+            await repository._delete(card)
+            await repository._commit()
+            return card
+
+        assert asyncio.run(scenario()) is CARD
+        session.execute.assert_awaited_once()
+        session.delete.assert_awaited_once_with(CARD)
+        session.commit.assert_awaited_once()
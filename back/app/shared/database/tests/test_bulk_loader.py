@@ -0,0 +1,84 @@
+"""
+Тесты BulkLoader: чтение CSV и защита REPLACE от неполных данных
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.shared.database.bulk_loader import (
+    REPLACE,
+    BulkLoader,
+    BulkLoadError,
+    iter_csv,
+)
+
+
+def to_row(row):
+    return {"id": row["id"], "name": row["name"]}
+
+
+def make_loader():
+    session = MagicMock()
+    session.execute.return_value.one.return_value = (1, 0)
+    return session, BulkLoader(session, "Item", ["id", "name"], key=["id"])
+
+
+def executed_sql(session):
+    return [str(call.args[0]) for call in session.execute.call_args_list]
+
+
+class TestBulkLoader:
+    """iter_csv и REPLACE"""
+
+    def test_iter_csv_strips_bom(self, tmp_path):
+        """Файл pandas to_csv(encoding="utf-8-sig"): первая колонка без BOM"""
+        path = tmp_path / "items.csv"
+        path.write_text("id,name\nq_1,Первый\nq_2,\n", encoding="utf-8-sig")
+
+        rows = list(iter_csv(path))
+
+        assert rows == [
+            {"id": "q_1", "name": "Первый"},
+            {"id": "q_2", "name": None},
+        ]
+
+    def test_replace_without_staged_rows_does_not_delete(self):
+        """Все строки отклонены - REPLACE падает до DELETE"""
+        session, loader = make_loader()
+
+        with pytest.raises(BulkLoadError) as error:
+            loader.load([{"name": "a"}, {"name": "b"}], mode=REPLACE, transform=to_row)
+
+        assert error.value.result.staged == 0
+        assert len(error.value.result.rejected) == 2
+        assert not any("DELETE" in sql for sql in executed_sql(session))
+
+    def test_replace_with_rejected_rows_does_not_delete(self):
+        """Часть строк отклонена - таблица не заменяется"""
+        session, loader = make_loader()
+
+        with pytest.raises(BulkLoadError) as error:
+            loader.load(
+                [{"id": "1", "name": "a"}, {"name": "b"}],
+                mode=REPLACE,
+                transform=to_row,
+            )
+
+        assert error.value.result.staged == 1
+        assert [rejected.row for rejected in error.value.result.rejected] == [2]
+        assert not any("DELETE" in sql for sql in executed_sql(session))
+
+    def test_replace_allow_partial(self):
+        """allow_partial_replace=True - замена выполняется"""
+        session, loader = make_loader()
+
+        result = loader.load(
+            [{"id": "1", "name": "a"}, {"name": "b"}],
+            mode=REPLACE,
+            transform=to_row,
+            allow_partial_replace=True,
+        )
+
+        assert result.inserted == 1
+        assert any('DELETE FROM "Item"' in sql for sql in executed_sql(session))
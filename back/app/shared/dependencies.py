@@ -14,6 +14,7 @@ from app.core.rate_limiter import get_rate_limiter
 from app.core.settings import Settings
 
 from app.features.auth.services.auth_service import AuthService
+from app.features.auth.services.session_cache import SessionUser
 from app.features.code_editor.services.ai_test_generator_service import AITestGeneratorService
 from app.features.code_editor.services.code_editor_service import CodeEditorService
 from app.features.code_editor.services.code_executor_service import CodeExecutorService
@@ -88,10 +89,10 @@ get_ai_test_generator_service = create_service_dependency(AITestGeneratorService
 
 async def get_current_user_optional(
     request: Request, auth_service: AuthService = Depends(get_auth_service)
-) -> Optional[User]:
+) -> Optional[SessionUser]:
     """Получение текущего пользователя (опционально)"""
     try:
-        user = await auth_service.get_user_by_session(request)
+        user = await auth_service.get_session_user(request)
         if user:
             logger.debug(
                 "User authenticated via session",
@@ -103,7 +104,7 @@ async def get_current_user_optional(
 
 
 async def get_current_user_id_optional(
-    user: Optional[User] = Depends(get_current_user_optional),
+    user: Optional[SessionUser] = Depends(get_current_user_optional),
 ) -> Optional[int]:
     """Получение ID текущего пользователя (опционально)"""
     return user.id if user else None
@@ -113,10 +114,10 @@ async def get_current_user_required(
     request: Request,
     auth_service: AuthService = Depends(get_auth_service),
     request_context: RequestContext = Depends(get_request_context),
-) -> User:
+) -> SessionUser:
     """Get current user (required) with enhanced error handling."""
     try:
-        user = await auth_service.get_user_by_session(request)
+        user = await auth_service.get_session_user(request)
         if not user:
             logger.warning(
                 "Authentication required but no user found",
@@ -211,8 +212,8 @@ async def get_current_user_jwt_optional(
         return None
 
 def get_current_admin_session(
-    current_user: User = Depends(get_current_user_required),
-) -> User:
+    current_user: SessionUser = Depends(get_current_user_required),
+) -> SessionUser:
     """Check admin privileges (session) with enhanced validation."""
     is_admin = getattr(current_user, "role", None) == "ADMIN" or getattr(
         current_user, "is_admin", False
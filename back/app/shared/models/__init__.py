@@ -6,7 +6,7 @@ from .content_models import ContentBlock, ContentFile, UserContentProgress
 from .enums import CardState, CodeLanguage, ExecutionStatus, ProgressStatus, UserRole
 from .interview_models import InterviewAnalytics, InterviewRecord
 from .learning_path_models import LearningPath, UserPathProgress
-from .progress_models import UserCategoryProgress
+from .progress_models import UserCategoryProgress, UserStatsRollup
 from .task_models import TaskAttempt, TaskSolution
 from .test_case_models import TestCase, TestValidationResult
 from .theory_models import TheoryCard, UserTheoryProgress
@@ -24,6 +24,7 @@ __all__ = [
     "CodeExecution",
     "UserCodeSolution",
     "UserCategoryProgress",
+    "UserStatsRollup",
     "TaskAttempt",
     "TaskSolution",
     "LearningPath",
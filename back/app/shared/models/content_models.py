@@ -7,6 +7,7 @@ from sqlalchemy import (
     JSON,
     Boolean,
     Column,
+    Computed,
     DateTime,
     ForeignKey,
     Index,
@@ -15,7 +16,8 @@ from sqlalchemy import (
     Text,
     func,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from app.shared.database import Base
 
@@ -97,12 +99,33 @@ class ContentBlock(Base):
     )
     rawBlockContentHash = Column(String, comment="Hash of raw block content")
 
+    # Full-text search document (generated, not loaded by default)
+    searchVector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('russian', coalesce(\"blockTitle\", '')), 'A') || "
+                "setweight(to_tsvector('russian', coalesce(\"codeFoldTitle\", '')), 'B') || "
+                "setweight(to_tsvector('russian', coalesce(\"textContent\", '')), 'B') || "
+                "setweight(to_tsvector('simple', coalesce(\"codeContent\", '')), 'D')",
+                persisted=True,
+            ),
+        )
+    )
+
     # Relationships
     file = relationship("ContentFile", back_populates="blocks")
 
     __table_args__ = (
         Index("idx_contentblock_fileid", "fileId"),
         Index("idx_contentblock_category", "fileId", "orderInFile"),
+        Index("idx_contentblock_search", "searchVector", postgresql_using="gin"),
+        Index(
+            "idx_contentblock_title_trgm",
+            "blockTitle",
+            postgresql_using="gin",
+            postgresql_ops={"blockTitle": "gin_trgm_ops"},
+        ),
     )
 
 
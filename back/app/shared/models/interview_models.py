@@ -5,8 +5,20 @@ Interview models - SQLAlchemy модели для работы с собесед
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import ARRAY, Boolean, Column, DateTime, Integer, Numeric, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (
+    ARRAY,
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from app.shared.database import Base
@@ -42,6 +54,35 @@ class InterviewRecord(Base):
         "updatedAt", DateTime, nullable=False, default=func.now(), onupdate=func.now()
     )
 
+    # Документ полнотекстового поиска (генерируемый, по умолчанию не загружается)
+    searchVector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', coalesce(company_name, '')), 'A') || "
+                "setweight(to_tsvector('russian', coalesce(position, '')), 'B') || "
+                "setweight(to_tsvector('russian', coalesce(full_content, '')), 'C')",
+                persisted=True,
+            ),
+        )
+    )
+
+    __table_args__ = (
+        # Keyset пагинация списка интервью
+        Index(
+            "idx_interviewrecord_date_id",
+            interview_date.desc(),
+            id.desc(),
+        ),
+        Index("idx_interviewrecord_search", "searchVector", postgresql_using="gin"),
+        Index(
+            "idx_interviewrecord_company_trgm",
+            "company_name",
+            postgresql_using="gin",
+            postgresql_ops={"company_name": "gin_trgm_ops"},
+        ),
+    )
+
 
 class InterviewAnalytics(Base):
     """
@@ -52,3 +52,29 @@ class UserCategoryProgress(Base):
             unique=True,
         ),
     )
+
+
+class UserStatsRollup(Base):
+    """
+    Количество пройденных элементов пользователя по категориям.
+
+    Поддерживается триггерами БД на UserContentProgress и UserTheoryProgress
+    (см. миграцию add_user_stats_rollup), пересчитывается целиком скриптом
+    scripts/rebuild_stats_rollups.py.
+    """
+
+    __tablename__ = "UserStatsRollup"
+
+    userId = Column(
+        Integer, ForeignKey("User.id", ondelete="CASCADE"), primary_key=True
+    )
+    # content - блоки контента, theory - карточки теории
+    itemType = Column(String, primary_key=True)
+    mainCategory = Column(String, primary_key=True)
+    subCategory = Column(String, primary_key=True)
+
+    completedCount = Column(Integer, default=0, nullable=False)
+
+    updatedAt = Column(
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -5,6 +5,7 @@ from sqlalchemy import (
     ARRAY,
     DECIMAL,
     Column,
+    Computed,
     DateTime,
     Enum as SQLEnum,
     ForeignKey,
@@ -13,7 +14,8 @@ from sqlalchemy import (
     String,
     Text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.shared.database.connection import Base
@@ -40,11 +42,32 @@ class TheoryCard(Base):
         DateTime, default=func.now(), onupdate=func.now(), nullable=False
     )
 
+    # Документ полнотекстового поиска (генерируемый, по умолчанию не загружается)
+    searchVector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('russian', coalesce(\"questionBlock\", '')), 'A') || "
+                "setweight(to_tsvector('russian', coalesce(\"answerBlock\", '')), 'B') || "
+                "setweight(to_tsvector('russian', coalesce(category, '') || ' ' || "
+                "coalesce(\"subCategory\", '')), 'C')",
+                persisted=True,
+            ),
+        )
+    )
+
     progressEntries = relationship("UserTheoryProgress", back_populates="card")
 
     __table_args__ = (
         Index("idx_theorycard_category", "category"),
         Index("idx_theorycard_deck", "deck"),
+        Index("idx_theorycard_search", "searchVector", postgresql_using="gin"),
+        Index(
+            "idx_theorycard_question_trgm",
+            "questionBlock",
+            postgresql_using="gin",
+            postgresql_ops={"questionBlock": "gin_trgm_ops"},
+        ),
     )
 
 
@@ -0,0 +1,21 @@
+"""Полнотекстовый поиск (tsvector + pg_trgm)"""
+
+from .fulltext import (
+    build_tsquery,
+    fuzzy_match,
+    is_fulltext_enabled,
+    normalize_query,
+    search_headline,
+    search_rank,
+    text_search_condition,
+)
+
+__all__ = [
+    "build_tsquery",
+    "fuzzy_match",
+    "is_fulltext_enabled",
+    "normalize_query",
+    "search_headline",
+    "search_rank",
+    "text_search_condition",
+]
@@ -0,0 +1,91 @@
+"""
+Выражения полнотекстового поиска PostgreSQL
+
+Документы индексируются в генерируемых колонках `searchVector` (tsvector,
+GIN индекс, миграция add_fulltext_search). Конфигурация `russian` стеммит
+кириллицу русским snowball, а латиницу - английским, поэтому один вектор
+покрывает оба языка; код индексируется конфигурацией `simple` без
+стемминга. Короткие поля (заголовки, вопросы) дополнительно проиндексированы
+pg_trgm для нечеткого совпадения по опечаткам и частям слов.
+
+Пока миграция не применена, `fulltext_search_enabled=False` возвращает
+прежний поиск через ILIKE.
+"""
+
+from typing import Iterable, Optional
+
+from sqlalchemy import Text, func, literal, or_
+from sqlalchemy.dialects.postgresql import TSQUERY
+
+from app.core.settings import settings
+
+TEXT_CONFIG = "russian"
+CODE_CONFIG = "simple"
+# Вес нечеткого совпадения относительно ts_rank_cd
+FUZZY_RANK_WEIGHT = 0.1
+# ts_rank_cd: нормализация rank / (rank + 1), чтобы ранги разных
+# источников были сопоставимы
+RANK_NORMALIZATION = 32
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, "
+    'MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+
+def is_fulltext_enabled() -> bool:
+    return settings.fulltext_search_enabled
+
+
+def normalize_query(query: Optional[str]) -> Optional[str]:
+    query = (query or "").strip()
+    return query or None
+
+
+def build_tsquery(query: str):
+    """Запрос websearch (кавычки, OR, -исключение) для текста и кода"""
+    return func.websearch_to_tsquery(TEXT_CONFIG, query, type_=TSQUERY).op("||")(
+        func.websearch_to_tsquery(CODE_CONFIG, query, type_=TSQUERY)
+    )
+
+
+def fuzzy_match(query: str, column):
+    """Нечеткое совпадение слов запроса с полем (pg_trgm, GIN индекс)"""
+    return literal(query, Text).op("<%", is_comparison=True)(column)
+
+
+def text_search_condition(
+    vector,
+    query: str,
+    fuzzy_columns: Iterable = (),
+    fallback_columns: Iterable = (),
+):
+    """
+    Условие поиска: tsvector @@ tsquery или нечеткое совпадение коротких
+    полей; при выключенном полнотекстовом поиске - ILIKE по fallback_columns
+    """
+    if not is_fulltext_enabled():
+        pattern = f"%{query}%"
+        return or_(*[column.ilike(pattern) for column in fallback_columns])
+
+    return or_(
+        vector.op("@@", is_comparison=True)(build_tsquery(query)),
+        *[fuzzy_match(query, column) for column in fuzzy_columns],
+    )
+
+
+def search_rank(vector, query: str, fuzzy_column=None):
+    """Релевантность: ts_rank_cd плюс небольшой вес нечеткого совпадения"""
+    rank = func.ts_rank_cd(vector, build_tsquery(query), RANK_NORMALIZATION)
+    if fuzzy_column is not None:
+        rank = rank + func.word_similarity(query, fuzzy_column) * FUZZY_RANK_WEIGHT
+    return rank
+
+
+def search_headline(document, query: str, config: str = TEXT_CONFIG):
+    """Фрагменты документа с подсветкой совпадений (<mark>)"""
+    return func.ts_headline(
+        config,
+        func.coalesce(document, ""),
+        build_tsquery(query),
+        HEADLINE_OPTIONS,
+    )
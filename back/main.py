@@ -7,15 +7,32 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.core.error_handlers import register_exception_handlers
-from app.core.logging import get_logger, init_default_logging
+from app.core.logging import (
+    CorrelationIdMiddleware,
+    get_logger,
+    init_default_logging,
+    shutdown_logging,
+)
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.query_profiler import QueryProfilerMiddleware
 from app.core.settings import settings
 from app.features.admin.api.admin_router import router as admin_router
 from app.features.auth.api.auth_router import router as auth_router
+from app.features.auth.services.session_cache import shutdown_session_cache
 from app.features.code_editor.api import router as code_editor_router
+from app.features.code_editor.services.ai_generation_client import (
+    shutdown_ai_generation_client,
+)
+from app.features.code_editor.services.container_pool import shutdown_container_pools
+from app.features.code_editor.services.execution_queue import (
+    start_execution_workers,
+    stop_execution_workers,
+)
+from app.features.code_editor.utils.execution_backend import shutdown_execution_backend
 from app.features.content.api import router as content_router
 from app.features.interviews.api.categories_router import router as categories_router
 from app.features.interviews.api.companies_router import router as companies_router
@@ -27,11 +44,18 @@ from app.features.logs.api.logs_router import (
 )
 from app.features.mindmap.api import router as mindmap_router
 from app.features.progress.api import router as progress_router
+from app.features.search.api import router as search_router
 from app.features.stats.api import router as stats_router
 
 from app.features.task.api import router as task_router
 from app.features.theory.api import router as theory_router
 from app.features.visualization.api import router as cluster_viz_router
+from app.features.visualization.services.constellation_snapshot import (
+    start_constellation_refresher,
+    stop_constellation_refresher,
+)
+from app.shared.catalog import warm_catalog_snapshot
+from app.shared.database.async_base import dispose_async_engine
 from app.shared.di import setup_di_container
 
 init_default_logging()
@@ -42,10 +66,21 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI):
     setup_di_container()
     setup_websocket_logging()  # Включено обратно с исправлениями
+    warm_catalog_snapshot()
+    start_constellation_refresher()
+    await start_execution_workers()
     logger.info("🚀 Приложение запущено", extra={"event": "startup"})
     yield
     disable_websocket_logging()  # Корректное отключение при shutdown
+    await stop_execution_workers()
+    await shutdown_ai_generation_client()
+    shutdown_container_pools()
+    shutdown_execution_backend()
+    shutdown_session_cache()
+    stop_constellation_refresher()
+    await dispose_async_engine()
     logger.info("🔒 Приложение остановлено", extra={"event": "shutdown"})
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -64,6 +99,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.sql_profiler_enabled:
+    app.add_middleware(QueryProfilerMiddleware)
+app.add_middleware(CorrelationIdMiddleware)
+if settings.metrics_enabled:
+    # Добавлен последним - внешний слой, время включает остальные middleware
+    app.add_middleware(MetricsMiddleware)
 
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -75,6 +116,7 @@ app.include_router(categories_router, prefix="/api/v2")
 app.include_router(companies_router, prefix="/api/v2")
 app.include_router(cluster_viz_router, prefix="/api/v2")
 app.include_router(theory_router, prefix="/api/v2")
+app.include_router(search_router, prefix="/api/v2")
 app.include_router(task_router, prefix="/api/v2")
 app.include_router(progress_router, prefix="/api/v2")
 app.include_router(code_editor_router, prefix="/api/v2/code-editor")
@@ -100,6 +142,16 @@ async def get_openapi():
     return JSONResponse(content=openapi_schema)
 
 
+if settings.metrics_enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Метрики процесса в текстовом формате Prometheus"""
+        return PlainTextResponse(
+            render_metrics(), media_type="text/plain; version=0.0.4"
+        )
+
+
 @app.get("/")
 async def root():
     return {
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк синхронного и асинхронного доступа к БД для фичи theory
+
+Поднимает ASGI-приложение с роутером theory в одном процессе (один
+воркер, один event loop) и гоняет конкурентные запросы к /theory/cards
+в двух режимах: синхронная сессия psycopg2 и AsyncSession (asyncpg).
+Опционально часть запросов делает медленный запрос (pg_sleep), чтобы
+показать блокировку остальных запросов воркера.
+
+Нужна доступная БД из DATABASE_URL.
+
+Использование:
+    python scripts/benchmarks/bench_async_db.py --concurrency 32 --duration 10
+    python scripts/benchmarks/bench_async_db.py --slow-every 10 --slow-ms 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Добавляем путь к app в PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+
+from app.core.settings import settings
+from app.features.theory.api.theory_router import router as theory_router
+from app.shared.database.async_base import dispose_async_engine, get_feature_session
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(theory_router, prefix="/api/v2")
+
+    @app.get("/bench/slow")
+    async def slow(ms: int, db=Depends(get_feature_session("theory"))):
+        result = db.execute(text("SELECT pg_sleep(:s)"), {"s": ms / 1000})
+        if asyncio.iscoroutine(result):
+            await result
+        return {"ok": True}
+
+    return app
+
+
+async def run_mode(
+    mode: str, concurrency: int, duration: float, slow_every: int, slow_ms: int
+) -> dict:
+    settings.database_async_features = ["theory"] if mode == "async" else []
+    transport = httpx.ASGITransport(app=build_app())
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker(worker_id: int) -> None:
+            nonlocal errors
+            sent = 0
+            while time.perf_counter() < deadline:
+                sent += 1
+                if slow_every and sent % slow_every == 0 and worker_id == 0:
+                    url = f"/bench/slow?ms={slow_ms}"
+                else:
+                    url = "/api/v2/theory/cards?limit=20"
+                started = time.perf_counter()
+                response = await client.get(url)
+                if response.status_code != 200:
+                    errors += 1
+                    continue
+                if not url.startswith("/bench"):
+                    latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    await dispose_async_engine()
+    latencies.sort()
+    return {
+        "mode": mode,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--slow-every",
+        type=int,
+        default=0,
+        help="Каждый N-й запрос воркера 0 - медленный",
+    )
+    parser.add_argument("--slow-ms", type=int, default=200)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"])
+    args = parser.parse_args()
+
+    print(
+        f"concurrency={args.concurrency} duration={args.duration}s "
+        f"slow_every={args.slow_every} slow_ms={args.slow_ms}"
+    )
+    for mode in args.modes:
+        result = asyncio.run(
+            run_mode(
+                mode, args.concurrency, args.duration, args.slow_every, args.slow_ms
+            )
+        )
+        print(
+            f"{result['mode']:>5}: {result['rps']:8.1f} req/s  "
+            f"p50={result['p50_ms']:7.1f} ms  p95={result['p95_ms']:7.1f} ms  "
+            f"errors={result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
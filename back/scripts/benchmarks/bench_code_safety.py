@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк проверки безопасности кода на больших отправках
+
+Сравнивает прежний подход (отдельный re.search на каждый паттерн с
+перекомпиляцией через кеш re) с однопроходным CodeSafetyScanner.
+
+Использование:
+    python scripts/benchmarks/bench_code_safety.py --size-kb 256 --repeat 50
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+
+# Добавляем путь к app в PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.features.code_editor.utils.code_safety import CONTAINER_SCANNER
+from app.shared.models.enums import CodeLanguage
+
+SAFE_SNIPPET = """
+def solve(numbers):
+    result = []
+    for index, value in enumerate(numbers):
+        if value % 2 == 0:
+            result.append(value * index)
+    return sorted(result)
+
+
+print(solve([1, 2, 3, 4, 5, 6, 7, 8, 9, 10]))
+"""
+
+
+def build_submission(size_kb: int, tail: str = "") -> str:
+    repeats = max(1, size_kb * 1024 // len(SAFE_SNIPPET))
+    return SAFE_SNIPPET * repeats + tail
+
+
+def legacy_is_safe(source_code: str, language: CodeLanguage) -> bool:
+    for pattern in CONTAINER_SCANNER.rules_for(language):
+        if re.search(pattern, source_code, re.IGNORECASE):
+            return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-kb", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    cases = {
+        "safe": build_submission(args.size_kb),
+        "unsafe_tail": build_submission(args.size_kb, "\nimport os\n"),
+    }
+    language = CodeLanguage.PYTHON
+
+    print(f"Размер отправки: {args.size_kb} KB, повторов: {args.repeat}")
+    for name, code in cases.items():
+        assert legacy_is_safe(code, language) == CONTAINER_SCANNER.is_safe(
+            code, language
+        )
+        legacy = timeit.timeit(
+            lambda code=code: legacy_is_safe(code, language), number=args.repeat
+        )
+        scanner = timeit.timeit(
+            lambda code=code: CONTAINER_SCANNER.scan(code, language),
+            number=args.repeat,
+        )
+        print(
+            f"{name:12} legacy: {legacy / args.repeat * 1000:8.2f} ms  "
+            f"scanner: {scanner / args.repeat * 1000:8.2f} ms  "
+            f"x{legacy / scanner:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
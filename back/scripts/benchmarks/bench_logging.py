@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк накладных расходов логирования на запрос
+
+Настраивает логирование через setup_logging в двух режимах: синхронный
+StreamHandler (JSON форматирование и запись в потоке запроса) и очередь
+AsyncQueueHandler + QueueListener (log_async). Каждый "запрос" пишет
+несколько записей с extra полями в контексте correlation id; измеряется
+время, которое запрос тратит на логирование, и время дописывания очереди.
+
+Вывод идет в /dev/null; --sink-delay-us имитирует медленный stdout
+(заполненный pipe, медленный сборщик логов).
+
+Использование:
+    python scripts/benchmarks/bench_logging.py --requests 20000 --records 5
+    python scripts/benchmarks/bench_logging.py --sink-delay-us 50
+"""
+
+import argparse
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Добавляем путь к app в PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.core.logging import set_correlation_id, setup_logging, shutdown_logging
+from app.core.settings import settings
+
+
+class SlowSink(io.TextIOBase):
+    """Приемник логов с задержкой на каждую запись"""
+
+    def __init__(self, target, delay: float):
+        self.target = target
+        self.delay = delay
+
+    def write(self, data: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return self.target.write(data)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+
+def run_mode(mode: str, requests: int, records: int, sink_delay: float) -> dict:
+    settings.log_async = mode == "async"
+    settings.log_format = "json"
+    settings.log_sample_rates = {}
+    settings.log_rate_limits = {}
+
+    original_stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        # StreamHandler запоминает sys.stdout при создании в setup_logging
+        sys.stdout = SlowSink(devnull, sink_delay)
+        try:
+            setup_logging()
+            logger = logging.getLogger("bench.request")
+            latencies = []
+
+            started = time.perf_counter()
+            for request_number in range(requests):
+                request_started = time.perf_counter()
+                set_correlation_id(f"bench-{request_number}")
+                for record_number in range(records):
+                    logger.info(
+                        "Handled step %s",
+                        record_number,
+                        extra={"path": "/api/v2/bench", "status_code": 200},
+                    )
+                set_correlation_id("")
+                latencies.append(time.perf_counter() - request_started)
+            elapsed = time.perf_counter() - started
+
+            drain_started = time.perf_counter()
+            shutdown_logging()
+            drain = time.perf_counter() - drain_started
+        finally:
+            sys.stdout = original_stdout
+            logging.root.handlers = []
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "mean_us": statistics.mean(latencies) * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+        "rps": requests / elapsed,
+        "drain_ms": drain * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument(
+        "--records", type=int, default=5, help="Записей лога на один запрос"
+    )
+    parser.add_argument(
+        "--sink-delay-us",
+        type=float,
+        default=0.0,
+        help="Задержка записи одной строки в stdout, мкс",
+    )
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"])
+    args = parser.parse_args()
+
+    # Очередь должна вместить все записи, иначе async режим начнет их отбрасывать
+    settings.log_queue_size = max(settings.log_queue_size, args.requests * args.records)
+
+    print(
+        f"requests={args.requests} records={args.records} "
+        f"sink_delay={args.sink_delay_us}us"
+    )
+    for mode in args.modes:
+        result = run_mode(mode, args.requests, args.records, args.sink_delay_us / 1e6)
+        print(
+            f"{result['mode']:>5}: {result['mean_us']:8.1f} us/request  "
+            f"p99={result['p99_us']:8.1f} us  {result['rps']:9.0f} req/s  "
+            f"drain={result['drain_ms']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк UniverseCalculator на синтетических данных
+
+Генерирует кластеры с ключевыми словами (с убывающей частотой), компании и
+вопросы и замеряет каждый этап раскладки: звезды, планеты, спутники и
+связи по общим ключевым словам. С --legacy дополнительно замеряет
+прежние поэлементные циклы (связи - двойной цикл O(n^2) с пересечением
+множеств) на первых --legacy-clusters кластерах.
+
+Использование:
+    python scripts/benchmarks/bench_universe.py --clusters 10000 --questions 100000
+    python scripts/benchmarks/bench_universe.py --legacy --legacy-clusters 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Добавляем путь к app в PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.features.visualization.services.universe_calculator import (
+    SCIPY_AVAILABLE,
+    UniverseCalculator,
+)
+
+
+def generate_data(
+    n_clusters: int, n_companies: int, n_questions: int, vocabulary: int, seed: int
+):
+    rng = np.random.default_rng(seed)
+    # Частоты ключевых слов убывают как 1/(rank + 50): есть популярные слова,
+    # но ни одно не встречается в большинстве кластеров
+    weights = 1 / (np.arange(vocabulary) + 50)
+    keyword_ids = rng.choice(
+        vocabulary, size=(n_clusters, 8), p=weights / weights.sum()
+    )
+    clusters = [
+        {
+            "id": i,
+            "name": f"cluster {i}",
+            "keywords": [f"kw{k}" for k in row],
+            "questions_count": int(count),
+            "category_id": "react",
+        }
+        for i, (row, count) in enumerate(
+            zip(keyword_ids.tolist(), rng.integers(1, 200, n_clusters).tolist())
+        )
+    ]
+    companies = [
+        {
+            "id": f"company-{i}",
+            "company_name": f"Company {i}",
+            "questions_count": int(count),
+            "primary_cluster_id": int(cluster),
+        }
+        for i, (count, cluster) in enumerate(
+            zip(
+                rng.integers(1, 500, n_companies).tolist(),
+                rng.integers(0, n_clusters, n_companies).tolist(),
+            )
+        )
+    ]
+    questions = [
+        {"id": f"q{i}", "company": f"Company {c}", "cluster_id": i % n_clusters}
+        for i, c in enumerate(rng.integers(0, n_companies, n_questions).tolist())
+    ]
+    return clusters, companies, questions
+
+
+def legacy_connections(clusters):
+    connections = []
+    for i, source in enumerate(clusters):
+        for target in clusters[i + 1 :]:
+            shared = len(set(source["keywords"]) & set(target["keywords"]))
+            if shared >= 2:
+                connections.append((source["id"], target["id"], float(shared * 5)))
+    return connections
+
+
+def legacy_question_positions(questions, company_positions):
+    positions = []
+    for question in questions:
+        company_id = question.get("company")
+        if company_id and company_id in company_positions:
+            company_pos = company_positions[company_id]
+            angle = np.random.random() * 2 * np.pi
+            phi = np.random.random() * np.pi
+            distance = 2 + np.random.random() * 3
+            positions.append(
+                {
+                    "id": question.get("id"),
+                    "x": company_pos["x"] + distance * np.sin(phi) * np.cos(angle),
+                    "y": company_pos["y"] + distance * np.sin(phi) * np.sin(angle),
+                    "z": company_pos["z"] + distance * np.cos(phi),
+                }
+            )
+    return positions
+
+
+def timed(label: str, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    print(f"{label:>32}: {(time.perf_counter() - started) * 1000:9.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clusters", type=int, default=10000)
+    parser.add_argument("--companies", type=int, default=2000)
+    parser.add_argument("--questions", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--legacy", action="store_true")
+    parser.add_argument("--legacy-clusters", type=int, default=2000)
+    args = parser.parse_args()
+
+    clusters, companies, questions = generate_data(
+        args.clusters, args.companies, args.questions, args.vocabulary, args.seed
+    )
+    print(
+        f"clusters={args.clusters} companies={args.companies} "
+        f"questions={args.questions} scipy={SCIPY_AVAILABLE}"
+    )
+
+    calculator = UniverseCalculator(seed=args.seed)
+    stars = timed("cluster positions", calculator.calculate_cluster_positions, clusters)
+    planets = timed(
+        "company positions", calculator.calculate_company_positions, companies, stars
+    )
+    company_positions = {planet["name"]: planet for planet in planets}
+    timed(
+        "question positions",
+        calculator.calculate_question_positions,
+        questions,
+        company_positions,
+    )
+    timed(
+        "question layout (arrays)",
+        calculator.question_layout,
+        questions,
+        company_positions,
+    )
+    connections = timed("connections", calculator.calculate_connections, clusters)
+    print(f"{'connections found':>32}: {len(connections)}")
+
+    if args.legacy:
+        subset = clusters[: args.legacy_clusters]
+        timed(
+            f"legacy questions ({len(questions)})",
+            legacy_question_positions,
+            questions,
+            company_positions,
+        )
+        timed(f"connections ({len(subset)})", calculator.calculate_connections, subset)
+        timed(f"legacy connections ({len(subset)})", legacy_connections, subset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Предрасчет 3D геометрии кластеров вопросов интервью
+
+Строит локальные эмбеддинги вопросов (хешированный TF-IDF + truncated
+SVD, без сети), усредняет их по кластерам, один раз раскладывает
+кластеры в 3D и записывает координаты, эмбеддинги и top-k связи по
+косинусной близости в InterviewCluster и ClusterConnections.
+
+Запускать после импорта вопросов или перекластеризации.
+
+Использование:
+    python scripts/build_universe_layout.py
+    python scripts/build_universe_layout.py --top-k 8 --min-similarity 0.4
+    python scripts/build_universe_layout.py --dry-run
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Добавляем путь к app в PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.logging import get_logger
+from app.features.visualization.services.universe_geometry import (
+    compute_universe_layout,
+    save_universe_layout,
+)
+from app.shared.database.base import db_manager
+
+logger = get_logger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Предрасчет 3D геометрии кластеров")
+    parser.add_argument("--dimensions", type=int, default=64)
+    parser.add_argument(
+        "--features", type=int, default=4096, help="Размер хеш-пространства токенов"
+    )
+    parser.add_argument(
+        "--top-k", type=int, default=5, help="Связей на кластер (ближайших соседей)"
+    )
+    parser.add_argument("--min-similarity", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Рассчитать без записи в БД"
+    )
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    with db_manager.get_transaction() as session:
+        layout = compute_universe_layout(
+            session,
+            dimensions=args.dimensions,
+            n_features=args.features,
+            top_k=args.top_k,
+            min_similarity=args.min_similarity,
+            seed=args.seed,
+        )
+        if not args.dry_run:
+            save_universe_layout(session, layout)
+
+    logger.info(
+        f"Геометрия вселенной {'рассчитана' if args.dry_run else 'сохранена'}: "
+        f"{len(layout['stars'])} кластеров, {len(layout['connections'])} связей "
+        f"за {time.monotonic() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,9 @@
 Скрипт импорта категоризированных вопросов интервью в базу данных
 """
 
-import json
 import sys
 from pathlib import Path
 
-import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
@@ -15,6 +13,80 @@ from sqlalchemy.orm import sessionmaker
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.core.settings import settings
+from app.features.interviews.services.question_sampler import (
+    bump_question_sampler_version,
+)
+from app.features.visualization.services.constellation_snapshot import (
+    bump_constellation_version,
+)
+from app.shared.database.bulk_loader import (
+    INSERT_MISSING,
+    BulkLoader,
+    iter_csv,
+    iter_json,
+)
+
+CATEGORY_COLUMNS = ["id", "name", "questions_count", "clusters_count", "percentage"]
+CLUSTER_COLUMNS = [
+    "id",
+    "name",
+    "category_id",
+    "keywords",
+    "questions_count",
+    "example_question",
+]
+QUESTION_COLUMNS = [
+    "id",
+    "question_text",
+    "company",
+    "cluster_id",
+    "category_id",
+    "topic_name",
+    "canonical_question",
+]
+
+
+def to_category_row(cat):
+    return {
+        "id": cat["name"].replace(" ", "_").lower(),
+        "name": cat["name"],
+        "questions_count": cat["questions_count"],
+        "clusters_count": cat["clusters_count"],
+        "percentage": cat["percentage"],
+    }
+
+
+def to_cluster_row(cluster):
+    return {
+        "id": cluster["id"],
+        "name": cluster["name"][:255],  # ограничиваем длину
+        "category_id": cluster["category"].replace(" ", "_").lower(),
+        "keywords": cluster["keywords"][:10],  # топ-10 ключевых слов
+        "questions_count": cluster["questions_count"],
+        "example_question": cluster.get("example_question"),
+    }
+
+
+def to_question_row(row):
+    category = row.get("final_category")
+    cluster_id = int(float(row["cluster_id"])) if row.get("cluster_id") else None
+    return {
+        "id": row["id"],
+        "question_text": row["question_text"][:2000],  # ограничиваем длину
+        "company": row.get("company"),
+        "cluster_id": cluster_id if cluster_id != -1 else None,
+        "category_id": category.replace(" ", "_").lower()
+        if category and category != "Нет кластера"
+        else None,
+        "topic_name": row.get("topic_name"),
+        "canonical_question": (row.get("canonical_question") or "")[:2000] or None,
+    }
+
+
+def report(result):
+    print(f"   {result.summary()}")
+    for rejected in result.rejected[:5]:
+        print(f"   ! строка {rejected.row}: {rejected.reason}")
 
 
 def import_data():
@@ -38,140 +110,55 @@ def import_data():
             / "outputs_api_ready"
         )
 
-        # 1. Загружаем и импортируем категории
+        # Существующие записи не трогаем, добавляем только новые; все три
+        # таблицы пополняются одной транзакцией
+        # 1. Категории
         print("\n1. Импорт категорий...")
-        with open(data_dir / "categories.json", encoding="utf-8") as f:
-            categories = json.load(f)
-
-        for cat in categories:
-            category_id = cat["name"].replace(" ", "_").lower()
-
-            # Проверяем существование
-            exists = session.execute(
-                text('SELECT 1 FROM "InterviewCategory" WHERE id = :id'),
-                {"id": category_id},
-            ).first()
-
-            if not exists:
-                session.execute(
-                    text("""
-                        INSERT INTO "InterviewCategory" 
-                        (id, name, questions_count, clusters_count, percentage)
-                        VALUES (:id, :name, :questions_count, :clusters_count, :percentage)
-                    """),
-                    {
-                        "id": category_id,
-                        "name": cat["name"],
-                        "questions_count": cat["questions_count"],
-                        "clusters_count": cat["clusters_count"],
-                        "percentage": cat["percentage"],
-                    },
-                )
-                print(f"   + {cat['name']}: {cat['questions_count']} вопросов")
-
-        session.commit()
-        print(f"   Импортировано категорий: {len(categories)}")
+        result = BulkLoader(
+            session, "InterviewCategory", CATEGORY_COLUMNS, key=["id"]
+        ).load(
+            iter_json(data_dir / "categories.json"),
+            mode=INSERT_MISSING,
+            transform=to_category_row,
+        )
+        report(result)
 
-        # 2. Загружаем и импортируем кластеры
+        # 2. Кластеры
         print("\n2. Импорт кластеров...")
-        with open(data_dir / "clusters.json", encoding="utf-8") as f:
-            clusters = json.load(f)
-
-        for cluster in clusters:
-            category_id = cluster["category"].replace(" ", "_").lower()
-
-            # Проверяем существование
-            exists = session.execute(
-                text('SELECT 1 FROM "InterviewCluster" WHERE id = :id'),
-                {"id": cluster["id"]},
-            ).first()
-
-            if not exists:
-                session.execute(
-                    text("""
-                        INSERT INTO "InterviewCluster"
-                        (id, name, category_id, keywords, questions_count, example_question)
-                        VALUES (:id, :name, :category_id, :keywords, :questions_count, :example_question)
-                    """),
-                    {
-                        "id": cluster["id"],
-                        "name": cluster["name"][:255],  # ограничиваем длину
-                        "category_id": category_id,
-                        "keywords": cluster["keywords"][:10],  # топ-10 ключевых слов
-                        "questions_count": cluster["questions_count"],
-                        "example_question": cluster.get("example_question"),
-                    },
-                )
+        result = BulkLoader(
+            session, "InterviewCluster", CLUSTER_COLUMNS, key=["id"]
+        ).load(
+            iter_json(data_dir / "clusters.json"),
+            mode=INSERT_MISSING,
+            transform=to_cluster_row,
+        )
+        report(result)
 
+        # 3. Вопросы
+        print("\n3. Импорт вопросов...")
+        result = BulkLoader(
+            session,
+            "InterviewQuestion",
+            QUESTION_COLUMNS,
+            key=["id"],
+            on_progress=lambda r: print(f"   Обработано: {r.read}"),
+        ).load(
+            iter_csv(data_dir / "questions_for_db.csv"),
+            mode=INSERT_MISSING,
+            transform=to_question_row,
+        )
+        report(result)
         session.commit()
-        print(f"   Импортировано кластеров: {len(clusters)}")
 
-        # 3. Загружаем и импортируем вопросы
-        print("\n3. Импорт вопросов...")
-        questions_df = pd.read_csv(data_dir / "questions_for_db.csv")
-
-        imported = 0
-        skipped = 0
-        batch_size = 500
-
-        for i in range(0, len(questions_df), batch_size):
-            batch = questions_df.iloc[i : i + batch_size]
-
-            for _, row in batch.iterrows():
-                # Проверяем существование
-                exists = session.execute(
-                    text('SELECT 1 FROM "InterviewQuestion" WHERE id = :id'),
-                    {"id": row["id"]},
-                ).first()
-
-                if not exists:
-                    category_id = None
-                    if (
-                        pd.notna(row.get("final_category"))
-                        and row["final_category"] != "Нет кластера"
-                    ):
-                        category_id = row["final_category"].replace(" ", "_").lower()
-
-                    cluster_id = None
-                    if pd.notna(row.get("cluster_id")) and row["cluster_id"] != -1:
-                        cluster_id = int(row["cluster_id"])
-
-                    session.execute(
-                        text("""
-                            INSERT INTO "InterviewQuestion"
-                            (id, question_text, company, cluster_id, category_id, topic_name, canonical_question)
-                            VALUES (:id, :question_text, :company, :cluster_id, :category_id, :topic_name, :canonical_question)
-                        """),
-                        {
-                            "id": row["id"],
-                            "question_text": row["question_text"][
-                                :2000
-                            ],  # ограничиваем длину
-                            "company": row.get("company")
-                            if pd.notna(row.get("company"))
-                            else None,
-                            "cluster_id": cluster_id,
-                            "category_id": category_id,
-                            "topic_name": row.get("topic_name")
-                            if pd.notna(row.get("topic_name"))
-                            else None,
-                            "canonical_question": row.get("canonical_question")[:2000]
-                            if pd.notna(row.get("canonical_question"))
-                            else None,
-                        },
-                    )
-                    imported += 1
-                else:
-                    skipped += 1
-
-            # Коммитим батчами
-            session.commit()
-            print(
-                f"   Обработано: {min(i+batch_size, len(questions_df))}/{len(questions_df)}"
-            )
+        print(f"\n   + Импортировано вопросов: {result.inserted}")
+        print(
+            f"   - Пропущено (уже существуют): "
+            f"{result.staged - result.duplicates - result.inserted}"
+        )
 
-        print(f"\n   + Импортировано вопросов: {imported}")
-        print(f"   - Пропущено (уже существуют): {skipped}")
+        # Граф созвездия кластеров и индекс случайных вопросов пересчитаются
+        bump_constellation_version()
+        bump_question_sampler_version()
 
         # 4. Статистика
         print("\n4. СТАТИСТИКА:")
@@ -188,7 +175,7 @@ def import_data():
 
         print(f"   Всего вопросов в БД: {total_questions}")
         print(
-            f"   Категоризировано: {categorized} ({categorized/total_questions*100:.1f}%)"
+            f"   Категоризировано: {categorized} ({categorized / total_questions * 100:.1f}%)"
         )
 
         print("\n[OK] ИМПОРТ ЗАВЕРШЕН УСПЕШНО!")
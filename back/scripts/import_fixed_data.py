@@ -6,13 +6,63 @@
 import sys
 from pathlib import Path
 
-import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 # Добавляем путь к корню проекта
 sys.path.append(str(Path(__file__).parent.parent))
 from app.core.settings import settings
+from app.features.interviews.services.question_sampler import (
+    bump_question_sampler_version,
+)
+from app.features.visualization.services.constellation_snapshot import (
+    bump_constellation_version,
+)
+from app.shared.database.bulk_loader import (
+    REPLACE,
+    BulkLoader,
+    BulkLoadError,
+    iter_csv,
+)
+
+QUESTION_COLUMNS = [
+    "id",
+    "original_question_id",
+    "interview_id",
+    "question_text",
+    "company",
+    "cluster_id",
+    "category_id",
+    "topic_name",
+    "canonical_question",
+]
+
+
+def to_question_row(row):
+    """Строка CSV -> колонки InterviewQuestion"""
+    category = row["final_category"]
+    return {
+        "id": row["id"],
+        "original_question_id": row["original_question_id"],
+        "interview_id": row["interview_id"],
+        "question_text": row["question_text"][:2000],
+        "company": row["company"],
+        "cluster_id": int(float(row["cluster_id"])) if row["cluster_id"] else None,
+        "category_id": category.replace(" ", "_").lower() if category else None,
+        "topic_name": row["topic_name"],
+        "canonical_question": (row["canonical_question"] or "")[:2000] or None,
+    }
+
+
+def report_rejected(result, csv_file):
+    """Отклоненные строки: первые в консоль, все - в .rejected.jsonl"""
+    if not result.rejected:
+        return
+    rejected_file = csv_file.with_suffix(".rejected.jsonl")
+    result.write_rejected(rejected_file)
+    for rejected in result.rejected[:5]:
+        print(f"Ошибка импорта строки {rejected.row}: {rejected.reason}")
+    print(f"Все отклоненные строки: {rejected_file}")
 
 
 def main():
@@ -29,69 +79,38 @@ def main():
         print("Сначала запустите создание CSV файла")
         return
 
-    df = pd.read_csv(csv_file)
-    print(f"Загружено: {len(df)} вопросов")
-
     # Подключение к БД
     engine = create_engine(settings.database_url)
     Session = sessionmaker(bind=engine)
     session = Session()
 
     try:
-        # Очищаем существующие вопросы
-        print("Очистка существующих вопросов...")
-        deleted = session.execute(text('DELETE FROM "InterviewQuestion"')).rowcount
-        print(f"Удалено: {deleted} записей")
-
-        # Импортируем новые данные
-        imported = 0
-        batch_size = 500
-
-        for i in range(0, len(df), batch_size):
-            batch = df.iloc[i : i + batch_size]
-
-            for _, row in batch.iterrows():
-                try:
-                    session.execute(
-                        text("""
-                            INSERT INTO "InterviewQuestion"
-                            (id, original_question_id, interview_id, question_text, company, 
-                             cluster_id, category_id, topic_name, canonical_question)
-                            VALUES (:id, :original_question_id, :interview_id, :question_text, 
-                                   :company, :cluster_id, :category_id, :topic_name, :canonical_question)
-                        """),
-                        {
-                            "id": row["id"],
-                            "original_question_id": row["original_question_id"],
-                            "interview_id": row["interview_id"],
-                            "question_text": row["question_text"][:2000],
-                            "company": row["company"]
-                            if pd.notna(row["company"])
-                            else None,
-                            "cluster_id": int(row["cluster_id"])
-                            if pd.notna(row["cluster_id"])
-                            else None,
-                            "category_id": row["final_category"]
-                            .replace(" ", "_")
-                            .lower()
-                            if pd.notna(row["final_category"])
-                            else None,
-                            "topic_name": row["topic_name"]
-                            if pd.notna(row["topic_name"])
-                            else None,
-                            "canonical_question": row["canonical_question"][:2000]
-                            if pd.notna(row["canonical_question"])
-                            else None,
-                        },
-                    )
-                    imported += 1
-
-                except Exception as e:
-                    print(f"Ошибка импорта {row['id']}: {e}")
-                    continue
-
-            session.commit()
-            print(f"Импортировано: {min(i+batch_size, len(df))}/{len(df)}")
+        # Замена вопросов одной транзакцией: до commit в базе прежние данные
+        loader = BulkLoader(
+            session,
+            "InterviewQuestion",
+            QUESTION_COLUMNS,
+            key=["id"],
+            on_progress=lambda r: print(f"Прочитано: {r.read}, в staging: {r.staged}"),
+        )
+        try:
+            result = loader.load(
+                iter_csv(csv_file), mode=REPLACE, transform=to_question_row
+            )
+        except BulkLoadError as e:
+            # Неполный файл не заменяет таблицу: вопросы в базе не тронуты
+            session.rollback()
+            print(f"Импорт отменен: {e}")
+            report_rejected(e.result, csv_file)
+            return
+        session.commit()
+        imported = result.inserted + result.updated
+        print(result.summary())
+        report_rejected(result, csv_file)
+
+        # Граф созвездия кластеров и индекс случайных вопросов пересчитаются
+        bump_constellation_version()
+        bump_question_sampler_version()
 
         # Проверяем результат
         total = session.execute(
@@ -106,7 +125,7 @@ def main():
         print("\nРЕЗУЛЬТАТ:")
         print(f"Импортировано: {imported}")
         print(f"Всего в базе: {total}")
-        print(f"Категоризировано: {categorized} ({categorized/total*100:.1f}%)")
+        print(f"Категоризировано: {categorized} ({categorized / total * 100:.1f}%)")
 
         # Примеры
         examples = session.execute(
@@ -18,9 +18,24 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.shared.database import get_session
+from app.shared.database import INSERT_MISSING, BulkLoader, get_session
 from app.shared.models.interview_models import InterviewAnalytics, InterviewRecord
 
+RECORD_COLUMNS = [
+    "id",
+    "company_name",
+    "interview_date",
+    "full_content",
+    "content_hash",
+    "position",
+    "tags",
+    "companies",
+    "extracted_urls",
+    "source_type",
+    "has_audio_recording",
+    "updatedAt",
+]
+
 
 class InterviewImporter:
     def __init__(self, session: Session):
@@ -38,30 +53,32 @@ class InterviewImporter:
 
         print(f"Загружено {len(data)} групп компаний")
 
-        for company_group in data:
-            company_name = company_group["company"]
-            records = company_group["records"]
-
-            print(f"Обрабатываю компанию: {company_name} ({len(records)} записей)")
-
-            for record in records:
-                try:
-                    interview_record = self._process_record(record, company_name)
-                    if interview_record:
-                        self.session.add(interview_record)
-                        self.imported_count += 1
-
-                        if self.imported_count % 100 == 0:
-                            print(f"Импортировано {self.imported_count} записей...")
-
-                except Exception as e:
-                    self.errors.append(
-                        f"Ошибка импорта записи {record.get('timestamp', 'unknown')}: {str(e)}"
-                    )
-                    self.skipped_count += 1
+        # Дубликаты по content_hash (в файле и в БД) отсекаются при загрузке
+        loader = BulkLoader(
+            self.session,
+            "InterviewRecord",
+            RECORD_COLUMNS,
+            key=["content_hash"],
+            on_progress=lambda r: print(f"Обработано {r.read} записей..."),
+        )
+        result = loader.load(
+            (
+                {**record, "company_name": company_group["company"]}
+                for company_group in data
+                for record in company_group["records"]
+            ),
+            mode=INSERT_MISSING,
+            transform=self._process_record,
+        )
 
         print("Сохраняю данные в БД...")
         self.session.commit()
+        self.imported_count = result.inserted
+        self.skipped_count = result.read - result.inserted - len(result.rejected)
+        self.errors = [
+            f"Ошибка импорта записи {rejected.row}: {rejected.reason}"
+            for rejected in result.rejected
+        ]
         print(f"Импортировано: {self.imported_count}, Пропущено: {self.skipped_count}")
 
         if self.errors:
@@ -69,49 +86,34 @@ class InterviewImporter:
             for error in self.errors[:5]:  # Показываем первые 5 ошибок
                 print(f"  - {error}")
 
-    def _process_record(
-        self, record: Dict, company_name: str
-    ) -> Optional[InterviewRecord]:
+    def _process_record(self, record: Dict) -> Dict:
         """Обработка одной записи интервью"""
-        timestamp_str = record["timestamp"]
-        content = record["content"]
+        company_name = record["company_name"]
         full_content = record["full_content"]
 
-        # Создание content_hash для дедупликации
-        content_hash = hashlib.md5(full_content.encode()).hexdigest()
-
-        # Проверка дубликатов
-        existing = (
-            self.session.query(InterviewRecord)
-            .filter_by(content_hash=content_hash)
-            .first()
-        )
-        if existing:
-            return None
-
         # Парсинг timestamp
-        interview_date = self._parse_timestamp(timestamp_str)
+        interview_date = self._parse_timestamp(record["timestamp"])
         if not interview_date:
-            return None
+            raise ValueError(f"Неверная дата {record['timestamp']!r}")
 
         # Извлечение данных из контента
         extracted_data = self._extract_metadata(full_content)
 
-        # Создание записи
-        interview_record = InterviewRecord(
-            id=str(uuid.uuid4()),
-            company_name=company_name,
-            interview_date=interview_date,
-            content=content,
-            full_content=full_content,
-            content_hash=content_hash,
-            position=extracted_data.get("position"),
-            tags=extracted_data.get("tags", []),
-            companies=[company_name],
-            updatedAt=datetime.now(),
-        )
-
-        return interview_record
+        return {
+            "id": str(uuid.uuid4()),
+            "company_name": company_name,
+            "interview_date": interview_date,
+            "full_content": full_content,
+            # content_hash для дедупликации
+            "content_hash": hashlib.md5(full_content.encode()).hexdigest(),
+            "position": extracted_data.get("position"),
+            "tags": extracted_data.get("tags", []),
+            "companies": [company_name],
+            "extracted_urls": [],
+            "source_type": "telegram",
+            "has_audio_recording": False,
+            "updatedAt": datetime.now(),
+        }
 
     def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
         """Парсинг временной метки"""
@@ -10,7 +10,7 @@ import sys
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Добавляем путь к app в PYTHONPATH
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -18,9 +18,28 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.shared.database import get_session
+from app.shared.database import INSERT_MISSING, BulkLoader, get_session
 from app.shared.models.interview_models import InterviewAnalytics, InterviewRecord
 
+RECORD_COLUMNS = [
+    "id",
+    "company_name",
+    "interview_date",
+    "position",
+    "full_content",
+    "duration_minutes",
+    "questions_count",
+    "source_type",
+    "content_hash",
+    "extracted_urls",
+    "companies",
+    "tags",
+    "has_audio_recording",
+    "updatedAt",
+]
+# Отчеты большие: в памяти держится не больше пачки файлов
+REPORTS_CHUNK_SIZE = 200
+
 
 class LLMReportImporter:
     def __init__(self, session: Session):
@@ -176,25 +195,16 @@ class LLMReportImporter:
 
         return difficulty
 
-    def parse_report_file(self, file_path: str) -> Optional[InterviewRecord]:
+    def parse_report_file(self, file_path: str) -> Dict:
         """Парсинг одного файла отчета"""
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise ValueError(f"Не удалось прочитать файл: {e}") from e
 
         filename = os.path.basename(file_path)
 
-        # Создание content_hash для дедупликации
-        content_hash = hashlib.md5(content.encode("utf-8")).hexdigest()
-
-        # Проверка дубликатов
-        existing = (
-            self.session.query(InterviewRecord)
-            .filter_by(content_hash=content_hash)
-            .first()
-        )
-        if existing:
-            return None
-
         # Извлекаем данные
         interview_date = self.parse_date_from_filename(filename)
         if not interview_date:
@@ -204,7 +214,6 @@ class LLMReportImporter:
         questions_count, technologies = self.parse_questions_from_content(content)
         duration_minutes = self.parse_duration_from_content(content)
         company_name = self.companies_mapping.get(filename, "Unknown")
-        difficulty_level = self.calculate_difficulty(questions_count, duration_minutes)
 
         # Определяем теги
         tags = ["frontend", "llm_report"]
@@ -213,25 +222,23 @@ class LLMReportImporter:
         if "JavaScript" in technologies:
             tags.append("javascript")
 
-        # Создание записи
-        interview_record = InterviewRecord(
-            id=str(uuid.uuid4()),
-            company_name=company_name,
-            interview_date=interview_date,
-            position="Frontend разработчик",
-            full_content=content,
-            duration_minutes=duration_minutes,
-            questions_count=questions_count if questions_count > 0 else None,
-            source_type="llm_report",
-            content_hash=content_hash,
-            extracted_urls=[],
-            companies=[company_name] if company_name != "Unknown" else [],
-            tags=tags,
-            has_audio_recording=True,  # LLM-отчеты имеют аудио/видеозапись
-            updatedAt=datetime.now(),
-        )
-
-        return interview_record
+        return {
+            "id": str(uuid.uuid4()),
+            "company_name": company_name,
+            "interview_date": interview_date,
+            "position": "Frontend разработчик",
+            "full_content": content,
+            "duration_minutes": duration_minutes,
+            "questions_count": questions_count if questions_count > 0 else None,
+            "source_type": "llm_report",
+            # content_hash для дедупликации
+            "content_hash": hashlib.md5(content.encode("utf-8")).hexdigest(),
+            "extracted_urls": [],
+            "companies": [company_name] if company_name != "Unknown" else [],
+            "tags": tags,
+            "has_audio_recording": True,  # LLM-отчеты имеют аудио/видеозапись
+            "updatedAt": datetime.now(),
+        }
 
     def import_from_reports_directory(self, reports_dir: str) -> None:
         """Импорт всех отчетов из директории"""
@@ -241,33 +248,34 @@ class LLMReportImporter:
             print(f"ERROR: Директория {reports_dir} не найдена")
             return
 
-        md_files = list(reports_path.glob("*.md"))
+        md_files = sorted(reports_path.glob("*.md"))
         print(f"INFO: Найдено {len(md_files)} .md файлов")
 
-        for file_path in md_files:
-            try:
-                print(f"PROCESSING: {file_path.name}")
-                record = self.parse_report_file(str(file_path))
-
-                if record:
-                    self.session.add(record)
-                    self.imported_count += 1
-
-                    if self.imported_count % 10 == 0:
-                        print(
-                            f"SUCCESS: Обработано {self.imported_count}/{len(md_files)}"
-                        )
-                        self.session.commit()  # Периодические коммиты
-                else:
-                    self.skipped_count += 1
-
-            except Exception as e:
-                error_msg = f"Ошибка обработки {file_path.name}: {e}"
-                print(f"ERROR: {error_msg}")
-                self.errors.append(error_msg)
+        # Дубликаты по content_hash (среди файлов и в БД) отсекаются при загрузке
+        loader = BulkLoader(
+            self.session,
+            "InterviewRecord",
+            RECORD_COLUMNS,
+            key=["content_hash"],
+            chunk_size=REPORTS_CHUNK_SIZE,
+            on_progress=lambda r: print(
+                f"SUCCESS: Обработано {r.read}/{len(md_files)}"
+            ),
+        )
+        result = loader.load(
+            ({"path": str(file_path)} for file_path in md_files),
+            mode=INSERT_MISSING,
+            transform=lambda row: self.parse_report_file(row["path"]),
+        )
 
         print("INFO: Сохраняю данные в БД...")
         self.session.commit()
+        self.imported_count = result.inserted
+        self.skipped_count = result.read - result.inserted - len(result.rejected)
+        self.errors = [
+            f"Ошибка обработки {md_files[rejected.row - 1].name}: {rejected.reason}"
+            for rejected in result.rejected
+        ]
 
         print("\nITOGO:")
         print(f"SUCCESS: Успешно обработано: {self.imported_count}")
@@ -20,6 +20,18 @@ from sqlalchemy.orm import sessionmaker
 # Добавляем путь к корню проекта
 sys.path.append(str(Path(__file__).parent.parent))
 from app.core.settings import settings
+from app.features.interviews.services.question_sampler import (
+    bump_question_sampler_version,
+)
+from app.features.visualization.services.constellation_snapshot import (
+    bump_constellation_version,
+)
+from app.shared.database.bulk_loader import (
+    REPLACE,
+    BulkLoader,
+    BulkLoadError,
+    iter_csv,
+)
 
 
 def create_unique_csv():
@@ -107,8 +119,46 @@ def apply_migration():
         return False
 
 
+QUESTION_COLUMNS = [
+    "id",
+    "original_question_id",
+    "interview_id",
+    "question_text",
+    "company",
+    "cluster_id",
+    "category_id",
+    "topic_name",
+    "canonical_question",
+]
+
+
+def to_question_row(row):
+    """Строка CSV -> колонки InterviewQuestion"""
+    category = row["final_category"]
+    return {
+        "id": row["id"],
+        "original_question_id": row["original_question_id"],
+        "interview_id": row["interview_id"],
+        "question_text": row["question_text"][:2000],
+        "company": row["company"],
+        "cluster_id": int(float(row["cluster_id"])) if row["cluster_id"] else None,
+        "category_id": category.replace(" ", "_").lower() if category else None,
+        "topic_name": row["topic_name"],
+        "canonical_question": (row["canonical_question"] or "")[:2000] or None,
+    }
+
+
+def report_rejected(result, csv_file):
+    """Отклоненные строки сохраняются в .rejected.jsonl рядом с CSV"""
+    if not result.rejected:
+        return
+    rejected_file = Path(csv_file).with_suffix(".rejected.jsonl")
+    result.write_rejected(rejected_file)
+    print(f"   Отклоненные строки: {rejected_file}")
+
+
 def clear_and_reimport_data(csv_file):
-    """Очищает таблицу и импортирует новые данные"""
+    """Заменяет вопросы данными из CSV одной транзакцией"""
     print("\n" + "=" * 70)
     print("ПЕРЕИМПОРТ ДАННЫХ С УНИКАЛЬНЫМИ ID")
     print("=" * 70)
@@ -118,70 +168,36 @@ def clear_and_reimport_data(csv_file):
     session = Session()
 
     try:
-        # 1. Очищаем существующие вопросы (сохраняем категории и кластеры)
-        print("Очистка существующих вопросов...")
-        deleted_count = session.execute(
-            text('DELETE FROM "InterviewQuestion"')
-        ).rowcount
-        print(f"   Удалено записей: {deleted_count}")
-
-        # 2. Читаем новые данные
-        print("Чтение нового файла...")
-        df = pd.read_csv(csv_file)
-        print(f"   Загружено: {len(df)} вопросов")
-
-        # 3. Импортируем батчами
-        imported = 0
-        batch_size = 500
-
-        for i in range(0, len(df), batch_size):
-            batch = df.iloc[i : i + batch_size]
-
-            for _, row in batch.iterrows():
-                try:
-                    session.execute(
-                        text("""
-                            INSERT INTO "InterviewQuestion"
-                            (id, original_question_id, interview_id, question_text, company, 
-                             cluster_id, category_id, topic_name, canonical_question)
-                            VALUES (:id, :original_question_id, :interview_id, :question_text, 
-                                   :company, :cluster_id, :category_id, :topic_name, :canonical_question)
-                        """),
-                        {
-                            "id": row["id"],
-                            "original_question_id": row["original_question_id"],
-                            "interview_id": row["interview_id"],
-                            "question_text": row["question_text"][:2000],
-                            "company": row["company"]
-                            if pd.notna(row["company"])
-                            else None,
-                            "cluster_id": row["cluster_id"]
-                            if pd.notna(row["cluster_id"])
-                            else None,
-                            "category_id": row["final_category"]
-                            .replace(" ", "_")
-                            .lower()
-                            if pd.notna(row["final_category"])
-                            else None,
-                            "topic_name": row["topic_name"]
-                            if pd.notna(row["topic_name"])
-                            else None,
-                            "canonical_question": row["canonical_question"][:2000]
-                            if pd.notna(row["canonical_question"])
-                            else None,
-                        },
-                    )
-                    imported += 1
-
-                except Exception as e:
-                    print(f"Ошибка импорта записи {row['id']}: {e}")
-                    continue
-
-            # Коммитим батч
-            session.commit()
-            print(f"   Импортировано: {min(i+batch_size, len(df))}/{len(df)}")
-
-        # 4. Проверяем результат
+        # Вопросы, которых нет в файле, удаляются; категории и кластеры
+        # сохраняются. До commit API видит прежние данные
+        loader = BulkLoader(
+            session,
+            "InterviewQuestion",
+            QUESTION_COLUMNS,
+            key=["id"],
+            on_progress=lambda r: print(
+                f"   Прочитано: {r.read}, в staging: {r.staged}"
+            ),
+        )
+        try:
+            result = loader.load(
+                iter_csv(csv_file), mode=REPLACE, transform=to_question_row
+            )
+        except BulkLoadError as e:
+            # Неполный файл не заменяет таблицу: вопросы в базе не тронуты
+            session.rollback()
+            print(f"Импорт отменен: {e}")
+            report_rejected(e.result, csv_file)
+            return False
+        session.commit()
+        print(f"   {result.summary()}")
+        report_rejected(result, csv_file)
+
+        # Граф созвездия кластеров и индекс случайных вопросов пересчитаются
+        bump_constellation_version()
+        bump_question_sampler_version()
+
+        # Проверяем результат
         total = session.execute(
             text('SELECT COUNT(*) FROM "InterviewQuestion"')
         ).scalar()
@@ -192,9 +208,9 @@ def clear_and_reimport_data(csv_file):
         ).scalar()
 
         print("\nРЕЗУЛЬТАТ ИМПОРТА:")
-        print(f"   Успешно импортировано: {imported}")
+        print(f"   Успешно импортировано: {result.inserted + result.updated}")
         print(f"   Всего в базе: {total}")
-        print(f"   Категоризировано: {categorized} ({categorized/total*100:.1f}%)")
+        print(f"   Категоризировано: {categorized} ({categorized / total * 100:.1f}%)")
 
         return True
 
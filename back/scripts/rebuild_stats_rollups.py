@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Полный пересчет UserStatsRollup
+
+Триггеры БД поддерживают rollup при изменении прогресса. Пересчет нужен
+после импорта контента, если блоки или карточки сменили категорию.
+
+Использование:
+    python scripts/rebuild_stats_rollups.py
+    python scripts/rebuild_stats_rollups.py --user-id 42
+"""
+
+import argparse
+import os
+import sys
+
+# Добавляем путь к app в PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.logging import get_logger
+from app.features.stats.repositories.stats_repository import StatsRepository
+from app.shared.database.base import db_manager
+
+logger = get_logger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Пересчет UserStatsRollup")
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        default=None,
+        help="Пересчитать только для одного пользователя",
+    )
+    args = parser.parse_args()
+
+    with db_manager.get_session() as session:
+        rows = StatsRepository(session).rebuild_rollups(args.user_id)
+
+    logger.info(f"UserStatsRollup пересчитан: {rows} строк")
+
+
+if __name__ == "__main__":
+    main()
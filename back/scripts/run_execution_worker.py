@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Отдельный процесс-воркер очереди выполнения кода
+
+Позволяет масштабировать выполнение кода независимо от API: API процессы
+запускаются с CODE_EXECUTION_WORKERS=0 и CODE_EXECUTION_BROKER=redis,
+а этот скрипт запускается в нужном количестве экземпляров.
+
+Использование:
+    CODE_EXECUTION_BROKER=redis python scripts/run_execution_worker.py --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+# Добавляем путь к app в PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.features.code_editor.services.container_pool import shutdown_container_pools
+from app.features.code_editor.services.execution_queue import (
+    start_execution_workers,
+    stop_execution_workers,
+)
+from app.features.code_editor.utils.execution_backend import shutdown_execution_backend
+
+logger = get_logger(__name__)
+
+
+async def run(concurrency: int) -> None:
+    if settings.code_execution_broker != "redis":
+        logger.warning(
+            "CODE_EXECUTION_BROKER не redis: воркер не увидит задачи API процессов"
+        )
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await start_execution_workers(concurrency)
+    logger.info(f"Воркер выполнения кода запущен ({concurrency} задач)")
+
+    await stop_event.wait()
+
+    await stop_execution_workers()
+    shutdown_container_pools()
+    shutdown_execution_backend()
+    logger.info("Воркер выполнения кода остановлен")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Воркер очереди выполнения кода")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=max(settings.code_execution_workers, 1),
+        help="Количество одновременно обрабатываемых задач",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
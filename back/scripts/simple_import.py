@@ -11,6 +11,65 @@ from sqlalchemy.orm import sessionmaker
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.core.settings import settings
+from app.features.interviews.services.question_sampler import (
+    bump_question_sampler_version,
+)
+from app.features.visualization.services.constellation_snapshot import (
+    bump_constellation_version,
+)
+from app.shared.database.bulk_loader import BulkLoader
+
+CATEGORY_COLUMNS = [
+    "id",
+    "name",
+    "questions_count",
+    "clusters_count",
+    "percentage",
+    "color",
+    "icon",
+]
+QUESTION_COLUMNS = [
+    "id",
+    "question_text",
+    "company",
+    "date",
+    "category_id",
+    "topic_name",
+    "canonical_question",
+]
+
+
+def to_category_id(name):
+    return name.lower().replace(" ", "_").replace("ь", "").replace("ё", "e")
+
+
+def to_category_row(cat):
+    return {
+        "id": to_category_id(cat["name"]),
+        "name": cat["name"],
+        "questions_count": cat["questions_count"],
+        "clusters_count": cat.get("clusters_count", 0),
+        "percentage": cat["percentage"],
+        "color": "#95a5a6",
+        "icon": "question",
+    }
+
+
+def to_question_row(q):
+    try:
+        date_obj = datetime.strptime(q["date"], "%Y-%m-%d") if q.get("date") else None
+    except ValueError:
+        date_obj = None
+
+    return {
+        "id": f"q{q['number']}",
+        "question_text": q["question"],
+        "company": q.get("company"),
+        "date": date_obj,
+        "category_id": to_category_id(q["category"]) if q.get("category") else None,
+        "topic_name": q.get("topic"),
+        "canonical_question": q.get("canonical_question"),
+    }
 
 
 def main():
@@ -38,85 +97,42 @@ def main():
 
         print(f"Loaded {len(questions)} questions and {len(categories)} categories")
 
-        # Очистка (в правильном порядке из-за FK constraints)
+        # Очистка (в правильном порядке из-за FK constraints) и загрузка
+        # идут одной транзакцией: до commit API видит прежние данные
         session.execute(text('DELETE FROM "InterviewQuestion"'))
         session.execute(text('DELETE FROM "InterviewCluster"'))
         session.execute(text('DELETE FROM "InterviewCategory"'))
-        session.commit()
-        print("Cleared old data")
-
-        # Импорт категорий
-        for cat in categories:
-            category_id = (
-                cat["name"].lower().replace(" ", "_").replace("ь", "").replace("ё", "e")
-            )
-
-            session.execute(
-                text("""
-                INSERT INTO "InterviewCategory" 
-                (id, name, questions_count, clusters_count, percentage, color, icon)
-                VALUES (:id, :name, :questions_count, :clusters_count, :percentage, :color, :icon)
-            """),
-                {
-                    "id": category_id,
-                    "name": cat["name"],
-                    "questions_count": cat["questions_count"],
-                    "clusters_count": cat.get("clusters_count", 0),
-                    "percentage": cat["percentage"],
-                    "color": "#95a5a6",
-                    "icon": "question",
-                },
-            )
 
+        categories_result = BulkLoader(
+            session,
+            "InterviewCategory",
+            CATEGORY_COLUMNS,
+            key=["id"],
+        ).load(categories, transform=to_category_row)
+        print(categories_result.summary())
+
+        questions_result = BulkLoader(
+            session,
+            "InterviewQuestion",
+            QUESTION_COLUMNS,
+            key=["id"],
+            on_progress=lambda r: print(f"Imported {r.staged}/{len(questions)}"),
+        ).load(
+            (
+                {**question, "number": number}
+                for number, question in enumerate(questions, start=1)
+            ),
+            transform=to_question_row,
+        )
+        print(questions_result.summary())
         session.commit()
-        print(f"Imported {len(categories)} categories")
-
-        # Импорт вопросов
-        batch_size = 1000
-        question_counter = 1
-        for i in range(0, len(questions), batch_size):
-            batch = questions[i : i + batch_size]
-
-            for q in batch:
-                category_id = None
-                if q.get("category"):
-                    category_id = (
-                        q["category"]
-                        .lower()
-                        .replace(" ", "_")
-                        .replace("ь", "")
-                        .replace("ё", "e")
-                    )
-
-                try:
-                    date_obj = (
-                        datetime.strptime(q["date"], "%Y-%m-%d")
-                        if q.get("date")
-                        else None
-                    )
-                except:
-                    date_obj = None
-
-                session.execute(
-                    text("""
-                    INSERT INTO "InterviewQuestion" 
-                    (id, question_text, company, date, category_id, topic_name, canonical_question)
-                    VALUES (:id, :question_text, :company, :date, :category_id, :topic_name, :canonical_question)
-                """),
-                    {
-                        "id": f"q{question_counter}",
-                        "question_text": q["question"],
-                        "company": q.get("company"),
-                        "date": date_obj,
-                        "category_id": category_id,
-                        "topic_name": q.get("topic"),
-                        "canonical_question": q.get("canonical_question"),
-                    },
-                )
-                question_counter += 1
-
-            session.commit()
-            print(f"Imported batch {i//batch_size + 1}")
+
+        for rejected in [*categories_result.rejected, *questions_result.rejected][:5]:
+            print(f"Rejected row {rejected.row}: {rejected.reason}")
+
+        # Граф созвездия кластеров и индекс случайных вопросов пересчитаются
+        bump_constellation_version()
+        bump_question_sampler_version()
 
         # Проверка
         cat_count = session.execute(
@@ -0,0 +1,109 @@
+"""Локальный fake LLM сервер для проверки final_processor.py без реального API.
+
+Отвечает в формате OpenAI chat/completions. Ответ детерминирован: по одной
+строке CSV на каждую непустую строку текста интервью (не больше --questions).
+Умеет имитировать задержку и ошибки 429/500, чтобы проверить ретраи и
+rate limiter.
+
+Запуск:
+    python scripts/fake_llm_server.py --port 8765 --latency 0.5 --error-rate 0.1
+    PROXY_API_KEY=test python scripts/final_processor.py --async \\
+        --api-url http://127.0.0.1:8765/v1/chat/completions --input-json sample.json
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def build_csv(prompt: str, max_questions: int) -> str:
+    """CSV без заголовка из текста после 'ОБРАБОТАЙ:' в промпте."""
+    interview_id = (re.search(r"interview_id: (\S+)", prompt) or [None, "interview_000"])[1]
+    content = prompt.split("ОБРАБОТАЙ:", 1)[-1]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    lines = [" ".join(line.split()) for line in content.splitlines() if line.strip()]
+    for idx, line in enumerate(lines[:max_questions], start=1):
+        writer.writerow([f"q{idx}", line[:200], "", "", interview_id])
+    return buffer.getvalue().strip()
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    # Заполняются в main()
+    options: argparse.Namespace
+    rng = random.Random(0)
+    rng_lock = threading.Lock()
+    stats = {"requests": 0, "errors": 0}
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        with self.rng_lock:
+            self.stats["requests"] += 1
+            fail = self.rng.random() < self.options.error_rate
+            status = self.rng.choice([429, 500])
+            if fail:
+                self.stats["errors"] += 1
+
+        time.sleep(self.options.latency)
+        if fail:
+            self._send(status, {"error": {"message": "fake failure"}}, {"Retry-After": "0.1"} if status == 429 else {})
+            return
+
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        self._send(200, {
+            "id": "fake",
+            "object": "chat.completion",
+            "model": payload.get("model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": build_csv(prompt, self.options.questions)},
+                "finish_reason": "stop",
+            }],
+        })
+
+    def _send(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server for final_processor.py")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Задержка ответа, секунды")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 429/500")
+    parser.add_argument("--questions", type=int, default=5, help="Максимум вопросов в ответе")
+    options = parser.parse_args()
+
+    FakeLLMHandler.options = options
+    server = ThreadingHTTPServer((options.host, options.port), FakeLLMHandler)
+    logger.info(f"Fake LLM: http://{options.host}:{options.port}/v1/chat/completions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info(f"Запросов: {FakeLLMHandler.stats['requests']}, ошибок: {FakeLLMHandler.stats['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,10 @@ import logging
 import hashlib
 import re
 import argparse
+import asyncio
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, List, Tuple, Set
 import requests
@@ -14,12 +18,108 @@ import requests
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Коды ответа, после которых запрос имеет смысл повторить
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token bucket для asyncio: в среднем не больше rate запросов в секунду."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class LLMCache:
+    """Кэш ответов LLM: append-only JSONL, дозапись пачками по flush_every.
+
+    Файл не переписывается целиком, поэтому после остановки (в том числе
+    аварийной) обработка продолжается с места остановки: теряется не больше
+    одной несброшенной пачки. Старый llm_cache.json читается как есть.
+    """
+
+    def __init__(self, path: Path, legacy_path: Optional[Path] = None, flush_every: int = 20):
+        self.path = path
+        self.flush_every = flush_every
+        self.data: Dict[str, str] = {}
+        self._pending: List[Tuple[str, str]] = []
+        self._needs_newline = False
+        if legacy_path is not None:
+            self._load_legacy(legacy_path)
+        self._load()
+
+    def _load_legacy(self, legacy_path: Path) -> None:
+        if not legacy_path.exists():
+            return
+        try:
+            with legacy_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.data.update(data)
+        except Exception:
+            pass
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                self._needs_newline = not line.endswith("\n")
+                try:
+                    entry = json.loads(line)
+                    self.data[entry["key"]] = entry["csv"]
+                except (ValueError, KeyError, TypeError):
+                    # Оборванная последняя строка после аварийной остановки
+                    continue
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def __getitem__(self, key: str) -> str:
+        return self.data[key]
+
+    def put(self, key: str, value: str) -> None:
+        self.data[key] = value
+        self._pending.append((key, value))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        with self.path.open("a", encoding="utf-8") as f:
+            if self._needs_newline:
+                f.write("\n")
+                self._needs_newline = False
+            for key, value in self._pending:
+                f.write(json.dumps({"key": key, "csv": value}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending.clear()
+
+
 class FinalInterviewProcessor:
     def __init__(self, proxy_api_key: Optional[str] = None):
         # Директории и пути
         self.data_dir: Path = Path(__file__).resolve().parent
         self.processed_dir: Path = self.data_dir / "processed_csv"
+        # llm_cache.json - прежний формат (только чтение), новые ответы дописываются в .jsonl
         self.cache_path: Path = self.data_dir / "llm_cache.json"
+        self.cache_log_path: Path = self.data_dir / "llm_cache.jsonl"
 
         # Секреты (.env → ENV)
         self._load_dotenv(self.data_dir / ".env")
@@ -28,12 +128,18 @@ class FinalInterviewProcessor:
             raise RuntimeError("PROXY_API_KEY is not set. Provide it via ENV or sobes-data/.env")
 
         # HTTP/LLM
-        self.proxy_api_url = "https://api.proxyapi.ru/openai/v1/chat/completions"
+        self.proxy_api_url = os.getenv("PROXY_API_URL", "").strip() or "https://api.proxyapi.ru/openai/v1/chat/completions"
         self.model = "gpt-4.1-mini"
         self.headers = {
             "Authorization": f"Bearer {self.proxy_api_key}",
             "Content-Type": "application/json",
         }
+        self.request_timeout = 60
+        # Повторы при 429/5xx/таймаутах: пауза backoff_base * 2^попытка + jitter (или Retry-After)
+        self.max_retries = 4
+        self.backoff_base = 1.0
+        # requests.Session на поток: keep-alive соединения к API
+        self._http = threading.local()
 
         # Промпт и целевой CSV формат (схема как в test_3_blocks.py)
         self.prompt_template = (
@@ -84,45 +190,97 @@ q4,"event-loop",Яндекс,2025-07-14,interview_003
         )
 
         # Кэш и стандартизация компаний
-        self._cache: Dict[str, str] = self._load_cache()
+        self._cache_store = LLMCache(self.cache_log_path, legacy_path=self.cache_path)
+        self._cache: Dict[str, str] = self._cache_store.data
         self._company_map: Dict[str, str] = self._load_company_standardization()
         # Глобальный бюджет по количеству обрабатываемых records (full_content)
         self.global_record_budget: Optional[int] = None
 
     def send_to_llm(self, content: str, company_for_log: str, interview_id: str) -> Optional[str]:
         """Отправляет контент в LLM и возвращает CSV-строку (без заголовка)."""
-        prompt = self.prompt_template.format(full_content=content, interview_id=interview_id)
+        payload = self._build_payload(content, interview_id)
+        label = f"{company_for_log} / {interview_id}"
+
+        for attempt in range(self.max_retries + 1):
+            csv_content, retryable, retry_after = self._post_once(payload, label)
+            if csv_content is not None or not retryable or attempt == self.max_retries:
+                return csv_content
+            time.sleep(self._retry_delay(attempt, retry_after))
+        return None
+
+    async def send_to_llm_async(
+        self, content: str, company_for_log: str, interview_id: str,
+        bucket: TokenBucket, executor: ThreadPoolExecutor,
+    ) -> Optional[str]:
+        """То же, что send_to_llm, но с общим rate limiter и без блокировки цикла событий."""
+        payload = self._build_payload(content, interview_id)
+        label = f"{company_for_log} / {interview_id}"
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            csv_content, retryable, retry_after = await loop.run_in_executor(
+                executor, self._post_once, payload, label
+            )
+            if csv_content is not None or not retryable or attempt == self.max_retries:
+                return csv_content
+            await asyncio.sleep(self._retry_delay(attempt, retry_after))
+        return None
 
-        payload = {
+    def _build_payload(self, content: str, interview_id: str) -> dict:
+        prompt = self.prompt_template.format(full_content=content, interview_id=interview_id)
+        return {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0,
             "max_tokens": 2000,
         }
 
+    def _post_once(self, payload: dict, label: str) -> Tuple[Optional[str], bool, Optional[float]]:
+        """Один запрос к API: (csv или None, можно ли повторить, Retry-After в секундах)."""
+        session = getattr(self._http, "session", None)
+        if session is None:
+            session = self._http.session = requests.Session()
+
         try:
-            logger.info(f"LLM запрос: {company_for_log} / {interview_id}")
-            response = requests.post(
+            logger.info(f"LLM запрос: {label}")
+            response = session.post(
                 self.proxy_api_url,
                 headers=self.headers,
                 json=payload,
-                timeout=60,
+                timeout=self.request_timeout,
             )
+        except requests.RequestException as e:
+            logger.error(f"Ошибка отправки для {label}: {str(e)}")
+            return None, True, None
 
-            if response.status_code == 200:
+        if response.status_code == 200:
+            try:
                 result = response.json()
-                csv_content = result["choices"][0]["message"]["content"].strip()
-                return csv_content
-            else:
-                logger.error(f"Ошибка API: {response.status_code} - {response.text}")
-                return None
+                return result["choices"][0]["message"]["content"].strip(), False, None
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                logger.error(f"Некорректный ответ API для {label}: {str(e)}")
+                return None, False, None
 
-        except Exception as e:
-            logger.error(f"Ошибка отправки для {company_for_log}: {str(e)}")
-            return None
+        logger.error(f"Ошибка API: {response.status_code} - {response.text[:500]}")
+        retry_after = None
+        try:
+            retry_after = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            pass
+        return None, response.status_code in RETRYABLE_STATUSES, retry_after
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return retry_after
+        return self.backoff_base * (2 ** attempt) + random.uniform(0, self.backoff_base)
 
-    def process_company_batch(self, company_data: dict, output_dir: Path) -> bool:
-        """Обрабатывает все интервью одной компании c кэшем/дедуп/фильтрами."""
+    def process_company_batch(self, company_data: dict, output_dir: Path, offline: bool = False) -> bool:
+        """Обрабатывает все интервью одной компании c кэшем/дедуп/фильтрами.
+
+        offline=True - только из кэша (ответы заранее получены prefetch_async):
+        промахи кэша пропускаются без запросов к LLM.
+        """
         raw_company = company_data.get("company", "")
         company_norm = self._normalize_company(raw_company) or "Unknown"
         records = company_data.get("records", [])
@@ -165,18 +323,28 @@ q4,"event-loop",Яндекс,2025-07-14,interview_003
             content_hash = self._hash_content(full_content)
 
             # Кэш по содержимому
+            llm_called = False
             if content_hash in self._cache:
                 csv_result = self._cache[content_hash]
-                logger.info(f"КЭШ hit: {company_norm} / {interview_id}")
+                logger.debug(f"КЭШ hit: {company_norm} / {interview_id}")
                 stats_cache_hits += 1
+            elif offline:
+                logger.warning(f"Нет ответа LLM для {company_norm} / {interview_id}, пропуск")
+                # Бюджет расходуется так же, как при планировании запросов
+                if self.global_record_budget is not None:
+                    self.global_record_budget -= 1
+                continue
             else:
                 csv_result = self.send_to_llm(full_content, company_norm, interview_id)
                 if not csv_result:
-                    # Пауза и продолжим, если ошибка API
+                    # Пауза и продолжим, если ошибка API. Неудачная попытка тоже
+                    # расходует бюджет - как в _plan_llm_jobs и offline режиме
                     time.sleep(0.5)
+                    if self.global_record_budget is not None:
+                        self.global_record_budget -= 1
                     continue
-                self._cache[content_hash] = csv_result
-                self._save_cache()
+                self._cache_store.put(content_hash, csv_result)
+                llm_called = True
 
             # Постобработка: убрать возможный заголовок, распарсить CSV
             for line in [ln.strip() for ln in csv_result.split("\n") if ln.strip()]:
@@ -228,8 +396,9 @@ q4,"event-loop",Яндекс,2025-07-14,interview_003
                     stats_parse_errors += 1
                     continue
 
-            # Рейтконтроль
-            time.sleep(0.2)
+            # Рейтконтроль (только после реального запроса к API)
+            if llm_called:
+                time.sleep(0.2)
 
             # Декремент глобального бюджета после обработки одного блока
             if self.global_record_budget is not None:
@@ -261,8 +430,17 @@ q4,"event-loop",Яндекс,2025-07-14,interview_003
             logger.error(f"Ошибка сохранения файла {output_file}: {str(e)}")
             return False
 
-    def process_all_companies(self, json_file: Path, output_dir: Path, limit: Optional[int] = None, record_limit: Optional[int] = None):
-        """Обрабатывает компании из JSON файла с опциональным лимитом."""
+    def process_all_companies(
+        self, json_file: Path, output_dir: Path, limit: Optional[int] = None, record_limit: Optional[int] = None,
+        async_mode: bool = False, concurrency: int = 8, rate: float = 5.0,
+    ):
+        """Обрабатывает компании из JSON файла с опциональным лимитом.
+
+        async_mode: сначала все ответы LLM запрашиваются параллельно (concurrency
+        воркеров, не больше rate запросов в секунду) и складываются в кэш, затем
+        компании обрабатываются по порядку из кэша - результат совпадает с
+        последовательным режимом.
+        """
         try:
             with json_file.open("r", encoding="utf-8") as f:
                 companies_data = json.load(f)
@@ -273,6 +451,10 @@ q4,"event-loop",Яндекс,2025-07-14,interview_003
 
             logger.info(f"Загружено {len(companies_data)} компаний")
 
+            if async_mode:
+                jobs = self._plan_llm_jobs(companies_data, record_limit)
+                asyncio.run(self.prefetch_async(jobs, concurrency, rate))
+
             # Устанавливаем глобальный лимит по количеству records
             self.global_record_budget = record_limit
 
@@ -282,10 +464,11 @@ q4,"event-loop",Яндекс,2025-07-14,interview_003
             for company_data in companies_data:
                 if self.global_record_budget is not None and self.global_record_budget <= 0:
                     break
-                success = self.process_company_batch(company_data, output_dir)
+                success = self.process_company_batch(company_data, output_dir, offline=async_mode)
                 processed_count += int(bool(success))
                 failed_count += int(not success)
-                time.sleep(1.0)
+                if not async_mode:
+                    time.sleep(1.0)
 
             logger.info(
                 f"Завершена обработка: {processed_count} успешно, {failed_count} ошибок"
@@ -294,6 +477,74 @@ q4,"event-loop",Яндекс,2025-07-14,interview_003
             self.global_record_budget = None
         except Exception as e:
             logger.error(f"Ошибка обработки файла {json_file}: {str(e)}")
+        finally:
+            self._save_cache()
+
+    def _plan_llm_jobs(self, companies_data: List[dict], record_limit: Optional[int]) -> List[Tuple[str, str, str, str]]:
+        """Записи без ответа в кэше в порядке обработки: (content_hash, content, company, interview_id).
+
+        record_limit считается так же, как в process_company_batch: каждая запись
+        (пустая, из кэша или с ошибкой LLM) расходует одну единицу бюджета.
+        """
+        jobs: List[Tuple[str, str, str, str]] = []
+        planned: Set[str] = set()
+        budget = record_limit
+
+        for company_data in companies_data:
+            company_norm = self._normalize_company(company_data.get("company", "")) or "Unknown"
+            for i, record in enumerate(company_data.get("records", [])):
+                if budget is not None:
+                    if budget <= 0:
+                        return jobs
+                    budget -= 1
+                full_content = (record.get("full_content", "") or "").strip()
+                if not full_content:
+                    continue
+                content_hash = self._hash_content(full_content)
+                if content_hash in self._cache or content_hash in planned:
+                    continue
+                planned.add(content_hash)
+                jobs.append((content_hash, full_content, company_norm, self._make_interview_id(company_norm, i)))
+
+        return jobs
+
+    async def prefetch_async(self, jobs: List[Tuple[str, str, str, str]], concurrency: int = 8, rate: float = 5.0) -> None:
+        """Параллельно получает ответы LLM для jobs и пишет их в кэш."""
+        if not jobs:
+            logger.info("Все ответы LLM уже в кэше")
+            return
+
+        logger.info(f"Запросов к LLM: {len(jobs)}; воркеров: {concurrency}; лимит: {rate}/с")
+        bucket = TokenBucket(rate)
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        done = 0
+        failed = 0
+        started = time.monotonic()
+
+        async def worker(executor: ThreadPoolExecutor) -> None:
+            nonlocal done, failed
+            while True:
+                try:
+                    content_hash, content, company_norm, interview_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                csv_result = await self.send_to_llm_async(content, company_norm, interview_id, bucket, executor)
+                if csv_result:
+                    self._cache_store.put(content_hash, csv_result)
+                else:
+                    failed += 1
+                done += 1
+                if done % 50 == 0 or done == len(jobs):
+                    elapsed = time.monotonic() - started
+                    logger.info(f"LLM: {done}/{len(jobs)} ({failed} ошибок), {done / elapsed:.1f} запросов/с")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                await asyncio.gather(*(worker(executor) for _ in range(concurrency)))
+            finally:
+                self._save_cache()
 
     def merge_csv_files(self, input_dir: Path, output_file: Path):
         """Объединяет все CSV файлы в один с глобальной дедупликацией по question_text."""
@@ -368,24 +619,11 @@ q4,"event-loop",Яндекс,2025-07-14,interview_003
         except Exception:
             pass
 
-    def _load_cache(self) -> Dict[str, str]:
-        if not self.cache_path.exists():
-            return {}
-        try:
-            with self.cache_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, dict):
-                return data
-            return {}
-        except Exception:
-            return {}
-
     def _save_cache(self) -> None:
         try:
-            with self.cache_path.open("w", encoding="utf-8") as f:
-                json.dump(self._cache, f, ensure_ascii=False)
-        except Exception:
-            pass
+            self._cache_store.flush()
+        except Exception as e:
+            logger.error(f"Ошибка записи кэша {self.cache_log_path}: {str(e)}")
 
     def _hash_content(self, content: str) -> str:
         """Версионированный ключ кэша: текст + модель + версия промпта."""
@@ -520,12 +758,21 @@ def main():
     parser.add_argument("--record-limit", type=int, default=None, help="Ограничить число интервью-блоков (records) суммарно для теста")
     parser.add_argument("--model", type=str, default=None, help="Переопределить модель (например, gpt-4o-mini)")
     parser.add_argument("--input-json", type=str, default=None, help="Путь к входному JSON (по умолчанию MASSIV_GROUPED.json)")
+    parser.add_argument("--async", dest="async_mode", action="store_true", help="Параллельные запросы к LLM (результат тот же, что без флага)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Число одновременных запросов в --async")
+    parser.add_argument("--rate", type=float, default=5.0, help="Не больше N запросов в секунду в --async")
+    parser.add_argument("--max-retries", type=int, default=None, help="Повторы при 429/5xx/таймаутах")
+    parser.add_argument("--api-url", type=str, default=None, help="URL chat/completions (например, локальный fake_llm_server.py)")
     args = parser.parse_args()
 
     # Конфигурация путей (без хардкодов)
     processor = FinalInterviewProcessor()
     if args.model:
         processor.model = args.model
+    if args.api_url:
+        processor.proxy_api_url = args.api_url
+    if args.max_retries is not None:
+        processor.max_retries = args.max_retries
 
     input_json = Path(args.input_json).resolve() if args.input_json else (processor.data_dir / "MASSIV_GROUPED.json")
     output_dir = processor.processed_dir
@@ -538,7 +785,10 @@ def main():
     print(f"Лимит компаний: {company_limit if company_limit is not None else 'все'}; лимит records: {record_limit if record_limit is not None else 'нет'}")
 
     # Обрабатываем компании
-    processor.process_all_companies(input_json, output_dir, company_limit, record_limit)
+    processor.process_all_companies(
+        input_json, output_dir, company_limit, record_limit,
+        async_mode=args.async_mode, concurrency=args.concurrency, rate=args.rate,
+    )
 
     # Объединяем все CSV в один файл
     processor.merge_csv_files(output_dir, final_csv)